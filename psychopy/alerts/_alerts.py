@@ -23,9 +23,13 @@ catalog : AlertCatalog
 alertLog : List
     For storing alerts that are otherwise lost when flushing standard stream. The stored
     lists can be used to feed AlertPanel using in Project Info and new Runner frame.
+alertCount : int
+    Number of alerts raised so far in this process, so that code which raises alerts
+    (e.g. compiling an experiment) can tell whether any were raised.
 """
 
 _activeAlertHandlers = []
+alertCount = 0
 
 
 class AlertCatalog:
@@ -150,6 +154,9 @@ def alert(code=None, obj=object, strFields=None, trace=None):
             The traceback
     """
 
+    global alertCount
+    alertCount += 1
+
     msg = AlertEntry(code, obj, strFields, trace)
 
     # format the warning into a string for console and logging targets
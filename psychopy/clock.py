@@ -19,10 +19,14 @@ Clock logic.
 # Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2024 Open Science Tools Ltd.
 # Distributed under the terms of the GNU General Public License (GPL).
 import logging
+import threading
 import time
 import sys
+from collections import deque
 from datetime import datetime
 
+import numpy as np
+
 from packaging.version import Version
 
 try:
@@ -35,6 +39,8 @@ import psychopy.logging  # Absolute import to work around circularity
 
 # set the default timing mechanism
 getTime = None
+# same time base as getTime, but as integer nanoseconds
+getTimeNs = None
 
 # Select the timer to use as the psychopy high resolution time base. Selection
 # is based on OS and Python version.
@@ -66,11 +72,16 @@ if havePTB:
     #     secs, wallTime, error = psychtoolbox.GetSecs('allclocks')
     #     return wallTime
     getTime = psychtoolbox.GetSecs
+
+    def getTimeNs():
+        return int(psychtoolbox.GetSecs() * 1e9)
+
 elif sys.platform == 'win32':
     from ctypes import byref, c_int64, windll
     _fcounter = c_int64()
     _qpfreq = c_int64()
     windll.Kernel32.QueryPerformanceFrequency(byref(_qpfreq))
+    _qpfreqInt = _qpfreq.value
     _qpfreq = float(_qpfreq.value)
     _winQPC = windll.Kernel32.QueryPerformanceCounter
 
@@ -78,6 +89,10 @@ elif sys.platform == 'win32':
         _winQPC(byref(_fcounter))
         return _fcounter.value / _qpfreq
 
+    def getTimeNs():
+        _winQPC(byref(_fcounter))
+        return _fcounter.value * 1000000000 // _qpfreqInt
+
 elif sys.platform == "darwin":
     # Monotonic getTime with absolute origin. Suggested by @aforren1, and
     # copied from github.com/aforren1/toon/blob/master/toon/input/mac_clock.py 
@@ -105,9 +120,14 @@ elif sys.platform == "darwin":
     def getTime():
         return (_mach_absolute_time() * _scaling_factor) / 1.0e9
 
+    def getTimeNs():
+        return _mach_absolute_time() * _timebase.numer // _timebase.denom
+
 else:
     import timeit
     getTime = timeit.default_timer
+    # default_timer is perf_counter, which has an integer version
+    getTimeNs = time.perf_counter_ns
 
 
 class Timestamp(float):
@@ -287,6 +307,59 @@ class MonotonicClock:
 
         return Timestamp(t, format, lastReset=lastReset)
 
+    def getTimeNs(self, applyZero=True):
+        """
+        Returns the current time on this clock as a whole number of
+        nanoseconds.
+
+        This is a fast alternative to :meth:`getTime` for tight loops (e.g.
+        polling a device many times per frame), as it doesn't create a
+        :class:`Timestamp` for each call.
+
+        Parameters
+        ----------
+        applyZero : bool
+            As for :meth:`getTime`.
+
+        Returns
+        -------
+        int
+            Time in nanoseconds.
+        """
+        t = getTimeNs() - round(self._timeAtLastReset * 1e9)
+        if not applyZero:
+            t += round(self._epochTimeAtLastReset * 1e9)
+
+        return t
+
+    def getTimesFromNs(self, timesNs, applyZero=True):
+        """
+        Convert many raw times from :func:`psychopy.clock.getTimeNs` to
+        times on this clock, in one go.
+
+        Storing the raw value of `getTimeNs()` for each event and converting
+        them all afterwards is the quickest way to timestamp a lot of events.
+
+        Parameters
+        ----------
+        timesNs : array-like of int
+            Raw times, as returned by :func:`psychopy.clock.getTimeNs`.
+        applyZero : bool
+            As for :meth:`getTime`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Times on this clock in seconds (as you'd have got from `getTime`
+            at the same moments).
+        """
+        timesNs = np.asarray(timesNs, dtype=np.int64)
+        t = (timesNs - round(self._timeAtLastReset * 1e9)) / 1e9
+        if not applyZero:
+            t += self._epochTimeAtLastReset
+
+        return t
+
     def getLastResetTime(self):
         """
         Returns the current offset being applied to the high resolution
@@ -378,6 +451,19 @@ class CountdownTimer(Clock):
         """
         return self._timeAtLastReset - getTime()
 
+    def getTimeNs(self):
+        """Returns the current time left on this timer as a whole number of
+        nanoseconds (`int`), without creating any objects.
+        """
+        return round(self._timeAtLastReset * 1e9) - getTimeNs()
+
+    def getTimesFromNs(self, timesNs):
+        """Convert many raw times from :func:`psychopy.clock.getTimeNs` to
+        the time left on this timer (in seconds) at those moments.
+        """
+        timesNs = np.asarray(timesNs, dtype=np.int64)
+        return (round(self._timeAtLastReset * 1e9) - timesNs) / 1e9
+
     def addTime(self, t):
         """Add more time to the CountdownTimer
         
@@ -614,3 +700,172 @@ def getAbsTime():
 
     """
     return int(time.mktime(time.localtime()))
+
+
+class ClockMapping:
+    """Maps times on one clock to times on another, correcting for drift
+    between them.
+
+    Two clocks can run at very slightly different rates (e.g. the system's
+    wall clock is adjusted by network time updates, and a clock in another
+    process or on another device has its own crystal), so a fixed offset
+    between them goes stale over a long session. This takes pairs of samples
+    from the two clocks, and fits a straight line through them (least
+    squares), which corrects for both the offset and the drift.
+
+    Call :meth:`sample` every so often (e.g. in each ITI), or call
+    :meth:`startSampling` to take samples on a background thread.
+
+    Parameters
+    ----------
+    source : MonotonicClock or callable
+        Clock to map times from. The default is
+        :data:`psychopy.clock.monotonicClock`.
+    target : MonotonicClock or callable
+        Clock to map times to, as a clock or a function returning the time in
+        seconds, e.g. `time.time` for absolute (Unix epoch) times or the
+        `getTime` method of an :class:`~psychopy.iohub.client.ioHubConnection`
+        for the ioHub Server's time. Use `time.time` rather than
+        :func:`getAbsTime`, which is rounded to whole seconds.
+    maxSamples : int
+        Number of the most recent samples to fit.
+
+    Examples
+    --------
+    Get the absolute time of a key press, from its time on the experiment
+    clock::
+
+        toAbs = clock.ClockMapping(clock.monotonicClock, time.time)
+        toAbs.startSampling(interval=1.0)
+        ...
+        absTime = toAbs.toTarget(keyTime)
+
+    """
+    def __init__(self, source=None, target=time.time, maxSamples=100):
+        if source is None:
+            source = monotonicClock
+        self.source = source
+        self.target = target
+        self.samples = deque(maxlen=maxSamples)
+        # (source mean, target mean, slope) of the last fit
+        self._fit = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopEvent = threading.Event()
+        self.sample()
+
+    @staticmethod
+    def _getTimeFunc(clock):
+        if isinstance(clock, MonotonicClock):
+            # return a plain float rather than a Timestamp
+            return lambda: clock.getTimeNs() / 1e9
+        return clock
+
+    def sample(self, nReads=5):
+        """Take a sample of the time on both clocks and update the fit.
+
+        The target clock is read between two reads of the source clock, and
+        the midpoint of those is taken as the source time. Of `nReads`
+        attempts the one where the source reads were closest together is
+        used, so a sample isn't spoiled by an interruption (e.g. a context
+        switch or a slow call to another process).
+
+        Parameters
+        ----------
+        nReads : int
+            Number of attempts to take the sample from.
+
+        Returns
+        -------
+        tuple
+            Time on the source clock, time on the target clock and the
+            uncertainty of the pair (time between the two source reads).
+        """
+        getSource = self._getTimeFunc(self.source)
+        getTarget = self._getTimeFunc(self.target)
+        best = None
+        for n in range(nReads):
+            before = getSource()
+            targetT = getTarget()
+            after = getSource()
+            if best is None or after - before < best[2]:
+                best = ((before + after) / 2, float(targetT), after - before)
+        with self._lock:
+            self.samples.append(best)
+            self._updateFit()
+
+        return best
+
+    def _updateFit(self):
+        samples = np.array(self.samples)
+        sourceT = samples[:, 0]
+        targetT = samples[:, 1]
+        # fit around the means to keep precision for large (e.g. epoch) times
+        sourceMean = sourceT.mean()
+        targetMean = targetT.mean()
+        spread = sourceT - sourceMean
+        if len(samples) < 2 or not np.any(spread):
+            slope = 1.0
+        else:
+            slope = np.dot(spread, targetT - targetMean) / np.dot(spread, spread)
+        self._fit = (sourceMean, targetMean, slope)
+
+    @property
+    def drift(self):
+        """Rate at which the target clock gains on the source clock (e.g. 1e-5
+        means it gains 10us per second), from the current fit."""
+        return self._fit[2] - 1.0
+
+    def toTarget(self, t):
+        """Convert a time, or an array of times, on the source clock to the
+        target clock.
+
+        Parameters
+        ----------
+        t : float or array-like
+            Time(s) on the source clock, in seconds.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Time(s) on the target clock, in seconds.
+        """
+        sourceMean, targetMean, slope = self._fit
+        mapped = targetMean + slope * (np.asarray(t, dtype=float) - sourceMean)
+        if mapped.ndim == 0:
+            return float(mapped)
+        return mapped
+
+    def toSource(self, t):
+        """Convert a time, or an array of times, on the target clock to the
+        source clock (the inverse of :meth:`toTarget`).
+        """
+        sourceMean, targetMean, slope = self._fit
+        mapped = sourceMean + (np.asarray(t, dtype=float) - targetMean) / slope
+        if mapped.ndim == 0:
+            return float(mapped)
+        return mapped
+
+    def startSampling(self, interval=1.0):
+        """Take a sample every `interval` seconds on a background thread,
+        until :meth:`stopSampling` is called.
+        """
+        if self._thread is not None:
+            return
+        self._stopEvent.clear()
+
+        def run():
+            while not self._stopEvent.wait(interval):
+                self.sample()
+
+        self._thread = threading.Thread(target=run, daemon=True,
+                                        name="ClockMapping")
+        self._thread.start()
+
+    def stopSampling(self):
+        """Stop taking samples on a background thread."""
+        if self._thread is None:
+            return
+        self._stopEvent.set()
+        self._thread.join()
+        self._thread = None
@@ -238,6 +238,89 @@ alphaSpaces = [
 nonAlphaSpaces = list(colorSpaces)
 for val in alphaSpaces:
     nonAlphaSpaces.remove(val)
+# spaces whose values are numbers rather than strings
+_numericSpaces = frozenset(colorSpaces).difference(strSpaces)
+# the space without alpha, for each space with alpha
+_alphaSpaceBase = {
+    'rgba': 'rgb', 'rgba1': 'rgb1', 'rgba255': 'rgb255', 'hsva': 'hsv',
+    'srgba': 'srgb', 'lmsa': 'lms', 'dkla': 'dkl', 'dklaCart': 'dklCart'}
+
+# names of each named color, by its rgb value (for looking up a color's name)
+_namesByRgb = {}
+for _name, _val in colorNames.items():
+    _namesByRgb.setdefault(tuple(_val[:3]), []).append(_name)
+
+# rgb255 values of hex strings which have already been converted
+_hexCache = {}
+
+
+def _hexToRgb255(hexColor):
+    """Convert a hex string (e.g. '#F2545B') to an array of rgb255 values,
+    remembering the result as the same few colors tend to be used repeatedly.
+    """
+    rgb255 = _hexCache.get(hexColor)
+    if rgb255 is None:
+        digits = hexColor.strip('#')
+        rgb255 = np.array([int(digits[i:i + 2], 16) for i in (0, 2, 4)])
+        if len(_hexCache) > 1024:
+            _hexCache.clear()
+        _hexCache[hexColor] = rgb255
+    return rgb255.copy()
+
+
+def _rgb255ToHex(rgb255):
+    """Convert an array of rgb255 values (Nx3 or 3) to hex strings."""
+    rgb255 = np.asarray(rgb255)
+    if rgb255.ndim > 1:
+        return np.array([_rgb255ToHex(row) for row in rgb255])
+    return "#" + "".join("{:02x}".format(int(val)) for val in rgb255)
+
+
+def _rgbToNamed(rgb):
+    """Get the name of an Nx3 array of rgb values (None where they don't match
+    a named color).
+    """
+    names = []
+    for row in rgb:
+        matches = [name for name in _namesByRgb.get(tuple(row), [])
+                   if name != 'none']
+        names.append(matches[-1] if matches else None)
+    return np.array(names, dtype=object)
+
+
+def _namedToRgb(names):
+    """Get the rgb values of an array of color names, along with their alpha
+    (0 for 'none').
+    """
+    names = [str(name).lower() for name in names]
+    rgb = np.array([colorNames[name][:3] for name in names], dtype=float)
+    alpha = np.array([0. if name == 'none' else 1. for name in names])
+    return rgb, alpha
+
+
+# functions to convert Nx3 arrays to (_toRgb) and from (_fromRgb) rgb, for
+# each numeric space, given a conversion matrix (or None for the default)
+_toRgb = {
+    'rgb': lambda color, matrix: color,
+    'rgb1': lambda color, matrix: 2 * (color - 0.5),
+    'rgb255': lambda color, matrix: 2 * (color / 255 - 0.5),
+    'hsv': lambda color, matrix: ct.hsv2rgb(color),
+    'srgb': lambda color, matrix: ct.srgbTF(color, reverse=True),
+    'lms': lambda color, matrix: ct.lms2rgb(color, matrix),
+    'dkl': lambda color, matrix: ct.dkl2rgb(color, matrix),
+    'dklCart': lambda color, matrix: ct.dklCart2rgb(
+        color[:, 0], color[:, 1], color[:, 2], matrix),
+}
+_fromRgb = {
+    'rgb': lambda rgb, matrix: rgb,
+    'rgb1': lambda rgb, matrix: (rgb + 1) / 2,
+    'rgb255': lambda rgb, matrix: np.round(255 * (rgb + 1) / 2),
+    'hsv': lambda rgb, matrix: ct.rgb2hsv(rgb),
+    'srgb': lambda rgb, matrix: ct.srgbTF(rgb),
+    'lms': lambda rgb, matrix: ct.rgb2lms(rgb, matrix),
+    'dklCart': lambda rgb, matrix: ct.rgb2dklCart(
+        rgb.reshape((-1, 1, 3)), matrix).reshape((-1, 3)),
+}
 
 
 class Color:
@@ -275,6 +358,15 @@ class Color:
         """
         Check that a color value is valid in the given space, or all spaces if space==None.
         """
+        # Numeric values in a numeric space (e.g. when animating a color every
+        # frame) don't need any of the string checks below
+        if space in _numericSpaces and isinstance(color, (np.ndarray, list, tuple)):
+            arr = np.asarray(color)
+            if arr.ndim == 1 and arr.size in (3, 4) and arr.dtype.kind in 'fiu':
+                if arr.size == 4:
+                    self.alpha = arr[3]
+                    arr = arr[:3]
+                return arr, space
         # Treat None as a named color
         if color is None:
             color = "none"
@@ -292,15 +384,11 @@ class Color:
             for i in range((len(color[:, 0]))):
                 color[i, 0] = color[i, 0].replace("\"", "").replace("'", "")
             # If colors are all named, override color space
-            namedMatch = np.vectorize(
-                lambda col: bool(colorSpaces['named'].fullmatch(
-                    str(col).lower())))  # match regex against named
-            if all(namedMatch(color[:, 0])):
+            if all(str(col).lower() in colorNames for col in color[:, 0]):
                 space = 'named'
             # If colors are all hex, override color space
-            hexMatch = np.vectorize(
-                lambda col: bool(colorSpaces['hex'].fullmatch(str(col))))  # match regex against hex
-            if all(hexMatch(color[:, 0])):
+            hexRe = colorSpaces['hex']
+            if all(hexRe.fullmatch(str(col)) for col in color[:, 0]):
                 space = 'hex'
             # If color is a string but does not match any string space, it's invalid
             if space not in strSpaces:
@@ -381,17 +469,105 @@ class Color:
         # If value is cached, return it rather than doing calculations again
         if space in self._renderCache:
             return self._renderCache[space]
-        # Transform contrast to match rgb
         contrast = self.contrast
-        contrast = np.reshape(contrast, (-1, 1))
-        contrast = np.hstack((contrast, contrast, contrast))
-        # Multiply
-        adj = np.clip(self.rgb * contrast, -1, 1)
-        buffer = self.copy()
-        buffer.rgb = adj
+        rgb = self.rgb
+        if isinstance(contrast, (int, float)) and rgb is not None:
+            # Single contrast value, so no need to validate the result
+            buffer = self._withRgb(np.clip(rgb * contrast, -1, 1))
+        else:
+            # Transform contrast to match rgb
+            contrast = np.reshape(contrast, (-1, 1))
+            contrast = np.hstack((contrast, contrast, contrast))
+            # Multiply
+            adj = np.clip(rgb * contrast, -1, 1)
+            buffer = self.copy()
+            buffer.rgb = adj
         self._renderCache[space] = getattr(buffer, space)
         return self._renderCache[space]
 
+    def _withRgb(self, rgb):
+        """Make a copy of this color with a different (already valid) rgb value,
+        without going through validation.
+        """
+        buffer = self.__class__.__new__(self.__class__)
+        buffer._cache = {'rgb': rgb}
+        buffer._renderCache = {}
+        buffer._contrast = self.contrast
+        buffer._alpha = self._alpha
+        buffer.valid = True
+        buffer.conematrix = self.conematrix
+        buffer._requested = self._requested
+        buffer._requestedSpace = self._requestedSpace
+        buffer._franca = rgb
+        return buffer
+
+    @staticmethod
+    def renderMany(colors, fromSpace='rgb', toSpace='rgb', contrast=1,
+                   conematrix=None):
+        """Convert many colors from one space to another at once, without
+        making a :class:`Color` for each. Useful for per-frame color changes of
+        many elements (e.g. the colors of an ElementArrayStim).
+
+        Values are not validated, so should already be in range for
+        `fromSpace`.
+
+        Parameters
+        ----------
+        colors : ArrayLike
+            An Nx3 (or Nx4, with alpha) array of colors, or a list of N strings
+            for the 'hex' and 'named' spaces.
+        fromSpace : str
+            Color space of `colors`.
+        toSpace : str
+            Color space to convert to.
+        contrast : float or ArrayLike
+            Contrast to apply to the colors (as in `Color.render`), either one
+            value or one per color.
+        conematrix : ArrayLike or None
+            Conversion matrix for the lms and dkl spaces.
+
+        Returns
+        -------
+        ndarray
+            The colors in `toSpace`, Nx3 (Nx4 for spaces with alpha, which is 1
+            unless given in `colors`) or N strings for 'hex' and 'named'.
+        """
+        for space in (fromSpace, toSpace):
+            if space not in colorSpaces:
+                raise ValueError(f"{space} is not a valid color space")
+        # Convert to rgb
+        alpha = None
+        if fromSpace == 'named':
+            rgb, alpha = _namedToRgb(np.ravel(colors))
+        elif fromSpace == 'hex':
+            rgb = np.array([_hexToRgb255(str(col)) for col in np.ravel(colors)])
+            rgb = _toRgb['rgb255'](rgb, conematrix)
+        else:
+            values = np.asarray(colors, dtype=float)
+            values = values.reshape((-1, values.shape[-1]))
+            if values.shape[1] == 4:
+                alpha = values[:, 3]
+                values = values[:, :3]
+            rgb = _toRgb[_alphaSpaceBase.get(fromSpace, fromSpace)](
+                values, conematrix)
+        if alpha is None:
+            alpha = np.ones(len(rgb))
+        # Apply contrast
+        rgb = np.clip(rgb * np.reshape(contrast, (-1, 1)), -1, 1)
+        # Convert to output space
+        if toSpace == 'hex':
+            return _rgb255ToHex(_fromRgb['rgb255'](rgb, conematrix))
+        if toSpace == 'named':
+            return _rgbToNamed(rgb)
+        base = _alphaSpaceBase.get(toSpace, toSpace)
+        if base not in _fromRgb:
+            raise NotImplementedError(
+                f"Conversion from rgb to {toSpace} is not yet implemented.")
+        color = _fromRgb[base](rgb, conematrix)
+        if toSpace in alphaSpaces:
+            color = np.column_stack((color, alpha))
+        return color
+
     def __repr__(self):
         """If colour is printed, it will display its class and value.
         """
@@ -539,6 +715,11 @@ class Color:
 
     @alpha.setter
     def alpha(self, value):
+        if type(value) is float:
+            # Quicker than np.clip for a single value
+            self._alpha = min(max(value, 0.), 1.) if value == value else value
+            self._renderCache = {}
+            return
         # Treat 1x1 arrays as a float
         if isinstance(value, np.ndarray):
             if value.size == 1:
@@ -712,30 +893,8 @@ class Color:
         if not self.valid:
             return
         if 'hex' not in self._cache:
-            # Map rgb255 values to corresponding letters in hex
-            hexmap = {10: 'a', 11: 'b', 12: 'c', 13: 'd', 14: 'e', 15: 'f'}
-            # Handle arrays
-            if self.rgb255.ndim > 1:
-                rgb255 = self.rgb255
-                # Iterate through rows of rgb255
-                self._cache['hex'] = np.array([])
-                for row in rgb255:
-                    rowHex = '#'
-                    # Convert each value to hex and append
-                    for val in row:
-                        dig = hex(int(val)).strip('0x')
-                        rowHex += dig if len(dig) == 2 else '0' + dig
-                    # Append full hex value to new array
-                    self._cache['hex'] = np.append(
-                        self._cache['hex'], [rowHex], 0)
-            else:
-                rowHex = '#'
-                # Convert each value to hex and append
-                for val in self.rgb255:
-                    dig = hex(int(val))[2:]
-                    rowHex += dig if len(dig) == 2 else '0' + dig
-                # Append full hex value to new array
-                self._cache['hex'] = rowHex
+            # Convert each row of rgb255 values to a hex string
+            self._cache['hex'] = _rgb255ToHex(self.rgb255)
         return self._cache['hex']
 
     @hex.setter
@@ -747,29 +906,16 @@ class Color:
             return
         if len(color) > 1:
             # Handle arrays
-            rgb255 = np.array([""])
-            for row in color:
-                if isinstance(row, np.ndarray):
-                    row = row[0]
-                row = row.strip('#')
-                # Convert string to list of strings
-                hexList = [row[:2], row[2:4], row[4:6]]
-                # Convert strings to int
-                hexInt = [int(val, 16) for val in hexList]
-                # Convert to array and append
-                rgb255 = np.append(rgb255, np.array(hexInt), 0)
+            rgb255 = np.array([
+                _hexToRgb255(str(row[0] if isinstance(row, np.ndarray) else row))
+                for row in color])
         else:
             # Handle single values
             if isinstance(color, np.ndarray):
                 # Strip away any extraneous numpy layers
                 color = color[(0,)*color.ndim]
+            rgb255 = _hexToRgb255(str(color))
             color = color.strip('#')
-            # Convert string to list of strings
-            hexList = [color[:2], color[2:4], color[4:6]]
-            # Convert strings to int
-            hexInt = [int(val, 16) for val in hexList]
-            # Convert to array
-            rgb255 = np.array(hexInt)
         # Set rgb255 accordingly
         self.rgb255 = rgb255
         # Clear outdated values from cache
@@ -795,21 +941,16 @@ class Color:
             self._cache['named'] = np.array([])
             # Handle array
             if len(self) > 1:
+                names = []
                 for row in self.rgb:
-                    for name, val in colorNames.items():
-                        if all(val[:3] == row):
-                            self._cache['named'] = np.append(
-                                self._cache['named'], [name], 0)
-                            continue
-                self._cache['named'] = np.reshape(self._cache['named'], (-1, 1))
+                    names.extend(_namesByRgb.get(tuple(row), []))
+                self._cache['named'] = np.reshape(np.array(names), (-1, 1))
             else:
-                rgb = self.rgb
-                for name, val in colorNames.items():
-                    if name == 'none': # skip None
-                        continue
-                    if all(val[:3] == rgb):
-                        self._cache['named'] = name
-                        continue
+                # Look up the name (the last one, if several have this value)
+                names = [name for name in _namesByRgb.get(tuple(np.ravel(self.rgb)), [])
+                         if name != 'none']
+                if names:
+                    self._cache['named'] = names[-1]
         return self._cache['named']
 
     @named.setter
@@ -852,7 +993,7 @@ class Color:
     def hsv(self):
         """Color value expressed as an HSV triplet.
         """
-        if 'hsva' not in self._cache:
+        if 'hsv' not in self._cache:
             self._cache['hsv'] = ct.rgb2hsv(self.rgb)
         return self._cache['hsv']
 
@@ -884,7 +1025,7 @@ class Color:
         """Color value expressed as an LMS triplet.
         """
         if 'lms' not in self._cache:
-            self._cache['lms'] = ct.rgb2lms(self.rgb)
+            self._cache['lms'] = ct.rgb2lms(self.rgb, self.conematrix)
         return self._cache['lms']
 
     @lms.setter
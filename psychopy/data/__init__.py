@@ -1,22 +1,23 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import sys
+import importlib.util
 
-from packaging.version import Version
+from psychopy.tools.importtools import lazyImport
 
+# Handlers and utilities are only imported when first used (PEP 562), as they
+# pull in pandas, scipy, openpyxl etc.
+__getattr__, __dir__, _lazyNames = lazyImport(__name__, """
 from .base import DataHandler
 from .routine import Routine
-from .experiment import ExperimentHandler
+from .experiment import ExperimentHandler, recoverJournal
 from .trial import TrialHandler, TrialHandler2, TrialHandlerExt, TrialType
 from .staircase import (StairHandler, QuestHandler, PsiHandler,
                         MultiStairHandler)
+from .staircase import QuestPlusHandler
 from .counterbalance import Counterbalancer
 from . import shelf
 
-if sys.version_info.major == 3 and sys.version_info.minor >= 6:
-    from .staircase import QuestPlusHandler
-
 from .utils import (checkValidFilePath, isValidVariableName, importTrialTypes,
                     sliceFromString, indicesFromString, importConditions,
                     createFactorialTrialList, bootStraps, functionFromStaircase,
@@ -25,21 +26,12 @@ from .utils import (checkValidFilePath, isValidVariableName, importTrialTypes,
 from .fit import (FitFunction, FitCumNormal, FitLogistic, FitNakaRushton,
                   FitWeibull)
 
-try:
-    # import openpyxl
-    import openpyxl
-    if Version(openpyxl.__version__) >= Version('2.4.0'):
-        # openpyxl moved get_column_letter to utils.cell
-        from openpyxl.utils.cell import get_column_letter
-    else:
-        from openpyxl.cell import get_column_letter
-    from openpyxl.reader.excel import load_workbook
-    haveOpenpyxl = True
-except ImportError:
-    haveOpenpyxl = False
-
-try:
-    import xlrd
-    haveXlrd = True
-except ImportError:
-    haveXlrd = False
+# openpyxl support (haveOpenpyxl is False if it isn't installed)
+from .base import haveOpenpyxl, get_column_letter, load_workbook
+""")
+
+# only check whether xlrd is installed, rather than importing it
+haveXlrd = importlib.util.find_spec("xlrd") is not None
+
+# names exported by `from psychopy.data import *`
+__all__ = _lazyNames + ['haveXlrd']
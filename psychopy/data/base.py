@@ -36,6 +36,18 @@ except ImportError:
 _experiments = weakref.WeakValueDictionary()
 
 
+def _toExcelValue(entry):
+    """Value to put in an Excel cell: a number if it can be converted to
+    one, otherwise text."""
+    if entry is None:
+        return ''
+    try:
+        # if it can convert to a number (from numpy) then do it
+        return float(entry)
+    except Exception:
+        return u"{}".format(entry)
+
+
 class _ComparisonMixin():
     def __eq__(self, other):
         # NoneType and booleans, for example, don't have a .__dict__ attribute.
@@ -349,19 +361,10 @@ class _BaseTrialHandler(_ComparisonMixin):
             ws = wb.create_sheet()
             ws.title = sheetName
 
-        # loop through lines in the data matrix
-        for lineN, line in enumerate(dataArray):
-            if line is None:
-                continue
-            for colN, entry in enumerate(line):
-                if entry is None:
-                    entry = ''
-                try:
-                    # if it can convert to a number (from numpy) then do it
-                    val = float(entry)
-                except Exception:
-                    val = u"{}".format(entry)
-                ws.cell(column=colN+1, row=lineN+1, value=val)
+        # write the data matrix a row at a time (much quicker than cell by
+        # cell for big designs)
+        for line in dataArray:
+            ws.append([_toExcelValue(entry) for entry in line or []])
 
         wb.save(filename=fileName)
 
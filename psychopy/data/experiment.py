@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 import json
+import os
 import sys
 import copy
 import pickle
+import queue
 import atexit
+import threading
 import pandas as pd
 
 from psychopy import constants, clock
@@ -12,6 +15,7 @@ from psychopy import logging
 from psychopy.data.trial import TrialHandler2
 from psychopy.tools.filetools import (openOutputFile, genDelimiter,
                                       genFilenameFromDelimiter)
+from psychopy.tools.fileerrortools import handleFileCollision
 from psychopy.localization import _translate
 from .utils import checkValidFilePath
 from .base import _ComparisonMixin
@@ -28,7 +32,9 @@ class ExperimentHandler(_ComparisonMixin):
         exp = data.ExperimentHandler(name="Face Preference",version='0.1.0')
 
     """
-    
+    # writer for the journal of entries, if checkpoints have been started
+    _journal = None
+
     def __init__(self,
                  name='',
                  version='',
@@ -40,7 +46,8 @@ class ExperimentHandler(_ComparisonMixin):
                  sortColumns=False,
                  dataFileName='',
                  autoLog=True,
-                 appendFiles=False):
+                 appendFiles=False,
+                 checkpointInterval=None):
         """
         :parameters:
 
@@ -82,6 +89,13 @@ class ExperimentHandler(_ComparisonMixin):
 
 
             autoLog : True (default) or False
+
+            checkpointInterval : float or None
+                If given (and there is a dataFileName), new entries are
+                written to a journal file at most this many seconds apart,
+                so the data can be recovered with
+                :func:`~psychopy.data.recoverJournal` after a crash. See
+                :func:`startCheckpoints`.
         """
         self.loops = []
         self.loopsUnfinished = []
@@ -116,8 +130,16 @@ class ExperimentHandler(_ComparisonMixin):
         else:
             # fail now if we fail at all!
             checkValidFilePath(dataFileName, makeValid=True)
+            if checkpointInterval is not None:
+                self.startCheckpoints(checkpointInterval)
         atexit.register(self.close)
 
+    def __getstate__(self):
+        # the journal writer is a thread, which can't be pickled
+        state = self.__dict__.copy()
+        state['_journal'] = None
+        return state
+
     def __del__(self):
         self.close()
 
@@ -271,6 +293,10 @@ class ExperimentHandler(_ComparisonMixin):
         entry = self.thisEntry
         if row is not None:
             entry = self.entries[row]
+            # entries in the journal already need updating there too
+            rowN = range(len(self.entries))[row]
+            if self._journal is not None and rowN < self._nJournalled:
+                self._journalEdits.append([rowN, name, value])
         entry[name] = value
 
         # set priority if given
@@ -578,6 +604,85 @@ class ExperimentHandler(_ComparisonMixin):
         self.entries.append(this)
         # add new entry with its
         self.thisEntry = {}
+        # write the new entries to the journal if it's time
+        if (self._journal is not None and
+                clock.getTime() - self._lastCheckpoint >= self._checkpointInterval):
+            self.checkpoint()
+
+    def startCheckpoints(self, interval=10.0):
+        """Start keeping a journal of the entries, to recover the data from
+        if the experiment crashes.
+
+        Every `interval` seconds (checked at each :func:`nextEntry`) the
+        entries added since the last checkpoint are appended to
+        ``dataFileName + '.journal'``. The file is written on a background
+        thread, so this doesn't hold up the trial loop. The journal is
+        removed when the data are saved by :func:`close`, or discarded by
+        :func:`abort`. After a crash, use :func:`~psychopy.data.recoverJournal`
+        to make the csv file from it.
+
+        Parameters
+        ----------
+        interval : float
+            Minimum time (s) between checkpoints.
+        """
+        if self.dataFileName in ['', None]:
+            raise ValueError("ExperimentHandler needs a dataFileName to keep "
+                             "a journal")
+        self._checkpointInterval = interval
+        if self._journal is not None:
+            return  # already started
+        journalFile = handleFileCollision(self.dataFileName + '.journal',
+                                          'rename')
+        self._journal = _JournalWriter(journalFile)
+        self._nJournalled = 0
+        self._journalNames = None
+        self._journalEdits = []
+        self._lastCheckpoint = clock.getTime()
+        self._journal.add([{'experiment': self.name,
+                            'version': self.version}])
+
+    def checkpoint(self):
+        """Write the entries added since the last checkpoint (and the column
+        names, if they've changed) to the journal now.
+        """
+        if self._journal is None:
+            return
+        records = []
+        names = self._getColumnNames()
+        if names != self._journalNames:
+            records.append({'names': names})
+            self._journalNames = names
+        # entries are copied as they are, then converted on the journal thread
+        nEntries = len(self.entries)
+        for entry in self.entries[self._nJournalled:nEntries]:
+            records.append({'entry': dict(entry)})
+        self._nJournalled = nEntries
+        # changes to entries which were already in the journal
+        for edit in self._journalEdits:
+            records.append({'edit': edit})
+        self._journalEdits = []
+        if records:
+            self._journal.add(records)
+        self._lastCheckpoint = clock.getTime()
+
+    def stopCheckpoints(self, removeJournal=False):
+        """Write any new entries to the journal and stop keeping it.
+
+        Parameters
+        ----------
+        removeJournal : bool
+            Delete the journal file too (e.g. once the data have been saved).
+        """
+        if self._journal is None:
+            return
+        if not removeJournal:
+            self.checkpoint()
+        journal = self._journal
+        self._journal = None
+        journal.stop(discard=removeJournal)
+        if removeJournal and os.path.isfile(journal.fileName):
+            os.remove(journal.fileName)
 
     def updateEntryFromLoop(self, thisLoop):
         """
@@ -685,14 +790,23 @@ class ExperimentHandler(_ComparisonMixin):
                            fileCollisionMethod=fileCollisionMethod,
                            encoding=encoding)
 
+        names = self._getColumnNames(sortColumns)
+        if len(names) < 1:
+            logging.error("No data was found, so data file may not look as expected.")
+        _writeWideText(f, names, self.getAllEntries(), delim, matrixOnly)
+        if f != sys.stdout:
+            f.close()
+        logging.info('saved data to %r' % f.name)
+
+    def _getColumnNames(self, sortColumns=None):
+        """Names of the columns of the wide-format data file, in order.
+        """
         names = self._getAllParamNames()
         for name in self.dataNames:
             if name not in names:
                 names.append(name)
         # names from the extraInfo dictionary
         names.extend(self._getExtraInfo()[0])
-        if len(names) < 1:
-            logging.error("No data was found, so data file may not look as expected.")
         # if sort columns not specified, use default from self
         if sortColumns is None:
             sortColumns = self.sortColumns
@@ -707,28 +821,7 @@ class ExperimentHandler(_ComparisonMixin):
                 priority = self.columnPriority.get(name, self._guessPriority(name))
                 priorityMap.append((priority, name))
             names = [name for priority, name in sorted(priorityMap, reverse=True)]
-        # write a header line
-        if not matrixOnly:
-            for heading in names:
-                f.write(u'%s%s' % (heading, delim))
-            f.write('\n')
-
-        # write the data for each entry
-        for entry in self.getAllEntries():
-            for name in names:
-                if name in entry:
-                    ename = str(entry[name])
-                    if ',' in ename or '\n' in ename:
-                        fmt = u'"%s"%s'
-                    else:
-                        fmt = u'%s%s'
-                    f.write(fmt % (entry[name], delim))
-                else:
-                    f.write(delim)
-            f.write('\n')
-        if f != sys.stdout:
-            f.close()
-        logging.info('saved data to %r' % f.name)
+        return names
 
     def saveAsPickle(self, fileName, fileCollisionMethod='rename'):
         """Basically just saves a copy of self (with data) to a pickle file.
@@ -810,6 +903,8 @@ class ExperimentHandler(_ComparisonMixin):
         return json.dumps(context, indent=True, allow_nan=False, default=str)
         
     def close(self):
+        # make sure the journal is up to date, in case saving fails
+        self.checkpoint()
         if self.dataFileName not in ['', None]:
             if self.autoLog:
                 msg = 'Saving data for %s ExperimentHandler' % self.name
@@ -832,3 +927,163 @@ class ExperimentHandler(_ComparisonMixin):
         """
         self.savePickle = False
         self.saveWideText = False
+        # data are saved (or not wanted) so the journal isn't needed
+        self.stopCheckpoints(removeJournal=True)
+
+
+def _writeWideText(f, names, entries, delim, matrixOnly=False):
+    """Write entries (dicts) to an open file, one line per entry with a
+    column for each name.
+    """
+    lines = []
+    # write a header line
+    if not matrixOnly:
+        lines.append(''.join(u'%s%s' % (heading, delim) for heading in names))
+
+    # write the data for each entry, a line at a time
+    for entry in entries:
+        cells = []
+        for name in names:
+            if name in entry:
+                ename = str(entry[name])
+                if ',' in ename or '\n' in ename:
+                    ename = u'"%s"' % ename
+                cells.append(ename)
+            else:
+                cells.append('')
+        cells.append('')  # each line ends with a delimiter
+        lines.append(delim.join(cells))
+    if lines:
+        lines.append('')
+        f.write('\n'.join(lines))
+
+
+def _toJournalValue(value):
+    """Value as stored in the journal: JSON types as they are, anything else
+    as the text it would have in the data file."""
+    if type(value) in (str, int, float, bool) or value is None:
+        return value
+    return str(value)
+
+
+class _JournalWriter(threading.Thread):
+    """Appends records (one JSON object per line) to an ExperimentHandler's
+    journal file on a background thread.
+    """
+    def __init__(self, fileName):
+        threading.Thread.__init__(self, name='ExperimentJournal', daemon=True)
+        self.fileName = fileName
+        self.records = queue.Queue()
+        # create the file now so it's clear where the journal is
+        open(fileName, 'w', encoding='utf-8').close()
+        self.start()
+
+    def add(self, records):
+        """Queue a list of records to be written."""
+        self.records.put(records)
+
+    def stop(self, discard=False):
+        """Stop the thread, after writing everything queued so far (unless
+        `discard` is True)."""
+        if discard:
+            try:
+                while True:
+                    self.records.get_nowait()
+            except queue.Empty:
+                pass
+        self.records.put(None)
+        self.join()
+
+    def run(self):
+        with open(self.fileName, 'a', encoding='utf-8') as f:
+            stopping = False
+            while not stopping:
+                # write everything queued so far in one go
+                batches = [self.records.get()]
+                while not self.records.empty():
+                    batches.append(self.records.get_nowait())
+                if None in batches:
+                    stopping = True
+                    batches = batches[:batches.index(None)]
+                records = [record for batch in batches for record in batch]
+                if not records:
+                    continue
+                lines = []
+                for record in records:
+                    if 'entry' in record:
+                        record['entry'] = {
+                            name: _toJournalValue(value)
+                            for name, value in record['entry'].items()}
+                    elif 'edit' in record:
+                        record['edit'][2] = _toJournalValue(record['edit'][2])
+                    lines.append(json.dumps(record) + '\n')
+                f.write(''.join(lines))
+                # make sure it's on disk, in case of a crash
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def recoverJournal(journalFile, fileName=None, delim='auto',
+                   encoding='utf-8-sig'):
+    """Make a wide-format data file from the journal of an ExperimentHandler
+    (see :func:`ExperimentHandler.startCheckpoints`), e.g. after a crash.
+
+    Values are written as they would have been by
+    :func:`ExperimentHandler.saveAsWideText`, up to the last checkpoint.
+
+    Parameters
+    ----------
+    journalFile : str
+        Path of the journal (``dataFileName + '.journal'``).
+    fileName : str or None
+        File to write. By default this is the journal's name with `.csv`
+        instead of `.journal`.
+    delim : str
+        Delimiter, or 'auto' to choose it from the file extension.
+    encoding : str
+        Encoding of the data file.
+
+    Returns
+    -------
+    str
+        Path of the data file written.
+    """
+    names = None
+    entries = []
+    with open(journalFile, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # last line was only partly written when the experiment
+                # crashed, so everything before it is all there is
+                break
+            if 'entry' in record:
+                entries.append(record['entry'])
+            elif 'names' in record:
+                names = record['names']
+            elif 'edit' in record:
+                rowN, name, value = record['edit']
+                if rowN < len(entries):
+                    entries[rowN][name] = value
+    # any names which aren't in the last list of them go at the end
+    allNames = list(names or [])
+    for entry in entries:
+        for name in entry:
+            if name not in allNames:
+                allNames.append(name)
+
+    if fileName is None:
+        fileName = str(journalFile)
+        if fileName.endswith('.journal'):
+            fileName = fileName[:-len('.journal')]
+        fileName += '.csv'
+    if delim == 'auto':
+        delim = genDelimiter(fileName)
+    with openOutputFile(fileName, append=False,
+                        fileCollisionMethod='rename',
+                        encoding=encoding) as f:
+        _writeWideText(f, allNames, entries, delim)
+    logging.info('recovered data from %s to %r' % (journalFile, f.name))
+
+    return f.name
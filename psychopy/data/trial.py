@@ -638,6 +638,78 @@ class TrialHandler(_BaseTrialHandler):
                            fileCollisionMethod=fileCollisionMethod,
                            encoding=encoding)
 
+        # every value is converted to text in the same way as str() would,
+        # with missing data as '--', then pandas writes the whole table
+        header, columns = self._getWideColumns(asText=True)
+        text = pd.DataFrame(dict(enumerate(columns)), copy=False)
+        text.columns = header
+        text.to_csv(f, sep=delim, header=not matrixOnly, index=False,
+                    lineterminator='\n')
+
+        if f != sys.stdout:
+            f.close()
+            logging.info('saved wide-format data to %s' % f.name)
+
+        return self.toDataFrame()
+
+    def toDataFrame(self):
+        """Get the session, stimulus and data values from each trial, in
+        chronological order, as a `pandas.DataFrame`.
+
+        This has the same rows and columns as the file written by
+        :func:`saveAsWideText`, but the columns are built directly from the
+        data arrays so values keep their types and missing data are `NaN`
+        (or '--' for non-numeric data).
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per trial, including any that have not been run yet.
+        """
+        header, columns = self._getWideColumns()
+        df = pd.DataFrame(dict(enumerate(columns)), copy=False)
+        df.columns = header
+
+        return df.infer_objects()
+
+    def _getWideSequence(self):
+        """Get the condition of each trial in chronological order, and the
+        position of its data in the arrays of `self.data`.
+
+        Returns
+        -------
+        tuple
+            Arrays of the condition index, data row and data column for
+            each trial.
+        """
+        # sequenceIndices has one column per repeat
+        sequence = np.asarray(self.sequenceIndices, dtype=int).T.ravel()
+        # which repeat of its condition each trial is: the number of earlier
+        # trials with the same condition
+        order = np.argsort(sequence, kind='stable')
+        sortedSequence = sequence[order]
+        repeats = np.empty(len(sequence), dtype=int)
+        repeats[order] = (np.arange(len(sequence)) -
+                          np.searchsorted(sortedSequence, sortedSequence))
+
+        return sequence, sequence, repeats
+
+    def _getWideColumns(self, asText=False):
+        """Get the header and columns of the wide-format data.
+
+        Each value comes from the trial's condition if it has that parameter,
+        otherwise from `self.data`, then `self.extraInfo`.
+
+        Parameters
+        ----------
+        asText : bool
+            Convert every value to a string, as written to a text file.
+
+        Returns
+        -------
+        tuple
+            List of column names and a list of arrays (one per name).
+        """
         # collect parameter names related to the stimuli:
         if self.trialList[0]:
             header = list(self.trialList[0].keys())
@@ -652,85 +724,59 @@ class TrialHandler(_BaseTrialHandler):
         if self.extraInfo is not None:
             for key in self.extraInfo:
                 header.insert(0, key)
-        df = pd.DataFrame(columns=header)
-
-        # loop through each trial, gathering the actual values:
-        dataOut = []
-        trialCount = 0
-        # total number of trials = number of trialtypes * number of
-        # repetitions:
-
-        repsPerType = {}
-        entriesList = []
-        for rep in range(self.nReps):
-            for trialN in range(len(self.trialList)):
-                # find out what trial type was on this trial
-                trialTypeIndex = self.sequenceIndices[trialN, rep]
-                # determine which repeat it is for this trial
-                if trialTypeIndex not in repsPerType:
-                    repsPerType[trialTypeIndex] = 0
-                else:
-                    repsPerType[trialTypeIndex] += 1
-                # what repeat are we on for this trial type?
-                trep = repsPerType[trialTypeIndex]
-
-                # create a dictionary representing each trial:
-                nextEntry = {}
-
-                # add a trial number so the original order of the data can
-                # always be recovered if sorted during analysis:
-                trialCount += 1
-
-                # now collect the value from each trial of vars in header:
-                for prmName in header:
-                    # the header includes both trial and data variables, so
-                    # need to check before accessing:
-                    tti = trialTypeIndex
-                    if self.trialList[tti] and prmName in self.trialList[tti]:
-                        nextEntry[prmName] = self.trialList[tti][prmName]
-                    elif prmName in self.data:
-                        nextEntry[prmName] = self.data[prmName][tti][trep]
-                    elif self.extraInfo != None and prmName in self.extraInfo:
-                        nextEntry[prmName] = self.extraInfo[prmName]
-                    else:
-                        # allow a null value if this parameter wasn't
-                        # explicitly stored on this trial:
-                        if prmName == "TrialNumber":
-                            nextEntry[prmName] = trialCount
-                        else:
-                            nextEntry[prmName] = ''
 
-                # store this trial's data
-                dataOut.append(nextEntry)
-                # df = df.append(nextEntry, ignore_index=True)
-                entriesList.append(nextEntry)
-        df = pd.concat([df, pd.DataFrame(entriesList)])
-
-        if not matrixOnly:
-            # write the header row:
-            nextLine = ''
-            for prmName in header:
-                nextLine = nextLine + prmName + delim
-            # remove the final orphaned tab character
-            f.write(nextLine[:-1] + '\n')
-
-        # write the data matrix:
-        for trial in dataOut:
-            nextLine = ''
-            for prmName in header:
-                nextLine = nextLine + str(trial[prmName]) + delim
-            # remove the final orphaned tab character
-            nextLine = nextLine[:-1]
-            f.write(nextLine + '\n')
-
-        if f != sys.stdout:
-            f.close()
-            logging.info('saved wide-format data to %s' % f.name)
-
-        # Converts numbers to numeric, such as float64, boolean to bool.
-        # Otherwise they all are "object" type, i.e. strings
-        # df = df.convert_objects()
-        return df
+        sequence, dataRows, dataCols = self._getWideSequence()
+        nTrials = len(sequence)
+
+        columns = []
+        for prmName in header:
+            # value if it's not a parameter of the condition
+            if prmName in self.data:
+                column = self._getDataColumn(prmName, dataRows, dataCols,
+                                             asText)
+            elif self.extraInfo is not None and prmName in self.extraInfo:
+                column = np.empty(nTrials, dtype=object)
+                value = self.extraInfo[prmName]
+                column.fill(str(value) if asText else value)
+            elif prmName == "TrialNumber":
+                column = np.arange(1, nTrials + 1)
+                if asText:
+                    column = column.astype(str)
+            else:
+                column = np.empty(nTrials, dtype=object)
+                column.fill('')
+
+            # conditions only need converting to text once, not per trial
+            inConditions = np.zeros(len(self.trialList), dtype=bool)
+            values = np.empty(len(self.trialList), dtype=object)
+            for condN, condition in enumerate(self.trialList):
+                if condition and prmName in condition:
+                    inConditions[condN] = True
+                    value = condition[prmName]
+                    values[condN] = str(value) if asText else value
+            if inConditions.all():
+                column = values[sequence]
+            elif inConditions.any():
+                column = np.where(inConditions[sequence], values[sequence],
+                                  column.astype(object))
+            columns.append(column)
+
+        return header, columns
+
+    def _getDataColumn(self, dataType, rows, cols, asText=False):
+        """Values of one data type for each trial (see `_getWideColumns`).
+        """
+        values = self.data[dataType][rows, cols]
+        if not self.data.isNumeric[dataType]:
+            # object array, with missing values already '--'
+            if asText:
+                return np.array([str(value) for value in values], dtype=object)
+            return values
+        missing = np.ma.getmaskarray(values)
+        if asText:
+            # numpy gives the same text as str() for each value
+            return np.where(missing, '--', values.data.astype(str))
+        return values.filled(np.nan)
 
     def saveAsJson(self,
                    fileName=None,
@@ -2339,108 +2385,26 @@ class TrialHandlerExt(TrialHandler):
                 Defaults to `utf-8-sig`.
 
         """
-        if self.thisTrialN < 0 and self.thisRepN < 0:
-            # if both are < 1 we haven't started
-            logging.info('TrialHandler.saveAsWideText called but no trials'
-                         ' completed. Nothing saved')
-            return -1
-
-        # set default delimiter if none given
-        if delim is None:
-            delim = genDelimiter(fileName)
-
-        # create the file or send to stdout
-        fileName = genFilenameFromDelimiter(fileName, delim)
-        f = openOutputFile(fileName=fileName, append=appendFile,
-                           fileCollisionMethod=fileCollisionMethod,
-                           encoding=encoding)
-
-        # collect parameter names related to the stimuli:
-        if self.trialList[0]:
-            header = list(self.trialList[0].keys())
-        else:
-            header = []
-        # and then add parameter names related to data (e.g. RT)
-        header.extend(self.data.dataTypes)
-
-        # loop through each trial, gathering the actual values:
-        dataOut = []
-        trialCount = 0
-        # total number of trials = number of trialtypes * number of
-        # repetitions:
-
-        repsPerType = {}
-        for rep in range(self.nReps):
-            if self.trialWeights is None:
-                nRows = len(self.trialList)
-            else:
-                nRows = sum(self.trialWeights)
-
-            for trialN in range(nRows):
-                # find out what trial type was on this trial
-                trialTypeIndex = self.sequenceIndices[trialN, rep]
-                # determine which repeat it is for this trial
-                if trialTypeIndex not in repsPerType:
-                    repsPerType[trialTypeIndex] = 0
-                else:
-                    repsPerType[trialTypeIndex] += 1
-
-                # create a dictionary representing each trial:
-                # this is wide format, so we want fixed information (e.g.
-                # subject ID, date, etc) repeated every line if it exists:
-                if self.extraInfo != None:
-                    nextEntry = self.extraInfo.copy()
-                else:
-                    nextEntry = {}
-
-                # add a trial number so the original order of the data can
-                # always be recovered if sorted during analysis:
-                trialCount += 1
-                nextEntry["TrialNumber"] = trialCount
-
-                # what repeat are we on for this trial type?
-                trep = repsPerType[trialTypeIndex]
-                # collect the value from each trial of the vars in the header:
-                tti = trialTypeIndex
-                for prmName in header:
-                    # the header includes both trial and data variables, so
-                    # need to check before accessing:
-                    if self.trialList[tti] and prmName in self.trialList[tti]:
-                        nextEntry[prmName] = self.trialList[tti][prmName]
-                    elif prmName in self.data:
-                        if self.trialWeights is None:
-                            nextEntry[prmName] = self.data[prmName][tti][trep]
-                        else:
-                            firstRowIndex = sum(self.trialWeights[:tti])
-                            _tw = self.trialWeights[tti]
-                            row = firstRowIndex + rep % _tw
-                            col = int(rep // _tw)
-                            nextEntry[prmName] = self.data[prmName][row][col]
-                    else:
-                        # allow a null value if this parameter wasn't
-                        # explicitly stored on this trial:
-                        nextEntry[prmName] = ''
-
-                # store this trial's data
-                dataOut.append(nextEntry)
-
-        # get the extra 'wide' parameter names into the header line:
-        header.insert(0, "TrialNumber")
-        if self.extraInfo is not None:
-            for key in self.extraInfo:
-                header.insert(0, key)
-
-        # write a header row:
-        if not matrixOnly:
-            f.write(delim.join(header) + '\n')
-        # write the data matrix:
-        for trial in dataOut:
-            line = delim.join([str(trial[prm]) for prm in header])
-            f.write(line + '\n')
-
-        if (fileName is not None) and (fileName != 'stdout'):
-            f.close()
-            logging.info('saved wide-format data to %s' % f.name)
+        return TrialHandler.saveAsWideText(
+            self, fileName, delim=delim, matrixOnly=matrixOnly,
+            appendFile=appendFile, encoding=encoding,
+            fileCollisionMethod=fileCollisionMethod)
+
+    def _getWideSequence(self):
+        """Get the condition of each trial in chronological order, and the
+        position of its data in the arrays of `self.data`.
+        """
+        sequence, dataRows, dataCols = TrialHandler._getWideSequence(self)
+        if self.trialWeights is not None:
+            # each condition has `weight` rows in the data arrays, which are
+            # filled before moving on to the next column
+            weights = np.asarray(self.trialWeights, dtype=int)
+            firstRows = np.concatenate([[0], np.cumsum(weights)[:-1]])
+            repeats = dataCols
+            dataRows = firstRows[sequence] + repeats % weights[sequence]
+            dataCols = repeats // weights[sequence]
+
+        return sequence, dataRows, dataCols
 
     def saveAsJson(self,
                    fileName=None,
@@ -8,6 +8,8 @@
 import os
 import re
 import ast
+import csv
+import hashlib
 import pickle
 import time, datetime
 import numpy as np
@@ -213,7 +215,209 @@ def listFromString(val, excludeEmpties=False):
     return asList
 
 
-def importConditions(fileName, returnFieldNames=False, selection=""):
+# delimiters which might be in a csv header if it's been parsed with the wrong one
+_csvDelims = (",", ".", ";", "\t")
+# separator / decimal pairs tried when loading a csv, most common first
+_csvFormats = (
+    # most common in US, EU
+    (',', '.'),
+    (';', ','),
+    # other possible formats
+    ('\t', '.'),
+    ('\t', ','),
+    (';', '.')
+)
+
+
+def _sniffCsvFormat(fileName):
+    """Work out the separator and decimal mark of a csv/tsv file from its
+    header, which picks the same pair that trying each of `_csvFormats` in turn
+    would, but without parsing the whole file for each.
+
+    Returns
+    -------
+    tuple or None
+        (sep, decimal), or None if the header is empty or unreadable.
+    """
+    try:
+        with open(fileName, encoding='utf-8-sig', newline='') as f:
+            header = f.readline()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not header.strip():
+        return None
+    # use the first separator (in order of preference) which splits the header
+    # into more than one column
+    for sep, dec in _csvFormats:
+        if len(next(csv.reader([header], delimiter=sep))) > 1:
+            return sep, dec
+    # one column, which is fine if it doesn't contain another delimiter
+    return _csvFormats[0]
+
+
+def _coerceNumericStrings(dataframe):
+    """Convert strings which are numbers (including with a comma as the decimal
+    mark) to floats, one column at a time. Any string `float()` accepts is
+    converted, so "nan" and "inf" become floats too.
+    """
+    for col in dataframe.columns:
+        values = dataframe[col]
+        if values.dtype.kind in 'biufcmM':
+            continue  # already numeric/datetime, nothing to convert
+        isStr = values.map(type).eq(str).to_numpy()
+        if not isStr.any():
+            continue
+        strValues = values[isStr].astype(object).str.replace(",", ".", regex=False)
+        numbers = np.array(pd.to_numeric(strValues, errors='coerce'), dtype=float)
+        converted = ~np.isnan(numbers)
+        # to_numeric gives NaN for "nan" as well as for strings which aren't
+        # numbers, so check the rest (usually few) with float()
+        for i in np.flatnonzero(~converted):
+            try:
+                value = float(strValues.iloc[i])
+            except ValueError:
+                continue
+            numbers[i] = value
+            converted[i] = True
+        if converted.any():
+            values = values.astype(object)
+            values.iloc[np.flatnonzero(isStr)[converted]] = numbers[converted]
+            dataframe[col] = values
+
+    return dataframe
+
+
+def _columnToList(column):
+    """Convert a column of a record array of conditions to a list of values
+    for each trial, with strings unescaped / evaluated and NaNs replaced by None.
+    """
+    if column.dtype.kind in 'fc':
+        values = list(column)  # numpy scalars, as when indexing the array
+        for i in np.flatnonzero(np.isnan(column)):
+            values[i] = None
+        return values
+    elif column.dtype.kind in 'mM':
+        values = list(column)
+        for i in np.flatnonzero(np.isnat(column)):
+            values[i] = None
+        return values
+    elif column.dtype.kind != 'O':
+        # can't contain NaN or strings
+        return list(column)
+
+    values = []
+    # lists are often repeated down a column, so only compile each once (but
+    # evaluate each time, so that trials don't share list objects)
+    compiled = {}
+    for val in column:
+        if type(val) == np.bytes_:
+            val = str(val.decode('utf-8-sig'))
+        elif isinstance(val, str):
+            val = val.replace('\\n', '\n')
+        elif np.isnan(val):
+            val = None
+        # if it looks like a list, convert it:
+        if isinstance(val, str) and val.startswith('[') and val.endswith(']'):
+            if val not in compiled:
+                compiled[val] = compile(val, '<conditions>', 'eval')
+            val = eval(compiled[val])
+        values.append(val)
+
+    return values
+
+
+# file types whose parsed contents are cached by importConditions
+_cachedConditionsTypes = ('.csv', '.tsv', '.xlsx', '.xlsm', '.xls')
+# increment if the way conditions are parsed changes, to invalidate the cache
+_conditionsCacheVersion = 2
+# parsed conditions (pickled) from recent calls to importConditions, by key
+_conditionsCache = OrderedDict()
+_conditionsCacheSize = 32
+
+
+def _getConditionsCacheKey(fileName):
+    """Key for the parsed contents of a conditions file, which changes if the
+    file is modified, moved or resized.
+    """
+    stat = os.stat(fileName)
+    key = "{}|{}|{}|{}".format(
+        os.path.abspath(fileName), stat.st_mtime_ns, stat.st_size,
+        _conditionsCacheVersion)
+
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _getConditionsCacheDir():
+    from psychopy.preferences import prefs
+    return os.path.join(prefs.paths['userCacheDir'], 'conditions')
+
+
+def _loadCachedConditions(key):
+    """Get the (trialList, fieldNames) cached for a key, from memory or disk,
+    or None if there isn't one.
+    """
+    if key in _conditionsCache:
+        _conditionsCache.move_to_end(key)
+        return pickle.loads(_conditionsCache[key])
+    try:
+        with open(os.path.join(_getConditionsCacheDir(), key + '.pkl'), 'rb') as f:
+            buffer = f.read()
+        conditions = pickle.loads(buffer)
+    except Exception:
+        return None  # not cached, or cache file unreadable
+    _rememberConditions(key, buffer)
+
+    return conditions
+
+
+def _saveCachedConditions(key, trialList, fieldNames):
+    """Cache parsed conditions, in memory and on disk.
+    """
+    buffer = pickle.dumps((trialList, fieldNames), protocol=pickle.HIGHEST_PROTOCOL)
+    _rememberConditions(key, buffer)
+    folder = _getConditionsCacheDir()
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # write then rename, so a partly written file is never read
+        tmpFile = os.path.join(folder, '{}.{}.tmp'.format(key, os.getpid()))
+        with open(tmpFile, 'wb') as f:
+            f.write(buffer)
+        os.replace(tmpFile, os.path.join(folder, key + '.pkl'))
+    except OSError as err:
+        logging.debug(u"Could not cache conditions in {}: {}".format(folder, err))
+
+
+def _rememberConditions(key, buffer):
+    _conditionsCache[key] = buffer
+    _conditionsCache.move_to_end(key)
+    while len(_conditionsCache) > _conditionsCacheSize:
+        _conditionsCache.popitem(last=False)
+
+
+def clearConditionsCache(memoryOnly=False):
+    """Forget the parsed contents of conditions files cached by
+    `importConditions`.
+
+    Parameters
+    ----------
+    memoryOnly : bool
+        If True, only clear conditions cached in memory, leaving those cached
+        on disk.
+    """
+    _conditionsCache.clear()
+    if memoryOnly:
+        return
+    folder = _getConditionsCacheDir()
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            if name.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(folder, name))
+                except OSError:
+                    pass
+
+
+def importConditions(fileName, returnFieldNames=False, selection="", useCache=True):
     """Imports a list of conditions from an .xlsx, .csv, or .pkl file
 
     The output is suitable as an input to :class:`TrialHandler`
@@ -248,6 +452,11 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
     - slice(-10, 2, None)  # the same as above
     - random(5) * 8  # five random vals 0-7
 
+    Parsed conditions from .csv, .tsv and Excel files are cached (in memory and
+    in the user cache folder) by the file's path, modification time and size, so
+    importing the same file again is near-instant unless it has changed. Set
+    `useCache` to False to always parse the file.
+
     """
 
     def _attemptImport(fileName):
@@ -260,18 +469,14 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
         if fileName.endswith(('.csv', '.tsv')):
             trialsArr = None
             errs = []
-            # list of possible delimiters
-            delims = (",", ".", ";", "\t")
-            # try a variety of separator / decimal pairs
-            for sep, dec in [
-                # most common in US, EU
-                (',', '.'), 
-                (';', ','),
-                # other possible formats
-                ('\t', '.'), 
-                ('\t', ','), 
-                (';', '.')
-            ]:
+            # work out the separator / decimal pair from the header, so the file
+            # only needs parsing once, falling back to trying each pair in turn
+            sniffed = _sniffCsvFormat(fileName)
+            formats = list(_csvFormats)
+            if sniffed is not None:
+                formats.remove(sniffed)
+                formats.insert(0, sniffed)
+            for sep, dec in formats:
                 # try to load
                 try:
                     thisAttempt = pd.read_csv(
@@ -281,7 +486,7 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
                     # (one column with delims probably means it's parsed without error but not
                     # recognised columns correctly)
                     if len(thisAttempt.columns) == 1:
-                        for delim in delims:
+                        for delim in _csvDelims:
                             if delim in thisAttempt.columns[0]:
                                 msg = _translate(
                                     "Could not load {}. \n"
@@ -306,15 +511,9 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
                 raise ValueError(
                     _translate("Could not parse file {}.").format(fileName)
                 )
-            # if we made it herre, we successfully loaded the file
-            for col in trialsArr.columns:
-                for row, cell in enumerate(trialsArr[col]):
-                    if isinstance(cell, str):
-                        tryVal = cell.replace(",", ".")
-                        try:
-                            trialsArr[col][row] = float(tryVal)
-                        except ValueError:
-                            pass
+            # if we made it here, we successfully loaded the file, so convert
+            # any numbers which weren't recognised (e.g. with a comma decimal)
+            trialsArr = _coerceNumericStrings(trialsArr)
             logging.debug(u"Read csv file with pandas: {}".format(fileName))
         elif fileName.endswith(('.xlsx', '.xlsm')):
             trialsArr = pd.read_excel(fileName, engine='openpyxl')
@@ -367,41 +566,29 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
         """
         # convert the resulting dataframe to a numpy recarray
         trialsArr = dataframe.to_records(index=False)
-        # Check for new line characters in strings, and replace escaped characters
-        for record in trialsArr:
-            for idx, element in enumerate(record):
-                if isinstance(element, str):
-                    record[idx] = element.replace('\\n', '\n')
         if trialsArr.shape == ():
             # convert 0-D to 1-D with one element:
             trialsArr = trialsArr[np.newaxis]
         fieldNames = list(trialsArr.dtype.names)
         _assertValidVarNames(fieldNames, fileName)
 
-        # convert the record array into a list of dicts
-        trialList = []
-        for trialN, trialType in enumerate(trialsArr):
-            thisTrial = OrderedDict()
-            for fieldN, fieldName in enumerate(fieldNames):
-                val = trialsArr[trialN][fieldN]
+        # convert each column (rather than each cell) then zip into a list of dicts
+        columns = [_columnToList(trialsArr[fieldName]) for fieldName in fieldNames]
+        trialList = [OrderedDict(zip(fieldNames, row)) for row in zip(*columns)]
 
-                if isinstance(val, str):
-                    if val.startswith('[') and val.endswith(']'):
-                        # val = eval('%s' %unicode(val.decode('utf8')))
-                        val = eval(val)
-                elif type(val) == np.string_:
-                    val = str(val.decode('utf-8-sig'))
-                    # if it looks like a list, convert it:
-                    if val.startswith('[') and val.endswith(']'):
-                        # val = eval('%s' %unicode(val.decode('utf8')))
-                        val = eval(val)
-                elif np.isnan(val):
-                    val = None
-                thisTrial[fieldName] = val
-            trialList.append(thisTrial)
         return trialList, fieldNames
 
-    if (fileName.endswith(('.csv', '.tsv'))
+    # use parsed conditions from the cache if the file hasn't changed
+    cacheKey = cached = None
+    if useCache and fileName.endswith(_cachedConditionsTypes):
+        cacheKey = _getConditionsCacheKey(fileName)
+        cached = _loadCachedConditions(cacheKey)
+
+    if cached is not None:
+        trialList, fieldNames = cached
+        logging.debug(u"Loaded conditions for {} from cache".format(fileName))
+
+    elif (fileName.endswith(('.csv', '.tsv'))
             or (fileName.endswith(('.xlsx', '.xls', '.xlsm')) and haveXlrd)):
         trialList, fieldNames = _attemptImport(fileName=fileName)
 
@@ -412,32 +599,51 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
                 _translate("openpyxl or xlrd is required for loading excel files, but neither was found.")
             )
 
-        # data_only was added in 1.8
-        if Version(openpyxl.__version__) < Version('1.8'):
-            wb = load_workbook(filename=fileName)
+        openpyxlVersion = Version(openpyxl.__version__)
+        if openpyxlVersion >= Version('2.6'):
+            # read all values in one go from a read-only workbook, which is much
+            # faster than reading cell by cell
+            wb = load_workbook(filename=fileName, data_only=True, read_only=True)
+            rows = [list(row) for row in wb.worksheets[0].iter_rows(values_only=True)]
+            wb.close()
+            nRows = len(rows)
+            nCols = max([len(row) for row in rows], default=0)
+            for row in rows:
+                row.extend([None] * (nCols - len(row)))
+            ws = None
         else:
-            wb = load_workbook(filename=fileName, data_only=True)
-        ws = wb.worksheets[0]
+            rows = None
+            # data_only was added in 1.8
+            if openpyxlVersion < Version('1.8'):
+                wb = load_workbook(filename=fileName)
+            else:
+                wb = load_workbook(filename=fileName, data_only=True)
+            ws = wb.worksheets[0]
+            try:
+                # in new openpyxl (2.3.4+) get_highest_xx is deprecated
+                nCols = ws.max_column
+                nRows = ws.max_row
+            except Exception:
+                # version openpyxl 1.5.8 (in Standalone 1.80) needs this
+                nCols = ws.get_highest_column()
+                nRows = ws.get_highest_row()
 
         logging.debug(u"Read excel file with openpyxl: {}".format(fileName))
-        try:
-            # in new openpyxl (2.3.4+) get_highest_xx is deprecated
-            nCols = ws.max_column
-            nRows = ws.max_row
-        except Exception:
-            # version openpyxl 1.5.8 (in Standalone 1.80) needs this
-            nCols = ws.get_highest_column()
-            nRows = ws.get_highest_row()
+
+        def _getCellValue(rowN, colN):
+            if rows is not None:
+                return rows[rowN][colN]
+            elif openpyxlVersion < Version('2.0'):
+                return ws.cell(_getExcelCellName(col=colN, row=rowN)).value
+            else:
+                # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
+                return ws.cell(row=rowN + 1, column=colN + 1).value
 
         # get parameter names from the first row header
         fieldNames = []
         rangeCols = []
         for colN in range(nCols):
-            if Version(openpyxl.__version__) < Version('2.0'):
-                fieldName = ws.cell(_getExcelCellName(col=colN, row=0)).value
-            else:
-                # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
-                fieldName = ws.cell(row=1, column=colN + 1).value
+            fieldName = _getCellValue(0, colN)
             if fieldName:
                 # If column is named, add its name to fieldNames
                 fieldNames.append(fieldName)
@@ -449,11 +655,7 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
         for rowN in range(1, nRows):  # skip header first row
             thisTrial = {}
             for rangeColsIndex, colN in enumerate(rangeCols):
-                if Version(openpyxl.__version__) < Version('2.0'):
-                    val = ws.cell(_getExcelCellName(col=colN, row=0)).value
-                else:
-                    # From 2.0, cells are referenced with 1-indexing: A1 == cell(row=1, column=1)
-                    val = ws.cell(row=rowN + 1, column=colN + 1).value
+                val = _getCellValue(rowN, colN)
                 # if it looks like a list or tuple, convert it
                 if (isinstance(val, str) and
                         (val.startswith('[') and val.endswith(']') or
@@ -506,6 +708,9 @@ def importConditions(fileName, returnFieldNames=False, selection=""):
             translated=_translate('Your conditions file should be an xlsx, csv, dlm, tsv or pkl file')
         )
 
+    if cacheKey is not None and cached is None:
+        _saveCachedConditions(cacheKey, trialList, fieldNames)
+
     # if we have a selection then try to parse it
     if isinstance(selection, str) and len(selection) > 0:
         selection = indicesFromString(selection)
@@ -18,6 +18,7 @@ The code that writes out a *_lastrun.py experiment file is (in order):
 import collections
 import os
 import codecs
+import hashlib
 import xml.etree.ElementTree as xml
 from xml.dom import minidom
 from copy import deepcopy, copy
@@ -38,6 +39,8 @@ from psychopy.experiment.routines._base import Routine, BaseStandaloneRoutine
 from psychopy.experiment.routines import getAllStandaloneRoutines
 from . import utils, py2js
 from .components import getComponents, getAllComponents, getInitVals
+from .components import pluginComponents as loadedPluginComponents
+from .components import _componentsModifiedTime
 
 from psychopy.localization import _translate
 import locale
@@ -45,6 +48,7 @@ import locale
 from collections import namedtuple, OrderedDict
 
 from ..alerts import alert
+from ..alerts import _alerts
 
 RequiredImport = namedtuple('RequiredImport',
                             field_names=('importName',
@@ -111,6 +115,92 @@ pluginComponents = {
 #             forceType[(Comp.__name__, key)] = 'list'
 
 
+class ScriptCache:
+    """
+    Cache of compiled experiment scripts, indexed by the digest of the
+    experiment they were compiled from (see `Experiment.getScriptDigest`).
+
+    Scripts are kept in memory for the rest of the process and, if `folder` is
+    set, also saved to disk so that they can be reused by other processes.
+
+    Parameters
+    ----------
+    maxSize : int
+        Maximum number of scripts to keep in memory, after which the least
+        recently used are dropped.
+    folder : str, Path or None
+        Folder to save compiled scripts in, or None to only keep them in memory.
+    """
+    # stands in for the compile date in cached scripts, which is filled in each
+    # time the script is retrieved
+    datePlaceholder = "{{compileDate}}"
+
+    def __init__(self, maxSize=64, folder=None):
+        self.maxSize = maxSize
+        self.folder = folder
+        self._scripts = collections.OrderedDict()
+
+    def _getFile(self, digest):
+        return Path(self.folder) / "{}.py".format(digest)
+
+    def get(self, digest):
+        """
+        Get the script compiled for the given digest, or None if there isn't one.
+        """
+        if digest in self._scripts:
+            self._scripts.move_to_end(digest)
+            return self._scripts[digest]
+        if self.folder is not None:
+            file = self._getFile(digest)
+            if file.is_file():
+                script = file.read_text(encoding="utf-8")
+                self._remember(digest, script)
+                return script
+
+    def put(self, digest, script):
+        """
+        Store the script compiled for the given digest.
+        """
+        self._remember(digest, script)
+        if self.folder is not None:
+            file = self._getFile(digest)
+            try:
+                file.parent.mkdir(parents=True, exist_ok=True)
+                # write to a temporary file first so other processes never read
+                # a partially written script
+                tmp = file.with_suffix(".{}.tmp".format(os.getpid()))
+                tmp.write_text(script, encoding="utf-8")
+                os.replace(tmp, file)
+            except OSError as err:
+                logging.warning(
+                    "Could not save compiled script to cache folder {}: {}".format(
+                        self.folder, err))
+
+    def _remember(self, digest, script):
+        self._scripts[digest] = script
+        self._scripts.move_to_end(digest)
+        while len(self._scripts) > self.maxSize:
+            self._scripts.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget all scripts held in memory (scripts saved to disk are kept).
+        """
+        self._scripts.clear()
+
+    def __contains__(self, digest):
+        return digest in self._scripts or (
+            self.folder is not None and self._getFile(digest).is_file()
+        )
+
+    def __len__(self):
+        return len(self._scripts)
+
+
+# cache used by Experiment.writeScript
+scriptCache = ScriptCache()
+
+
 class Experiment:
     """
     An experiment contains a single Flow and at least one
@@ -260,8 +350,72 @@ class Experiment:
         # then check the contents 1-by-1 from the Flow
         self.flow.integrityCheck()
 
-    def writeScript(self, expPath=None, target="PsychoPy", modular=True):
+    def getScriptDigest(self, expPath=None, target="PsychoPy", modular=True):
+        """Get a digest of everything the script compiled from this experiment
+        depends on: the serialized settings, Routine and Flow (including Loop)
+        nodes, required imports, the compile options and the PsychoPy version,
+        preferences and plugin Components used to compile it, and when the
+        source of the available Components was last modified.
+
+        Parameters
+        ----------
+        expPath : str or None
+            Path the script is to be written to.
+        target : str
+            "PsychoPy" or "PsychoJS"
+        modular : bool
+            Whether a PsychoJS script is to be modular.
+
+        Returns
+        -------
+        str
+            Hex digest, the same for any two experiments which compile to the
+            same script.
+        """
+        digest = hashlib.sha1()
+        # compile options and environment
+        for value in (
+            psychopy.__version__, target, modular, expPath, self.filename,
+            self.requiredImports,
+            psychopy.prefs.general['units'],
+            psychopy.prefs.piloting['forceNonRush'],
+            sorted(loadedPluginComponents),
+            _componentsModifiedTime(self.prefsBuilder['componentsFolders']),
+        ):
+            digest.update(repr(value).encode('utf-8'))
+        # settings, routines and flow (NB this is the same as self._xml, but
+        # without building the whole tree)
+        digest.update(xml.tostring(self.settings._xml))
+        for routine in self.routines.values():
+            digest.update(xml.tostring(routine._xml))
+        digest.update(xml.tostring(self.flow._xml))
+
+        return digest.hexdigest()
+
+    def writeScript(self, expPath=None, target="PsychoPy", modular=True, useCache=True):
         """Write a PsychoPy script for the experiment
+
+        Python scripts are cached by `getScriptDigest`, so compiling an
+        experiment which hasn't changed since it was last compiled returns the
+        cached script (with the date updated) without generating it again.
+        PsychoJS scripts are always generated, as their resource lists depend on
+        the contents of files outside of the experiment.
+
+        Parameters
+        ----------
+        expPath : str or None
+            Path the script is to be written to.
+        target : str
+            "PsychoPy" or "PsychoJS"
+        modular : bool
+            Whether a PsychoJS script should be modular.
+        useCache : bool
+            Whether to look for (and store) the script in `scriptCache`.
+
+        Returns
+        -------
+        str
+            The compiled script.
         """
         # self.integrityCheck()
 
@@ -278,6 +432,18 @@ class Experiment:
         else:
             localDateTime = data.getDateStr(format="%B %d, %Y, at %H:%M")
 
+        # use cached script if there is one
+        useCache = useCache and target == "PsychoPy"
+        if useCache:
+            digest = self.getScriptDigest(expPath, target=target, modular=modular)
+            cached = scriptCache.get(digest)
+            if cached is not None:
+                return cached.replace(scriptCache.datePlaceholder, localDateTime, 1)
+            # write placeholder date, so the script can be cached
+            compileDate = localDateTime
+            localDateTime = scriptCache.datePlaceholder
+            nAlerts = _alerts.alertCount
+
         # Remove disabled components, but leave original experiment unchanged.
         self_copy = deepcopy(self)
         for key, routine in list(self_copy.routines.items()):  # PY2/3 compat
@@ -360,6 +526,13 @@ class Experiment:
 
             script = script.getvalue()
 
+            if useCache:
+                # only cache scripts which compiled without raising alerts, so
+                # that alerts are raised each time
+                if _alerts.alertCount == nAlerts:
+                    scriptCache.put(digest, script)
+                script = script.replace(scriptCache.datePlaceholder, compileDate, 1)
+
         elif target == "PsychoJS":
             script.oneIndent = "  "  # use 2 spaces rather than python 4
 
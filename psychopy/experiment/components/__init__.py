@@ -14,7 +14,7 @@ import glob
 import copy
 import shutil
 from os.path import join, dirname, abspath, split
-from importlib import import_module  # helps python 2.7 -> 3.x migration
+from importlib import import_module, reload  # helps python 2.7 -> 3.x migration
 from ._base import BaseVisualComponent, BaseComponent, BaseDeviceComponent
 from ..params import Param
 from psychopy.localization import _translate
@@ -33,6 +33,47 @@ excludeComponents = [
 # components.
 pluginComponents = {}
 
+# components found by `getComponents`, by folder, along with the latest
+# modification time of the folder and its files when it was searched (and
+# fetchIcons) - so that each folder is only globbed and imported once per
+# process unless its contents change
+_componentCache = {}
+
+
+def _folderModifiedTime(folder):
+    """Latest modification time (ns) of a components folder, its .py files
+    and those of its component packages, so that editing a component in place
+    is noticed as well as adding or removing one.
+    """
+    paths = [folder]
+    paths += glob.glob(join(folder, '*.py'))
+    paths += glob.glob(join(folder, '*', '*.py'))
+    mtime = 0
+    for path in paths:
+        try:
+            mtime = max(mtime, os.stat(path).st_mtime_ns)
+        except OSError:  # removed while we were looking
+            pass
+    return mtime
+
+def _componentsModifiedTime(folderList=()):
+    """Latest modification time (ns) of the source of all available
+    components: the built-ins, those in folderList and those registered by
+    plugins, so that a component being edited is noticed.
+    """
+    mtime = _folderModifiedTime(dirname(__file__))
+    for folder in folderList:
+        mtime = max(mtime, _folderModifiedTime(folder))
+    for compClass in list(pluginComponents.values()):
+        path = getattr(sys.modules.get(compClass.__module__), '__file__', None)
+        if path is None:
+            continue
+        try:
+            mtime = max(mtime, os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return mtime
+
 # try to remove old pyc files in case they're detected as components
 pycFiles = glob.glob(join(split(__file__)[0], "*.pyc"))
 for filename in pycFiles:
@@ -165,6 +206,11 @@ def getComponents(folder=None, fetchIcons=True):
     The code within the component.py file itself must use absolute paths for
     importing from psychopy:
        `from psychopy.experiment.components import BaseComponent, Param`
+
+    Components found in each folder are cached for the rest of the process,
+    and only searched for again if the folder or a component file in it is
+    modified (or after calling `clearComponentCache`). Component files
+    modified since the last search are reloaded.
     """
 
     if folder is None:
@@ -198,6 +244,14 @@ def getComponents(folder=None, fetchIcons=True):
     if pth not in sys.path:
         sys.path.insert(0, pth)
 
+    # if this folder has already been searched and hasn't changed, reuse
+    mtime = _folderModifiedTime(folder)
+    cached = _componentCache.get(folder)
+    if cached is not None and cached[0] == (mtime, fetchIcons):
+        return dict(cached[1])
+    # components edited since the last search need importing again
+    lastSearched = cached[0][0] if cached is not None else None
+
     components = {}
 
     # go through components in directory
@@ -225,7 +279,13 @@ def getComponents(folder=None, fetchIcons=True):
                 'Failed to load component package `{}`. Does it have a '
                 '`__init__.py`?'.format(cmpfile))
             continue  # not a valid module (no __init__.py?)
-            
+        if lastSearched is not None and getattr(module, '__file__', None):
+            try:
+                if os.stat(module.__file__).st_mtime_ns > lastSearched:
+                    module = reload(module)
+            except OSError:
+                pass
+
         # check for orphaned pyc files (__file__ is not a .py file)
         if hasattr(module, '__file__'):
             if not module.__file__:
@@ -258,7 +318,16 @@ def getComponents(folder=None, fetchIcons=True):
                 if not hasattr(components[attrib], 'categories'):
                     components[attrib].categories = ['Custom']
 
-    return components
+    _componentCache[folder] = ((mtime, fetchIcons), components)
+
+    return dict(components)
+
+
+def clearComponentCache():
+    """Forget which components were found in each folder, so that the next
+    call to `getComponents` searches and imports them again.
+    """
+    _componentCache.clear()
 
 
 def getInitVals(params, target="PsychoPy"):
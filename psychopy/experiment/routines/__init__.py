@@ -18,6 +18,9 @@ from psychopy import logging
 # builtin components with the same name.
 pluginRoutines = {} 
 
+# whether the builtin routine modules have been imported yet
+_routinesImported = False
+
 
 def addStandaloneRoutine(routineClass):
     """Add a standalone routine to Builder.
@@ -71,10 +74,14 @@ def getAllStandaloneRoutines(fetchIcons=True):
         those added by plugins.
 
     """
-    # Safe import all modules within this folder (apart from protected ones with a _)
-    for loc in Path(__file__).parent.glob("*"):
-        if loc.is_dir() and not loc.name.startswith("_"):
-            import_module("." + loc.name, package="psychopy.experiment.routines")
+    # Safe import all modules within this folder (apart from protected ones with a _),
+    # only needs doing once per process
+    global _routinesImported
+    if not _routinesImported:
+        for loc in Path(__file__).parent.glob("*"):
+            if loc.is_dir() and not loc.name.startswith("_"):
+                import_module("." + loc.name, package="psychopy.experiment.routines")
+        _routinesImported = True
 
     # Get list of subclasses of BaseStandalone
     def getSubclasses(cls, classList=None):
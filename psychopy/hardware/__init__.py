@@ -5,9 +5,15 @@ import sys
 import glob
 from itertools import chain
 from psychopy import logging
+from psychopy.tools.importtools import lazyImport
+
+# device classes and submodules are only imported when first used (PEP 562),
+# eyetracker in particular pulls in ioHub
+__getattr__, __dir__, _ = lazyImport(__name__, """
 from . import eyetracker, listener
 from .manager import DeviceManager, deviceManager
 from .base import BaseDevice, BaseResponse, BaseResponseDevice
+""")
 
 try:
     from collections.abc import Iterable
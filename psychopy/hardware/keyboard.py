@@ -61,8 +61,11 @@ Example usage
 from __future__ import absolute_import, division, print_function
 
 import json
+import heapq
+import itertools
 from collections import deque
 import sys
+import threading
 import psychopy.clock
 from psychopy import logging
 from psychopy.constants import NOT_STARTED
@@ -262,6 +265,188 @@ class Keyboard(AttributeGetSetMixin):
         return self.device.clearEvents(eventType=eventType)
 
 
+class _PendingKeyPresses:
+    """Presses which are still waiting for a matching release, indexed by
+    key code so that a release can be paired with its press in O(1).
+
+    Several presses of the same key can be pending at once (e.g. if a release
+    was dropped by the backend), in which case they are paired oldest first.
+    """
+
+    def __init__(self):
+        self._byCode = {}
+
+    def push(self, code, keyPress):
+        """Store a press which has not yet been released."""
+        if code not in self._byCode:
+            self._byCode[code] = deque()
+        self._byCode[code].append(keyPress)
+
+    def pop(self, code):
+        """Get the oldest pending press for a given key code, or None if
+        there isn't one."""
+        pending = self._byCode.get(code)
+        if not pending:
+            return None
+        keyPress = pending.popleft()
+        if not pending:
+            del self._byCode[code]
+        return keyPress
+
+    def clear(self):
+        self._byCode.clear()
+
+    def __iter__(self):
+        for pending in self._byCode.values():
+            yield from pending
+
+    def __len__(self):
+        return sum(len(pending) for pending in self._byCode.values())
+
+
+class KeyResponseStore:
+    """Store of the KeyPress objects received by a :class:`KeyboardDevice`.
+
+    Responses are kept in a list per key name, each entry tagged with a
+    sequence number so that chronological order can be recovered by merging
+    the lists. This means that asking for a handful of keys only ever looks
+    at the responses for those keys, and clearing returned keys doesn't
+    involve shuffling one long list.
+
+    A listener loop may dispatch messages (and so append responses) from
+    another thread, so the store is guarded by a lock. The list for a key is
+    only ever appended to (removing responses replaces it with a new list),
+    so a view just notes the length of each list it needs while holding the
+    lock, and responses appended while it's being iterated don't affect it.
+
+    `append`, `+=`, iteration, `len` and indexing work as they would for a
+    list, so code reading `KeyboardDevice.responses` as one still works.
+    Unlike a list, the same KeyPress object is only ever stored once, so
+    re-adding a press when its release is received doesn't duplicate it,
+    and responses are removed several at a time with `removeAll`.
+    """
+
+    def __init__(self, responses=()):
+        self._byName = {}
+        self._ids = set()
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        # list of responses in order, made when indexing and reset on change
+        self._list = None
+        self.extend(responses)
+
+    def append(self, response):
+        """Add a response to the store (ignored if it's already stored)."""
+        with self._lock:
+            if id(response) in self._ids:
+                return
+            self._ids.add(id(response))
+            if response.value not in self._byName:
+                self._byName[response.value] = []
+            self._byName[response.value].append((next(self._counter), response))
+            self._list = None
+
+    def extend(self, responses):
+        for response in responses:
+            self.append(response)
+
+    def __iadd__(self, responses):
+        self.extend(responses)
+        return self
+
+    def view(self, keyList=None, ignoreKeys=None, released=None):
+        """Iterate over stored responses in the order they were received,
+        without copying them.
+
+        Parameters
+        ----------
+        keyList : list[str] or None
+            If given, only responses whose value is in this list are included.
+        ignoreKeys : list[str] or None
+            Responses whose value is in this list are never included.
+        released : bool or None
+            If True, only include responses which have a duration (i.e. the
+            key has been released), if False only include those which don't.
+            If None, include both.
+
+        Returns
+        -------
+        generator
+            Yields KeyPress objects in chronological order, as stored when
+            iteration started.
+        """
+        if isinstance(keyList, str):
+            keyList = [keyList]
+        if isinstance(ignoreKeys, str):
+            ignoreKeys = [ignoreKeys]
+        ignoreKeys = set(ignoreKeys or ())
+        # pick out only the lists we need, and how much of them is stored now
+        with self._lock:
+            if keyList:
+                names = [name for name in dict.fromkeys(keyList)
+                         if name in self._byName and name not in ignoreKeys]
+            else:
+                names = [name for name in self._byName if name not in ignoreKeys]
+            queues = [itertools.islice(self._byName[name], len(self._byName[name]))
+                      for name in names]
+        # merge queues by sequence number to get chronological order
+        if len(queues) == 1:
+            entries = queues[0]
+        else:
+            entries = heapq.merge(*queues, key=lambda entry: entry[0])
+        for _, response in entries:
+            if released is not None:
+                wasReleased = getattr(response, "duration", None) is not None
+                if wasReleased != released:
+                    continue
+            yield response
+
+    def removeAll(self, responses):
+        """Remove each of the given responses from the store (responses
+        which aren't stored are ignored)."""
+        with self._lock:
+            toRemove = {}
+            for response in responses:
+                if id(response) in self._ids:
+                    toRemove.setdefault(response.value, set()).add(id(response))
+            for name, ids in toRemove.items():
+                queue = self._byName[name]
+                if len(ids) == len(queue):
+                    del self._byName[name]
+                else:
+                    # replace rather than edit the list, as views may be using it
+                    self._byName[name] = [
+                        entry for entry in queue if id(entry[1]) not in ids
+                    ]
+                self._ids -= ids
+            if toRemove:
+                self._list = None
+
+    def clear(self):
+        with self._lock:
+            self._byName.clear()
+            self._ids.clear()
+            self._list = None
+
+    def __iter__(self):
+        return self.view()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __bool__(self):
+        return bool(self._ids)
+
+    def __getitem__(self, i):
+        with self._lock:
+            if self._list is None:
+                self._list = list(self.view())
+            return self._list[i]
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {list(self.view())}>"
+
+
 class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
     """
     Object representing
@@ -384,11 +569,29 @@ class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
 
         logging.info('keyboard.Keyboard is using %s backend.' % KeyboardDevice._backend)
 
-        # array in which to store ongoing presses
-        self._keysStillDown = deque()
+        # presses awaiting a release, by key code
+        self._keysStillDown = _PendingKeyPresses()
         # set whether or not to mute any keypresses which happen outside of PsychoPy
         self.muteOutsidePsychopy = muteOutsidePsychopy
 
+    @property
+    def responses(self):
+        """
+        Responses received by this keyboard, as a :class:`KeyResponseStore`.
+        Setting this to a list replaces the stored responses with its contents.
+        """
+        if '_responses' not in self.__dict__:
+            self._responses = KeyResponseStore()
+        return self._responses
+
+    @responses.setter
+    def responses(self, value):
+        if isinstance(value, KeyResponseStore):
+            self._responses = value
+        else:
+            self.responses.clear()
+            self.responses.extend(value)
+
     def isSameDevice(self, other):
         """
         Determine whether this object represents the same physical keyboard as a given other
@@ -492,35 +695,13 @@ class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
         """
         # dispatch messages
         self.dispatchMessages()
-        # filter
-        keys = []
-        toClear = []
-        for i, resp in enumerate(self.responses):
-            # start off assuming we want the key
-            wanted = True
-            # if we're waiting on release, only store if it has a duration
-            wasRelease = hasattr(resp, "duration") and resp.duration is not None
-            if waitRelease:
-                wanted = wanted and wasRelease
-            else:
-                wanted = wanted and not wasRelease
-            # if we're looking for a key list, only store if it's in the list
-            if keyList:
-                if resp.value not in keyList:
-                    wanted = False
-            # if we're ignoring some keys, never store if ignored
-            if ignoreKeys:
-                if resp.value in ignoreKeys:
-                    wanted = False
-            # if we got this far and the key is still wanted and not present, add it to output
-            if wanted and not any(k is resp for k in keys):
-                keys.append(resp)
-            # if clear=True, mark wanted responses as toClear
-            if wanted and clear:
-                toClear.append(i)
-        # pop any responses marked as to clear
-        for i in sorted(toClear, reverse=True):
-            self.responses.pop(i)
+        # filter (only looking at the keys asked for)
+        keys = list(self.responses.view(
+            keyList=keyList, ignoreKeys=ignoreKeys, released=waitRelease
+        ))
+        # remove returned keys from the store if requested
+        if clear:
+            self.responses.removeAll(keys)
 
         return keys
 
@@ -642,18 +823,13 @@ class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
                     tDown=message['time'] - logging.defaultClock.getLastResetTime()
                 )
                 response.rt = message['time'] - self.clock.getLastResetTime()
-                self._keysStillDown.append(response)
+                self._keysStillDown.push(message['keycode'], response)
             else:
                 # if message is from a key up event, alter existing response
-                for key in self._keysStillDown:
-                    if key.code == message['keycode']:
-                        response = key
-                        # calculate duration
-                        key.duration = message['time'] - key.tDown - logging.defaultClock.getLastResetTime()
-                        # remove key from stillDown
-                        self._keysStillDown.remove(key)
-                        # stop processing keys as we're done
-                        break
+                response = self._keysStillDown.pop(message['keycode'])
+                if response is not None:
+                    # calculate duration
+                    response.duration = message['time'] - response.tDown - logging.defaultClock.getLastResetTime()
 
         elif KeyboardDevice._backend == 'iohub':
             if message.type == "KEYBOARD_PRESS":
@@ -661,18 +837,13 @@ class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
                 response = KeyPress(code=message.char, tDown=message.time, name=message.key)
                 response.rt = response.tDown - (
                     self.clock.getLastResetTime() - self._iohubKeyboard.clock.getLastResetTime())
-                self._keysStillDown.append(response)
+                self._keysStillDown.push(message.char, response)
             else:
                 # if message is from a key up event, alter existing response
-                for key in self._keysStillDown:
-                    if key.code == message.char:
-                        response = key
-                        # calculate duration
-                        key.duration = message.time - key.tDown
-                        # remove key from stillDown
-                        self._keysStillDown.remove(key)
-                        # stop processing keys as we're done
-                        break
+                response = self._keysStillDown.pop(message.char)
+                if response is not None:
+                    # calculate duration
+                    response.duration = message.time - response.tDown
                 # if no matching press, make a new KeyPress object
                 if response is None:
                     response = KeyPress(code=message.char, tDown=message.time, name=message.key)
@@ -743,7 +914,7 @@ class KeyboardDevice(BaseResponseDevice, aliases=["keyboard"]):
             global event
             event.clearEvents(eventType)
         # clear dispatched responses
-        self.responses = []
+        self.responses.clear()
 
         logging.info("Keyboard events cleared", obj=self)
 
@@ -795,7 +966,7 @@ class _KeyBuffer(object):
         allInds, names, keyboards = hid.get_keyboard_indices()
 
         self._keys = deque()
-        self._keysStillDown = deque()
+        self._keysStillDown = _PendingKeyPresses()
 
         if kb_id == -1:
             self.dev = hid.Keyboard()  # a PTB keyboard object
@@ -840,7 +1011,7 @@ class _KeyBuffer(object):
                     keyPresses.append(k)
             if clear:
                 self._keys = deque()
-                self._keysStillDown = deque()
+                self._keysStillDown = _PendingKeyPresses()
             keyPresses.sort(key=lambda x: x.tDown, reverse=False)
             return keyPresses
 
@@ -856,9 +1027,9 @@ class _KeyBuffer(object):
             keyPresses.append(keyPress)
 
         # clear keys in a second step (not during iteration)
-        if clear:
-            for key in keyPresses:
-                self._keys.remove(key)
+        if clear and keyPresses:
+            returned = set(id(key) for key in keyPresses)
+            self._keys = deque(key for key in self._keys if id(key) not in returned)
 
         return keyPresses
 
@@ -881,16 +1052,12 @@ class _KeyBuffer(object):
             if evt['down']:
                 newKey = KeyPress(code=evt['keycode'], tDown=evt['time'])
                 self._keys.append(newKey)
-                self._keysStillDown.append(newKey)
+                self._keysStillDown.push(evt['keycode'], newKey)
             else:
-                for key in self._keysStillDown:
-                    if key.code == evt['keycode']:
-                        key.duration = evt['time'] - key.tDown
-                        self._keysStillDown.remove(key)
-                        break  # this key is done
-                    else:
-                        # we found a key that was first pressed before reading
-                        pass
+                key = self._keysStillDown.pop(evt['keycode'])
+                # if None, we found a key that was first pressed before reading
+                if key is not None:
+                    key.duration = evt['time'] - key.tDown
 
 
 _keyBuffers = _KeyBuffers()
@@ -1,6 +1,11 @@
 import sys
+import heapq
 import threading
 import time
+from collections import deque
+
+import numpy as np
+
 from psychopy import logging
 
 
@@ -17,18 +22,30 @@ class ListenerLoop(threading.Thread):
         How long to sleep inbetween iterations of the loop
     maxTime : float
         Maximum time (s) which this loop is allowed to run for, after this time limit is reached the loop will end.
+    scheduled : bool
+        If True, rather than waking every `refreshRate` and dispatching messages from every device, each device is
+        dispatched on its own poll interval (see `addDevice`) and the loop sleeps until the next one is due.
+    statsLength : int
+        How many dispatches to keep latency statistics for, per device.
     """
     def __init__(self):
         self.devices = []
         # placeholder values for function params
         self.refreshRate = self.maxTime = None
+        self.scheduled = False
+        self.statsLength = 1000
+        # poll intervals and latency stats, by device id (as devices aren't hashable)
+        self._pollIntervals = {}
+        self._latencies = {}
+        # flag to rebuild the schedule when devices change
+        self._devicesChanged = True
         # set initial alive and active states
         self._alive = False
         self._active = False
         # initialise base Thread
         threading.Thread.__init__(self, target=self.dispatchLoop, daemon=True)
 
-    def addDevice(self, device):
+    def addDevice(self, device, pollInterval=None):
         """
         Add a device to this loop.
 
@@ -36,9 +53,15 @@ class ListenerLoop(threading.Thread):
         ----------
         device : BaseDevice
             Device to add
+        pollInterval : float or None
+            When `scheduled`, how often (s) to dispatch messages from this device. None (default) uses the loop's
+            `refreshRate`.
         """
         if device not in self.devices:
             self.devices.append(device)
+        if pollInterval is not None:
+            self._pollIntervals[id(device)] = pollInterval
+        self._devicesChanged = True
 
     def removeDevice(self, device):
         """
@@ -51,7 +74,10 @@ class ListenerLoop(threading.Thread):
         """
         if device in self.devices:
             i = self.devices.index(device)
-            self.devices.pop(i)
+            device = self.devices.pop(i)
+            self._pollIntervals.pop(id(device), None)
+            self._latencies.pop(id(device), None)
+        self._devicesChanged = True
 
     def start(self):
         """
@@ -118,10 +144,98 @@ class ListenerLoop(threading.Thread):
         """
         self._active = True
 
+    def getLatencyStats(self, device=None):
+        """
+        Get statistics on how promptly each device was dispatched.
+
+        For each dispatch, two durations are recorded: `wait`, the time from a device's poll being due to the loop
+        calling `dispatchMessages`, and `dispatch`, how long `dispatchMessages` took. Stats cover the last
+        `statsLength` dispatches.
+
+        Parameters
+        ----------
+        device : BaseDevice or None
+            Device to get stats for, or None to get stats for all devices.
+
+        Returns
+        -------
+        dict or list
+            Dict with keys `n`, `wait` and `dispatch`; `wait` and `dispatch` are dicts of `mean`, `median`,
+            `p95` and `max` (s). If `device` is None, a list of (device, stats dict) for each device.
+        """
+        if device is None:
+            return [(dev, self.getLatencyStats(dev)) for dev in self.devices]
+        samples = np.array(self._latencies.get(id(device), ()), dtype=float).reshape(-1, 2)
+        stats = {'n': len(samples)}
+        for i, key in enumerate(("wait", "dispatch")):
+            values = samples[:, i]
+            if len(values):
+                stats[key] = {
+                    'mean': float(values.mean()),
+                    'median': float(np.median(values)),
+                    'p95': float(np.percentile(values, 95)),
+                    'max': float(values.max()),
+                }
+            else:
+                stats[key] = {'mean': None, 'median': None, 'p95': None, 'max': None}
+
+        return stats
+
+    def _dispatchDevice(self, device, dueTime):
+        """
+        Dispatch messages from a device, recording how long after `dueTime` this happened.
+        """
+        start = time.perf_counter()
+        device.dispatchMessages()
+        end = time.perf_counter()
+        # store latency (wait, dispatch) for this device
+        if id(device) not in self._latencies:
+            self._latencies[id(device)] = deque(maxlen=self.statsLength)
+        self._latencies[id(device)].append((start - dueTime, end - start))
+
+    def _buildSchedule(self):
+        """
+        Make a schedule of poll times for the devices.
+        """
+        now = time.perf_counter()
+        schedule = [
+            (now, id(device), self._pollIntervals.get(id(device), self.refreshRate), device)
+            for device in list(self.devices)
+        ]
+        heapq.heapify(schedule)
+        self._devicesChanged = False
+
+        return schedule
+
+    def _scheduledIteration(self, schedule):
+        """
+        Wait until a device's poll is due, then dispatch whichever devices are due.
+        """
+        # wait until the next poll is due, but no longer than refreshRate so we notice being stopped/paused
+        timeout = self.refreshRate
+        if schedule:
+            timeout = min(timeout, max(schedule[0][0] - time.perf_counter(), 0))
+        time.sleep(timeout)
+        # pop any devices whose poll is due (each device is dispatched at most once per iteration)
+        now = time.perf_counter()
+        due = []
+        while schedule and schedule[0][0] <= now:
+            due.append(heapq.heappop(schedule))
+        # dispatch them and schedule their next poll
+        for dueTime, devId, interval, device in due:
+            self._dispatchDevice(device, dueTime)
+            # skip any polls we've missed rather than trying to catch up
+            nextDue = dueTime + interval
+            if nextDue <= now:
+                nextDue = now + interval
+            heapq.heappush(schedule, (nextDue, devId, interval, device))
+
     def dispatchLoop(self):
         """
         Function to make continuous calls to the device for responses.
         """
+        if self.scheduled:
+            return self._scheduledLoop()
         cont = self._alive
         startTime = time.time()
         # until something says otherwise, continue
@@ -132,15 +246,38 @@ class ListenerLoop(threading.Thread):
                 cont &= time.time() - startTime < self.maxTime
             # only dispatch messages if not paused
             if self._active:
-                # dispatch messages from devices
+                # dispatch messages from devices, all of which are due now
+                dueTime = time.perf_counter()
                 for device in self.devices:
-                    device.dispatchMessages()
+                    self._dispatchDevice(device, dueTime)
             # if there are no more devices attached, stop
             if not len(self.devices):
                 self._active = False
             # sleep for 10ms
             time.sleep(self.refreshRate)
 
+    def _scheduledLoop(self):
+        """
+        Equivalent of `dispatchLoop` for when `scheduled` is True.
+        """
+        schedule = []
+        startTime = time.time()
+        while self._alive:
+            if self.maxTime is not None and time.time() - startTime >= self.maxTime:
+                break
+            # if paused, just sleep
+            if not self._active:
+                time.sleep(self.refreshRate)
+                continue
+            # if devices have been added/removed, rebuild the schedule
+            if self._devicesChanged:
+                schedule = self._buildSchedule()
+            # if there are no more devices attached, stop
+            if not len(self.devices):
+                self._active = False
+                continue
+            self._scheduledIteration(schedule)
+
 
 # make a global instance of ListenerLoop so all listeners can share the same loop
 loop = ListenerLoop()
@@ -160,7 +297,7 @@ class BaseListener:
         global loop
         self.loop = loop
 
-    def startLoop(self, device, refreshRate=0.01, maxTime=None):
+    def startLoop(self, device, refreshRate=0.01, maxTime=None, scheduled=None, pollInterval=None):
         """
         Start a threaded loop listening for responses
 
@@ -172,6 +309,12 @@ class BaseListener:
             How long to sleep inbetween iterations of the loop
         maxTime : float
             Maximum time (s) which this loop is allowed to run for, after this time limit is reached the loop will end.
+        scheduled : bool or None
+            If True, dispatch each device on its own poll interval rather than all of them every `refreshRate` (see
+            `ListenerLoop.scheduled`). Only takes effect if the loop isn't already running. None leaves the loop's
+            current setting.
+        pollInterval : float or None
+            When scheduled, how often (s) to dispatch this device.
 
         Returns
         -------
@@ -179,9 +322,11 @@ class BaseListener:
             True if loop started successfully
         """
         # set attributes of loop
-        self.loop.addDevice(device)
+        self.loop.addDevice(device, pollInterval=pollInterval)
         self.loop.refreshRate = refreshRate
         self.loop.maxTime = maxTime
+        if scheduled is not None:
+            self.loop.scheduled = scheduled
         # start loop
         return self.loop.start()
 
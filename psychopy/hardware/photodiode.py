@@ -1,4 +1,5 @@
 import json
+import numpy as np
 from psychopy import core, layout, logging
 from psychopy.hardware import base, DeviceManager
 from psychopy.localization import _translate
@@ -707,13 +708,354 @@ class ScreenBufferSampler(BasePhotodiodeGroup):
         return self.getThreshold(channel=channel)
 
 
+def rectMeanLuminance(pixels, rects):
+    """
+    Get the mean luminance of several rectangles within a block of pixels.
+
+    Rectangles of the same size are gathered together with one fancy-indexing operation and reduced with a
+    single matrix product, so only the pixels inside rectangles are ever touched (the block is usually the
+    bounding box of many small, scattered rectangles).
+
+    Parameters
+    ----------
+    pixels : np.ndarray
+        Array of pixel values, either luminance (height, width) or RGB(A) (height, width, channels).
+    rects : np.ndarray
+        Array of rectangles (n, 4) as (left, bottom, width, height) in pixels, relative to the block.
+
+    Returns
+    -------
+    np.ndarray
+        Mean luminance (0-255) of each rectangle.
+    """
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, np.newaxis]
+    height, width, nChannels = pixels.shape
+    # luminance weight of each colour channel
+    if nChannels >= 3:
+        weights = np.zeros(nChannels, dtype=np.float32)
+        weights[:3] = (0.2989, 0.5870, 0.1140)
+    else:
+        weights = np.ones(1, dtype=np.float32)
+    # gathering whole RGBA pixels as uint32 is much faster than gathering each byte
+    if nChannels == 4 and pixels.dtype == np.uint8 and pixels.flags.c_contiguous:
+        source = pixels.view(np.uint32)[:, :, 0]
+    else:
+        source = pixels
+    # clip rects to block
+    rects = np.asarray(rects, dtype=int).reshape(-1, 4)
+    x0 = np.clip(rects[:, 0], 0, width - 1)
+    y0 = np.clip(rects[:, 1], 0, height - 1)
+    w = np.clip(rects[:, 0] + rects[:, 2], x0 + 1, width) - x0
+    h = np.clip(rects[:, 1] + rects[:, 3], y0 + 1, height) - y0
+    lum = np.empty(len(rects))
+    sizes = w * (height + 1) + h
+    for thisSize in np.unique(sizes):
+        group = np.flatnonzero(sizes == thisSize)
+        gw, gh = w[group[0]], h[group[0]]
+        # index arrays (rects, rows, cols) for every pixel in every rect of this size
+        rows = y0[group, np.newaxis, np.newaxis] + np.arange(gh)[np.newaxis, :, np.newaxis]
+        cols = x0[group, np.newaxis, np.newaxis] + np.arange(gw)[np.newaxis, np.newaxis, :]
+        values = np.ascontiguousarray(source[rows, cols])
+        # flatten to (rects, pixels * channels) bytes and take weighted mean with one product
+        values = values.view(pixels.dtype).reshape(len(group), -1).astype(np.float32)
+        lum[group] = values @ (np.tile(weights, gw * gh) / (gw * gh))
+
+    return lum
+
+
+class ScreenBufferBatchSampler(BasePhotodiodeGroup):
+    """
+    Emulates a photodiode for each of many rectangles on screen (one channel per rectangle), sampling all of
+    them from a single read of the front buffer per frame.
+
+    The read covers the bounding box of all channels and, if `asynchronous` is True, goes into a pixel buffer
+    object so the GPU can copy it while the next frame is prepared; it's then picked up on the following call to
+    `dispatchMessages`, meaning responses arrive one call late but still carry the time of the frame they came
+    from. Mean luminance of every channel on every sampled frame is kept in `timeline`, so onsets can be checked
+    for many stimuli at once after the fact (see `getTimeline` and `getOnsets`).
+
+    Parameters
+    ----------
+    win : psychopy.visual.Window
+        Window to sample.
+    threshold : int
+        Default threshold (0-255) for new channels.
+    maxFrames : int
+        Number of frames to keep in the timeline, after which the oldest are overwritten.
+    asynchronous : bool
+        Read pixels via a pixel buffer object (True) or synchronously (False).
+    """
+    def __init__(self, win, threshold=125, maxFrames=36000, asynchronous=True):
+        self.win = win
+        self.defaultThreshold = threshold
+        self.asynchronous = asynchronous
+        # rects for each channel, as (pos, size) layout objects
+        self._rects = []
+        # initialise base class with no channels yet
+        BasePhotodiodeGroup.__init__(self, channels=0)
+        # make clock
+        from psychopy.core import Clock
+        self.clock = Clock()
+        # timeline of frame times and luminance per channel
+        self.maxFrames = maxFrames
+        self._frameTimes = np.full(maxFrames, np.nan)
+        self._luminance = np.full((maxFrames, 0), np.nan, dtype=np.float32)
+        self.nFrames = 0
+        # time of the last frame we sampled, and of the frame waiting in the pixel buffer
+        self._lastSampled = None
+        self._pending = None
+        self._pbo = None
+
+    def addChannel(self, pos, size, units=None, threshold=None):
+        """
+        Add a rectangle to sample as a new channel.
+
+        Parameters
+        ----------
+        pos : layout.Position or tuple
+            Position of the rectangle.
+        size : layout.Size or tuple
+            Size of the rectangle.
+        units : str or None
+            Units of `pos` and `size`, if not given as layout objects.
+        threshold : int or None
+            Threshold for this channel, or None to use `defaultThreshold`.
+
+        Returns
+        -------
+        int
+            Index of the new channel.
+        """
+        if not isinstance(pos, layout.Position):
+            pos = layout.Position(pos, units, win=self.win)
+        if not isinstance(size, layout.Size):
+            size = layout.Size(size, units, win=self.win)
+        self._rects.append((pos, size))
+        channel = self.channels
+        self.channels += 1
+        self.state.append(False)
+        self.threshold.append(None)
+        if threshold is None:
+            threshold = self.defaultThreshold
+        self.setThreshold(threshold, channel=channel)
+        # add a column to the timeline
+        self._luminance = np.hstack([
+            self._luminance, np.full((self.maxFrames, 1), np.nan, dtype=np.float32)
+        ])
+
+        return channel
+
+    def _setThreshold(self, threshold, channel):
+        return threshold
+
+    def _getRects(self):
+        """
+        Get the bounding box (left, bottom, width, height) of all channels in window pixels, and each channel's
+        rect relative to it.
+        """
+        rects = []
+        for pos, size in self._rects:
+            x, y = pos.pix + self.win.size / 2
+            w, h = size.pix
+            rects.append((int(x - w / 2), int(y - h / 2), int(w), int(h)))
+        rects = np.array(rects, dtype=int).reshape(-1, 4)
+        # bounding box, clipped to window
+        left, bottom = np.maximum(rects[:, :2].min(axis=0), 0)
+        right, top = np.minimum((rects[:, :2] + rects[:, 2:]).max(axis=0), self.win.size)
+        bbox = (int(left), int(bottom), int(max(right - left, 1)), int(max(top - bottom, 1)))
+        # make rects relative to bounding box
+        rects[:, 0] -= left
+        rects[:, 1] -= bottom
+
+        return bbox, rects
+
+    def _startRead(self, bbox):
+        """
+        Start an asynchronous read of the front buffer into a pixel buffer object.
+        """
+        import ctypes
+        import pyglet
+        GL = pyglet.gl
+        left, bottom, w, h = bbox
+        if self._pbo is None:
+            self._pbo = GL.GLuint()
+            GL.glGenBuffers(1, ctypes.byref(self._pbo))
+        # read from front buffer
+        if self.win.useFBO:
+            GL.glBindFramebufferEXT(GL.GL_FRAMEBUFFER_EXT, 0)
+        GL.glReadBuffer(GL.GL_FRONT)
+        # orphan old storage and start the copy into the buffer (returns immediately)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._pbo)
+        GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, 4 * w * h, None, GL.GL_STREAM_READ)
+        GL.glReadPixels(left, bottom, w, h, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, 0)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        if self.win.useFBO:
+            GL.glBindFramebufferEXT(GL.GL_FRAMEBUFFER_EXT, self.win.frameBuffer)
+
+    def _finishRead(self, bbox, rects):
+        """
+        Get the mean luminance of each rect from the last asynchronous read (computed directly from the mapped
+        buffer, without copying it).
+        """
+        import ctypes
+        import pyglet
+        GL = pyglet.gl
+        left, bottom, w, h = bbox
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._pbo)
+        ptr = GL.glMapBuffer(GL.GL_PIXEL_PACK_BUFFER, GL.GL_READ_ONLY)
+        pixels = np.ctypeslib.as_array(
+            ctypes.cast(ptr, ctypes.POINTER(GL.GLubyte)), shape=(h, w, 4)
+        )
+        lum = rectMeanLuminance(pixels, rects)
+        GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+
+        return lum
+
+    def _processFrame(self, frameTime, lum):
+        """
+        Store luminance for a sampled frame and make responses for any channels whose state changed.
+        """
+        # store in timeline
+        i = self.nFrames % self.maxFrames
+        self._frameTimes[i] = frameTime
+        self._luminance[i, :len(lum)] = lum
+        self.nFrames += 1
+        # find state changes for all channels at once
+        thresholds = 255 - np.array(self.threshold, dtype=float)
+        state = lum > thresholds
+        changed = np.flatnonzero(state != np.array(self.state, dtype=bool))
+        if not len(changed):
+            return
+        # convert frame time (on defaultClock) to this device's clock
+        t = self.clock.getTime() - (logging.defaultClock.getTime() - frameTime)
+        for channel in changed:
+            self.receiveMessage(PhotodiodeResponse(
+                t=t, value=bool(state[channel]), channel=int(channel),
+                threshold=self.threshold[channel]
+            ))
+
+    def dispatchMessages(self):
+        """
+        Sample all channels from the most recently flipped frame, if it hasn't been sampled already, and
+        dispatch events for any state changes.
+        """
+        # if there's no window or channels, skip
+        if self.win is None or not self.channels:
+            return
+        bbox, rects = self._getRects()
+        # pick up pixels from the previous asynchronous read
+        if self._pending is not None:
+            frameTime, pendingBbox, pendingRects = self._pending
+            self._pending = None
+            self._processFrame(frameTime, self._finishRead(pendingBbox, pendingRects))
+        # if there's no new frame, there's nothing more to do
+        frameTime = self.win._frameTimes[-1] if self.win._frameTimes else None
+        if frameTime is None or frameTime == self._lastSampled:
+            return
+        self._lastSampled = frameTime
+        if self.asynchronous:
+            try:
+                self._startRead(bbox)
+                self._pending = (frameTime, bbox, rects)
+                return
+            except Exception as err:
+                # no pixel buffer objects, so fall back to reading synchronously
+                logging.warning(
+                    f"Could not read pixels asynchronously ({err}), falling back to synchronous reads."
+                )
+                self.asynchronous = False
+        pixels = self.win._getPixels(buffer="front", rect=bbox, makeLum=False)
+        self._processFrame(frameTime, rectMeanLuminance(pixels, rects))
+
+    def getTimeline(self):
+        """
+        Get the luminance of each channel on each sampled frame.
+
+        Returns
+        -------
+        np.ndarray
+            Times (on `logging.defaultClock`) of each sampled frame, oldest first.
+        np.ndarray
+            Mean luminance (frames, channels) of each channel on each sampled frame.
+        """
+        n = min(self.nFrames, self.maxFrames)
+        order = (np.arange(n) + self.nFrames - n) % self.maxFrames
+
+        return self._frameTimes[order], self._luminance[order]
+
+    def getOnsets(self, state=True):
+        """
+        Get the times at which each channel changed to the given state, from the timeline.
+
+        Parameters
+        ----------
+        state : bool
+            True to get onsets (dark to light), False to get offsets.
+
+        Returns
+        -------
+        list[np.ndarray]
+            For each channel, an array of frame times at which it changed to `state`.
+        """
+        times, lum = self.getTimeline()
+        above = lum > (255 - np.array(self.threshold, dtype=float))
+        # compare each frame to the previous one (first frame compared to "off")
+        previous = np.vstack([np.zeros((1, self.channels), dtype=bool), above[:-1]])
+        if state:
+            changes = above & ~previous
+        else:
+            changes = ~above & previous
+        frames, channels = np.nonzero(changes)
+
+        return [times[frames[channels == channel]] for channel in range(self.channels)]
+
+    def parseMessage(self, message):
+        """
+        Events are created as PhotodiodeResponses, so parseMessage is not needed for
+        ScreenBufferBatchSampler. Will return message unchanged.
+        """
+        return message
+
+    def isSameDevice(self, other):
+        if isinstance(other, type(self)):
+            return other.win is self.win
+        elif isinstance(other, dict):
+            if other.get('win', None) == "session.win":
+                return True
+            return other.get('win', None) is self.win
+        else:
+            return False
+
+    @staticmethod
+    def getAvailableDevices():
+        return [{
+            'deviceName': "Photodiode Emulator (Screen Buffer, batched)",
+            'deviceClass': "psychopy.hardware.photodiode.ScreenBufferBatchSampler",
+            'win': "session.win"
+        }]
+
+    def resetTimer(self, clock=logging.defaultClock):
+        self.clock._timeAtLastReset = clock._timeAtLastReset
+        self.clock._epochTimeAtLastReset = clock._epochTimeAtLastReset
+
+    def getChannelRect(self, channel):
+        """
+        Get the position and size (as layout objects) of a given channel.
+        """
+        return self._rects[channel]
+
+
 class PhotodiodeValidator:
 
     def __init__(
             self, win, diode, channel=None,
             variability=1/60,
             report="log",
-            autoLog=False):
+            autoLog=False,
+            pos=None, size=None, units=None):
         # set autolog
         self.autoLog = autoLog
         # store window handle
@@ -725,6 +1067,13 @@ class PhotodiodeValidator:
         self.report = report
         # set acceptable variability
         self.variability = variability
+        # when sharing a batched sampler, each validator gets its own rect (and channel)
+        if isinstance(diode, ScreenBufferBatchSampler) and channel is None:
+            if pos is None:
+                pos = layout.Position((0.95, -0.95), units="norm", win=win)
+            if size is None:
+                size = layout.Size((0.05, 0.05), units="norm", win=win)
+            self.channel = diode.addChannel(pos, size, units=units)
 
         from psychopy import visual
         # black rect which is always drawn on win flip
@@ -757,6 +1106,14 @@ class PhotodiodeValidator:
         Update the size and position of this validator's rectangles to match the size and position of the associated
         diode.
         """
+        if isinstance(self.diode, ScreenBufferBatchSampler):
+            # batched samplers store a rect per channel
+            pos, size = self.diode.getChannelRect(self.channel)
+            for rect in (self.onRect, self.offRect):
+                rect.units = "pix"
+                rect.pos = pos.pix
+                rect.size = size.pix
+            return
         for rect in (self.onRect, self.offRect):
             # set units from diode
             rect.units = self.diode.units
@@ -9,8 +9,11 @@
 ports and check for the expected device
 """
 
+import re
 import sys
+import threading
 import time
+from collections import deque, namedtuple
 
 from psychopy import logging
 import serial
@@ -56,6 +59,111 @@ def _findPossiblePorts():
 ports = {port: None for port in _findPossiblePorts()}
 
 
+SerialFrame = namedtuple("SerialFrame", ["t", "data"])
+SerialFrame.__doc__ = """A frame of bytes read by a SerialDevice's background reader, with the time (on the
+reader's clock) at which its first byte arrived."""
+
+
+class SerialFrameParser:
+    """Splits a stream of timestamped bytes into frames.
+
+    Exactly one of `delimiter`, `length` or `pattern` should be given.
+
+    Parameters
+    ----------
+    delimiter : bytes or None
+        Frames end with this sequence of bytes (which is not included in the frame).
+    length : int or None
+        Frames are this many bytes long.
+    pattern : str, bytes or None
+        Frames are matches of this regular expression. Any bytes before a match are discarded. The pattern
+        should be unambiguous on partial input (e.g. include a terminator), as it's matched against whatever
+        has arrived so far.
+    """
+
+    def __init__(self, delimiter=None, length=None, pattern=None):
+        if sum(arg is not None for arg in (delimiter, length, pattern)) != 1:
+            raise ValueError(
+                "SerialFrameParser needs exactly one of `delimiter`, `length` or `pattern`."
+            )
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode('utf-8')
+        if isinstance(pattern, str):
+            pattern = pattern.encode('utf-8')
+        if isinstance(pattern, bytes):
+            pattern = re.compile(pattern)
+        self.delimiter = delimiter
+        self.length = length
+        self.pattern = pattern
+        # bytes received but not yet parsed into a frame
+        self._buffer = bytearray()
+        # arrival time of each chunk still (partly) in the buffer, as [nBytes, t]
+        self._chunks = deque()
+
+    def _consume(self, n):
+        """Remove `n` bytes from the start of the buffer, returning them along with the arrival time of the
+        first one."""
+        t = self._chunks[0][1] if self._chunks else None
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        # drop chunk times for consumed bytes
+        while n and self._chunks:
+            if self._chunks[0][0] <= n:
+                n -= self._chunks.popleft()[0]
+            else:
+                self._chunks[0][0] -= n
+                n = 0
+
+        return t, data
+
+    def feed(self, data, t):
+        """Add bytes which arrived at time `t`, returning any frames now complete.
+
+        Parameters
+        ----------
+        data : bytes
+            Bytes received.
+        t : float
+            Time at which they were received.
+
+        Returns
+        -------
+        list[SerialFrame]
+            Complete frames, in the order they arrived.
+        """
+        if not data:
+            return []
+        self._buffer += data
+        self._chunks.append([len(data), t])
+        frames = []
+        while self._buffer:
+            if self.length is not None:
+                if len(self._buffer) < self.length:
+                    break
+                frames.append(SerialFrame(*self._consume(self.length)))
+            elif self.delimiter is not None:
+                end = self._buffer.find(self.delimiter)
+                if end == -1:
+                    break
+                t, frame = self._consume(end + len(self.delimiter))
+                frames.append(SerialFrame(t, frame[:end]))
+            else:
+                match = self.pattern.search(self._buffer)
+                if match is None:
+                    break
+                # discard anything before the match
+                if match.start():
+                    self._consume(match.start())
+                frames.append(SerialFrame(*self._consume(match.end() - match.start())))
+
+        return frames
+
+    def clear(self):
+        """Discard any partially received frame."""
+        self._buffer.clear()
+        self._chunks.clear()
+
+
 class SerialDevice(BaseDevice, AttributeGetSetMixin):
     """A base class for serial devices, to be sub-classed by specific devices
 
@@ -108,6 +216,12 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
 
         self.pauseDuration = pauseDuration
         self.com = None
+        # background reader (see startReader)
+        self._reader = None
+        self._readerAlive = False
+        # port timeout to restore when the reader stops
+        self._timeoutBeforeReader = None
+        self.frames = deque()
         self.OK = False
         self.maxAttempts = maxAttempts
         if type(eol) is bytes:
@@ -189,10 +303,117 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         """
         time.sleep(self.pauseDuration)
 
+    def startReader(self, delimiter=None, length=None, pattern=None, clock=None, maxFrames=10000):
+        """Start a background thread which reads from the port as bytes arrive, timestamps them and parses them
+        into frames (see :class:`SerialFrameParser`).
+
+        Frames are stored in `self.frames` (a deque, so can be read from another thread without locking) and can
+        be retrieved with `getFrames`. While the reader is running, `getResponse` and `awaitResponse` return
+        frames rather than reading from the port.
+
+        Parameters
+        ----------
+        delimiter : bytes or None
+            Frames end with this sequence of bytes. If none of `delimiter`, `length` or `pattern` are given,
+            this device's `eol` is used.
+        length : int or None
+            Frames are this many bytes long.
+        pattern : str, bytes or None
+            Frames are matches of this regular expression.
+        clock : psychopy.clock.Clock or None
+            Clock to timestamp bytes with, default is `logging.defaultClock`.
+        maxFrames : int
+            Maximum number of frames to keep, after which the oldest are dropped.
+        """
+        if self._readerAlive:
+            self.stopReader()
+        if delimiter is None and length is None and pattern is None:
+            delimiter = self.eol
+        self._parser = SerialFrameParser(delimiter=delimiter, length=length, pattern=pattern)
+        self._readerClock = clock or logging.defaultClock
+        self.frames = deque(maxlen=maxFrames)
+        # short timeout so the thread notices being stopped (restored by stopReader)
+        self._timeoutBeforeReader = self.com.timeout
+        self.com.timeout = 0.01
+        self._readerAlive = True
+        self._reader = threading.Thread(target=self._readLoop, daemon=True)
+        self._reader.start()
+
+    def stopReader(self):
+        """Stop the background reader started by `startReader`."""
+        self._readerAlive = False
+        if self._reader is not None:
+            self._reader.join(timeout=1)
+            self.com.timeout = self._timeoutBeforeReader
+        self._reader = None
+
+    @property
+    def readerRunning(self):
+        """Is the background reader currently running?"""
+        return self._reader is not None and self._readerAlive
+
+    def _readLoop(self):
+        """Body of the background reader thread."""
+        com = self.com
+        parser = self._parser
+        getTime = self._readerClock.getTime
+        while self._readerAlive:
+            try:
+                # blocks until at least one byte arrives (or timeout)
+                data = com.read(max(1, com.in_waiting))
+            except (serial.SerialException, OSError, TypeError) as err:
+                # port closed under us
+                if self._readerAlive:
+                    logging.warning(f"Serial reader for {self.portString} stopped: {err}")
+                self._readerAlive = False
+                break
+            # timestamp as soon as the read returns
+            t = getTime()
+            if data:
+                self.frames.extend(parser.feed(data, t))
+
+    def getFrames(self, clear=True):
+        """Get frames received by the background reader.
+
+        Parameters
+        ----------
+        clear : bool
+            If True (default), returned frames are removed.
+
+        Returns
+        -------
+        list[SerialFrame]
+            Frames in the order they arrived.
+        """
+        if not clear:
+            return list(self.frames)
+        frames = []
+        # popleft rather than copy & clear so frames arriving meanwhile aren't lost
+        while self.frames:
+            frames.append(self.frames.popleft())
+
+        return frames
+
+    def _awaitFrames(self, timeout):
+        """Wait for the background reader to receive at least one frame, then return all frames."""
+        start = time.time()
+        while not self.frames and time.time() - start < timeout:
+            time.sleep(0.0001)
+
+        return self.getFrames()
+
+    def _frameValues(self, frames):
+        """Get the data of frames from the background reader: decoded to text
+        for a delimited (i.e. line based) parser, or as bytes for fixed length
+        and pattern parsers, whose frames needn't be text."""
+        if self._parser.delimiter is None:
+            return [frame.data for frame in frames]
+        return [frame.data.decode('utf-8', errors='replace') for frame in frames]
+
     def sendMessage(self, message, autoLog=True):
         """Send a command to the device (does not wait for a reply or sleep())
         """
-        if self.com.inWaiting():
+        if not self.readerRunning and self.com.inWaiting():
             inStr = self.com.read(self.com.inWaiting())
             msg = "Sending '%s' to %s but found '%s' on the input buffer"
             logging.warning(msg % (message, self.name, inStr))
@@ -218,7 +439,30 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
            - 2: a multiline reply (use readlines() which *requires* timeout)
            - -1: may not be any EOL character; just read whatever chars are
                 there
+
+        If the background reader is running (see `startReader`), replies are
+        the frames it has received. Frames of a `length` or `pattern` parser
+        are returned as bytes, as they needn't be text.
         """
+        # if the background reader is running, get replies from it instead
+        if self.readerRunning:
+            frames = self._awaitFrames(timeout)
+            lines = self._frameValues(frames)
+            delimiter = self._parser.delimiter
+            if length == 1:
+                # put any extra frames back for later
+                for frame in reversed(frames[1:]):
+                    self.frames.appendleft(frame)
+                if lines:
+                    return lines[0]
+                return "" if delimiter is not None else b""
+            elif length > 1:
+                return lines
+            # return the bytes as they arrived, like reading from the port would
+            if delimiter is None:
+                return b"".join(lines)
+            data = b"".join(frame.data + delimiter for frame in frames)
+            return data.decode('utf-8', errors='replace')
         # get reply (within timeout limit)
         self.com.timeout = timeout
         if length == 1:
@@ -251,6 +495,17 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         # default timeout
         if timeout is None:
             timeout = 1
+        # if the background reader is running, get replies from it instead
+        if self.readerRunning:
+            frames = self._awaitFrames(timeout)
+            if not frames:
+                return
+            lines = self._frameValues(frames)
+            if multiline:
+                return lines
+            if self._parser.delimiter is None:
+                return b"".join(lines)
+            return str(self.eol.decode('utf-8')).join(lines)
         # set timeout
         self.com.timeout = self.pauseDuration
         # get start time
@@ -321,9 +576,12 @@ class SerialDevice(BaseDevice, AttributeGetSetMixin):
         return devices
 
     def close(self):
+        self.stopReader()
         self.com.close()
 
     def __del__(self):
+        if getattr(self, "_readerAlive", False):
+            self.stopReader()
         if self.com is not None:
             self.com.close()
 
@@ -24,11 +24,13 @@ file.
 __all__ = [
     'BaseTriggerBox',
     'ParallelPortTrigger',
+    'TriggerScheduler',
     'getAllTriggerBoxes'
 ]
 
 from psychopy.hardware.triggerbox.base import BaseTriggerBox
 from psychopy.hardware.triggerbox.parallel import ParallelPortTrigger
+from psychopy.hardware.triggerbox.scheduler import TriggerScheduler
 
 
 def getAllTriggerBoxes():
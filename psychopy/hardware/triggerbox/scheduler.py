@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Low-jitter trigger output synchronised to window flips.
+
+Triggers are encoded once, up front, and written from a single callback
+registered with `Window.callOnFlip`, so that the only work done between the
+flip returning and the port being written is looking up the pre-encoded value.
+Logging is deferred until every trigger for that flip has been written, and
+the time of each write is recorded in a preallocated NumPy ring buffer for
+offline analysis of flip-to-trigger jitter.
+
+"""
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2024 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+__all__ = ['TriggerScheduler']
+
+import numbers
+
+import numpy as np
+
+import psychopy.clock
+from psychopy import logging
+
+
+class TriggerScheduler:
+    """Send pre-encoded triggers to a port on the next window flip.
+
+    Parameters
+    ----------
+    win : psychopy.visual.Window
+        Window whose flips triggers are synchronised to.
+    port : object
+        Port to write triggers to. Can be an object with a `setData` method
+        (e.g. `psychopy.parallel.ParallelPort` or
+        `psychopy.hardware.triggerbox.ParallelPortTrigger`), in which case
+        triggers are encoded as ints; a `SerialDevice` or `serial.Serial`, in
+        which case triggers are encoded as bytes; or any callable accepting
+        one encoded value.
+    historySize : int
+        Number of writes to keep timestamps for, after which the oldest are
+        overwritten.
+    autoLog : bool
+        Whether to log each trigger (after all triggers for the flip have been
+        written).
+
+    Examples
+    --------
+    Send a trigger to an EEG amplifier on stimulus onset::
+
+        scheduler = TriggerScheduler(win, parallel.ParallelPort(0x0378))
+        scheduler.addTrigger("onset", 8)
+        scheduler.addTrigger("reset", 0)
+        ...
+        stim.draw()
+        scheduler.schedule("onset")
+        win.flip()
+        ...
+        # afterwards, check jitter
+        history = scheduler.getHistory()
+        jitter = history['writeTime'] - history['flipTime']
+
+    """
+    def __init__(self, win, port, historySize=10000, autoLog=True):
+        self.win = win
+        self.port = port
+        self.autoLog = autoLog
+        # work out how to write to the port, and so how to encode triggers
+        self._write, self._encoding = self._getWriter(port)
+        # pre-encoded triggers, by index, and a map of names to indices
+        self._names = []
+        self._values = []
+        self._encoded = []
+        self._index = {}
+        # triggers to send on the next flip
+        self._armed = []
+        self._registered = False
+        # ring buffer of write history
+        self.historySize = historySize
+        self._history = np.zeros(historySize, dtype=[
+            ('trigger', np.int32),
+            ('flipTime', np.float64),
+            ('writeTime', np.float64),
+        ])
+        # views of each field, so writing a value doesn't create a record object
+        self._triggerLog = self._history['trigger']
+        self._flipTimes = self._history['flipTime']
+        self._writeTimes = self._history['writeTime']
+        self._nWrites = 0
+
+    @staticmethod
+    def _getWriter(port):
+        """Get the function used to write to a port and the type it expects.
+        """
+        if hasattr(port, "setData"):
+            return port.setData, int
+        # SerialDevice wraps a serial.Serial as `com`
+        com = getattr(port, "com", None)
+        if com is not None and hasattr(com, "write"):
+            return com.write, bytes
+        if hasattr(port, "write"):
+            return port.write, bytes
+        if callable(port):
+            return port, None
+        raise TypeError(
+            "TriggerScheduler needs a port with a `setData` or `write` method, "
+            "or a callable, not {}".format(type(port).__name__))
+
+    def _encode(self, value):
+        """Convert a trigger value to what the port expects.
+        """
+        if self._encoding is int:
+            return int(value)
+        if self._encoding is bytes:
+            if isinstance(value, bytes):
+                return value
+            if isinstance(value, str):
+                return value.encode('utf-8')
+            if isinstance(value, int):
+                return bytes([value])
+            return bytes(value)
+        return value
+
+    def addTrigger(self, name, value):
+        """Encode a trigger so it can be scheduled by name.
+
+        Parameters
+        ----------
+        name : str
+            Name to refer to this trigger by.
+        value : int, str or bytes
+            Value to write to the port. Converted to an int for parallel ports,
+            or bytes for serial ports (ints become a single byte, strings are
+            encoded as UTF-8).
+
+        Returns
+        -------
+        int
+            Index of the trigger, which can be used in place of its name.
+        """
+        encoded = self._encode(value)
+        if name in self._index:
+            # replace existing trigger
+            i = self._index[name]
+            self._values[i] = value
+            self._encoded[i] = encoded
+        else:
+            i = len(self._names)
+            self._names.append(name)
+            self._values.append(value)
+            self._encoded.append(encoded)
+            self._index[name] = i
+
+        return i
+
+    def _getIndex(self, trigger):
+        """Get the index of a trigger from its name or index, checking that
+        it has been added (so that a bad trigger fails here, not mid-flip).
+        """
+        if not isinstance(trigger, numbers.Integral):
+            return self._index[trigger]
+        i = int(trigger)
+        if not 0 <= i < len(self._encoded):
+            raise IndexError(
+                "No trigger with index {}, {} triggers have been added".format(i, len(self._encoded)))
+        return i
+
+    def schedule(self, trigger):
+        """Send a trigger on the next window flip.
+
+        Parameters
+        ----------
+        trigger : str or int
+            Name or index (any integer type, e.g. from a conditions file) of a trigger added with
+            `addTrigger`.
+        """
+        trigger = self._getIndex(trigger)
+        self._armed.append(trigger)
+        # register with the window once per flip, however many triggers
+        if not self._registered:
+            self.win.callOnFlip(self._onFlip)
+            self._registered = True
+
+    def sendNow(self, trigger):
+        """Send a trigger immediately rather than on the next flip.
+
+        Parameters
+        ----------
+        trigger : str or int
+            Name or index (any integer type, e.g. from a conditions file) of a trigger added with
+            `addTrigger`.
+        """
+        trigger = self._getIndex(trigger)
+        self._write(self._encoded[trigger])
+        self._record(trigger, np.nan, psychopy.clock.getTime())
+        if self.autoLog:
+            self._log(trigger)
+
+    def _onFlip(self):
+        """Write all armed triggers, then record and log them.
+        """
+        armed = self._armed
+        encoded = self._encoded
+        write = self._write
+        writeTimes = self._writeTimes
+        getTime = psychopy.clock.getTime
+        # write everything first, keeping times in the (preallocated) history
+        start = self._nWrites
+        for trigger in armed:
+            write(encoded[trigger])
+            writeTimes[self._nWrites % self.historySize] = getTime()
+            self._nWrites += 1
+        # now that the port has been written, do the bookkeeping
+        flipTime = self.win._frameTime + logging.defaultClock.getLastResetTime()
+        for n, trigger in zip(range(start, self._nWrites), armed):
+            self._triggerLog[n % self.historySize] = trigger
+            self._flipTimes[n % self.historySize] = flipTime
+            if self.autoLog:
+                self._log(trigger)
+        armed.clear()
+        self._registered = False
+
+    def _record(self, trigger, flipTime, writeTime):
+        i = self._nWrites % self.historySize
+        self._triggerLog[i] = trigger
+        self._flipTimes[i] = flipTime
+        self._writeTimes[i] = writeTime
+        self._nWrites += 1
+
+    def _log(self, trigger):
+        logging.data(
+            "Sent trigger '{}' ({})".format(self._names[trigger], self._values[trigger]),
+            obj=self
+        )
+
+    @property
+    def nWrites(self):
+        """Total number of triggers written."""
+        return self._nWrites
+
+    def getHistory(self, clock=None):
+        """Get the recorded trigger writes, oldest first.
+
+        Parameters
+        ----------
+        clock : psychopy.clock.Clock or None
+            Clock to express times on, default is `logging.defaultClock`.
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with fields `trigger` (index of the trigger),
+            `flipTime` (time of the flip it was scheduled for, NaN if sent with
+            `sendNow`) and `writeTime` (time the write to the port returned).
+        """
+        if clock is None:
+            clock = logging.defaultClock
+        n = min(self._nWrites, self.historySize)
+        order = (np.arange(n) + self._nWrites - n) % self.historySize
+        history = self._history[order]
+        # convert from raw times to times on the clock
+        history['flipTime'] -= clock.getLastResetTime()
+        history['writeTime'] -= clock.getLastResetTime()
+
+        return history
+
+    def getTriggerNames(self):
+        """Names of added triggers, in index order."""
+        return list(self._names)
+
+
+if __name__ == "__main__":
+    pass
@@ -273,6 +273,7 @@ class ioHubConnection():
 
         # udp port setup
         self.udp_client = None
+        self.framed_client = None
 
         # the dynamically generated object that contains an attribute for
         # each device registered for monitoring with the ioHub server so
@@ -291,6 +292,8 @@ class ioHubConnection():
         self._iohub_server_config = None
         self._shutdown_attempted = False
         self._cv_order = None
+        self._cv_cache = []
+        self._cv_cache_size = 1
         self._message_cache = []
         self.iohub_status = self._startServer(ioHubConfig, ioHubConfigAbsPath)
         if self.iohub_status != 'OK':
@@ -598,7 +601,7 @@ class ioHubConnection():
 
         return Computer.getTime() - stime
 
-    def createTrialHandlerRecordTable(self, trials, cv_order=None):
+    def createTrialHandlerRecordTable(self, trials, cv_order=None, cache_size=1):
         """
         Create a condition variable table in the ioHub data file based on
         the a psychopy TrialHandler. By doing so, the iohub data file
@@ -638,8 +641,15 @@ class ioHubConnection():
             #
             io.addTrialHandlerRecord(trial)
 
+        With a cache_size > 1, trial records are sent to the ioHub Server
+        cache_size at a time (and added to the data file with one table
+        append), rather than one at a time. Cached records are also sent
+        by sendTrialHandlerRecords(), for example at the end of a block of
+        trials, and when iohub is shut down.
+
         """
         trial = trials.trialList[0]
+        self._cv_cache_size = max(int(cache_size), 1)
         self._cv_order = cv_order
         if cv_order is None:
             self._cv_order = trial.keys()
@@ -667,7 +677,21 @@ class ioHubConnection():
 
     def addTrialHandlerRecord(self, cv_row):
         """Adds the values from a TriaHandler row / record to the iohub data
-        file for future data analysis use.
+        file for future data analysis use. If the cache_size given to
+        createTrialHandlerRecordTable is > 1, the record is cached until
+        cache_size records have been added.
+
+        :param cv_row:
+        :return: None
+
+        """
+        self.cacheTrialHandlerRecord(cv_row)
+        if len(self._cv_cache) >= self._cv_cache_size:
+            return self.sendTrialHandlerRecords()
+
+    def cacheTrialHandlerRecord(self, cv_row):
+        """Adds the values from a TriaHandler row / record to the records to
+        be sent to the iohub data file by the next sendTrialHandlerRecords().
 
         :param cv_row:
         :return: None
@@ -685,9 +709,21 @@ class ioHubConnection():
         for i, d in enumerate(data):
             if isinstance(d, str):
                 data[i] = d.encode('utf-8')
+        self._cv_cache.append(data)
+
+    def sendTrialHandlerRecords(self):
+        """Sends any cached TrialHandler records to the iohub data file,
+        as one column of values for each condition variable.
+
+        :return: True if the records were added to the data file.
 
-        cvt_rpc = ('RPC', 'extendConditionVariableTable',
-                   (self.experimentID, self.experimentSessionID, data))
+        """
+        if not self._cv_cache:
+            return None
+        columns = [list(c) for c in zip(*self._cv_cache)]
+        self._cv_cache = []
+        cvt_rpc = ('RPC', 'extendConditionVariableColumns',
+                   (self.experimentID, self.experimentSessionID, columns))
         r = self._sendToHubServer(cvt_rpc)
         return r[2]
 
@@ -849,6 +885,24 @@ class ioHubConnection():
         r = self._sendToHubServer(('RPC', 'flushIODataStoreFile'))
         return r
 
+    def getDeviceMetrics(self, reset=False):
+        """Returns statistics the iohub server has collected about each device,
+        which can help to choose device_timer settings or to find a device that
+        is slowing down event processing.
+
+        Args:
+            reset (bool): If True, the statistics are collected again from now.
+
+        Returns:
+            dict: For each device name, a dict with the device_class,
+            event_count and events_per_sec, poll_count, idle_poll_count and the
+            current poll_interval (for polled devices), poll_duration and
+            process_duration (dicts of 'p50', 'p95', 'p99' and 'max' times
+            in msec, or None), buffer_length, buffer_high_water,
+            buffer_full_count and the period (in sec) the statistics cover.
+        """
+        return self._sendToHubServer(('RPC', 'getDeviceMetrics', [reset, ]))[2]
+
     def startCustomTasklet(self, task_name, task_class_path, **class_kwargs):
         """
         Instruct the iohub server to start running a custom tasklet given
@@ -1002,7 +1056,7 @@ class ioHubConnection():
 
         # >>>>> Create open UDP port to ioHub Server
         server_udp_port = self._iohub_server_config.get('udp_port', 9000)
-        from ..net import UDPClientConnection
+        from ..net import UDPClientConnection, FramedClientConnection, getFramedAddress
         # initially open with a timeout so macOS does not hang.        
         self.udp_client = UDPClientConnection(remote_port=server_udp_port, timeout=0.1)
 
@@ -1017,6 +1071,12 @@ class ioHubConnection():
         self.udp_client = UDPClientConnection(remote_port=server_udp_port)
         # <<<<< Done Creating open UDP port to ioHub Server
 
+        # requests are sent over tcp or a Unix domain socket if the
+        # ipc_transport setting is 'tcp' or 'uds'
+        framed_address = getFramedAddress(self._iohub_server_config)
+        if framed_address:
+            self.framed_client = FramedClientConnection(framed_address)
+
         # <<<<< Done starting iohub subprocess
 
         ioHubConnection.ACTIVE_CONNECTION = proxy(self)
@@ -1162,8 +1222,8 @@ class ioHubConnection():
         return r
 
     def _sendToHubServer(self, tx_data):
-        """General purpose local <-> iohub server process UDP based
-        request - reply code. The method blocks until the request is fulfilled
+        """General purpose local <-> iohub server process UDP (or tcp / uds)
+        based request - reply code. The method blocks until the request is fulfilled
         and and a response is received from the ioHub server.
 
         Args:
@@ -1171,10 +1231,11 @@ class ioHubConnection():
 
         Return (object): response from the ioHub Server process.
         """
+        client = self.framed_client or self.udp_client
         try:
             # send request to host, return is # bytes sent.
             #print("SEND:",tx_data)
-            self.udp_client.sendTo(tx_data)
+            client.sendTo(tx_data)
         except Exception as e: # pylint: disable=broad-except
             import traceback
             traceback.print_exc()
@@ -1186,7 +1247,7 @@ class ioHubConnection():
         try:
             # wait for response from ioHub server, which will be the
             # result data and iohub server address (ip4,port).
-            result = self.udp_client.receive()
+            result = client.receive()
             if result:
                 result, _ = result
             #print("RESULT:",result)
@@ -1303,8 +1364,9 @@ class ioHubConnection():
 
     def _shutDownServer(self):
         if self._shutdown_attempted is False:
-            # send any cached experiment messages
+            # send any cached experiment messages and trial records
             self.sendMessageEvents()
+            self.sendTrialHandlerRecords()
 
             try:
                 from psychopy.visual import window
@@ -1315,6 +1377,9 @@ class ioHubConnection():
             self._shutdown_attempted = True
             TimeoutError = psutil.TimeoutExpired
             try:
+                if self.framed_client:
+                    self.framed_client.close()
+                    self.framed_client = None
                 if self.udp_client:  # if it isn't already garbage-collected
                     self.udp_client.sendTo(('STOP_IOHUB_SERVER',))
                     self.udp_client.close()
@@ -17,6 +17,7 @@ To use the validation process from within a Coder script:
 See demos/coder/iohub/eyetracking/validation.py for a complete example.
 """
 from weakref import proxy
+from operator import attrgetter
 import numpy as np
 from time import sleep
 import os
@@ -428,6 +429,10 @@ class ValidationProcedure:
            This is also calculated as an average of both eyes when binocular data is available.
            The data is unsigned, providing the absolute distance from gaze to target positions
 
+        d) The precision of the samples used, as the root mean square of the distances between
+           successive gaze positions (rms_s2s_precision). With binocular data the average gaze
+           position of both eyes is used.
+
         Validation Results Dict Structure
         ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -453,6 +458,7 @@ class ValidationProcedure:
                                'max_error': 0.7484680652684592,
                                'mean_error': 0.39518431321527914,
                                'stdev_error': 0.24438398690651483,
+                               'rms_s2s_precision': 0.0213410289154325,
                                'valid_filtered_sample_perc': 1.0,
                               },
                               # Validation results dict is given for each target position
@@ -469,39 +475,84 @@ class ValidationProcedure:
         Create validation results dict and save validation analysis info as experiment messages to
         the iohub .hdf5 file.
 
+        The samples of all target positions are processed together; the sample selection and error
+        statistics of each position are calculated with grouped numpy reductions.
+
         :return: dict
         """
         self._validation_results = None
-        sample_array = self.targetsequence.getSampleMessageData()
+        samples, sample_counts = self.targetsequence.getSampleMessageArray()
+        # each position's samples are views of the samples array
+        sample_array = _splitPositions(samples, sample_counts)
         target_positions_used = self.targetsequence.positions.getPositions()
+        binoc_sample_types = [EventConstants.BINOCULAR_EYE_SAMPLE, EventConstants.GAZEPOINT_SAMPLE]
+        binocular = self.targetsequence.sample_type in binoc_sample_types
 
-        if self.results_in_degrees:
-            for postdat in sample_array:
-                postdat['targ_pos_x'], postdat['targ_pos_y'] = toDeg(self.win,
-                                                                     *toPix(self.win, postdat['targ_pos_x'],
-                                                                            postdat['targ_pos_y']))
-
-                binoc_sample_types = [EventConstants.BINOCULAR_EYE_SAMPLE, EventConstants.GAZEPOINT_SAMPLE]
-                if self.targetsequence.sample_type in binoc_sample_types:
-                    postdat['left_eye_x'], postdat['left_eye_y'] = toDeg(self.win,
-                                                                         *toPix(self.win, postdat['left_eye_x'],
-                                                                                postdat['left_eye_y']))
-
-                    postdat['right_eye_x'], postdat['right_eye_y'] = toDeg(self.win,
-                                                                           *toPix(self.win, postdat['right_eye_x'],
-                                                                                  postdat['right_eye_y']))
-                else:
-                    postdat['eye_x'], postdat['eye_y'] = toDeg(self.win,
-                                                               *toPix(self.win, postdat['eye_x'], postdat['eye_y']))
+        position_count = len(sample_array)
+        split_indices = np.cumsum(sample_counts)[:-1]
 
-        min_error = 100000.0
-        max_error = 0.0
-        summed_error = 0.0
-        point_count = 0
+        if self.results_in_degrees:
+            xy_fields = [('targ_pos_x', 'targ_pos_y')]
+            if binocular:
+                xy_fields.extend([('left_eye_x', 'left_eye_y'), ('right_eye_x', 'right_eye_y')])
+            else:
+                xy_fields.append(('eye_x', 'eye_y'))
+            for x, y in xy_fields:
+                samples[x], samples[y] = toDeg(self.win, *toPix(self.win, samples[x], samples[y]))
+
+        # position index of each sample
+        sample_position = np.repeat(np.arange(position_count), sample_counts)
+
+        sample_time = samples['eye_time']
+        stationary = samples['targ_state'] == self.targetsequence.TARGET_STATIONARY
+        first_stime = _groupReduce(np.minimum, sample_time[stationary], sample_position[stationary],
+                                   position_count)
+        last_stime = _groupReduce(np.maximum, sample_time[stationary], sample_position[stationary],
+                                  position_count)
+        filter_stime = last_stime - self.accuracy_period_start
+        filter_etime = last_stime - self.accuracy_period_stop
+
+        in_period = stationary & (sample_time >= filter_stime[sample_position]) & \
+            (sample_time < filter_etime[sample_position])
+        used = in_period & (samples['eye_status'] == 0)
+
+        all_samples_count = np.bincount(sample_position[in_period], minlength=position_count)
+        good_sample_count = np.bincount(sample_position[used], minlength=position_count)
+        good_sample_ratio = good_sample_count / np.maximum(all_samples_count, 1)
+
+        # gaze error of each used sample, and its sample to sample precision
+        used_samples = samples[used]
+        used_position = sample_position[used]
+        target_x = used_samples['targ_pos_x']
+        target_y = used_samples['targ_pos_y']
+        if binocular:
+            left_error_xy = np.hypot(target_x - used_samples['left_eye_x'], target_y - used_samples['left_eye_y'])
+            right_error_xy = np.hypot(target_x - used_samples['right_eye_x'], target_y - used_samples['right_eye_y'])
+            sample_error = (right_error_xy + left_error_xy) / 2.0
+            gaze_x = (used_samples['left_eye_x'] + used_samples['right_eye_x']) / 2.0
+            gaze_y = (used_samples['left_eye_y'] + used_samples['right_eye_y']) / 2.0
+        else:
+            sample_error = np.hypot(target_x - used_samples['eye_x'], target_y - used_samples['eye_y'])
+            gaze_x = used_samples['eye_x']
+            gaze_y = used_samples['eye_y']
+
+        safe_count = np.maximum(good_sample_count, 1)
+        position_min_error = _groupReduce(np.minimum, sample_error, used_position, position_count)
+        position_max_error = _groupReduce(np.maximum, sample_error, used_position, position_count)
+        position_mean_error = np.bincount(used_position, sample_error, position_count) / safe_count
+        position_std_error = np.sqrt(np.bincount(used_position,
+                                                 (sample_error - position_mean_error[used_position]) ** 2,
+                                                 position_count) / safe_count)
+        same_position = used_position[1:] == used_position[:-1]
+        s2s_position = used_position[1:][same_position]
+        s2s_sq = (np.diff(gaze_x) ** 2 + np.diff(gaze_y) ** 2)[same_position]
+        s2s_count = np.bincount(s2s_position, minlength=position_count)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            position_rms_s2s = np.sqrt(np.bincount(s2s_position, s2s_sq, position_count) / s2s_count)
 
         self.io.sendMessageEvent('Results', 'VALIDATION')
         results = dict(display_units=self.win.units, display_bounds=self.positions.bounds,
-                       display_pix=self.win.size, position_count=len(sample_array),
+                       display_pix=self.win.size, position_count=position_count,
                        target_positions=target_positions_used)
 
         for k, v in results.items():
@@ -510,52 +561,31 @@ class ValidationProcedure:
         results['position_results'] = []
         results['positions_failed_processing'] = 0
 
+        stationary_split = np.split(stationary, split_indices)
+        in_period_split = np.split(in_period, split_indices)
+        used_split = np.split(used, split_indices)
+        passed = np.zeros(position_count, dtype=bool)
         for pindex, samplesforpos in enumerate(sample_array):
             self.io.sendMessageEvent('Target Position Results: {0}'.format(pindex), 'VALIDATION')
 
-            stationary_samples = samplesforpos[samplesforpos['targ_state'] == self.targetsequence.TARGET_STATIONARY]
-
-            if len(stationary_samples):
-                last_stime = stationary_samples[-1]['eye_time']
-                first_stime = stationary_samples[0]['eye_time']
-
-                filter_stime = last_stime - self.accuracy_period_start
-                filter_etime = last_stime - self.accuracy_period_stop
-
-                all_samples_in_period = stationary_samples[stationary_samples['eye_time'] >= filter_stime]
-                all_samples_in_period = all_samples_in_period[all_samples_in_period['eye_time'] < filter_etime]
-
-                good_samples_in_period = all_samples_in_period[all_samples_in_period['eye_status'] == 0]
-
-                all_samples_count = all_samples_in_period.shape[0]
-                good_sample_count = good_samples_in_period.shape[0]
-                try:
-                    good_sample_ratio = good_sample_count / float(all_samples_count)
-                except ZeroDivisionError:
-                    good_sample_ratio = 0
-            else:
-                all_samples_in_period = []
-                good_samples_in_period = []
-                good_sample_ratio = 0
-
             # Dictionary of the different levels of samples selected during filtering
             # for valid samples to use in accuracy calculations.
             sample_msg_data_filtering = dict(all_samples=samplesforpos,  # All samples from target period.
-                                                    # Sample during stationary period at end of target
-                                                    # presentation display.
-                                                    stationary_samples=stationary_samples,
-                                                    # Samples that occurred within the
-                                                    # defined time selection period.
-                                                    time_filtered_samples=all_samples_in_period,
-                                                    # Samples from the selection period that
-                                                    # do not have missing data
-                                                    used_samples=good_samples_in_period)
+                                             # Sample during stationary period at end of target
+                                             # presentation display.
+                                             stationary_samples=samplesforpos[stationary_split[pindex]],
+                                             # Samples that occurred within the
+                                             # defined time selection period.
+                                             time_filtered_samples=samplesforpos[in_period_split[pindex]],
+                                             # Samples from the selection period that
+                                             # do not have missing data
+                                             used_samples=samplesforpos[used_split[pindex]])
 
             position_results = dict(index=pindex,
                                     target_position=target_positions_used[pindex],
-                                    sample_time_range=[first_stime, last_stime],
-                                    filter_samples_time_range=[filter_stime, filter_etime],
-                                    valid_filtered_sample_perc=good_sample_ratio)
+                                    sample_time_range=[first_stime[pindex], last_stime[pindex]],
+                                    filter_samples_time_range=[filter_stime[pindex], filter_etime[pindex]],
+                                    valid_filtered_sample_perc=good_sample_ratio[pindex])
 
             for k, v in position_results.items():
                 self.io.sendMessageEvent('{}: {}'.format(k, v), 'VALIDATION')
@@ -563,57 +593,17 @@ class ValidationProcedure:
             position_results['sample_from_filter_stages'] = sample_msg_data_filtering
 
             position_results2 = dict()
-            if int(good_sample_ratio * 100) == 0:
+            if int(good_sample_ratio[pindex] * 100) == 0:
                 position_results2['calculation_status'] = 'FAILED'
                 results['positions_failed_processing'] += 1
             else:
-                target_x = good_samples_in_period[:]['targ_pos_x']
-                target_y = good_samples_in_period[:]['targ_pos_y']
-
-                binoc_sample_types = [EventConstants.BINOCULAR_EYE_SAMPLE, EventConstants.GAZEPOINT_SAMPLE]
-                if self.targetsequence.sample_type in binoc_sample_types:
-                    left_x = good_samples_in_period[:]['left_eye_x']
-                    left_y = good_samples_in_period[:]['left_eye_y']
-                    left_error_x = target_x - left_x
-                    left_error_y = target_y - left_y
-                    left_error_xy = np.hypot(left_error_x, left_error_y)
-
-                    right_x = good_samples_in_period[:]['right_eye_x']
-                    right_y = good_samples_in_period[:]['right_eye_y']
-                    right_error_x = target_x - right_x
-                    right_error_y = target_y - right_y
-                    right_error_xy = np.hypot(right_error_x, right_error_y)
-
-                    lr_error = (right_error_xy + left_error_xy) / 2.0
-                    lr_error_max = lr_error.max()
-                    lr_error_min = lr_error.min()
-                    lr_error_mean = lr_error.mean()
-                    lr_error_std = np.std(lr_error)
-                    min_error = min(min_error, lr_error_min)
-                    max_error = max(max_error, lr_error_max)
-                    summed_error += lr_error_mean
-                    point_count += 1.0
-                else:
-                    eye_x = good_samples_in_period[:]['eye_x']
-                    eye_y = good_samples_in_period[:]['eye_y']
-                    error_x = target_x - eye_x
-                    error_y = target_y - eye_y
-                    error_xy = np.hypot(error_x, error_y)
-                    lr_error = error_xy
-                    lr_error_max = lr_error.max()
-                    lr_error_min = lr_error.min()
-                    lr_error_mean = lr_error.mean()
-                    lr_error_std = np.std(lr_error)
-                    min_error = min(min_error, lr_error_min)
-                    max_error = max(max_error, lr_error_max)
-                    summed_error += lr_error_mean
-                    point_count += 1.0
-
+                passed[pindex] = True
                 position_results2['calculation_status'] = 'PASSED'
-                position_results2['min_error'] = lr_error_min
-                position_results2['max_error'] = lr_error_max
-                position_results2['mean_error'] = lr_error_mean
-                position_results2['stdev_error'] = lr_error_std
+                position_results2['min_error'] = position_min_error[pindex]
+                position_results2['max_error'] = position_max_error[pindex]
+                position_results2['mean_error'] = position_mean_error[pindex]
+                position_results2['stdev_error'] = position_std_error[pindex]
+                position_results2['rms_s2s_precision'] = position_rms_s2s[pindex]
             for k, v in position_results2.items():
                 self.io.sendMessageEvent('{}: {}'.format(k, v), 'VALIDATION')
                 position_results[k] = v
@@ -624,8 +614,10 @@ class ValidationProcedure:
         if self.results_in_degrees:
             unit_type = 'degree'
 
-        if point_count >= 1:
-            mean_error = summed_error / point_count
+        if passed.any():
+            min_error = position_min_error[passed].min()
+            max_error = position_max_error[passed].max()
+            mean_error = position_mean_error[passed].mean()
         else:
             min_error = max_error = mean_error = 0.0
 
@@ -706,12 +698,9 @@ class ValidationProcedure:
                     gaze_x = samples[:]['eye_x']
                     gaze_y = samples[:]['eye_y']
 
-                for i in range(len(gaze_x)):
-                    if self.results_in_degrees:
-                        g_pos = gaze_x[i], gaze_y[i]
-                    else:
-                        g_pos = toPix(self.win, gaze_x[i], gaze_y[i])
-                        g_pos = g_pos[0][0], g_pos[1][0]
+                if not self.results_in_degrees:
+                    gaze_x, gaze_y = toPix(self.win, gaze_x, gaze_y)
+                for g_pos in zip(gaze_x, gaze_y):
                     sample_gfx.pos = g_pos
                     sample_gfx.draw()
                 txt_bold = False
@@ -1175,95 +1164,137 @@ class ValidationTargetRenderer:
 
         return self.target_pos_msgs
 
-    def getSampleMessageData(self):
+    def _updateTargetState(self, msg, target_pos, targ_state):
         """
-        Return a list of numpy ndarrays, each containing joined eye sample
-        and previous / next experiment message data for the sample's time.
+        Return the target position and state following experiment message msg.
+        """
+        msg_type = msg[2]
+        if msg_type == 'START_DRAW':
+            if not targ_state & self.TARGET_STATIONARY:
+                targ_state += self.TARGET_STATIONARY
+            targ_state -= targ_state & self.TARGET_MOVING
+            targ_state -= targ_state & self.TARGET_EXPANDING
+            targ_state -= targ_state & self.TARGET_CONTRACTING
+        elif msg_type == 'EXPAND_SIZE':
+            if not targ_state & self.TARGET_EXPANDING:
+                targ_state += self.TARGET_EXPANDING
+            targ_state -= targ_state & self.TARGET_CONTRACTING
+        elif msg_type == 'CONTRACT_SIZE':
+            if not targ_state & self.TARGET_CONTRACTING:
+                targ_state += self.TARGET_CONTRACTING
+            targ_state -= targ_state & self.TARGET_EXPANDING
+        elif msg_type == 'TARGET_POS':
+            target_pos = float(msg[3]), float(msg[4])
+            targ_state -= targ_state & self.TARGET_MOVING
+            if not targ_state & self.TARGET_STATIONARY:
+                targ_state += self.TARGET_STATIONARY
+        elif msg_type == 'POS_UPDATE':
+            target_pos = float(msg[3]), float(msg[4])
+            if not targ_state & self.TARGET_MOVING:
+                targ_state += self.TARGET_MOVING
+            targ_state -= targ_state & self.TARGET_STATIONARY
+        elif msg_type == 'SYNCTIME':
+            if not targ_state & self.TARGET_STATIONARY:
+                targ_state += self.TARGET_STATIONARY
+            targ_state -= targ_state & self.TARGET_MOVING
+            targ_state -= targ_state & self.TARGET_EXPANDING
+            targ_state -= targ_state & self.TARGET_CONTRACTING
+            target_pos = float(msg[6]), float(msg[7])
+        return target_pos, targ_state
+
+    def getSampleMessageArray(self):
+        """
+        Return a structured array of the joined eye sample and previous / next experiment
+        message data for the sample's time, for the samples of all target positions, and
+        an array of the number of samples of each target position.
+
+        The sample fields are read into arrays once, and the messages each sample falls
+        between are found with searchsorted on the sample and message times.
         """
         # preprocess message events
         self._processMessageEvents()
+        if not self.saved_pos_samples:
+            return np.zeros(0, dtype=self.monocular_sample_message_element), np.zeros(0, dtype=int)
 
-        # inline func to return sample field array based on sample namedtup
-        def getSampleData(s):
-            sampledata = [s.time, s.status]
-            binoc_sample_types = [EventConstants.BINOCULAR_EYE_SAMPLE, EventConstants.GAZEPOINT_SAMPLE]
-            if s.type in binoc_sample_types:
-                sampledata.extend((s.left_gaze_x, s.left_gaze_y, s.left_pupil_measure1,
-                                   s.right_gaze_x, s.right_gaze_y, s.right_pupil_measure1))
-                return sampledata
-
-            sampledata.extend((s.gaze_x, s.gaze_y, s.pupil_measure1))
-            return sampledata
+        msg_fields = [f[0] for f in self.sample_msg_dtype[:8]]
+        sample_fields = [f[0] for f in self.sample_msg_dtype[8:]]
+        if self.sample_type == EventConstants.MONOCULAR_EYE_SAMPLE:
+            getSampleData = attrgetter('time', 'status', 'gaze_x', 'gaze_y', 'pupil_measure1')
+        else:
+            getSampleData = attrgetter('time', 'status', 'left_gaze_x', 'left_gaze_y', 'left_pupil_measure1',
+                                       'right_gaze_x', 'right_gaze_y', 'right_pupil_measure1')
 
         current_target_pos = -1.0, -1.0
         current_targ_state = 0
-        target_pos_samples = []
+        # message fields of each period between two messages of a target position
+        msg_periods = []
+        sample_periods = [np.zeros(0, dtype=int)]
+        sample_data = [np.zeros((0, len(sample_fields)))]
+        sample_counts = np.zeros(len(self.saved_pos_samples), dtype=int)
         for pindex, samples in enumerate(self.saved_pos_samples):
-            last_msg, messages = self.target_pos_msgs[pindex][0], self.target_pos_msgs[pindex][1:]
-            samplesforposition = []
-            pos_sample_count = len(samples)
-            si = 0
-            for current_msg in messages:
-                last_msg_time = last_msg[0]
-                last_msg_type = last_msg[2]
-                if last_msg_type == 'START_DRAW':
-                    if not current_targ_state & self.TARGET_STATIONARY:
-                        current_targ_state += self.TARGET_STATIONARY
-                    current_targ_state -= current_targ_state & self.TARGET_MOVING
-                    current_targ_state -= current_targ_state & self.TARGET_EXPANDING
-                    current_targ_state -= current_targ_state & self.TARGET_CONTRACTING
-                elif last_msg_type == 'EXPAND_SIZE':
-                    if not current_targ_state & self.TARGET_EXPANDING:
-                        current_targ_state += self.TARGET_EXPANDING
-                    current_targ_state -= current_targ_state & self.TARGET_CONTRACTING
-                elif last_msg_type == 'CONTRACT_SIZE':
-                    if not current_targ_state & self.TARGET_CONTRACTING:
-                        current_targ_state += self.TARGET_CONTRACTING
-                    current_targ_state -= current_targ_state & self.TARGET_EXPANDING
-                elif last_msg_type == 'TARGET_POS':
-                    current_target_pos = float(last_msg[3]), float(last_msg[4])
-                    current_targ_state -= current_targ_state & self.TARGET_MOVING
-                    if not current_targ_state & self.TARGET_STATIONARY:
-                        current_targ_state += self.TARGET_STATIONARY
-                elif last_msg_type == 'POS_UPDATE':
-                    current_target_pos = float(last_msg[3]), float(last_msg[4])
-                    if not current_targ_state & self.TARGET_MOVING:
-                        current_targ_state += self.TARGET_MOVING
-                    current_targ_state -= current_targ_state & self.TARGET_STATIONARY
-                elif last_msg_type == 'SYNCTIME':
-                    if not current_targ_state & self.TARGET_STATIONARY:
-                        current_targ_state += self.TARGET_STATIONARY
-                    current_targ_state -= current_targ_state & self.TARGET_MOVING
-                    current_targ_state -= current_targ_state & self.TARGET_EXPANDING
-                    current_targ_state -= current_targ_state & self.TARGET_CONTRACTING
-                    current_target_pos = float(last_msg[6]), float(last_msg[7])
-
-                while si < pos_sample_count:
-                    sample = samples[si]
-                    if last_msg_time <= sample.time < current_msg[0]:
-                        sarray = [pindex, last_msg_time, last_msg_type,
-                                  current_msg[0], current_msg[2],
-                                  current_target_pos[0], current_target_pos[1],
-                                  current_targ_state]
-                        sarray.extend(getSampleData(sample))
-                        sndarray = np.asarray(tuple(sarray), dtype=self.sample_msg_dtype)
-                        samplesforposition.append(sndarray)
-                        si += 1
-                    elif sample.time >= current_msg[0]:
-                        break
-                    else:
-                        si += 1
-                last_msg = current_msg
-
-            possamples = np.asanyarray(samplesforposition)
-            target_pos_samples.append(possamples)
-
-        # So we now have a list len == number target positions. Each element
-        # of the list is a list of all eye sample / message data for a
-        # target position. Each element of the data list for a single target
-        # position is itself a list that that contains combined info about
-        # an eye sample and message info valid for when the sample time was.
-        return np.asanyarray(target_pos_samples, dtype=object)
+            messages = self.target_pos_msgs[pindex]
+            first_period = len(msg_periods)
+            for last_msg, next_msg in zip(messages[:-1], messages[1:]):
+                current_target_pos, current_targ_state = self._updateTargetState(last_msg, current_target_pos,
+                                                                                 current_targ_state)
+                msg_periods.append((pindex, last_msg[0], last_msg[2], next_msg[0], next_msg[2],
+                                    current_target_pos[0], current_target_pos[1], current_targ_state))
+            msg_times = np.asarray([m[0] for m in messages], dtype=np.float64)
+
+            data = np.asarray([getSampleData(s) for s in samples], dtype=np.float64)
+            data = data.reshape(len(samples), len(sample_fields))
+            # index of the message before each sample, keeping samples that
+            # are between the first and last message
+            period = np.searchsorted(msg_times, data[:, 0], side='right') - 1
+            keep = (period >= 0) & (period < len(messages) - 1)
+            sample_periods.append(period[keep] + first_period)
+            sample_data.append(data[keep])
+            sample_counts[pindex] = keep.sum()
+
+        msg_periods = np.asarray(msg_periods, dtype=self.sample_msg_dtype[:8])
+        sample_periods = np.concatenate(sample_periods)
+        sample_data = np.concatenate(sample_data)
+        sample_array = np.zeros(len(sample_periods), dtype=self.sample_msg_dtype)
+        for name in msg_fields:
+            sample_array[name] = msg_periods[name][sample_periods]
+        for fi, name in enumerate(sample_fields):
+            sample_array[name] = sample_data[:, fi]
+        return sample_array, sample_counts
+
+    def getSampleMessageData(self):
+        """
+        Return a list of numpy ndarrays, each containing joined eye sample
+        and previous / next experiment message data for the sample's time.
+        """
+        # So we return an array len == number target positions. Each element
+        # of the array is a structured array of all eye sample / message data for a
+        # target position, which contains combined info about an eye sample and
+        # message info valid for when the sample time was.
+        return _splitPositions(*self.getSampleMessageArray())
+
+
+def _splitPositions(sample_array, sample_counts):
+    """
+    Return an object array of views of the samples of each target position of sample_array.
+    """
+    position_samples = np.empty(len(sample_counts), dtype=object)
+    end = np.cumsum(sample_counts)
+    for pindex, count in enumerate(sample_counts):
+        position_samples[pindex] = sample_array[end[pindex] - count:end[pindex]]
+    return position_samples
+
+
+def _groupReduce(ufunc, values, groups, group_count):
+    """
+    Return the reduction of values by ufunc (e.g. np.minimum) for each of group_count
+    groups, given the group of each value. groups must be in ascending order. Groups
+    without values are nan.
+    """
+    result = np.full(group_count, np.nan)
+    if len(values):
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        result[groups[starts]] = ufunc.reduceat(values, starts)
+    return result
 
 
 def toPix(win, x, y):
@@ -283,6 +283,9 @@ class DeviceConstants(Constants):
     #: Constant for an AnalogInput Device.
     ANALOGINPUT = 120
 
+    #: Constant for a Replay Device, which replays events from a DataStore file.
+    REPLAY = 130
+
     #: Constant for an Experiment Device.
     EXPERIMENT = 150
 
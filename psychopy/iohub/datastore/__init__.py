@@ -269,20 +269,30 @@ class DataStoreFile():
         return True
 
     def extendConditionVariableTable(self, experiment_id, session_id, data):
+        return self.extendConditionVariableColumns(experiment_id, session_id, [[d] for d in data])
+
+    def extendConditionVariableColumns(self, experiment_id, session_id, columns):
+        """
+        Add rows to the condition variable table with one table append. The
+        rows are given as columns; a list of the values of each condition
+        variable, in table column order.
+        """
         if self._EXP_COND_DTYPE is None:
             return False
         if self.emrtFile and 'EXP_CV' in self.TABLES:
-            temp = [experiment_id, session_id]
-            temp.extend(data)
-            data = temp
             try:
                 etable = self.TABLES['EXP_CV']
-                for i, d in enumerate(data):
-                    if isinstance(d, (list, tuple)):
-                        data[i] = tuple(d)
-                np_array = np.array([tuple(data), ], dtype=self._EXP_COND_DTYPE)
+                names = self._EXP_COND_DTYPE.names
+                row_count = len(columns[0]) if columns else 0
+                np_array = np.zeros(row_count, dtype=self._EXP_COND_DTYPE)
+                np_array[names[0]] = experiment_id
+                np_array[names[1]] = session_id
+                for name, column in zip(names[2:], columns):
+                    if self._EXP_COND_DTYPE[name].names:
+                        column = [tuple(d) for d in column]
+                    np_array[name] = column
                 etable.append(np_array)
-                self.bufferedFlush()
+                self.bufferedFlush(row_count)
                 return True
             except Exception:
                 printExceptionDetailsToStdErr()
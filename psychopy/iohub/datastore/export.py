@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Part of the PsychoPy library
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+"""
+Export the event tables of ioHub DataStore HDF5 files to Parquet, Feather
+(Arrow IPC) or csv files for analysis.
+
+Each event table is read in chunks of rows, so memory use depends on the
+chunk size rather than on the size of the file. Events can be labelled with
+the condition variables of the trial they occurred in, using a trial start
+and stop time column of the condition variables table.
+
+Files are written to <output_dir>/<hdf5 file name>/<event class>/, with one
+file per experiment session (session_<id>.<format>). Each chunk is written as
+a Parquet row group, or an Arrow record batch, as it is read.
+
+From the command line, many files can be exported in parallel::
+
+    python -m psychopy.iohub.datastore.export data/*.hdf5 -o exported -j 4 \\
+        --trial-start trial_start --trial-stop trial_stop
+
+Writing Parquet or Feather files requires the pyarrow package.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from .util import open_file
+
+EXPORT_FORMATS = ('parquet', 'feather', 'csv')
+DEFAULT_CHUNK_SIZE = 250000
+
+
+def readChunks(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the rows of a DataStore table as numpy structured arrays of at most
+    chunk_size rows.
+
+    :param table: (tables.Table)
+    :param chunk_size: (int)
+    :return: (generator)
+    """
+    chunk_size = max(1, int(chunk_size))
+    for start in range(0, table.nrows, chunk_size):
+        yield table.read(start, min(start + chunk_size, table.nrows))
+
+
+class TrialWindows:
+    """
+    The start and stop time of each row of an experiment condition variables
+    table, used to find the trial each event occurred in.
+
+    Events are assigned to the trial, of the same session, with the latest
+    start time that is <= the event time, if the event time is also <= the
+    stop time of that trial.
+
+    :param cv_rows: (numpy structured array) condition variable table rows.
+    :param trial_start: (str) name of the trial start time column.
+    :param trial_stop: (str) name of the trial stop time column.
+    :param time_margins: ([float, float]) added before the start and after the stop of each trial.
+    """
+    def __init__(self, cv_rows, trial_start, trial_stop, time_margins=(0.0, 0.0)):
+        for cname in (trial_start, trial_stop):
+            if cname not in cv_rows.dtype.names:
+                raise ValueError("TrialWindows: column not found in condition variables table: %s" % cname)
+        self.rows = cv_rows
+        starts = cv_rows[trial_start].astype(numpy.float64) - time_margins[0]
+        stops = cv_rows[trial_stop].astype(numpy.float64) + time_margins[1]
+        # trials with no (or a nan) start or stop time can not contain events
+        valid = numpy.flatnonzero(numpy.isfinite(starts) & numpy.isfinite(stops))
+        sessions = cv_rows['SESSION_ID'][valid]
+        order = valid[numpy.lexsort((starts[valid], sessions))]
+
+        self._order = order
+        self._starts = starts[order]
+        self._stops = stops[order]
+        self._sessions = {}
+        session_ids = cv_rows['SESSION_ID'][order]
+        bounds = numpy.flatnonzero(numpy.diff(session_ids)) + 1
+        for first, last in zip(numpy.r_[0, bounds], numpy.r_[bounds, len(order)]):
+            if last > first:
+                self._sessions[int(session_ids[first])] = (first, last)
+
+    def trialIndices(self, session_ids, times):
+        """
+        Return the condition variable table row index of the trial each event
+        occurred in, or -1 for events that are not within a trial.
+
+        :param session_ids: (ndarray) session id of each event.
+        :param times: (ndarray) time of each event.
+        :return: (ndarray)
+        """
+        indices = numpy.full(len(times), -1, dtype=numpy.int64)
+        for session_id in numpy.unique(session_ids):
+            if int(session_id) not in self._sessions:
+                continue
+            first, last = self._sessions[int(session_id)]
+            events = numpy.flatnonzero(session_ids == session_id)
+            etimes = times[events]
+            windows = numpy.searchsorted(self._starts[first:last], etimes, side='right') - 1 + first
+            inside = windows >= first
+            inside[inside] = etimes[inside] <= self._stops[windows[inside]]
+            indices[events[inside]] = self._order[windows[inside]]
+        return indices
+
+
+def _columnArrays(rows, names):
+    """Return a list of (name, array) for the given columns of rows, with
+    bytes columns decoded to str."""
+    columns = []
+    for name in names:
+        values = rows[name]
+        if values.dtype.kind == 'S':
+            values = numpy.char.decode(values, 'utf-8')
+        columns.append((name, values))
+    return columns
+
+
+class _SessionFileWriter:
+    """Writes the chunks of one event type and session to a file."""
+    extension = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, columns, missing=None):
+        """
+        Write the columns of a chunk of events.
+
+        :param columns: (list) of (name, array, masked), where masked is True
+                        for condition variable columns.
+        :param missing: (ndarray or None) True for events that are not
+                        within a trial; masked columns are null for them.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+def _importPyarrow():
+    try:
+        import pyarrow
+    except ImportError as err:
+        raise ImportError("Exporting to parquet or feather files requires the pyarrow package "
+                          "(pip install pyarrow). Use the csv format instead.") from err
+    return pyarrow
+
+
+class _ArrowFileWriter(_SessionFileWriter):
+    def __init__(self, path):
+        _SessionFileWriter.__init__(self, path)
+        self._pa = _importPyarrow()
+        self._writer = None
+
+    def _arrowTable(self, columns, missing):
+        pa = self._pa
+        arrays = [pa.array(values, mask=missing if masked else None)
+                  for name, values, masked in columns]
+        return pa.Table.from_arrays(arrays, names=[name for name, values, masked in columns])
+
+    def _openWriter(self, schema):
+        raise NotImplementedError()
+
+    def write(self, columns, missing=None):
+        table = self._arrowTable(columns, missing)
+        if self._writer is None:
+            self._writer = self._openWriter(table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class _ParquetFileWriter(_ArrowFileWriter):
+    extension = 'parquet'
+
+    def _openWriter(self, schema):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self.path, schema)
+
+
+class _FeatherFileWriter(_ArrowFileWriter):
+    extension = 'feather'
+
+    def _openWriter(self, schema):
+        import pyarrow.ipc
+        return self._pa.ipc.new_file(self.path, schema)
+
+
+class _CsvFileWriter(_SessionFileWriter):
+    extension = 'csv'
+
+    def __init__(self, path):
+        _SessionFileWriter.__init__(self, path)
+        self._header = True
+
+    def write(self, columns, missing=None):
+        import pandas
+        data = pandas.DataFrame({name: values for name, values, masked in columns}, copy=False)
+        if missing is not None:
+            for name, values, masked in columns:
+                if not masked:
+                    continue
+                # integer and bool columns get a nullable dtype, so that they
+                # are written the same way whether or not a chunk has missing
+                # values, rather than as floats only in some chunks
+                if values.dtype.kind in 'iu':
+                    data[name] = pandas.array(values, dtype=values.dtype.name.capitalize().replace('Uint', 'UInt'))
+                elif values.dtype.kind == 'b':
+                    data[name] = pandas.array(values, dtype='boolean')
+                if missing.any():
+                    data[name] = data[name].where(~missing)
+        data.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+        self._header = False
+
+
+_WRITERS = dict(parquet=_ParquetFileWriter, feather=_FeatherFileWriter, csv=_CsvFileWriter)
+
+
+def exportFile(hdf5FilePath, outputDir, exportFormat='parquet', eventTypes=None,
+               trialStart=None, trialStop=None, timeMargins=(0.0, 0.0), cvColumns=None,
+               trialsOnly=False, chunkSize=DEFAULT_CHUNK_SIZE):
+    """
+    Export the event tables of an ioHub DataStore file.
+
+    Events are written to <outputDir>/<file name>/<event class>/session_<id>.<exportFormat>.
+
+    If trialStart and trialStop are given, each event is labelled with the
+    condition variables (all, or cvColumns) of the trial it occurred in, and
+    a 'trial_index' column, the trial's condition variables table row, which
+    is -1 for events that are not within a trial. Condition variables are
+    null for those events, or they are excluded if trialsOnly is True.
+
+    :param hdf5FilePath: (str)
+    :param outputDir: (str)
+    :param exportFormat: (str) 'parquet', 'feather' or 'csv'.
+    :param eventTypes: (list or None) event class names to export, e.g. ['MessageEvent'], or None for all.
+    :param trialStart: (str or None) condition variables table trial start time column.
+    :param trialStop: (str or None) condition variables table trial stop time column.
+    :param timeMargins: ([float, float])
+    :param cvColumns: (list or None)
+    :param trialsOnly: (bool)
+    :param chunkSize: (int) number of events read at a time.
+    :return: (dict) number of events exported for each event class.
+    """
+    if exportFormat not in _WRITERS:
+        raise ValueError("exportFile: exportFormat must be one of %s, not %s" % (EXPORT_FORMATS, exportFormat))
+    if (trialStart is None) != (trialStop is None):
+        raise ValueError("exportFile: trialStart and trialStop must both be given, or both be None.")
+    writerClass = _WRITERS[exportFormat]
+    if writerClass is not _CsvFileWriter:
+        _importPyarrow()
+
+    fileName = os.path.splitext(os.path.basename(hdf5FilePath))[0]
+    fileOutputDir = os.path.join(outputDir, fileName)
+    exported = {}
+
+    with open_file(hdf5FilePath, 'r') as hdfFile:
+        trialWindows = None
+        cvNames = []
+        if trialStart is not None:
+            cvTables = list(hdfFile.root.data_collection.condition_variables._v_leaves.values())
+            if not cvTables:
+                raise ValueError("exportFile: %s has no condition variables table." % hdf5FilePath)
+            cvRows = cvTables[0].read()
+            trialWindows = TrialWindows(cvRows, trialStart, trialStop, timeMargins)
+            cvNames = list(cvColumns) if cvColumns else [n for n in cvRows.dtype.names
+                                                          if n not in ('EXPERIMENT_ID', 'SESSION_ID')]
+            for cname in cvNames:
+                if cname not in cvRows.dtype.names:
+                    raise ValueError("exportFile: condition variables table column '%s' not found." % cname)
+            # an extra row of empty values, used for events not within a trial (trial index -1)
+            cvValues = [(n, numpy.append(v, numpy.zeros(1, v.dtype))) for n, v in _columnArrays(cvRows, cvNames)]
+
+        for mapping in hdfFile.root.class_table_mapping.read():
+            if mapping['class_type_id'] != 1:
+                continue
+            className = mapping['class_name'].decode('utf-8')
+            if eventTypes and className not in eventTypes:
+                continue
+            tablePath = mapping['table_path'].decode('utf-8')
+            if tablePath not in hdfFile:
+                continue
+            table = hdfFile.get_node(tablePath)
+            typeId = mapping['class_id']
+            count = 0
+            writers = {}
+            try:
+                for rows in readChunks(table, chunkSize):
+                    if (rows['type'] != typeId).any():
+                        # a table shared by several event types
+                        rows = rows[rows['type'] == typeId]
+                    if len(rows) == 0:
+                        continue
+                    trialIndex = None
+                    if trialWindows is not None:
+                        trialIndex = trialWindows.trialIndices(rows['session_id'], rows['time'])
+                        if trialsOnly:
+                            rows = rows[trialIndex >= 0]
+                            trialIndex = trialIndex[trialIndex >= 0]
+                    for session_id in numpy.unique(rows['session_id']):
+                        inSession = rows['session_id'] == session_id
+                        if inSession.all():
+                            sessionRows, sessionTrials = rows, trialIndex
+                        else:
+                            sessionRows = rows[inSession]
+                            sessionTrials = trialIndex[inSession] if trialIndex is not None else None
+                        columns = [(n, v, False) for n, v in _columnArrays(sessionRows, sessionRows.dtype.names)]
+                        missing = None
+                        if sessionTrials is not None:
+                            missing = sessionTrials < 0
+                            columns.append(('trial_index', sessionTrials, False))
+                            columns.extend((n, v[sessionTrials], True) for n, v in cvValues)
+                        writer = writers.get(session_id)
+                        if writer is None:
+                            eventDir = os.path.join(fileOutputDir, className)
+                            os.makedirs(eventDir, exist_ok=True)
+                            writer = writers[session_id] = writerClass(os.path.join(
+                                eventDir, 'session_%d.%s' % (session_id, writerClass.extension)))
+                        writer.write(columns, missing)
+                        count += len(sessionRows)
+            finally:
+                for writer in writers.values():
+                    writer.close()
+            if count:
+                exported[className] = count
+    return exported
+
+
+def _exportFile(args):
+    hdf5FilePath, kwargs = args
+    try:
+        return hdf5FilePath, exportFile(hdf5FilePath, **kwargs), None
+    except Exception as e:
+        return hdf5FilePath, None, '%s: %s' % (type(e).__name__, e)
+
+
+def exportFiles(hdf5FilePaths, outputDir, jobs=None, **kwargs):
+    """
+    Export the event tables of several ioHub DataStore files, using a pool
+    of jobs processes. See exportFile for the keyword arguments.
+
+    :param hdf5FilePaths: (list)
+    :param outputDir: (str)
+    :param jobs: (int or None) number of processes; None uses one per cpu.
+    :return: (list) of (hdf5 file path, event counts or None, error message or None).
+    """
+    tasks = [(path, dict(kwargs, outputDir=outputDir)) for path in hdf5FilePaths]
+    if jobs == 1 or len(tasks) <= 1:
+        return [_exportFile(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_exportFile, tasks))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m psychopy.iohub.datastore.export',
+        description="Export the event tables of ioHub DataStore HDF5 files to "
+                    "parquet, feather or csv files.")
+    parser.add_argument('files', nargs='+', help="ioHub .hdf5 files to export.")
+    parser.add_argument('-o', '--output-dir', default='.', help="folder to save exported files in.")
+    parser.add_argument('-f', '--format', default='parquet', choices=EXPORT_FORMATS)
+    parser.add_argument('-e', '--events', nargs='+', default=None, metavar='EVENT_CLASS',
+                        help="event classes to export, e.g. MessageEvent. Default: all.")
+    parser.add_argument('--trial-start', default=None,
+                        help="condition variables column with the start time of each trial.")
+    parser.add_argument('--trial-stop', default=None,
+                        help="condition variables column with the stop time of each trial.")
+    parser.add_argument('--time-margins', nargs=2, type=float, default=(0.0, 0.0), metavar=('BEFORE', 'AFTER'))
+    parser.add_argument('--cv-columns', nargs='+', default=None, help="condition variables to add to events.")
+    parser.add_argument('--trials-only', action='store_true', help="only export events within a trial.")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="events read at a time.")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="number of processes. Default: one per cpu.")
+    args = parser.parse_args(argv)
+
+    results = exportFiles(args.files, args.output_dir, jobs=args.jobs, exportFormat=args.format,
+                          eventTypes=args.events, trialStart=args.trial_start, trialStop=args.trial_stop,
+                          timeMargins=args.time_margins, cvColumns=args.cv_columns,
+                          trialsOnly=args.trials_only, chunkSize=args.chunk_size)
+    failed = 0
+    for path, counts, error in results:
+        if error:
+            failed += 1
+            print("%s: export failed. %s" % (path, error), file=sys.stderr)
+        else:
+            print("%s: %s" % (path, ', '.join('%s %d' % (k, v) for k, v in counts.items()) or 'no events'))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
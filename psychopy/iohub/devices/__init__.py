@@ -245,11 +245,16 @@ class Device(ioObject):
         self._configuration = kwargs
         self._last_poll_time = 0
         self._last_callback_time = 0
-        self._native_event_buffer = deque(maxlen=self.event_buffer_length)
+        self._native_event_buffer = self._createEventBuffer()
         self._filters = dict()
         self._hw_interface_status = self.HW_STAT_UNDEFINED
         self._hw_error_str = u''
 
+    def _createEventBuffer(self):
+        # events are kept in list form (or as native event objects), which a
+        # deque appends faster than an object dtype RingBuffer
+        return deque(maxlen=self.event_buffer_length)
+
     @staticmethod
     def _getNextEventID():
         n = Device._next_event_id
@@ -377,17 +382,19 @@ class Device(ioObject):
         if event_type:
             if filter_id:
                 event_que = self._iohub_event_buffer[event_type]
-                newque = deque([e for e in event_que if e[
-                               DeviceEvent.EVENT_FILTER_ID_INDEX] != filter_id], maxlen=self.event_buffer_length)
+                newque = self._createEventBuffer()
+                newque.extend([e for e in event_que if e[
+                              DeviceEvent.EVENT_FILTER_ID_INDEX] != filter_id])
                 self._iohub_event_buffer[event_type] = newque
             else:
                 self._iohub_event_buffer.setdefault(
-                    event_type, deque(maxlen=self.event_buffer_length)).clear()
+                    event_type, self._createEventBuffer()).clear()
         else:
             if filter_id:
                 for event_type, event_deque in list(self._iohub_event_buffer.items()):
-                    newque = deque([e for e in event_deque if e[
-                                   DeviceEvent.EVENT_FILTER_ID_INDEX] != filter_id], maxlen=self.event_buffer_length)
+                    newque = self._createEventBuffer()
+                    newque.extend([e for e in event_deque if e[
+                                  DeviceEvent.EVENT_FILTER_ID_INDEX] != filter_id])
                     self._iohub_event_buffer[event_type] = newque
             else:
                 self._iohub_event_buffer.clear()
@@ -511,9 +518,10 @@ class Device(ioObject):
 
     def _handleEvent(self, e):
         event_type_id = e[DeviceEvent.EVENT_TYPE_ID_INDEX]
-        self._iohub_event_buffer.setdefault(
-            event_type_id, deque(
-                maxlen=self.event_buffer_length)).append(e)
+        event_buffer = self._iohub_event_buffer.get(event_type_id)
+        if event_buffer is None:
+            event_buffer = self._iohub_event_buffer[event_type_id] = self._createEventBuffer()
+        event_buffer.append(e)
 
         # Add the event to any filters bound to the device which
         # list wanting the event's type and events filter_id
@@ -192,10 +192,10 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
             vel_filter_class, vel_filter_kwargs = eventfilters.PassThroughFilter, {}
 
         self.adaptive_x_vthresh_buffer = np.zeros(
-            self.vel_thresh_history_dur * sampling_rate)
+            int(self.vel_thresh_history_dur * sampling_rate))
         self.x_vthresh_buffer_index = 0
         self.adaptive_y_vthresh_buffer = np.zeros(
-            self.vel_thresh_history_dur * sampling_rate)
+            int(self.vel_thresh_history_dur * sampling_rate))
         self.y_vthresh_buffer_index = 0
 
         pos_filter_kwargs['event_type'] = MONOCULAR_EYE_SAMPLE
@@ -239,16 +239,20 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
     def process(self):
         """"""
         samples_for_processing = []
-        for in_evt in self.getInputEvents():
-            if self.sample_type is None:
-                self.initializeForSampleType(in_evt)
+        in_events = self.getInputEvents()
+        if in_events and self.sample_type is None:
+            self.initializeForSampleType(in_events[0])
 
-            # If event is binocular, convert to monocular.
-            # Regardless of type, convert pix to angle positions and calculate
-            # unfiltered velocity data.
-            current_mono_evt = self.convertEvent(self.last_sample, in_evt)
+        # If event is binocular, convert to monocular.
+        # Regardless of type, convert pix to angle positions (of all the
+        # input events at once) and calculate unfiltered velocity data.
+        mono_events = [self.convertEvent(in_evt) for in_evt in in_events]
+        self._convertPosToAngles(mono_events)
 
+        for current_mono_evt in mono_events:
             is_valid = self.isValidSample(current_mono_evt)
+            if is_valid and self.last_sample:
+                self._addVelocity(self.last_sample, current_mono_evt)
             if is_valid:
                 # If sample is valid (no missing pos data), first
                 # check for a previous missing data run and handle.
@@ -521,13 +525,27 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
         self.y_velocity_filter.add(sample)
         return self.xy_velocity_filter.add(sample)
 
-    def _convertPosToAngles(self, mono_event):
+    def _convertPosToAngles(self, mono_events):
+        """Sets the angle_x, angle_y fields of the valid samples in
+        mono_events from their gaze_x, gaze_y, converting the gaze positions
+        of all the samples in one pix2deg call."""
+        valid_events = [e for e in mono_events if self.isValidSample(e)]
+        if not valid_events:
+            return
         gx_ix = self.io_event_ix('gaze_x')
-        gx_iy = self.io_event_ix('gaze_y')
-        mono_event[
-            self.io_event_ix('angle_x')], mono_event[
-            self.io_event_ix('angle_y')] = self.pix2deg(
-            mono_event[gx_ix], mono_event[gx_iy])
+        gy_ix = self.io_event_ix('gaze_y')
+        ax_ix = self.io_event_ix('angle_x')
+        ay_ix = self.io_event_ix('angle_y')
+        if len(valid_events) == 1:
+            mono_event = valid_events[0]
+            mono_event[ax_ix], mono_event[ay_ix] = self.pix2deg(
+                float(mono_event[gx_ix]), float(mono_event[gy_ix]))
+            return
+        angles = self.pix2deg(np.asarray([(e[gx_ix], e[gy_ix]) for e in valid_events],
+                                         dtype=np.float64))
+        for mono_event, (angle_x, angle_y) in zip(valid_events, angles.tolist()):
+            mono_event[ax_ix] = angle_x
+            mono_event[ay_ix] = angle_y
 
     def _addVelocity(self, prev_event, current_event):
         io_ix = self.io_event_ix
@@ -548,13 +566,10 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
         current_event[io_ix('velocity_y')] = dy / dt
         current_event[io_ix('velocity_xy')] = np.hypot(dx / dt, dy / dt)
 
-    def _convertMonoFields(self, prev_event, current_event):
-        if self.isValidSample(current_event):
-            self._convertPosToAngles(self, current_event)
-            if prev_event:
-                self._addVelocity(prev_event, current_event)
+    def _convertMonoFields(self, current_event):
+        return current_event
 
-    def _convertToMonoAveraged(self, prev_event, current_event):
+    def _convertToMonoAveraged(self, current_event):
         mono_evt = []
         binoc_field_names = EventConstants.getClass(
             EventConstants.BINOCULAR_EYE_SAMPLE).CLASS_ATTRIBUTE_NAMES
@@ -609,10 +624,6 @@ class EyeTrackerEventParser(eventfilters.DeviceEventFilter):
                     ValueError('Unknown Sample Status: %d' % (status))
         mono_evt[self.io_event_fields.index(
             'type')] = EventConstants.MONOCULAR_EYE_SAMPLE
-        if self.isValidSample(mono_evt):
-            self._convertPosToAngles(mono_evt)
-            if prev_event:
-                self._addVelocity(prev_event, mono_evt)
         return mono_evt
 
     def _binocSampleValidEyeData(self, sample):
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# Part of the PsychoPy library
+# Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+import heapq
+import os
+from itertools import count
+
+import numpy as np
+
+from .. import Device, DeviceEvent, Computer
+from ...constants import DeviceConstants
+from ...errors import print2err, printExceptionDetailsToStdErr
+from ..eyetracker.eye_events import (MonocularEyeSampleEvent, BinocularEyeSampleEvent,
+                                     GazepointSampleEvent, FixationStartEvent, FixationEndEvent,
+                                     SaccadeStartEvent, SaccadeEndEvent, BlinkStartEvent,
+                                     BlinkEndEvent)
+from ..experiment import MessageEvent, LogEvent
+from ..keyboard import KeyboardPressEvent, KeyboardReleaseEvent
+
+getTime = Computer.getTime
+
+_replayEventClassNames = ['MonocularEyeSampleEvent', 'BinocularEyeSampleEvent',
+                          'GazepointSampleEvent', 'FixationStartEvent', 'FixationEndEvent',
+                          'SaccadeStartEvent', 'SaccadeEndEvent', 'BlinkStartEvent',
+                          'BlinkEndEvent', 'MessageEvent', 'LogEvent',
+                          'KeyboardPressEvent', 'KeyboardReleaseEvent']
+
+_mouseEventClassNames = ['MouseMoveEvent', 'MouseDragEvent', 'MouseScrollEvent',
+                         'MouseButtonPressEvent', 'MouseButtonReleaseEvent']
+
+
+def __getattr__(name):
+    # The mouse event classes can only be imported once the ioHub Server has
+    # loaded the Keyboard device, so they are imported when first asked for,
+    # i.e. by import_device when the Replay device is loaded.
+    if name in _mouseEventClassNames:
+        from .. import mouse
+        return getattr(mouse, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+class Replay(Device):
+    """
+    The Replay device streams events saved in an existing ioHub DataStore
+    (hdf5) file back through the ioHub Process, as if they were being
+    generated by the device that originally recorded them. This allows an
+    experiment (or gaze contingent / ROI code) to be developed and tested
+    without the original hardware, and the ioHub event pipeline to be
+    benchmarked at realistic (e.g. 1 - 2 kHz eye sample) event rates.
+
+    Events from all the tables of the file that hold one of the
+    monitor_event_types are merged in time order. Each event is given a
+    new event id and its time stamps are shifted so that it is reported
+    at the current ioHub time, keeping the timing of the original
+    session. Playback speed is set by the 'speed' setting: 1.0 replays
+    events with their original timing, 2.0 twice as fast, and 0.0 as fast
+    as the device timer allows (up to event_buffer_length events each
+    poll).
+
+    Playback starts when event reporting is enabled, and pauses when it
+    is disabled.
+    """
+    EVENT_CLASS_NAMES = _replayEventClassNames + _mouseEventClassNames
+
+    DEVICE_TYPE_ID = DeviceConstants.REPLAY
+    DEVICE_TYPE_STRING = 'REPLAY'
+    __slots__ = ['_file', '_session_id', '_table_type_ids', '_events',
+                 '_next_event', '_source_start', '_replay_start', '_speed',
+                 '_loop', '_replayed_count']
+
+    def __init__(self, *args, **kwargs):
+        Device.__init__(self, *args, **kwargs['dconfig'])
+
+        self._file = None
+        self._session_id = None
+        self._table_type_ids = dict()
+        self._events = iter(())
+        self._next_event = None
+        self._source_start = 0.0
+        self._replay_start = 0.0
+        self._speed = float(self._configuration.get('speed', 1.0))
+        self._loop = self._configuration.get('loop', False)
+        self._replayed_count = 0
+
+        self._openFile(self._configuration.get('file'),
+                       self._configuration.get('session_code'))
+        self.restart()
+
+    def _openFile(self, file_path, session_code):
+        if not file_path:
+            self._hw_interface_status = self.HW_STAT_NOT_INITIALIZED
+            self._hw_error_str = u'No replay file has been set.'
+            return False
+        try:
+            import tables
+
+            self._file = tables.open_file(os.path.abspath(file_path), mode='r')
+
+            sessions = self._file.root.data_collection.session_meta_data.read()
+            if session_code:
+                match = sessions[sessions['code'] == session_code.encode('utf-8')]
+                if len(match) == 0:
+                    raise ValueError('Session code {} not found in {}.'.format(session_code, file_path))
+                self._session_id = int(match['session_id'][0])
+            elif len(sessions):
+                self._session_id = int(sessions['session_id'][0])
+
+            event_types = set(self._configuration.get('monitor_event_types', []))
+            event_types.intersection_update(self.EVENT_CLASS_NAMES)
+            for row in self._file.root.class_table_mapping.read():
+                class_name = row['class_name'].decode('utf-8')
+                if class_name in event_types:
+                    table_path = row['table_path'].decode('utf-8')
+                    self._table_type_ids.setdefault(table_path, []).append(int(row['class_id']))
+
+            self._hw_interface_status = self.HW_STAT_OK
+            return True
+        except Exception as e:
+            self._hw_interface_status = self.HW_STAT_ERROR
+            self._hw_error_str = u'Could not open replay file {}: {}'.format(file_path, e)
+            print2err(self._hw_error_str)
+            printExceptionDetailsToStdErr()
+            self._closeFile()
+            return False
+
+    def _closeFile(self):
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None
+
+    def _iterTableEvents(self, table, type_ids, chunk_size=4096):
+        """Yields the events of one table, as lists in the form used by the
+        ioHub Process, reading chunk_size rows at a time."""
+        text_fields = [i for i, name in enumerate(table.dtype.names)
+                       if table.dtype[name].kind == 'S']
+        for start in range(0, table.nrows, chunk_size):
+            rows = table.read(start, start + chunk_size)
+            keep = np.isin(rows['type'], type_ids)
+            if self._session_id is not None:
+                keep &= rows['session_id'] == self._session_id
+            for row in rows[keep].tolist():
+                row = list(row)
+                for i in text_fields:
+                    row[i] = row[i].decode('utf-8')
+                yield row
+
+    def _iterEvents(self):
+        """Yields the events of all the replayed tables in time order."""
+        if self._file is None:
+            return iter(())
+        tie_break = count()
+        streams = []
+        for table_path, type_ids in self._table_type_ids.items():
+            table = self._file.get_node(table_path)
+            streams.append(((e[DeviceEvent.EVENT_HUB_TIME_INDEX], next(tie_break), e)
+                            for e in self._iterTableEvents(table, type_ids)))
+        return (e for t, n, e in heapq.merge(*streams))
+
+    def _anchor(self, replay_time):
+        """Sets the replay time at which the next event should be reported."""
+        self._replay_start = replay_time
+        if self._next_event is not None:
+            self._source_start = self._next_event[DeviceEvent.EVENT_HUB_TIME_INDEX]
+
+    def restart(self):
+        """
+        Start replaying the events of the file again from the first event.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self._events = self._iterEvents()
+        self._next_event = next(self._events, None)
+        self._replayed_count = 0
+        self._anchor(getTime())
+
+    def setSpeed(self, speed):
+        """
+        Set the playback speed. 1.0 replays events with the timing they were
+        recorded with, larger values replay them faster and 0.0 replays them
+        as fast as possible.
+
+        Args:
+            speed (float): The new playback speed.
+
+        Returns:
+            float: The playback speed.
+        """
+        if speed < 0:
+            raise ValueError('Replay speed must be >= 0, got {}.'.format(speed))
+        now = getTime()
+        if self._speed > 0 and self._next_event is not None:
+            # continue from the current position in the recording
+            self._source_start = min(self._source_start + (now - self._replay_start) * self._speed,
+                                     self._next_event[DeviceEvent.EVENT_HUB_TIME_INDEX])
+            self._replay_start = now
+        else:
+            self._anchor(now)
+        self._speed = float(speed)
+        return self._speed
+
+    def getReplayStatus(self):
+        """
+        Returns information about the state of the playback.
+
+        Args:
+            None
+
+        Returns:
+            dict: with keys 'file', 'session_id', 'speed', 'loop',
+            'replayed_count' (the number of events reported since the last
+            restart), 'next_event_time' (the recorded time of the next event,
+            or None) and 'finished'.
+        """
+        next_time = None
+        if self._next_event is not None:
+            next_time = self._next_event[DeviceEvent.EVENT_HUB_TIME_INDEX]
+        return dict(file=self._configuration.get('file'),
+                    session_id=self._session_id,
+                    speed=self._speed,
+                    loop=self._loop,
+                    replayed_count=self._replayed_count,
+                    next_event_time=next_time,
+                    finished=self._next_event is None)
+
+    def enableEventReporting(self, enabled=True):
+        was_reporting = self.isReportingEvents()
+        enabled = Device.enableEventReporting(self, enabled)
+        if enabled and not was_reporting:
+            self._anchor(getTime())
+        return enabled
+
+    def _poll(self):
+        if not self.isReportingEvents() or self._next_event is None:
+            return False
+
+        now = getTime()
+        speed = self._speed
+        if speed > 0:
+            due_time = self._source_start + (now - self._replay_start) * speed
+        else:
+            due_time = np.inf
+
+        hub_time_index = DeviceEvent.EVENT_HUB_TIME_INDEX
+        device_time_index = DeviceEvent.EVENT_DEVICE_TIME_INDEX
+        event = self._next_event
+        added = 0
+        replay_time = now
+        while event is not None and added < self.event_buffer_length:
+            source_time = event[hub_time_index]
+            if source_time > due_time:
+                break
+            if speed > 0:
+                replay_time = self._replay_start + (source_time - self._source_start) / speed
+            offset = replay_time - source_time
+            event[DeviceEvent.EVENT_ID_INDEX] = Device._getNextEventID()
+            event[device_time_index] += offset
+            event[hub_time_index] = replay_time
+            event[DeviceEvent.EVENT_LOGGED_TIME_INDEX] = now
+            event[DeviceEvent.EVENT_DELAY_INDEX] = now - replay_time
+            event[DeviceEvent.EVENT_FILTER_ID_INDEX] = 0
+            self._addNativeEventToBuffer(event)
+            added += 1
+
+            event = next(self._events, None)
+            if event is None and self._loop:
+                self._events = self._iterEvents()
+                event = next(self._events, None)
+                self._next_event = event
+                # the next loop follows on from the last event replayed
+                self._anchor(replay_time)
+                if speed > 0:
+                    due_time = self._source_start + (now - self._replay_start) * speed
+
+        self._next_event = event
+        self._replayed_count += added
+        self._last_poll_time = now
+        return added > 0
+
+    def _close(self):
+        self._closeFile()
+        Device._close(self)
@@ -2,7 +2,9 @@
 # Part of the PsychoPy library
 # Copyright (C) 2012-2020 iSolver Software Solutions (C) 2021 Open Science Tools Ltd.
 # Distributed under the terms of the GNU General Public License (GPL).
+import os
 import struct
+import tempfile
 from weakref import proxy
 
 from gevent import sleep, Greenlet
@@ -24,6 +26,78 @@ if Computer.platform == 'win32':
 else:
     MAX_PACKET_SIZE = 16 * 1024
 
+# Each frame sent by the tcp and uds transports is a 4 byte (network order)
+# payload length followed by the msgpack encoded [request_id, data] payload.
+FRAME_HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+
+def getFramedAddress(config):
+    """
+    Returns the address the ioHub Server listens for length prefixed
+    (framed) requests on, given the ioHub config settings; a
+    (host, port) tuple for the 'tcp' ipc_transport, a file path for 'uds',
+    or None if only the udp transport is used.
+
+    The uds transport is only available on platforms with Unix domain
+    sockets; elsewhere tcp is used instead.
+    """
+    import socket
+    transport = config.get('ipc_transport', 'udp')
+    if transport == 'uds' and not hasattr(socket, 'AF_UNIX'):
+        transport = 'tcp'
+    if transport == 'tcp':
+        return '127.0.0.1', int(config.get('tcp_port', 9037))
+    if transport == 'uds':
+        path = config.get('uds_path')
+        if path in (None, '', 'None'):
+            path = os.path.join(tempfile.gettempdir(),
+                                'iohub_{}.sock'.format(config.get('udp_port', 9000)))
+        return path
+    if transport != 'udp':
+        raise ValueError("Unknown ipc_transport '{}', expected 'udp', 'tcp' or "
+                         "'uds'.".format(transport))
+    return None
+
+
+class FrameReader():
+    """Splits the bytes received on a stream socket into the
+    [request_id, data] payloads of the length prefixed frames they hold.
+    Received bytes are fed as they arrive; a frame can be split across
+    any number of reads, and one read can hold many frames."""
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        self._buffer += data
+
+    def frames(self):
+        """Returns a list of the payloads of the complete frames received
+        since the last call, unpacked."""
+        buffer = self._buffer
+        header_size = FRAME_HEADER.size
+        unpackb = msgpack.unpackb
+        frames = []
+        offset = 0
+        while len(buffer) - offset >= header_size:
+            size, = FRAME_HEADER.unpack_from(buffer, offset)
+            if size > MAX_FRAME_SIZE:
+                raise ValueError('Frame of {} bytes exceeds MAX_FRAME_SIZE.'.format(size))
+            end = offset + header_size + size
+            if len(buffer) < end:
+                break
+            frames.append(unpackb(buffer[offset + header_size:end], use_list=True))
+            offset = end
+        if offset:
+            del buffer[:offset]
+        return frames
+
+
+def packFrame(pack, request_id, data):
+    """Returns the bytes of the frame for request_id holding data."""
+    payload = pack([request_id, data])
+    return FRAME_HEADER.pack(len(payload)) + payload
+
 class SocketConnection(): # pylint: disable=too-many-instance-attributes
     def __init__(
             self,
@@ -132,6 +206,91 @@ class UDPClientConnection(SocketConnection):
         self.sock.settimeout(timeout)
         self.sock.setblocking(blocking)
 
+
+class FramedClientConnection():
+    """
+    Connection to the ioHub Server's tcp or uds transport. Each request is
+    sent as a length prefixed msgpack frame tagged with a request id, so
+    requests of any size are sent without the multi packet handling needed
+    by UDP, and several requests can be sent before their responses are
+    read (pipelining). The server replies to the requests of a connection
+    in the order they were sent.
+
+    At most max_pending requests are outstanding at a time; sending
+    another reads (and keeps) responses until one has arrived, so a client
+    that sends requests faster than the server handles them is slowed down
+    rather than filling the socket buffers.
+
+    sendTo() and receive() work as they do for the UDPClientConnection, so
+    either can be used by the ioHubConnection.
+    """
+    def __init__(self, address, timeout=None, max_pending=32,
+                 rcvBufferLength=MAX_PACKET_SIZE):
+        if Computer.is_iohub_process is True:
+            from gevent import socket
+        else:
+            import socket
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            address = tuple(address)
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+        self.address = address
+        self.max_pending = max_pending
+        self._rcvBufferLength = rcvBufferLength
+        self._reader = FrameReader()
+        self._next_request_id = 1
+        self._last_request_id = None
+        self._pending = set()
+        self._responses = dict()
+
+        self.packer = msgpack.Packer()
+        self.pack = self.packer.pack
+
+    def sendRequest(self, data):
+        """Sends a request without waiting for its response, returning the
+        request id to pass to getResponse()."""
+        while len(self._pending) >= self.max_pending:
+            self._receiveFrames()
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        self.sock.sendall(packFrame(self.pack, request_id, data))
+        self._pending.add(request_id)
+        return request_id
+
+    def getResponse(self, request_id):
+        """Returns the response to request_id, waiting for it if it hasn't
+        been received yet."""
+        while request_id not in self._responses:
+            if request_id not in self._pending:
+                raise KeyError('No request {} is waiting for a response.'.format(request_id))
+            self._receiveFrames()
+        return self._responses.pop(request_id)
+
+    def request(self, data):
+        return self.getResponse(self.sendRequest(data))
+
+    def _receiveFrames(self):
+        data = self.sock.recv(self._rcvBufferLength)
+        if not data:
+            raise ConnectionError('ioHub Server closed the connection.')
+        self._reader.feed(data)
+        for request_id, response in self._reader.frames():
+            self._pending.discard(request_id)
+            self._responses[request_id] = response
+
+    def sendTo(self, data, address=None):
+        self._last_request_id = self.sendRequest(data)
+
+    def receive(self):
+        return self.getResponse(self._last_request_id), self.address
+
+    def close(self):
+        self.sock.close()
+
 ##### TIME SYNC CLASS ######
 
 
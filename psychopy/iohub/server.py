@@ -7,11 +7,12 @@ import os
 import sys
 import inspect
 from operator import itemgetter
+from time import perf_counter
 from collections import deque, OrderedDict
 
 import msgpack
 import gevent
-from gevent.server import DatagramServer
+from gevent.server import DatagramServer, StreamServer
 from gevent import Greenlet
 
 import numpy
@@ -24,7 +25,7 @@ except ImportError:
 
 from . import IOHUB_DIRECTORY, EXP_SCRIPT_DIRECTORY, _DATA_STORE_AVAILABLE
 from .errors import print2err, printExceptionDetailsToStdErr, ioHubError
-from .net import MAX_PACKET_SIZE
+from .net import MAX_PACKET_SIZE, FrameReader, packFrame, getFramedAddress
 from .util import convertCamelToSnake, win32MessagePump
 from .util import yload, yLoader
 from .constants import DeviceConstants, EventConstants
@@ -87,6 +88,11 @@ class udpServer(DatagramServer):
         else:
             self.multipacket_reads = 0
 
+        return self.handleRequest(request, replyTo)
+
+    def handleRequest(self, request, replyTo):
+        """Handles one request, received by this server or the
+        framedServer, sending the response to replyTo."""
         request_type = request.pop(0)
         if not isinstance(request_type, str):
             request_type = str(request_type, 'utf-8') # convert bytes to string for compatibility
@@ -100,7 +106,7 @@ class udpServer(DatagramServer):
             payload = request.pop(0)
             ctime = getTime()
             self.sendResponse(['PING_BACK', ctime, msg_id,
-                               payload, replyTo], replyTo)
+                               payload, getattr(replyTo, 'address', replyTo)], replyTo)
             return True
         elif request_type == 'GET_EVENTS':
             return self.handleGetEvents(replyTo)
@@ -365,6 +371,8 @@ class udpServer(DatagramServer):
             return False
 
     def sendResponse(self, data, address):
+        if isinstance(address, FramedReply):
+            return address.send(data)
         reply_data_sz = -1
         max_pkt_sz = int(MAX_PACKET_SIZE / 2 - 20)
         pkt_cnt = -1
@@ -488,6 +496,12 @@ class udpServer(DatagramServer):
             return dsfile.extendConditionVariableTable(exp_id, sess_id, data)
         return False
 
+    def extendConditionVariableColumns(self, exp_id, sess_id, columns):
+        dsfile = self.iohub.dsfile
+        if dsfile:
+            return dsfile.extendConditionVariableColumns(exp_id, sess_id, columns)
+        return False
+
     def clearEventBuffer(self, clear_device_level_buffers=False):
         """
 
@@ -541,6 +555,15 @@ class udpServer(DatagramServer):
     def setProcessAffinity(processorList):
         return Computer.setCurrentProcessAffinity(processorList)
 
+    def getDeviceMetrics(self, reset=False):
+        """Returns the event rate, poll and processing durations (in msec)
+        and event buffer use of each device, keyed by device name.
+
+        :param reset: If True, start collecting the statistics again.
+        :return: dict
+        """
+        return self.iohub.getDeviceMetrics(reset)
+
     def flushIODataStoreFile(self):
         dsfile = self.iohub.dsfile
         if dsfile:
@@ -553,6 +576,8 @@ class udpServer(DatagramServer):
             self.setPriority('normal')
             self.iohub.shutdown()
             self._running = False
+            if getattr(self.iohub, 'framedService', None):
+                self.iohub.framedService.stop()
             self.stop()
         except Exception:
             print2err('Error in ioSever.shutdown():')
@@ -560,21 +585,181 @@ class udpServer(DatagramServer):
             sys.exit(1)
 
 
+class FramedReply():
+    """The replyTo of a request received by the framedServer; the response
+    is sent as a frame tagged with the request's id on the connection the
+    request arrived on."""
+    __slots__ = ['sock', 'address', 'request_id', 'pack']
+
+    def __init__(self, sock, address, request_id, pack):
+        self.sock = sock
+        self.address = address
+        self.request_id = request_id
+        self.pack = pack
+
+    def send(self, data):
+        try:
+            frame = packFrame(self.pack, self.request_id, data)
+        except Exception:
+            print2err('Error trying to pack data for experiment process:')
+            printExceptionDetailsToStdErr()
+            frame = packFrame(self.pack, self.request_id, 'IOHUB_SERVER_RESPONSE_ERROR')
+        try:
+            self.sock.sendall(frame)
+        except Exception:
+            # the connection can't be used after a partial send, so close it;
+            # the framedServer handler then stops reading its requests
+            print2err('Error trying to send data to experiment process:')
+            printExceptionDetailsToStdErr()
+            self.sock.close()
+
+
+class framedServer(StreamServer):
+    """Receives requests sent as length prefixed msgpack frames over a
+    localhost tcp connection or a Unix domain socket (the 'tcp' and 'uds'
+    ipc_transport settings), and has them handled by the udpServer.
+
+    The requests of a connection are handled in the order they arrive. A
+    response is written before the next request is read, so a client that
+    sends requests faster than they are handled is held back by the socket
+    buffers filling, rather than requests queuing in the ioHub Process."""
+    def __init__(self, udp_service, address):
+        self.udpService = udp_service
+        self.pack = udp_service.pack
+        if isinstance(address, str):
+            from gevent import socket
+            if os.path.exists(address):
+                os.remove(address)
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            listener.bind(address)
+            listener.listen(16)
+            self.uds_path = address
+        else:
+            listener = address
+            self.uds_path = None
+        StreamServer.__init__(self, listener)
+
+    def handle(self, sock, address):
+        from gevent import socket
+        if sock.family != getattr(socket, 'AF_UNIX', None):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = FrameReader()
+        handleRequest = self.udpService.handleRequest
+        try:
+            while self.udpService._running:
+                data = sock.recv(MAX_PACKET_SIZE)
+                if not data:
+                    break
+                reader.feed(data)
+                for request_id, request in reader.frames():
+                    handleRequest(request, FramedReply(sock, address, request_id, self.pack))
+        except (ConnectionError, OSError):
+            pass
+        except Exception:
+            print2err('Error handling framed request:')
+            printExceptionDetailsToStdErr()
+        finally:
+            sock.close()
+
+    def stop(self, timeout=None):
+        StreamServer.stop(self, timeout)
+        if self.uds_path and os.path.exists(self.uds_path):
+            os.remove(self.uds_path)
+
+
+class DeviceStatistics():
+    """Event counts, timing and buffer use of a device, collected by the
+    ioHub Server and returned by getDeviceMetrics()."""
+    def __init__(self, device, sample_count=1000):
+        self.device = device
+        self.poll_interval = None
+        self.poll_durations = deque(maxlen=sample_count)
+        self.process_durations = deque(maxlen=sample_count)
+        self.reset()
+
+    def reset(self):
+        self.start_time = perf_counter()
+        self.event_count = 0
+        self.poll_count = 0
+        self.idle_poll_count = 0
+        self.buffer_full_count = 0
+        self.buffer_high_water = 0
+        self.poll_durations.clear()
+        self.process_durations.clear()
+
+    def updateBufferLength(self, length):
+        if length > self.buffer_high_water:
+            self.buffer_high_water = length
+        if length == self.device._native_event_buffer.maxlen:
+            # older events may have been dropped from the buffer
+            self.buffer_full_count += 1
+
+    @staticmethod
+    def _percentiles(durations):
+        if not durations:
+            return None
+        values = numpy.percentile(numpy.asarray(durations) * 1000.0, [50, 95, 99, 100])
+        return dict(zip(('p50', 'p95', 'p99', 'max'), [float(v) for v in values]))
+
+    def getMetrics(self):
+        """Returns the statistics as a dict, with durations in msec."""
+        duration = perf_counter() - self.start_time
+        return dict(device_class=self.device.__class__.__name__,
+                    event_count=self.event_count,
+                    events_per_sec=self.event_count / duration if duration > 0 else 0.0,
+                    poll_count=self.poll_count,
+                    idle_poll_count=self.idle_poll_count,
+                    poll_interval=self.poll_interval,
+                    poll_duration=self._percentiles(self.poll_durations),
+                    process_duration=self._percentiles(self.process_durations),
+                    buffer_length=self.device._native_event_buffer.maxlen,
+                    buffer_high_water=self.buffer_high_water,
+                    buffer_full_count=self.buffer_full_count,
+                    period=duration)
+
+
 class DeviceMonitor(Greenlet):
-    def __init__(self, device, sleep_interval):
+    """Calls the _poll() method of a device every sleep_interval seconds.
+
+    If max_sleep_interval is larger than sleep_interval, the time between
+    polls is doubled after each poll that adds no events to the device's
+    event buffer (up to max_sleep_interval), and goes back to sleep_interval
+    as soon as a poll finds new events.
+    """
+    def __init__(self, device, sleep_interval, max_sleep_interval=None, statistics=None):
         Greenlet.__init__(self)
         self.device = device
         self.sleep_interval = sleep_interval
+        self.max_sleep_interval = max(sleep_interval, max_sleep_interval or sleep_interval)
+        self.current_interval = sleep_interval
+        self.statistics = statistics or DeviceStatistics(device)
         self.running = False
 
     def _run(self):
         self.running = True
-        ctime = Computer.getTime
+        stats = self.statistics
+        poll = self.device._poll
+        buffer = self.device._native_event_buffer
+        buffer_length = buffer.maxlen
         while self.running is True:
-            stime = ctime()
-            self.device._poll()
-            i = self.sleep_interval - (ctime() - stime)
-            gevent.sleep(max(0,i))
+            count_before = len(buffer)
+            stime = perf_counter()
+            poll()
+            etime = perf_counter()
+            count_after = len(buffer)
+
+            stats.poll_count += 1
+            stats.poll_durations.append(etime - stime)
+            if count_after > count_before or count_after == buffer_length:
+                stats.updateBufferLength(count_after)
+                self.current_interval = self.sleep_interval
+            else:
+                stats.idle_poll_count += 1
+                if self.current_interval < self.max_sleep_interval:
+                    self.current_interval = min(self.current_interval * 2,
+                                                self.max_sleep_interval)
+            stats.poll_interval = self.current_interval
+            gevent.sleep(max(0, self.current_interval - (etime - stime)))
 
     def __del__(self):
         self.device = None
@@ -598,6 +783,7 @@ class ioServer():
         self.config = config
         self.devices = []
         self.deviceMonitors = []
+        self.deviceStatistics = dict()
         self.custom_tasks = OrderedDict()
         self.sessionInfoDict = None
         self.experimentInfoList = None
@@ -612,6 +798,11 @@ class ioServer():
         self._running = True
         # start UDP service
         self.udpService = udpServer(self, ':%d' % config.get('udp_port', 9000))
+        # requests can also be sent over tcp or a Unix domain socket
+        self.framedService = None
+        framed_address = getFramedAddress(config)
+        if framed_address:
+            self.framedService = framedServer(self.udpService, framed_address)
         self._initDataStore(config, rootScriptPathDir)
 
         self._addDevices(config)
@@ -818,12 +1009,14 @@ class ioServer():
                     msgpump_interval = self.config.get('msgpump_interval', 0.001)
                     if dev_cls_name == 'Mouse':
                         dmouse = deviceDict['Mouse']
-                        self.deviceMonitors.append(DeviceMonitor(dmouse, msgpump_interval))
+                        self.deviceMonitors.append(DeviceMonitor(dmouse, msgpump_interval,
+                                                                 statistics=self.getDeviceStatistics(dmouse)))
                         dmouse._CGEventTapEnable(dmouse._tap, True)
                         self._hookDevice.append('Mouse')
                     if dev_cls_name == 'Keyboard':
                         dkeyboard = deviceDict['Keyboard']
-                        kbHookMonitor = DeviceMonitor(dkeyboard, 0.001)
+                        kbHookMonitor = DeviceMonitor(dkeyboard, 0.001,
+                                                      statistics=self.getDeviceStatistics(dkeyboard))
                         self.deviceMonitors.append(kbHookMonitor)
                         dkeyboard._CGEventTapEnable(dkeyboard._tap, True)
                         self._hookDevice.append('Keyboard')
@@ -918,9 +1111,12 @@ class ioServer():
 
             if 'device_timer' in dev_conf:
                 interval = dev_conf['device_timer'].get('interval', 0.001)
-                dPoller = DeviceMonitor(dev_instance, interval)
+                max_interval = dev_conf['device_timer'].get('max_interval', interval)
+                dPoller = DeviceMonitor(dev_instance, interval, max_interval,
+                                        self.getDeviceStatistics(dev_instance))
                 self.deviceMonitors.append(dPoller)
-                ltxt = '%s timer period: %.3f' % (dev_cls_name, interval)
+                ltxt = '%s timer period: %.3f - %.3f' % (dev_cls_name, interval,
+                                                         dPoller.max_sleep_interval)
                 self.log(ltxt)
 
             monitor_evt_ids = []
@@ -981,11 +1177,36 @@ class ioServer():
             dur = sleep_interval - (Computer.getTime() - stime)
             gevent.sleep(max(0, dur))
 
+    def getDeviceStatistics(self, device):
+        stats = self.deviceStatistics.get(device)
+        if stats is None:
+            stats = self.deviceStatistics[device] = DeviceStatistics(device)
+        return stats
+
+    def getDeviceMetrics(self, reset=False):
+        """Returns a dict with the event rate, poll and processing durations
+        and event buffer use of each device, keyed by device name."""
+        metrics = dict()
+        for device in self.devices:
+            stats = self.getDeviceStatistics(device)
+            metrics[device.name] = stats.getMetrics()
+            if reset:
+                stats.reset()
+        return metrics
+
     def processDeviceEvents(self):
         for device in self.devices:
             evt = []
             try:
                 events = device._getNativeEventBuffer()
+                if not events and not device._filters:
+                    continue
+
+                stats = self.deviceStatistics.get(device) or self.getDeviceStatistics(device)
+                stime = perf_counter()
+                event_count = len(events)
+                if event_count:
+                    stats.updateBufferLength(event_count)
                 while events:
                     evt = device._getIOHubEventObject(events.popleft())
                     if evt:
@@ -1000,6 +1221,8 @@ class ioServer():
                     etype = evt[DeviceEvent.EVENT_TYPE_ID_INDEX]
                     for l in device._getEventListeners(etype):
                         l._handleEvent(evt)
+                stats.event_count += event_count
+                stats.process_durations.append(perf_counter() - stime)
 
             except Exception:
                 print2err('Error in processDeviceEvents: ', device,
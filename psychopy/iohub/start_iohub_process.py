@@ -54,6 +54,9 @@ def run(rootScriptPathDir, configFilePath):
         udp_port = s.config.get('udp_port', 9000)
         s.log("Receiving diagram's on: {}".format(udp_port))
         s.udpService.start()
+        if s.framedService:
+            s.log("Receiving framed requests on: {}".format(s.framedService.address))
+            s.framedService.start()
         s.setStatus("INITIALIZING")
         msgpump_interval = s.config.get('msgpump_interval', 0.001)
         glets = []
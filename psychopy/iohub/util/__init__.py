@@ -591,12 +591,212 @@ def complement(r, g, b):
     return tuple(k - u for u in (r, g, b))
 
 
-class NumPyRingBuffer():
-    """NumPyRingBuffer is a circular buffer implemented using a one dimensional
-    numpy array on the backend. The algorithm used to implement the ring buffer
-    behavior does not require any array copies to occur while the ring buffer
-    is maintained, while at the same time allowing sequential element access
-    into the numpy array using a subset of standard slice notation.
+class RingBuffer():
+    """RingBuffer is a fixed size circular buffer of elements stored in a
+    numpy array. The elements can have any numpy dtype, including structured
+    dtypes (for example an event class NUMPY_DTYPE, with one field per event
+    attribute) and object (for example for events in list form).
+
+    Each element is stored twice, in an array of 2 * max_size elements, so
+    that the elements in the buffer can always be accessed as one contiguous
+    view of the array, oldest element first, without copying them.
+
+    Elements are added with append(), or many at a time (for example an
+    array of samples) with extend(). When the buffer is full, each element
+    added removes the oldest element from the buffer.
+
+    Elements are removed with popElements(), which returns a copy of the
+    oldest elements in the buffer, or popleft().
+
+    One producer (calling append() and extend()) and one consumer (calling
+    popElements(), popleft() and clear()) can use the buffer from different
+    threads or greenlets without locking. The producer only changes the
+    count of elements written and the consumer only the count of elements
+    read. Any elements that were overwritten by the producer while the
+    consumer was copying them are left out of the elements returned by
+    popElements().
+
+    Example::
+
+        samples = RingBuffer(1024, dtype=[('time', 'f8'), ('gaze_x', 'f4')])
+        samples.append((0.001, 10.0))
+        samples.extend(sample_array)
+        for sample in samples.popElements():
+            print(sample['time'], sample['gaze_x'])
+
+    """
+
+    def __init__(self, max_size, dtype=numpy.float64):
+        self.max_size = int(max_size)
+        self._npa = numpy.empty(self.max_size * 2, dtype=dtype)
+        self._structured = self._npa.dtype.names is not None
+        # only changed by the producer; _writing is set before elements
+        # are stored, and _written once they have been
+        self._writing = 0
+        self._written = 0
+        # only changed by the consumer
+        self._read = 0
+
+    @property
+    def dtype(self):
+        return self._npa.dtype
+
+    @property
+    def maxlen(self):
+        """The maximum number of elements, as for a collections.deque."""
+        return self.max_size
+
+    def append(self, element):
+        """Add element to the end of the RingBuffer. For a structured dtype,
+        element can be a tuple or list of field values.
+
+        :param element: The element to add.
+        :returns None:
+
+        """
+        n = self.max_size
+        if n:
+            if self._structured and isinstance(element, list):
+                element = tuple(element)
+            written = self._written
+            self._writing = written + 1
+            i = written % n
+            npa = self._npa
+            npa[i] = element
+            npa[i + n] = element
+            self._written = written + 1
+
+    def _asElementArray(self, elements):
+        dtype = self._npa.dtype
+        if isinstance(elements, numpy.ndarray) and elements.dtype == dtype:
+            return elements
+        if dtype == object:
+            element_array = numpy.empty(len(elements), dtype=object)
+            for i, element in enumerate(elements):
+                element_array[i] = element
+            return element_array
+        if self._structured:
+            elements = [e if isinstance(e, tuple) else tuple(e) for e in elements]
+        return numpy.asarray(elements, dtype=dtype)
+
+    def extend(self, elements):
+        """Add each of elements to the end of the RingBuffer, oldest first.
+
+        :param elements: An array (or sequence) of elements.
+        :returns None:
+
+        """
+        n = self.max_size
+        elements = self._asElementArray(elements)
+        count = len(elements)
+        if count == 0 or n == 0:
+            return
+        if count > n:
+            # only the last n elements will still be in the buffer
+            elements = elements[-n:]
+        written = self._written
+        self._writing = written + count
+        start = (written + count - len(elements)) % n
+        first = min(len(elements), n - start)
+        npa = self._npa
+        npa[start:start + first] = elements[:first]
+        npa[start + n:start + n + first] = elements[:first]
+        rest = len(elements) - first
+        if rest:
+            npa[:rest] = elements[first:]
+            npa[n:n + rest] = elements[first:]
+        self._written = written + count
+
+    def _getRange(self):
+        written = self._written
+        return max(self._read, written - self.max_size), written
+
+    def getElements(self):
+        """Return the elements in the RingBuffer, oldest first, as a view of
+        the array used by the RingBuffer. The view is only valid until more
+        elements are added to the buffer; use popElements() to get a copy.
+
+        :param None:
+        :returns numpy.array: The elements in the RingBuffer.
+
+        """
+        start, end = self._getRange()
+        i = start % self.max_size if self.max_size else 0
+        return self._npa[i:i + end - start]
+
+    def popElements(self, count=None):
+        """Remove the oldest count elements (or all the elements) from the
+        RingBuffer and return a copy of them, oldest first.
+
+        :param int count: The maximum number of elements to remove.
+        :returns numpy.array: The elements removed.
+
+        """
+        start, end = self._getRange()
+        if count is not None:
+            end = min(end, start + count)
+        if end == start:
+            return self._npa[:0].copy()
+        i = start % self.max_size
+        elements = self._npa[i:i + end - start].copy()
+        # elements being overwritten when the copy was made
+        overwritten = self._writing - self.max_size - start
+        if overwritten > 0:
+            elements = elements[overwritten:]
+        self._read = end
+        return elements
+
+    def popleft(self):
+        """Remove and return the oldest element in the RingBuffer.
+
+        :param None:
+        :returns: The oldest element.
+
+        """
+        while True:
+            start, end = self._getRange()
+            if end == start:
+                raise IndexError('pop from an empty RingBuffer')
+            element = self._npa[start % self.max_size]
+            if self._structured:
+                element = element.copy()
+            if self._writing - self.max_size <= start:
+                # not overwritten while it was being read
+                break
+        self._read = start + 1
+        return element
+
+    def isFull(self):
+        """Indicates if the RingBuffer holds max_size elements.
+
+        :param None:
+        :returns bool: True if the RingBuffer is full; False otherwise.
+
+        """
+        return len(self) >= self.max_size
+
+    def clear(self):
+        """Clears the RingBuffer. The next time an element is added to the
+        buffer, it will have a size of one.
+
+        :param None:
+        :returns None:
+
+        """
+        self._read = self._written
+
+    def __iter__(self):
+        return iter(self.getElements())
+
+    def __len__(self):
+        start, end = self._getRange()
+        return end - start
+
+
+class NumPyRingBuffer(RingBuffer):
+    """NumPyRingBuffer is a RingBuffer, by default of float32 values, which
+    can also be used like a numpy array of the elements in the buffer, using
+    a subset of standard slice notation.
 
     When the circular buffer is created, a maximum size , or maximum
     number of elements,  that the buffer can hold *must* be specified. When
@@ -644,122 +844,20 @@ class NumPyRingBuffer():
     """
 
     def __init__(self, max_size, dtype=numpy.float32):
-        self._dtype = dtype
-        self._npa = numpy.empty(max_size * 2, dtype=dtype)
-        self.max_size = max_size
-        self._index = 0
-
-    def append(self, element):
-        """Add element e to the end of the RingBuffer. The element must match
-        the numpy data type specified when the NumPyRingBuffer was created. By
-        default, the RingBuffer uses float32 values.
-
-        If the Ring Buffer is full, adding the element to the end of the array
-        removes the currently oldest element from the start of the array.
-
-        :param numpy.dtype element: An element to add to the RingBuffer.
-        :returns None:
-
-        """
-        i = self._index
-        self._npa[i % self.max_size] = element
-        self._npa[(i % self.max_size) + self.max_size] = element
-        self._index += 1
-
-    def getElements(self):
-        """Return the numpy array being used by the RingBuffer, the length of
-        which will be equal to the number of elements added to the list, or the
-        last max_size elements added to the list. Elements are in order of
-        addition to the ring buffer.
-
-        :param None:
-        :returns numpy.array: The array of data elements that make up the Ring Buffer.
-
-        """
-        return self._npa[
-            self._index %
-            self.max_size:(
-                self._index %
-                self.max_size) + self.max_size]
-
-    def isFull(self):
-        """Indicates if the RingBuffer is at it's max_size yet.
-
-        :param None:
-        :returns bool: True if max_size or more elements have been added to the RingBuffer; False otherwise.
-
-        """
-        return self._index >= self.max_size
-
-    def clear(self):
-        """Clears the RingBuffer. The next time an element is added to the
-        buffer, it will have a size of one.
-
-        :param None:
-        :returns None:
-
-        """
-        self._index = 0
+        RingBuffer.__init__(self, max_size, dtype)
 
     def __setitem__(self, indexs, v):
-        if isinstance(indexs, (list, tuple)):
-            for i in indexs:
-                if isinstance(i, numbers.Integral):
-                    i = i + self._index
-                    self._npa[i % self.max_size] = v
-                    self._npa[(i % self.max_size) + self.max_size] = v
-                elif isinstance(i, slice):
-                    istart = indexs.start
-                    if istart is None:
-                        istart = 0
-                    istop = indexs.stop
-                    if indexs.stop is None:
-                        istop = 0
-                    start = istart + self._index
-                    stop = istop + self._index
-                    self._npa[
-                        slice(
-                            start %
-                            self.max_size,
-                            stop %
-                            self.max_size,
-                            i.step)] = v
-                    self._npa[
-                        slice(
-                            (start %
-                             self.max_size) + self.max_size, (stop %
-                                                              self.max_size) + self.max_size, i.step)] = v
-        elif isinstance(indexs, numbers.Integral):
-            i = indexs + self._index
-            self._npa[i % self.max_size] = v
-            self._npa[(i % self.max_size) + self.max_size] = v
-        elif isinstance(indexs, slice):
-            istart = indexs.start
-            if istart is None:
-                istart = 0
-            istop = indexs.stop
-            if indexs.stop is None:
-                istop = 0
-            start = istart + self._index
-            stop = istop + self._index
-            self._npa[
-                slice(
-                    start %
-                    self.max_size,
-                    stop %
-                    self.max_size,
-                    indexs.step)] = v
-            self._npa[
-                slice(
-                    (start %
-                     self.max_size) +
-                    self.max_size,
-                    (stop %
-                     self.max_size) +
-                    self.max_size,
-                    indexs.step)] = v
-        else:
+        if isinstance(indexs, tuple):
+            indexs = list(indexs)
+        if not isinstance(indexs, (numbers.Integral, slice, list)):
             raise TypeError()
+        start, end = self._getRange()
+        n = self.max_size
+        i = start % n
+        self._npa[i:i + end - start][indexs] = v
+        # keep the mirrored copy of the elements up to date
+        positions = numpy.arange(i, i + end - start)
+        self._npa[(positions + n) % (2 * n)] = self._npa[positions]
 
     def __getitem__(self, indexs):
         current_array = self.getElements()
@@ -770,26 +868,17 @@ class NumPyRingBuffer():
                     rarray.append(current_array[i])
                 elif isinstance(i, slice):
                     rarray.extend(current_array[i])
-            return numpy.asarray(rarray, dtype=self._dtype)
+            return numpy.asarray(rarray, dtype=self.dtype)
         elif isinstance(indexs, (int, slice)):
             return current_array[indexs]
         else:
             raise TypeError()
 
     def __getattr__(self, a):
-        if self._index < self.max_size:
-            return getattr(self._npa[:self._index], a)
-        return getattr(
-            self._npa[
-                self._index %
-                self.max_size:(
-                    self._index %
-                    self.max_size) + self.max_size], a)
+        if a.startswith('_'):
+            raise AttributeError(a)
+        return getattr(self.getElements(), a)
 
-    def __len__(self):
-        if self.isFull():
-            return self.max_size
-        return self._index
 
 ###############################################################################
 #
@@ -12,11 +12,17 @@ Assumptions:
    2) Eye is orthogonal to origin of 2D plane
 """
 
+import math
+
 import numpy as np
 arctan = np.arctan2
 rad2deg = np.rad2deg
 hypot = np.hypot
 
+RAD2DEG = 180.0 / math.pi
+DEG2RAD = math.pi / 180.0
+_scalar = (int, float)
+
 
 class VisualAngleCalc():
     def __init__(self, display_size_mm, display_res_pix, eye_distance_mm=None):
@@ -45,25 +51,76 @@ class VisualAngleCalc():
 
         The pix2deg method is vectorized, meaning that is will perform the
         pixel to angle calculations on all elements of the provided pixel
-        position numpy arrays in one numpy call.
+        position numpy arrays in one numpy call. If pixel_y is None, pixel_x
+        must be an N x 2 array of x, y pixel positions, and an N x 2 array of
+        x, y angles is returned. When pixel_x, pixel_y (and eye_distance_mm)
+        are scalars, the angles are calculated without numpy, which is
+        quicker for one sample at a time.
 
         The conversion process can use either a fixed eye to calibration
         plane distance, or a numpy array of eye distances passed as
         eye_distance_mm. In this case the eye distance array must be the same
         length as pixel_x, pixel_y arrays.
         """
+        if pixel_y is None:
+            pixels = np.asarray(pixel_x, dtype=np.float64)
+            Ah, Av = self.pix2deg(pixels[..., 0], pixels[..., 1], eye_distance_mm)
+            return np.stack((Ah, Av), axis=-1)
+
         eye_dist_mm = self._eye_distance_mm
         if eye_distance_mm is not None:
             eye_dist_mm = eye_distance_mm
 
-        x_mm = self.mmpp_x * pixel_x
-        y_mm = self.mmpp_y * pixel_y
+        if isinstance(pixel_x, _scalar) and isinstance(pixel_y, _scalar) and isinstance(eye_dist_mm, _scalar):
+            x_mm = self.mmpp_x * pixel_x
+            y_mm = self.mmpp_y * pixel_y
+            return (math.atan2(x_mm, math.hypot(eye_dist_mm, y_mm)) * RAD2DEG,
+                    math.atan2(y_mm, math.hypot(eye_dist_mm, x_mm)) * RAD2DEG)
+
+        x_mm = np.multiply(self.mmpp_x, pixel_x)
+        y_mm = np.multiply(self.mmpp_y, pixel_y)
 
         Ah = arctan(x_mm, hypot(eye_dist_mm, y_mm))
         Av = arctan(y_mm, hypot(eye_dist_mm, x_mm))
 
         return rad2deg(Ah), rad2deg(Av)
 
+    def deg2pix(self, degree_x, degree_y=None, eye_distance_mm=None):
+        """
+        The inverse of pix2deg; converts x and y visual angles (in degrees)
+        to pixel positions, with the origin (0,0) being at the **center** of
+        the display.
+
+        As with pix2deg, degree_x and degree_y can be scalars or numpy
+        arrays, or degree_y can be None and degree_x an N x 2 array of x, y
+        angles, in which case an N x 2 array of x, y pixel positions is
+        returned. eye_distance_mm can be a numpy array of eye distances for
+        each position.
+        """
+        if degree_y is None:
+            degrees = np.asarray(degree_x, dtype=np.float64)
+            x, y = self.deg2pix(degrees[..., 0], degrees[..., 1], eye_distance_mm)
+            return np.stack((x, y), axis=-1)
+
+        eye_dist_mm = self._eye_distance_mm
+        if eye_distance_mm is not None:
+            eye_dist_mm = eye_distance_mm
+
+        # with a = tan(Ah), b = tan(Av): x = a * sqrt(d^2 + y^2) and
+        # y = b * sqrt(d^2 + x^2), which are solved for x and y.
+        tan_h = np.tan(np.multiply(DEG2RAD, degree_x))
+        tan_v = np.tan(np.multiply(DEG2RAD, degree_y))
+        tan_h2 = tan_h * tan_h
+        tan_v2 = tan_v * tan_v
+        scale = np.multiply(eye_dist_mm, 1.0 / np.sqrt(1.0 - tan_h2 * tan_v2))
+        x_mm = tan_h * np.sqrt(1.0 + tan_v2) * scale
+        y_mm = tan_v * np.sqrt(1.0 + tan_h2) * scale
+        x_pix = x_mm / self.mmpp_x
+        y_pix = y_mm / self.mmpp_y
+        if np.ndim(x_pix) == 0:
+            return float(x_pix), float(y_pix)
+        return x_pix, y_pix
+
 ###############################################################################
 
 
@@ -301,6 +301,17 @@ class Vector:
         """
         return self.win.monitor
 
+    def _getScale(self, units, value):
+        """Pixels per unit for each dimension of `value`, from the window's
+        unit converter (so the monitor and window size are only looked up
+        when they change).
+        """
+        scale = tools.getUnitConverter(self.win).getScale(units)
+        if units == 'norm':
+            # only norm differs between x and y
+            return scale[:value.shape[-1]]
+        return scale[0]
+
     @property
     def dimensions(self):
         """How many dimensions (x, y, z) are specified?"""
@@ -404,7 +415,7 @@ class Vector:
         if 'deg' in self._cache:
             return self._cache['deg']
         # Otherwise, do conversion and cache
-        self._cache['deg'] = tools.pix2deg(self.pix, self.monitor)
+        self._cache['deg'] = self.pix / self._getScale('deg', self.pix)
         # Return new cached value
         return self._cache['deg']
 
@@ -413,7 +424,7 @@ class Vector:
         # Validate
         value, units = self.validate(value, 'deg')
         # Convert and set
-        self.pix = tools.deg2pix(value, self.monitor)
+        self.pix = value * self._getScale('deg', value)
 
     @property
     def degFlat(self):
@@ -452,7 +463,7 @@ class Vector:
         if 'cm' in self._cache:
             return self._cache['cm']
         # Otherwise, do conversion and cache
-        self._cache['cm'] = tools.pix2cm(self.pix, self.monitor)
+        self._cache['cm'] = self.pix / self._getScale('cm', self.pix)
         # Return new cached value
         return self._cache['cm']
 
@@ -461,7 +472,7 @@ class Vector:
         # Validate
         value, units = self.validate(value, 'cm')
         # Convert and set
-        self.pix = tools.cm2pix(value, self.monitor)
+        self.pix = value * self._getScale('cm', value)
 
     @property
     def pt(self):
@@ -493,15 +504,7 @@ class Vector:
         if 'norm' in self._cache:
             return self._cache['norm']
         # Otherwise, do conversion and cache
-        buffer = np.ndarray(self.pix.shape, dtype=float)
-        for i in range(self.dimensions):
-            u = self.win.useRetina + 1
-            if len(self) > 1:
-                buffer[:, i] = self.pix[:, i] / (self.win.size[i] / u) * 2
-            else:
-                buffer[i] = self.pix[i] / (self.win.size[i] / u) * 2
-
-        self._cache['norm'] = buffer
+        self._cache['norm'] = self.pix / self._getScale('norm', self.pix)
 
         return self._cache['norm']  # return new cached value
 
@@ -511,15 +514,7 @@ class Vector:
         value, units = self.validate(value, 'norm')
 
         # Convert and set
-        buffer = np.ndarray(value.shape, dtype=float)
-        for i in range(self.dimensions):
-            u = self.win.useRetina + 1
-            if len(self) > 1:
-                buffer[:, i] = value[:, i] * (self.win.size[i] / u) / 2
-            else:
-                buffer[i] = value[i] * (self.win.size[i] / u) / 2
-
-        self.pix = buffer
+        self.pix = value * self._getScale('norm', value)
 
     @property
     def height(self):
@@ -529,8 +524,7 @@ class Vector:
         if 'height' in self._cache:
             return self._cache['height']
         # Otherwise, do conversion and cache
-        self._cache['height'] = \
-            self.pix / (self.win.size[1] / (self.win.useRetina + 1))
+        self._cache['height'] = self.pix / self._getScale('height', self.pix)
         # Return new cached value
         return self._cache['height']
 
@@ -539,7 +533,7 @@ class Vector:
         # Validate
         value, units = self.validate(value, 'height')
         # Convert and set
-        self.pix = value * (self.win.size[1] / (self.win.useRetina + 1))
+        self.pix = value * self._getScale('height', value)
 
 
 class Position(Vector):
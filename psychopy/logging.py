@@ -29,15 +29,18 @@ messages, (which PsychoPy doesn't use) using the commands::
 """
 
 # Much of the code below is based conceptually, if not syntactically, on the
-# python logging module but it's simpler (no threading) and maintaining a
-# stack of log entries for later writing (don't want files written while
-# drawing)
+# python logging module but it's simpler and maintaining a stack of log entries
+# for later writing (don't want files written while drawing). Optionally, the
+# entries can be written by a background thread (see setBackgroundWriter)
 
 from os import path
 import atexit
 import sys
 import codecs
 import locale
+import struct
+import threading
+from collections import deque
 from pathlib import Path
 
 from psychopy import clock
@@ -126,16 +129,38 @@ def setDefaultClock(clock):
 
 
 class _LogEntry():
+    # many of these are created per frame, so use slots to keep them small and
+    # quick to create (levelname and t_ms are only worked out when formatted)
+    __slots__ = ('t', 'level', 'message', 'obj')
+    _fields = ('t', 't_ms', 'level', 'levelname', 'message', 'obj')
 
     def __init__(self, level, message, t=None, obj=None):
-        super(_LogEntry, self).__init__()
         self.t = t
-        self.t_ms = t * 1000
         self.level = level
-        self.levelname = getLevel(level)
         self.message = message
         self.obj = obj
 
+    @property
+    def t_ms(self):
+        return self.t * 1000
+
+    @property
+    def levelname(self):
+        return getLevel(self.level)
+
+    @property
+    def __dict__(self):
+        # entries used to have a __dict__, so keep `format(**entry.__dict__)`
+        # working
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __getitem__(self, key):
+        # allows entries to be used with str.format_map
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
 
 class LogFile():
     """A text stream to receive inputs from the logging system
@@ -231,6 +256,151 @@ class LogFile():
             pass
 
 
+class BinaryLogFile(LogFile):
+    """A log file which stores entries as fixed-width binary records rather
+    than text, so it's quicker to write and much quicker to read back (see
+    :mod:`psychopy.tools.logtools`).
+
+    Each record is the time (float64), level (int32) and the id (uint32) of
+    the message in a table of strings, so repeated messages are only stored
+    once. The file is a series of chunks, each a 1-byte tag (`S` for new
+    strings, `R` for records), the uint32 length of the chunk and then its
+    contents. Each time the file is opened a header is written, after which
+    string ids start again from 0.
+
+    Parameters
+    ----------
+    f : str, Path or file
+        Path of the file to write to, or a file object opened in binary mode.
+    level : int
+        The minimum level of importance that a message must have to be logged
+        by this target.
+    filemode : str
+        'a' to append to an existing file or 'w' to overwrite it.
+    logger : _Logger or None
+        Logger to receive entries from, default is the root logger.
+    maxInterned : int
+        Maximum number of messages to remember the ids of, after which they're
+        forgotten (and written again if they recur) to limit memory use.
+    """
+    # start of the file and of each section appended to it
+    magic = b"PSYLOGB1"
+    # time, level and message id of each entry
+    recordFormat = "<diI"
+    recordSize = struct.calcsize(recordFormat)
+    # level of text written directly with write(), which has no time or level
+    rawLevel = -1
+
+    def __init__(self, f, level=WARNING, filemode='a', logger=None,
+                 maxInterned=100000):
+        if isinstance(f, Path):
+            f = str(f)
+        if isinstance(f, str):
+            f = open(f, filemode + 'b')
+        self._strings = {}
+        self._nextId = 0
+        self.maxInterned = maxInterned
+        f.write(self.magic)
+        LogFile.__init__(self, f=f, level=level, logger=logger)
+
+    def _getStringIds(self, messages):
+        """Get the id of each message, along with a chunk defining any new
+        ones.
+        """
+        strings = self._strings
+        ids = []
+        newStrings = []
+        for message in messages:
+            if not isinstance(message, str):
+                message = str(message)
+            stringId = strings.get(message)
+            if stringId is None:
+                if len(strings) >= self.maxInterned:
+                    # forget old strings (ids carry on from where they were)
+                    strings.clear()
+                stringId = strings[message] = self._nextId
+                self._nextId += 1
+                newStrings.append(message.encode('utf-8'))
+            ids.append(stringId)
+        chunk = b""
+        if newStrings:
+            payload = [struct.pack("<I", len(newStrings))]
+            for encoded in newStrings:
+                payload.append(struct.pack("<I", len(encoded)))
+                payload.append(encoded)
+            payload = b"".join(payload)
+            chunk = b"S" + struct.pack("<I", len(payload)) + payload
+
+        return ids, chunk
+
+    def _writeRecords(self, times, levels, messages):
+        ids, chunk = self._getStringIds(messages)
+        flat = []
+        for record in zip(times, levels, ids):
+            flat.extend(record)
+        payload = struct.pack(
+            "<" + self.recordFormat[1:] * len(ids), *flat)
+        self.stream.write(
+            chunk + b"R" + struct.pack("<I", len(payload)) + payload)
+        self.stream.flush()
+
+    def writeEntries(self, entries):
+        """Write log entries (called by the logger when it's flushed).
+        """
+        self._writeRecords(
+            [float(entry.t) for entry in entries],
+            [entry.level for entry in entries],
+            [entry.message for entry in entries])
+
+    def write(self, txt):
+        """Write text directly to the log file (without using logging
+        functions), stored with level `rawLevel` and the current time.
+        """
+        lines = txt.splitlines()
+        self._writeRecords(
+            [float(defaultClock.getTime())] * len(lines),
+            [self.rawLevel] * len(lines), lines)
+
+
+class _LogWriter(threading.Thread):
+    """Thread which writes the entries of a logger to its targets, so that
+    calling `flush()` doesn't block the thread which is drawing.
+
+    Parameters
+    ----------
+    logger : _Logger
+        Logger whose entries to write.
+    interval : float or None
+        If given, also write entries every `interval` seconds, rather than only
+        when the logger is flushed.
+    """
+
+    def __init__(self, logger, interval=None):
+        threading.Thread.__init__(self, name="PsychoPyLogWriter", daemon=True)
+        self.logger = logger
+        self.interval = interval
+        self._wake = threading.Event()
+        self._running = True
+
+    def run(self):
+        while self._running:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.logger._writeEntries()
+
+    def wake(self):
+        """Write any pending entries as soon as possible.
+        """
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Stop the thread, once it's written any pending entries.
+        """
+        self._running = False
+        self._wake.set()
+        self.join(timeout)
+
+
 class _Logger():
     """Maintains a set of log targets (text streams such as files of stdout)
 
@@ -238,20 +408,28 @@ class _Logger():
 
     """
 
-    def __init__(self, format="{t:.4f} \t{levelname} \t{message}"):
+    def __init__(self, format="{t:.4f} \t{levelname} \t{message}",
+                 flushedSize=10000):
         """The string-formatted elements {xxxx} can be used, where
         each xxxx is an attribute of the LogEntry.
         e.g. t, t_ms, level, levelname, message
+
+        `flushedSize` is the number of entries kept in `self.flushed` after
+        they've been written (None to keep all of them).
         """
         super(_Logger, self).__init__()
         self.targets = []
-        self.flushed = []
-        self.toFlush = []
+        self.flushed = deque(maxlen=flushedSize)
+        # entries are appended by log() and popped when written, deque does
+        # both atomically so no lock is needed between threads
+        self.toFlush = deque()
         self.format = format
         self.lowestTarget = 50
+        self.writer = None
+        self._writeLock = threading.Lock()
 
     def __del__(self):
-        self.flush()
+        self._writeEntries()
         # unicode logged to coder output window can cause logger failure, with
         # error message pointing here. this is despite it being ok to log to
         # terminal or Builder output. proper fix: fix coder unicode bug #97
@@ -275,6 +453,12 @@ class _Logger():
         for target in self.targets:
             self.lowestTarget = min(self.lowestTarget, target.level)
 
+    def setFlushedSize(self, size):
+        """Set how many entries are kept in `self.flushed` after they've been
+        written (None to keep all of them).
+        """
+        self.flushed = deque(self.flushed, maxlen=size)
+
     def log(self, message, level, t=None, obj=None):
         """Add the `message` to the log stack at the appropriate `level`
 
@@ -286,42 +470,130 @@ class _Logger():
             return
         # check time
         if t is None:
-            global defaultClock
             t = defaultClock.getTime()
         # add message to list
-        self.toFlush.append(
-            _LogEntry(t=t, level=level, message=message, obj=obj))
+        self.toFlush.append(_LogEntry(level, message, t, obj))
+
+    def startWriter(self, interval=None):
+        """Write entries from a background thread, so that `flush()` returns
+        immediately rather than waiting for the entries to be written.
+
+        Parameters
+        ----------
+        interval : float or None
+            If given, also write entries every `interval` seconds, rather than
+            only when the logger is flushed.
+        """
+        if self.writer is not None and self.writer.is_alive():
+            self.writer.interval = interval
+            return
+        self.writer = _LogWriter(self, interval=interval)
+        self.writer.start()
+
+    def stopWriter(self):
+        """Stop writing entries from a background thread, once any pending
+        entries have been written.
+        """
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+        self._writeEntries()
 
-    def flush(self):
+    def flush(self, wait=False):
         """Process all current messages to each target
+
+        Parameters
+        ----------
+        wait : bool
+            If there's a background writer, wait until the messages have been
+            written rather than leaving it to write them.
         """
-        # loop through targets then entries in toFlush
-        # so that stream.flush can be called just once
-        formatted = {}  # keep a dict - so only do the formatting once
-        for target in self.targets:
-            for thisEntry in self.toFlush:
-                if thisEntry.level >= target.level:
-                    if not thisEntry in formatted:
-                        # convert the entry into a formatted string
-                        formatted[thisEntry] = self.format.format(**thisEntry.__dict__)
-                    target.write(formatted[thisEntry] + '\n')
-            if hasattr(target.stream, 'flush'):
-                target.stream.flush()
-        # finished processing entries - move them to self.flushed
-        self.flushed.extend(self.toFlush)
-        self.toFlush = []  # a new empty list
+        writer = self.writer
+        if writer is not None and writer.is_alive() and not wait:
+            writer.wake()
+        else:
+            self._writeEntries()
+
+    def _writeEntries(self):
+        """Write the entries waiting in toFlush to each target, then move them
+        to self.flushed
+        """
+        with self._writeLock:
+            toFlush = self.toFlush
+            # only take entries which were there when we started, in case more
+            # are being logged from another thread
+            entries = [toFlush.popleft() for n in range(len(toFlush))]
+            if not entries:
+                return
+            targets = list(self.targets)
+            # targets which take the entries themselves (e.g. BinaryLogFile)
+            for target in targets:
+                if hasattr(target, 'writeEntries'):
+                    targetEntries = [entry for entry in entries
+                                     if entry.level >= target.level]
+                    if targetEntries:
+                        target.writeEntries(targetEntries)
+            targets = [target for target in targets
+                       if not hasattr(target, 'writeEntries')]
+            if targets:
+                # format each entry once, however many targets it goes to
+                lowest = min(target.level for target in targets)
+                formatter = self.format.format_map
+                formatted = [(entry.level, formatter(entry))
+                             for entry in entries if entry.level >= lowest]
+                for target in targets:
+                    # one write per target, rather than per entry
+                    lines = [txt for level, txt in formatted
+                             if level >= target.level]
+                    if lines:
+                        lines.append('')
+                        target.write('\n'.join(lines))
+                    if hasattr(getattr(target, 'stream', None), 'flush'):
+                        target.stream.flush()
+            # finished processing entries - move them to self.flushed
+            self.flushed.extend(entries)
 
 root = _Logger()
 console = LogFile(level=WARNING)
 
 
-def flush(logger=root):
+def flush(logger=root, wait=False):
     """Send current messages in the log to all targets
+
+    If the logger has a background writer (see `setBackgroundWriter`) they'll
+    be written from that thread, unless `wait` is True.
+    """
+    logger.flush(wait=wait)
+
+
+def setBackgroundWriter(enabled=True, interval=None, logger=root):
+    """Write log messages from a background thread, so that calling `flush()`
+    (e.g. between trials) doesn't hold up the experiment while files are
+    written.
+
+    Parameters
+    ----------
+    enabled : bool
+        Start (True) or stop (False) the background writer. Stopping it writes
+        any messages still waiting.
+    interval : float or None
+        If given, also write messages every `interval` seconds rather than only
+        when `flush()` is called.
+    logger : _Logger
+        Logger to write the messages of, default is the root logger.
     """
-    logger.flush()
+    if enabled:
+        logger.startWriter(interval=interval)
+    else:
+        logger.stopWriter()
+
+
+def _flushAtExit():
+    # stop any background writer, then write whatever is left from this thread
+    root.stopWriter()
 
 # make sure this function gets called as python closes
-atexit.register(flush)
+atexit.register(_flushAtExit)
 
 
 def critical(msg, t=None, obj=None):
@@ -11,15 +11,20 @@ import os
 import argparse
 from subprocess import PIPE, Popen
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 from psychopy import __version__
 
 # DO NOT IMPORT ANY OTHER PSYCHOPY SUB-PACKAGES OR THEY WON'T SWITCH VERSIONS
 
 parser = argparse.ArgumentParser(description='Compile your python file from here')
-parser.add_argument('infile', help='The input (psyexp) file to be compiled')
+parser.add_argument('infile', nargs='+', help='The input (psyexp) file(s) to be compiled')
 parser.add_argument('--version', '-v', help='The PsychoPy version to use for compiling the script. e.g. 1.84.1')
 parser.add_argument('--outfile', '-o', help='The output (py) file to be generated (defaults to the ')
+parser.add_argument('--jobs', '-j', type=int, default=None,
+                    help='Number of worker processes to compile multiple files with (defaults to one per CPU)')
+parser.add_argument('--cache-dir', dest='cacheDir', default=None,
+                    help='Folder to cache compiled scripts in, so unchanged experiments are not compiled again')
 
 
 class LegacyScriptError(ChildProcessError):
@@ -85,7 +90,7 @@ def generateScript(exp, outfile, target="PsychoPy"):
     return outfile
 
 
-def compileScript(infile=None, version=None, outfile=None):
+def compileScript(infile=None, version=None, outfile=None, cacheDir=None):
     """
     Compile either Python or JS PsychoPy script from .psyexp file.
 
@@ -100,6 +105,9 @@ def compileScript(infile=None, version=None, outfile=None):
         command line interface only.
     outfile: string
         The output file to be generated (defaults to Python script).
+    cacheDir: str or None
+        Folder to cache compiled scripts in, so unchanged experiments are not
+        compiled again.
     """
     def _setVersion(version):
         """
@@ -143,7 +151,8 @@ def compileScript(infile=None, version=None, outfile=None):
             The experiment object used for generating the experiment script
         """
         # import PsychoPy experiment and write script with useVersion active
-        from psychopy.app.builder import experiment
+        # (from psychopy rather than psychopy.app, so the app isn't needed to compile)
+        from psychopy import experiment
         # Check infile type
         if isinstance(infile, experiment.Experiment):
             thisExp = infile
@@ -216,14 +225,87 @@ def compileScript(infile=None, version=None, outfile=None):
 
     ###### Write script #####
     version = _setVersion(version)
+    # only once the version is set, as this imports psychopy.experiment
+    _setCacheFolder(cacheDir)
     thisExp = _getExperiment(infile, version)
     targetOutput = _setTarget(outfile)
     _makeTarget(thisExp, outfile, targetOutput)
 
 
+def _setCacheFolder(cacheDir):
+    """
+    Set the folder compiled scripts are cached in, for this process.
+    """
+    if cacheDir is not None:
+        from psychopy.experiment._experiment import scriptCache
+        scriptCache.folder = cacheDir
+
+
+def _compileOne(infile, outfile, cacheDir):
+    """
+    Compile a single file in a worker process, returning any error as a string
+    rather than raising it, so that one bad file doesn't stop the batch.
+    """
+    try:
+        compileScript(infile=infile, version=None, outfile=outfile, cacheDir=cacheDir)
+    except Exception as err:
+        return "{}: {}".format(type(err).__name__, err)
+
+
+def compileScripts(infiles, outfiles=None, jobs=None, cacheDir=None):
+    """
+    Compile many .psyexp files in parallel, each in a worker process.
+
+    Parameters
+    ----------
+    infiles : list of str
+        The input (psyexp) files to be compiled
+    outfiles : list of str or None
+        The output file for each input file, defaults to the input file with
+        its extension changed to .py
+    jobs : int or None
+        Number of worker processes, defaults to the number of CPUs
+    cacheDir : str or None
+        Folder to cache compiled scripts in, so that experiments which haven't
+        changed since they were last compiled (by any process) aren't
+        compiled again.
+
+    Returns
+    -------
+    dict
+        Error message for each input file which failed to compile, empty if
+        all files compiled.
+    """
+    infiles = [str(infile) for infile in infiles]
+    if outfiles is None:
+        outfiles = [str(Path(infile).with_suffix(".py")) for infile in infiles]
+    outfiles = [str(outfile) for outfile in outfiles]
+    if len(outfiles) != len(infiles):
+        raise ValueError("Got {} output files for {} input files".format(len(outfiles), len(infiles)))
+    # compile in worker processes
+    errors = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(_compileOne, infiles, outfiles, [cacheDir] * len(infiles))
+        for infile, err in zip(infiles, results):
+            if err is not None:
+                errors[infile] = err
+
+    return errors
+
+
 if __name__ == "__main__":
     # define args
     args = parser.parse_args()
-    if args.outfile is None:
-        args.outfile = args.infile.replace(".psyexp", ".py")
-    compileScript(args.infile, args.version, args.outfile)
+    if len(args.infile) == 1:
+        infile, = args.infile
+        if args.outfile is None:
+            args.outfile = infile.replace(".psyexp", ".py")
+        compileScript(infile, args.version, args.outfile, cacheDir=args.cacheDir)
+    else:
+        # batch mode
+        if args.outfile is not None or args.version is not None:
+            parser.error("--outfile and --version can only be used when compiling a single file")
+        errors = compileScripts(args.infile, jobs=args.jobs, cacheDir=args.cacheDir)
+        for infile, err in errors.items():
+            sys.stderr.write("Failed to compile {}: {}\n".format(infile, err))
+        sys.exit(int(bool(errors)))
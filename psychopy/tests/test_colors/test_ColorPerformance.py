@@ -0,0 +1,92 @@
+"""
+Checks that the fast paths for color changes give the same values as the full
+conversions, and microbenchmarks for them (timings are reported with
+record_property, not asserted).
+"""
+import timeit
+
+import numpy as np
+import pytest
+
+from psychopy import colors
+
+
+def _timePerCall(func, number=200):
+    """Best time per call of func, in seconds"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+@pytest.mark.parametrize("fromSpace, values", [
+    ('rgb', [[0.5, 0.2, -0.1], [-1, 0, 1]]),
+    ('rgba', [[0.5, 0.2, -0.1, 0.5], [-1, 0, 1, 1]]),
+    ('rgb255', [[128, 0, 255], [10, 20, 30]]),
+    ('rgb1', [[0.2, 0.4, 1], [0, 0, 0]]),
+    ('hsv', [[200, 0.5, 0.5], [10, 1, 1]]),
+])
+@pytest.mark.parametrize("toSpace", [
+    'rgb', 'rgba', 'rgb255', 'rgba1', 'hsv', 'hex', 'srgb'])
+def test_renderMany(fromSpace, values, toSpace):
+    """renderMany should match rendering each color separately"""
+    contrast = 0.5
+    many = colors.Color.renderMany(values, fromSpace, toSpace, contrast=contrast)
+    for row, value in enumerate(values):
+        expected = colors.Color(value, fromSpace, contrast=contrast).render(toSpace)
+        if toSpace == 'hex':
+            assert many[row] == expected
+        else:
+            np.testing.assert_allclose(many[row], expected, atol=1e-9)
+
+
+def test_renderMany_strings():
+    rgb = colors.Color.renderMany(['red', 'none'], 'named', 'rgba')
+    np.testing.assert_allclose(rgb, [[1, -1, -1, 1], [0, 0, 0, 0]])
+    rgb255 = colors.Color.renderMany(['#ff0080', '#00FF00'], 'hex', 'rgb255')
+    np.testing.assert_allclose(rgb255, [[255, 0, 128], [0, 255, 0]])
+    names = colors.Color.renderMany([[1, -1, -1], [0.1, 0.2, 0.3]], 'rgb', 'named')
+    assert list(names) == ['red', None]
+    with pytest.raises(ValueError):
+        colors.Color.renderMany([[0, 0, 0]], 'rgb', 'notASpace')
+
+
+def test_hexArray():
+    col = colors.Color([['#ff0080'], ['#00ff00']], 'hex')
+    np.testing.assert_allclose(col.rgb255, [[255, 0, 128], [0, 255, 0]])
+    assert list(col.hex) == ['#ff0080', '#00ff00']
+
+
+@pytest.mark.benchmark
+def test_perFrameColorChange(record_property):
+    """Time setting and rendering a color, as happens each frame (ideally a
+    tiny fraction of a frame)."""
+    col = colors.Color((0.5, 0.2, 0.1), 'rgb')
+    values = np.random.uniform(-1, 1, (100, 3))
+
+    def setAndRender():
+        for value in values:
+            col.rgb = value
+            col.render('rgba')
+    perColor = _timePerCall(setAndRender, number=10) / len(values)
+    record_property("setRgbAndRenderUs", perColor * 1e6)
+    np.testing.assert_allclose(col.render('rgba'), list(values[-1]) + [1])
+
+    def named():
+        colors.Color('crimson', 'named').render('rgb')
+    perNamed = _timePerCall(named)
+    record_property("namedColorUs", perNamed * 1e6)
+
+
+@pytest.mark.benchmark
+def test_renderManyVsColors(record_property):
+    """Time converting many colors at once, compared with making a Color for
+    each (e.g. for the elements of an ElementArrayStim)."""
+    values = np.column_stack([
+        np.random.uniform(0, 360, 1000), np.random.uniform(0, 1, (1000, 2))])
+    tMany = _timePerCall(
+        lambda: colors.Color.renderMany(values, 'hsv', 'rgba'), number=20)
+
+    def each():
+        for value in values:
+            colors.Color(value, 'hsv').render('rgba')
+    tEach = _timePerCall(each, number=1)
+    record_property("renderMany1000Ms", tMany * 1000)
+    record_property("colorEach1000Ms", tEach * 1000)
@@ -165,6 +165,48 @@ class TestExperimentHandler():
                 # If failed, remove and store character which failed
                 raise UnicodeEncodeError(*err.args[:4], "character failing to save to csv")
 
+    def test_journal(self):
+        dataFileName = os.path.join(self.tmpDir, 'journal')
+        exp = data.ExperimentHandler(
+            name='testExp', extraInfo={'participant': 'jwp'},
+            savePickle=False, dataFileName=dataFileName, checkpointInterval=0)
+        trials = data.TrialHandler([{'ori': 0}, {'ori': 90}], nReps=5,
+                                   name='trials', seed=self.random_seed)
+        exp.addLoop(trials)
+        for n, trial in enumerate(trials):
+            trials.addData('resp.keys', ['left', 'right'][n % 2])
+            trials.addData('resp.rt', np.float32(n / 10))
+            exp.addData('note, with comma', (n, n))
+            exp.nextEntry()
+            if n == 5:
+                # change an entry which is already in the journal
+                exp.addData('resp.corr', 1, row=2)
+        # the journal has everything up to the last entry
+        exp.stopCheckpoints()
+        assert os.path.isfile(dataFileName + '.journal')
+        exp.saveAsWideText(dataFileName + '.csv', appendFile=False)
+        recovered = data.recoverJournal(dataFileName + '.journal',
+                                        dataFileName + '_recovered.csv')
+        with io.open(dataFileName + '.csv', encoding='utf-8-sig') as f:
+            expected = f.read()
+        with io.open(recovered, encoding='utf-8-sig') as f:
+            assert f.read() == expected
+
+        # a partly written last line (e.g. after a crash) is ignored
+        with open(dataFileName + '.journal', 'a') as f:
+            f.write('{"entry": {"resp.keys": "le')
+        recovered = data.recoverJournal(dataFileName + '.journal',
+                                        dataFileName + '_crashed.csv')
+        with io.open(recovered, encoding='utf-8-sig') as f:
+            assert f.read() == expected
+
+        # once the data are saved the journal is removed
+        os.remove(dataFileName + '.journal')
+        exp.startCheckpoints()
+        exp.close()
+        assert os.path.isfile(dataFileName + '.csv')
+        assert not os.path.isfile(dataFileName + '.journal')
+
 
 if __name__ == '__main__':
     import pytest
@@ -5,6 +5,7 @@ import shutil
 from tempfile import mkdtemp, mkstemp
 import numpy as np
 import io
+import time
 import pytest
 
 from psychopy import data
@@ -330,6 +331,75 @@ class TestTrialHandlerOutput():
 
         assert header == expected_header
 
+    def test_toDataFrame(self):
+        df = self.trials.toDataFrame()
+        assert list(df.columns) == (['TrialNumber', 'trialType'] +
+                                    self.trials.data.dataTypes)
+        assert len(df) == 15
+        # rows are in the order the trials were run
+        np.testing.assert_array_equal(df['order'], np.arange(15))
+        assert list(df['resp']) == ['resp%i' % trialType
+                                    for trialType in df['trialType']]
+        assert df['rand'].dtype.kind == 'f'
+
+
+def _saveAsWideTextPerCell(trials, fileName, delim):
+    """Wide-format output written a cell at a time (as saveAsWideText used
+    to), to compare against."""
+    header = ['TrialNumber'] + list(trials.trialList[0].keys())
+    header.extend(trials.data.dataTypes)
+    repsPerType = {}
+    with open(fileName, 'w') as f:
+        f.write(delim.join(header) + '\n')
+        trialCount = 0
+        for rep in range(trials.nReps):
+            for trialN in range(len(trials.trialList)):
+                tti = trials.sequenceIndices[trialN, rep]
+                repsPerType[tti] = repsPerType.get(tti, -1) + 1
+                trialCount += 1
+                line = []
+                for prmName in header:
+                    if prmName in trials.trialList[tti]:
+                        line.append(str(trials.trialList[tti][prmName]))
+                    elif prmName in trials.data:
+                        value = trials.data[prmName][tti][repsPerType[tti]]
+                        line.append(str(value))
+                    else:
+                        line.append(str(trialCount))
+                f.write(delim.join(line) + '\n')
+
+
+@pytest.mark.benchmark
+def test_saveAsWideText_large(tmp_path, record_property):
+    """Benchmark saving a large design, compared with writing it a cell at a
+    time, and check both give the same file."""
+    conditions = [{'ori': ori, 'contrast': contrast, 'label': 'c%i' % ori}
+                  for ori in range(50) for contrast in (0.1, 0.5, 1.0)]
+    trials = data.TrialHandler(conditions, nReps=20, method='random',
+                               seed=1, autoLog=False)
+    rng = np.random.RandomState(seed=1)
+    for n, thisTrial in enumerate(trials):
+        trials.addData('rt', rng.rand())
+        trials.addData('corr', n % 2)
+        if n % 5:
+            trials.addData('resp', 'left' if n % 3 else 'right')
+        if n > trials.nTotal - 100:
+            break  # leave the last trials empty
+
+    t0 = time.perf_counter()
+    trials.saveAsWideText(str(tmp_path / 'wide.csv'), delim=',')
+    tWide = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _saveAsWideTextPerCell(trials, str(tmp_path / 'perCell.csv'), ',')
+    tPerCell = time.perf_counter() - t0
+    record_property("saveWide3000Ms", tWide * 1000)
+    record_property("savePerCell3000Ms", tPerCell * 1000)
+
+    with io.open(tmp_path / 'wide.csv', 'r', encoding='utf-8-sig') as f:
+        wide = f.read()
+    with io.open(tmp_path / 'perCell.csv', 'r') as f:
+        assert wide == f.read()
+
 
 if __name__ == '__main__':
     pytest.main()
@@ -355,5 +355,20 @@ class TestTrialHandlerOutput():
         assert header == expected_header
 
 
+def test_weightedWideOutput():
+    conditions = [{'name': name, 'weight': weight}
+                  for name, weight in (('A', 3), ('B', 1), ('C', 2))]
+    trials = data.TrialHandlerExt(conditions, nReps=2, method='random',
+                                  seed=1, autoLog=False)
+    for n, thisTrial in enumerate(trials):
+        trials.addData('resp', thisTrial['name'] + str(n))
+    df = trials.toDataFrame()
+    assert len(df) == 12
+    # every trial's own data should be in its row
+    assert list(df['resp']) == ['%s%i' % (name, n)
+                                for n, name in enumerate(df['name'])]
+    np.testing.assert_array_equal(df['order'], np.arange(12))
+
+
 if __name__ == '__main__':
     pytest.main()
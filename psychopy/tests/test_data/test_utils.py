@@ -153,6 +153,50 @@ class Test_utilsClass:
         assert len(conds) == 6
         assert len(list(conds[0].keys())) == 6
 
+    def test_importConditions_cache(self, tmp_path):
+        fileName = str(tmp_path / 'conditions.csv')
+        with open(fileName, 'w') as f:
+            f.write("text,n,float\nred,1,1.1\ngreen,2,2.5\n")
+        uncached, fieldNames = utils.importConditions(
+            fileName, returnFieldNames=True, useCache=False)
+        # first import parses the file, the second comes from the cache
+        utils.importConditions(fileName)
+        utils.clearConditionsCache(memoryOnly=True)
+        cached, cachedFieldNames = utils.importConditions(
+            fileName, returnFieldNames=True)
+        assert cached == uncached
+        assert cachedFieldNames == fieldNames == ['text', 'n', 'float']
+        # modifying the cached result shouldn't affect the next import
+        cached[0]['text'] = 'changed'
+        assert utils.importConditions(fileName) == uncached
+        # changing the file should invalidate the cache
+        with open(fileName, 'a') as f:
+            f.write("blue,3,3.5\n")
+        conds = utils.importConditions(fileName)
+        assert len(conds) == 3
+        assert conds[-1]['float'] == 3.5
+        utils.clearConditionsCache()
+
+    def test_importConditions_nanInf(self, tmp_path):
+        # strings float() accepts are converted, as they were before the
+        # columns were converted with pandas
+        fileName = str(tmp_path / 'special.csv')
+        with open(fileName, 'w') as f:
+            f.write("word,value\nNAN,inf\nx,-inf\n\" nan\",\" 2,5\"\n+nan,1_000\n")
+        conds = utils.importConditions(fileName, useCache=False)
+        # pandas leaves these spellings of nan as strings, float() doesn't
+        assert [c['word'] for c in conds] == [None, 'x', None, None]
+        assert [c['value'] for c in conds] == [np.inf, -np.inf, 2.5, 1000.0]
+        assert all(isinstance(c['value'], float) for c in conds)
+
+    def test_importConditions_delimiters(self):
+        # the same conditions in files with different delimiters
+        expected = utils.importConditions(
+            join(fixturesPath, 'trialTypes.csv'), useCache=False)
+        for name in ('trialTypes.tsv', 'trialTypes_eu.csv'):
+            conds = utils.importConditions(join(fixturesPath, name), useCache=False)
+            assert conds == expected, name
+
 def test_listFromString():
     assert ['yes', 'no'] == utils.listFromString("yes, no")
     assert ['yes', 'no'] == utils.listFromString("[yes, no]")
@@ -1,6 +1,12 @@
 from psychopy import experiment
+import importlib.util
+import os
+import sys
+from psychopy.experiment._experiment import scriptCache
+from psychopy.scripts import psyexpCompile
 from psychopy.tests.utils import TESTS_DATA_PATH
 from pathlib import Path
+import shutil
 import esprima
 
 
@@ -101,3 +107,78 @@ class TestExperiment:
             else:
                 assert case['value'] not in unhandledResources
 
+    def test_script_cache(self):
+        exp = experiment.Experiment()
+        exp.loadFromXML(Path(TESTS_DATA_PATH) / "ghost_stroop.psyexp")
+        scriptCache.clear()
+        # first compile should store the script, second should reuse it
+        script = exp.writeScript()
+        digest = exp.getScriptDigest()
+        assert digest in scriptCache
+        assert exp.writeScript() == script
+        assert scriptCache.datePlaceholder not in script
+        # should match a script compiled without the cache
+        assert exp.writeScript(useCache=False) == script
+        # changing a param in a Routine should change the digest and the script
+        comp = list(exp.routines.values())[0][0]
+        comp.params['name'].val = "renamedComponent"
+        assert exp.getScriptDigest() != digest
+        assert "renamedComponent" in exp.writeScript()
+
+    def test_batch_compile(self, tmp_path):
+        # copy experiments to temp folder so scripts are written there
+        infiles = []
+        for name in ("ghost_stroop.psyexp", "TextComponent_disabled.psyexp"):
+            shutil.copy(Path(TESTS_DATA_PATH) / name, tmp_path / name)
+            infiles.append(tmp_path / name)
+        errors = psyexpCompile.compileScripts(infiles, jobs=2, cacheDir=tmp_path / "cache")
+        assert errors == {}
+        for infile in infiles:
+            assert infile.with_suffix(".py").is_file()
+        # each compiled script should be in the cache folder
+        assert len(list((tmp_path / "cache").glob("*.py"))) == 2
+
+    def test_script_digest_components(self, tmp_path, monkeypatch):
+        from psychopy.experiment.components import pluginComponents
+        exp = experiment.Experiment()
+        exp.loadFromXML(Path(TESTS_DATA_PATH) / "ghost_stroop.psyexp")
+        # register a plugin Component
+        compFile = tmp_path / "digestTestPlugin.py"
+        compFile.write_text(
+            "from psychopy.experiment.components import BaseComponent\n"
+            "class DigestTestComponent(BaseComponent):\n"
+            "    pass\n"
+        )
+        spec = importlib.util.spec_from_file_location("digestTestPlugin", compFile)
+        module = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, "digestTestPlugin", module)
+        spec.loader.exec_module(module)
+        monkeypatch.setitem(pluginComponents, "DigestTestComponent", module.DigestTestComponent)
+        digest = exp.getScriptDigest()
+        assert exp.getScriptDigest() == digest
+        # editing the Component's code should change the digest
+        mtime = os.stat(compFile).st_mtime_ns + 10 ** 9
+        os.utime(compFile, ns=(mtime, mtime))
+        assert exp.getScriptDigest() != digest
+
+    def test_component_cache(self, tmp_path):
+        from psychopy.experiment.components import getComponents
+        folder = tmp_path / "cacheCompts" / "cacheCompts"
+        folder.mkdir(parents=True)
+        (folder / "__init__.py").write_text("")
+        compFile = folder / "cacheTest.py"
+        compFile.write_text(
+            "from psychopy.experiment.components import BaseComponent\n"
+            "class CacheTestComponent(BaseComponent):\n"
+            "    tooltip = 'first'\n"
+        )
+        components = getComponents(str(tmp_path / "cacheCompts"))
+        assert components['CacheTestComponent'].tooltip == "first"
+        # unchanged folder gives the cached components
+        assert getComponents(str(tmp_path / "cacheCompts")) == components
+        # editing a component in place is noticed, and the component reloaded
+        compFile.write_text(compFile.read_text().replace("first", "second"))
+        mtime = os.stat(compFile).st_mtime_ns + 10 ** 9
+        os.utime(compFile, ns=(mtime, mtime))
+        components = getComponents(str(tmp_path / "cacheCompts"))
+        assert components['CacheTestComponent'].tooltip == "second"
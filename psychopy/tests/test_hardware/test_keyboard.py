@@ -1,4 +1,5 @@
 import sys
+import threading
 from psychopy.hardware import keyboard
 import pytest
 import time
@@ -54,6 +55,28 @@ class _TestBaseKeyboard:
         keys = self.kb.getKeys(waitRelease=True, clear=False)
         assert len(keys) == 2
 
+    def testFilteredGetKeys(self):
+        """
+        Test that getKeys only returns (and clears) the keys asked for, in the order they were
+        received, when there are many other responses waiting.
+        """
+        self.kb.clearEvents()
+        # make a big backlog of presses of keys we're not interested in
+        for n in range(1000):
+            self.kb.makeResponse(tDown=n / 1000, code="a")
+        # interleave some presses we are interested in
+        wanted = [
+            self.kb.makeResponse(tDown=1.1, code="space"),
+            self.kb.makeResponse(tDown=1.2, code="b"),
+            self.kb.makeResponse(tDown=1.3, code="space"),
+        ]
+        keys = self.kb.getKeys(keyList=["space", "b"], waitRelease=False, clear=True)
+        assert keys == wanted
+        assert all(k is w for k, w in zip(keys, wanted))
+        # wanted keys should be cleared, others left alone
+        assert self.kb.getKeys(keyList=["space", "b"], waitRelease=False, clear=False) == []
+        assert len(self.kb.getKeys(keyList=["a"], waitRelease=False, clear=True)) == 1000
+
     def testMuteOutsidePsychopyNotSlower(self):
         """
         Test that responses aren't worryingly slower when using muteOutsidePsychopy
@@ -95,6 +118,77 @@ class _TestBaseKeyboard:
         self.kb.muteOutsidePsychopy = False
 
 
+class TestKeyResponseStore:
+    """
+    Tests for the store of responses used by KeyboardDevice.
+    """
+    def testOrderAndFiltering(self):
+        store = keyboard.KeyResponseStore()
+        a1 = keyboard.BaseResponse(t=0.1, value="a")
+        b1 = keyboard.BaseResponse(t=0.2, value="b")
+        a2 = keyboard.BaseResponse(t=0.3, value="a")
+        a2.duration = 0.1
+        store += [a1, b1, a2]
+        # chronological order is kept across keys
+        assert list(store) == [a1, b1, a2]
+        assert list(store.view(keyList=["a"])) == [a1, a2]
+        assert list(store.view(ignoreKeys=["a"])) == [b1]
+        assert list(store.view(released=True)) == [a2]
+        assert list(store.view(released=False)) == [a1, b1]
+        # a view only includes the responses stored when iteration started
+        view = store.view()
+        first = next(view)
+        store.append(keyboard.BaseResponse(t=0.4, value="a"))
+        assert [first] + list(view) == [a1, b1, a2]
+
+    def testNoDuplicates(self):
+        store = keyboard.KeyResponseStore()
+        resp = keyboard.BaseResponse(t=0.1, value="a")
+        store.append(resp)
+        store.append(resp)
+        assert len(store) == 1
+
+    def testRemoveAll(self):
+        store = keyboard.KeyResponseStore()
+        resps = [keyboard.BaseResponse(t=n, value="ab"[n % 2]) for n in range(10)]
+        store.extend(resps)
+        store.removeAll(resps[::3])
+        assert list(store) == [r for i, r in enumerate(resps) if i % 3]
+        store.clear()
+        assert not store
+
+    def testIndexing(self):
+        store = keyboard.KeyResponseStore()
+        resps = [keyboard.BaseResponse(t=n, value="ab"[n % 2]) for n in range(10)]
+        store.extend(resps)
+        assert [store[i] for i in range(len(store))] == resps
+        assert store[-1] is resps[-1]
+        # indexing reflects later changes to the store
+        store.removeAll(resps[:2])
+        extra = keyboard.BaseResponse(t=10, value="c")
+        store.append(extra)
+        assert store[0] is resps[2] and store[-1] is extra
+
+    def testAppendFromThread(self):
+        store = keyboard.KeyResponseStore()
+        resps = [keyboard.BaseResponse(t=n, value="abc"[n % 3]) for n in range(20000)]
+
+        def listen():
+            for resp in resps:
+                store.append(resp)
+
+        listener = threading.Thread(target=listen)
+        listener.start()
+        # reading and removing while another thread appends loses nothing
+        received = []
+        while listener.is_alive() or store:
+            got = list(store.view(keyList=["a", "b"])) + list(store.view(keyList=["c"]))
+            store.removeAll(got)
+            received.extend(got)
+        listener.join()
+        assert sorted(received, key=lambda r: r.t) == resps
+
+
 class _MillikeyMixin:
     """
     Mixin to add tests which use a Millikey device to generate keypresses. If no such device is
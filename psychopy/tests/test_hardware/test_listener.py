@@ -0,0 +1,43 @@
+import time
+
+from psychopy.hardware.listener import ListenerLoop
+
+
+class _PolledDevice:
+    """
+    Minimal device which counts how often it's dispatched.
+    """
+    def __init__(self):
+        self.nDispatches = 0
+
+    def dispatchMessages(self):
+        self.nDispatches += 1
+
+
+class TestScheduledLoop:
+    def setup_method(self):
+        self.loop = ListenerLoop()
+        self.loop.scheduled = True
+        self.loop.refreshRate = 0.05
+
+    def teardown_method(self):
+        self.loop.stop()
+
+    def testPollInterval(self):
+        """
+        Test that devices are dispatched at their own poll interval.
+        """
+        fast = _PolledDevice()
+        slow = _PolledDevice()
+        self.loop.addDevice(fast, pollInterval=0.005)
+        self.loop.addDevice(slow, pollInterval=0.1)
+        self.loop.start()
+        time.sleep(0.3)
+        assert fast.nDispatches > slow.nDispatches * 4
+        assert 1 <= slow.nDispatches <= 5
+        # check stats are reported for each device, even of the same class
+        stats = self.loop.getLatencyStats()
+        assert [dev for dev, devStats in stats] == [fast, slow]
+        assert stats[0][1]['n'] > stats[1][1]['n'] > 0
+        assert stats[1][1]['wait']['max'] < self.loop.refreshRate
+        assert stats[1][1]['dispatch']['max'] is not None
@@ -0,0 +1,30 @@
+import numpy as np
+
+from psychopy.hardware.photodiode import rectMeanLuminance
+
+
+def testRectMeanLuminance():
+    """
+    Check that batched mean luminance matches per-rect means, for luminance and RGBA blocks and for rects
+    of different sizes.
+    """
+    rng = np.random.default_rng(0)
+    rects = np.array([
+        [0, 0, 10, 10],
+        [50, 20, 30, 40],
+        [5, 5, 10, 10],
+        [190, 90, 10, 10],
+    ])
+    weights = np.array([0.2989, 0.5870, 0.1140])
+    # luminance block
+    lum = rng.integers(0, 255, (100, 200), dtype=np.uint8)
+    expected = [lum[y:y + h, x:x + w].mean() for x, y, w, h in rects]
+    assert np.allclose(rectMeanLuminance(lum, rects), expected, atol=1e-3)
+    # RGBA block
+    rgba = rng.integers(0, 255, (100, 200, 4), dtype=np.uint8)
+    expected = [rgba[y:y + h, x:x + w, :3].reshape(-1, 3).mean(axis=0) @ weights for x, y, w, h in rects]
+    assert np.allclose(rectMeanLuminance(rgba, rects), expected, atol=1e-3)
+    # rects hanging off the edge of the block are clipped
+    assert np.isclose(
+        rectMeanLuminance(lum, [[195, 95, 20, 20]])[0], lum[95:, 195:].mean(), atol=1e-3
+    )
@@ -0,0 +1,127 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from psychopy import logging
+from psychopy.hardware.serialdevice import SerialDevice, SerialFrameParser
+
+
+class TestSerialFrameParser:
+    def testDelimiter(self):
+        parser = SerialFrameParser(delimiter=b"\n")
+        # frame split across two chunks is timestamped by its first byte
+        assert parser.feed(b"ab", 1.0) == []
+        frames = parser.feed(b"c\nde\nf", 2.0)
+        assert [f.data for f in frames] == [b"abc", b"de"]
+        assert [f.t for f in frames] == [1.0, 2.0]
+        frames = parser.feed(b"\n", 3.0)
+        assert frames[0].data == b"f"
+        assert frames[0].t == 2.0
+
+    def testLength(self):
+        parser = SerialFrameParser(length=3)
+        frames = parser.feed(b"abcdefg", 1.0)
+        assert [f.data for f in frames] == [b"abc", b"def"]
+        frames = parser.feed(b"hi", 2.0)
+        assert frames[0].data == b"ghi"
+        assert frames[0].t == 1.0
+
+    def testPattern(self):
+        parser = SerialFrameParser(pattern=rb"<\d+>")
+        frames = parser.feed(b"junk<12><3", 1.0)
+        assert [f.data for f in frames] == [b"<12>"]
+        frames = parser.feed(b"4>", 2.0)
+        assert frames[0].data == b"<34>"
+
+    def testBadArgs(self):
+        with pytest.raises(ValueError):
+            SerialFrameParser()
+        with pytest.raises(ValueError):
+            SerialFrameParser(delimiter=b"\n", length=2)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs a pty pair")
+class TestSerialReaderLoopback:
+    """
+    Tests for the background reader of SerialDevice, using a pseudo-terminal pair in place of a physical
+    serial port.
+    """
+    def setup_method(self):
+        import pty
+        self.master, slave = pty.openpty()
+        self.device = SerialDevice(port=os.ttyname(slave), checkAwake=False)
+        os.close(slave)
+
+    def teardown_method(self):
+        self.device.close()
+        os.close(self.master)
+
+    def testFramesReceived(self):
+        self.device.startReader(delimiter=b"\n")
+        os.write(self.master, b"hello\nworld\n")
+        time.sleep(0.05)
+        frames = self.device.getFrames()
+        assert [f.data for f in frames] == [b"hello", b"world"]
+        # check getResponse now reads from the reader
+        os.write(self.master, b"again\n")
+        assert self.device.getResponse(timeout=0.5) == "again"
+        # reading everything keeps the delimiters, as reading the port does
+        os.write(self.master, b"one\ntwo\n")
+        time.sleep(0.05)
+        assert self.device.getResponse(length=-1) == "one\ntwo\n"
+
+    def testTimeoutRestored(self):
+        self.device.com.timeout = 0.5
+        self.device.startReader(delimiter=b"\n")
+        assert self.device.com.timeout == 0.01
+        self.device.stopReader()
+        assert self.device.com.timeout == 0.5
+
+    def testBinaryFrames(self):
+        self.device.startReader(length=2)
+        os.write(self.master, b"\xff\x00\x01\x02\x03\x04")
+        time.sleep(0.05)
+        # fixed length frames needn't be text, so are returned as bytes
+        assert self.device.getResponse() == b"\xff\x00"
+        assert self.device.getResponse(length=2) == [b"\x01\x02", b"\x03\x04"]
+        os.write(self.master, b"\xfe\xfd")
+        assert self.device.awaitResponse(timeout=0.5) == b"\xfe\xfd"
+        assert self.device.getResponse(length=-1) == b""
+
+    @pytest.mark.benchmark
+    def testTimestampAccuracyUnderLoad(self, record_property):
+        """
+        Time how soon after they were written frames are timestamped, with another thread competing
+        for the CPU.
+        """
+        self.device.startReader(length=4)
+        # keep the CPU busy in another thread
+        busy = True
+
+        def spin():
+            x = 0
+            while busy:
+                x += 1
+        spinner = threading.Thread(target=spin, daemon=True)
+        spinner.start()
+        # write frames at known times
+        sent = []
+        for n in range(200):
+            sent.append(logging.defaultClock.getTime())
+            os.write(self.master, n.to_bytes(4, "big"))
+            time.sleep(0.002)
+        time.sleep(0.05)
+        busy = False
+        spinner.join()
+        frames = self.device.getFrames()
+        # every frame arrived, in order
+        assert [int.from_bytes(f.data, "big") for f in frames] == list(range(200))
+        # frames are never timestamped before they were written
+        errors = np.array([f.t for f in frames]) - np.array(sent)
+        assert (errors >= 0).all()
+        record_property("median_timestamp_error_ms", np.median(errors) * 1000)
+        record_property("max_timestamp_error_ms", errors.max() * 1000)
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from psychopy import logging
+from psychopy.hardware.triggerbox import TriggerScheduler
+
+
+class _MockWindow:
+    """
+    Stands in for a Window, calling callOnFlip functions when flipped.
+    """
+    def __init__(self):
+        self._toCall = []
+        self._frameTime = None
+
+    def callOnFlip(self, function, *args, **kwargs):
+        self._toCall.append((function, args, kwargs))
+
+    def flip(self):
+        self._frameTime = logging.defaultClock.getTime()
+        for function, args, kwargs in self._toCall:
+            function(*args, **kwargs)
+        self._toCall.clear()
+
+
+class _MockParallelPort:
+    def __init__(self):
+        self.written = []
+
+    def setData(self, data):
+        self.written.append(data)
+
+
+class _MockSerialPort:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+
+class TestTriggerScheduler:
+    def testParallelOnFlip(self):
+        win = _MockWindow()
+        port = _MockParallelPort()
+        scheduler = TriggerScheduler(win, port, autoLog=False)
+        scheduler.addTrigger("onset", "8")
+        scheduler.addTrigger("reset", 0)
+        # nothing is written until the flip
+        scheduler.schedule("onset")
+        assert port.written == []
+        win.flip()
+        assert port.written == [8]
+        # several triggers on one flip only register one callback
+        scheduler.schedule("reset")
+        scheduler.schedule("onset")
+        assert len(win._toCall) == 1
+        win.flip()
+        assert port.written == [8, 0, 8]
+
+    def testSerialEncoding(self):
+        port = _MockSerialPort()
+        scheduler = TriggerScheduler(_MockWindow(), port, autoLog=False)
+        scheduler.addTrigger("a", "A")
+        scheduler.addTrigger("b", 66)
+        scheduler.sendNow("a")
+        scheduler.sendNow("b")
+        assert port.written == [b"A", b"B"]
+        # triggers can be given by index, including numpy integers from a conditions file
+        scheduler.sendNow(np.int64(1))
+        scheduler.sendNow(0)
+        assert port.written == [b"A", b"B", b"B", b"A"]
+
+    def testHistory(self):
+        win = _MockWindow()
+        scheduler = TriggerScheduler(win, _MockParallelPort(), historySize=4, autoLog=False)
+        scheduler.addTrigger("onset", 1)
+        for n in range(6):
+            scheduler.schedule("onset")
+            win.flip()
+        history = scheduler.getHistory()
+        # only the last 4 are kept, in order
+        assert len(history) == 4
+        assert scheduler.nWrites == 6
+        assert (np.diff(history['writeTime']) > 0).all()
+        # writes happen after (and very shortly after) the flip
+        jitter = history['writeTime'] - history['flipTime']
+        assert (jitter >= 0).all()
+        assert (jitter < 0.01).all()
+
+    def testBadPort(self):
+        with pytest.raises(TypeError):
+            TriggerScheduler(_MockWindow(), object())
+
+    def testBadTrigger(self):
+        win = _MockWindow()
+        port = _MockParallelPort()
+        scheduler = TriggerScheduler(win, port, autoLog=False)
+        scheduler.addTrigger("onset", 1)
+        scheduler.schedule("onset")
+        # unknown triggers fail when scheduled, not on the flip, and negative indices don't wrap
+        for trigger in (1, -1, np.int64(5)):
+            with pytest.raises(IndexError):
+                scheduler.schedule(trigger)
+            with pytest.raises(IndexError):
+                scheduler.sendNow(trigger)
+        with pytest.raises(KeyError):
+            scheduler.schedule("offset")
+        win.flip()
+        assert port.written == [1]
@@ -0,0 +1,112 @@
+"""
+Tests for adding TrialHandler records to the condition variable table of an
+ioHub DataStore file, one at a time and cached. The requests the
+ioHubConnection would send to the ioHub Server are passed to the DataStore
+file directly.
+"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+tables = pytest.importorskip('tables')
+
+from psychopy.iohub.client import ioHubConnection
+from psychopy.iohub.datastore import DataStoreFile
+from psychopy.iohub.devices import Computer
+
+
+@pytest.fixture
+def datastore(tmp_path):
+    datastore = DataStoreFile('cv.hdf5', str(tmp_path), 'w',
+                              {'multiple_sessions': False, 'flush_interval': 32})
+    datastore.updateDataStoreStructure(Computer, dict())
+    datastore.createOrUpdateExperimentEntry([0, 'cv', 'CV', '', '1.0'])
+    datastore.createExperimentSessionEntry(
+        dict(code='a', name='a', comments='', user_variables='{}'))
+    yield datastore
+    datastore.close()
+
+
+class _Connection(ioHubConnection):
+    """An ioHubConnection whose requests are handled by a DataStore file,
+    counting the requests sent."""
+    def __init__(self, datastore):
+        self._datastore = datastore
+        self._cv_order = None
+        self._cv_cache = []
+        self._cv_cache_size = 1
+        self.experimentID = 1
+        self.experimentSessionID = 1
+        self.requests = []
+
+    def _sendToHubServer(self, tx_data):
+        _, name, args = tx_data
+        self.requests.append(name)
+        return 'RPC_RESULT', name, getattr(self._datastore, name)(*args)
+
+    def __del__(self):
+        pass
+
+
+def _trials(count):
+    return [dict(trial=n, word='word{}'.format(n), rt=n * 0.5) for n in range(count)]
+
+
+def _cvTable(datastore):
+    datastore.flush()
+    return datastore.TABLES['EXP_CV'].read()
+
+
+def test_cachedRecords(datastore):
+    trials = _trials(25)
+    io = _Connection(datastore)
+    io.createTrialHandlerRecordTable(SimpleNamespace(trialList=trials), cache_size=10)
+    for trial in trials[:22]:
+        io.addTrialHandlerRecord(trial)
+    # records are sent 10 at a time
+    assert io.requests.count('extendConditionVariableColumns') == 2
+    assert len(_cvTable(datastore)) == 20
+    # the end of a block
+    assert io.sendTrialHandlerRecords()
+    assert io.sendTrialHandlerRecords() is None
+    for trial in trials[22:]:
+        io.addTrialHandlerRecord([trial['trial'], trial['word'], trial['rt']])
+    io.sendTrialHandlerRecords()
+
+    table = _cvTable(datastore)
+    assert list(table['trial']) == list(range(25))
+    assert list(table['word']) == [t['word'].encode('utf-8') for t in trials]
+    assert list(table['rt']) == [t['rt'] for t in trials]
+    assert set(table['SESSION_ID']) == {1}
+
+
+def test_singleRecords(datastore):
+    trials = _trials(3)
+    io = _Connection(datastore)
+    io.createTrialHandlerRecordTable(SimpleNamespace(trialList=trials), cv_order=['word', 'trial', 'rt'])
+    for trial in trials:
+        assert io.addTrialHandlerRecord(trial)
+    assert io.requests.count('extendConditionVariableColumns') == 3
+    assert list(_cvTable(datastore)['word']) == [b'word0', b'word1', b'word2']
+    # the table can still be extended one row at a time
+    assert datastore.extendConditionVariableTable(1, 1, [b'word3', 3, 1.5])
+    assert len(_cvTable(datastore)) == 4
+
+
+@pytest.mark.benchmark
+def test_cachedRecordsBenchmark(datastore, record_property):
+    trials = _trials(2000)
+    io = _Connection(datastore)
+    io.createTrialHandlerRecordTable(SimpleNamespace(trialList=trials))
+    start = time.perf_counter()
+    for trial in trials[:1000]:
+        io.addTrialHandlerRecord(trial)
+    record_property("single_1000_records_ms", (time.perf_counter() - start) * 1000)
+
+    io._cv_cache_size = 1000
+    start = time.perf_counter()
+    for trial in trials[1000:]:
+        io.addTrialHandlerRecord(trial)
+    record_property("cached_1000_records_ms", (time.perf_counter() - start) * 1000)
+    assert len(_cvTable(datastore)) == 2000
@@ -0,0 +1,126 @@
+"""
+Tests for the adaptive device polling and device metrics of the ioHub Server,
+which are run in this process rather than by launching the ioHub Server.
+"""
+from collections import deque
+
+import gevent
+import pytest
+
+from psychopy.iohub.devices import DeviceEvent
+from psychopy.iohub.server import DeviceMonitor, DeviceStatistics, ioServer
+
+
+class _PolledDevice:
+    """Just enough of a Device to be polled and have its events processed.
+    Adds one event to its buffer each poll while 'busy' is True."""
+    def __init__(self, name='polled', buffer_length=8):
+        self.name = name
+        self.busy = False
+        self._native_event_buffer = deque(maxlen=buffer_length)
+        self._filters = dict()
+        self.handled = []
+
+    def _getNativeEventBuffer(self):
+        return self._native_event_buffer
+
+    def _poll(self):
+        if self.busy:
+            event = [0] * (DeviceEvent.EVENT_FILTER_ID_INDEX + 1)
+            self._native_event_buffer.append(event)
+
+    def _getIOHubEventObject(self, event):
+        return event
+
+    def _getEventListeners(self, event_type):
+        return [self]
+
+    def _handleEvent(self, event):
+        self.handled.append(event)
+
+
+class _Server(ioServer):
+    """An ioServer without its UDP server, datastore or devices."""
+    def __init__(self, devices):
+        self.devices = devices
+        self.deviceStatistics = dict()
+
+    def __del__(self):
+        pass
+
+
+def test_adaptivePolling():
+    device = _PolledDevice()
+    monitor = DeviceMonitor(device, 0.001, 0.008)
+    # record the interval slept before each poll
+    intervals = []
+    poll = device._poll
+
+    def recordingPoll():
+        intervals.append(monitor.current_interval)
+        poll()
+    device._poll = recordingPoll
+
+    monitor.start()
+    try:
+        gevent.sleep(0.1)
+        # idle, so the interval doubles after each poll, up to the max
+        assert intervals[:5] == [0.001, 0.002, 0.004, 0.008, 0.008]
+        assert set(intervals[3:]) == {0.008}
+        assert monitor.current_interval == monitor.max_sleep_interval
+        assert monitor.statistics.idle_poll_count == monitor.statistics.poll_count
+        idlePolls = monitor.statistics.poll_count
+
+        device.busy = True
+        gevent.sleep(0.02)
+        # busy, so back to polling every sleep_interval
+        busyIntervals = intervals[idlePolls:]
+        assert len(busyIntervals) > 1
+        assert set(busyIntervals[1:]) == {0.001}
+        assert monitor.current_interval == monitor.sleep_interval
+        assert monitor.statistics.buffer_high_water == 8
+        assert monitor.statistics.buffer_full_count > 0
+    finally:
+        monitor.running = False
+        monitor.join()
+
+    # without a max interval the poll interval doesn't change
+    monitor = DeviceMonitor(_PolledDevice(), 0.002)
+    assert monitor.max_sleep_interval == 0.002
+
+
+def test_deviceMetrics():
+    idle, busy = _PolledDevice('idle'), _PolledDevice('busy', buffer_length=1000)
+    server = _Server([idle, busy])
+
+    busy.busy = True
+    for n in range(3):
+        for i in range(100):
+            busy._poll()
+        server.processDeviceEvents()
+    assert len(busy.handled) == 300
+    # devices without events aren't processed
+    assert idle not in server.deviceStatistics
+
+    metrics = server.getDeviceMetrics(reset=True)
+    assert set(metrics) == {'idle', 'busy'}
+    assert metrics['busy']['event_count'] == 300
+    assert metrics['busy']['events_per_sec'] > 0
+    assert metrics['busy']['buffer_high_water'] == 100
+    assert metrics['busy']['buffer_length'] == 1000
+    assert metrics['busy']['buffer_full_count'] == 0
+    assert metrics['busy']['poll_duration'] is None
+    assert set(metrics['busy']['process_duration']) == {'p50', 'p95', 'p99', 'max'}
+    assert metrics['idle']['event_count'] == 0
+    assert metrics['idle']['process_duration'] is None
+
+    # statistics are collected again after a reset
+    assert server.getDeviceMetrics()['busy']['event_count'] == 0
+
+
+def test_statisticsPercentiles():
+    stats = DeviceStatistics(_PolledDevice())
+    stats.poll_durations.extend([0.001] * 99 + [0.01])
+    metrics = stats.getMetrics()
+    assert metrics['poll_duration']['p50'] == pytest.approx(1.0)
+    assert metrics['poll_duration']['max'] == pytest.approx(10.0)
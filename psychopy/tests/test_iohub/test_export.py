@@ -0,0 +1,181 @@
+"""
+Tests for exporting the event tables of ioHub DataStore files, labelled with
+the condition variables of each trial.
+"""
+import os
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+tables = pytest.importorskip('tables')
+pandas = pytest.importorskip('pandas')
+
+from psychopy.iohub.constants import EventConstants
+from psychopy.iohub.datastore import DataStoreFile
+from psychopy.iohub.datastore.export import TrialWindows, exportFile, main, _importPyarrow
+from psychopy.iohub.devices import Computer
+from psychopy.iohub.devices.replay import MonocularEyeSampleEvent, MessageEvent
+
+SAMPLE_RATE = 1000
+CV_DTYPE = [('trial', 'i4'), ('word', 'S8'), ('trial_start', 'f8'), ('trial_stop', 'f8')]
+
+
+def _makeEvents(eventClass, times, **values):
+    rows = np.zeros(len(times), dtype=eventClass.NUMPY_DTYPE)
+    rows['type'] = eventClass.EVENT_TYPE_ID
+    rows['time'] = times
+    for name, value in values.items():
+        rows[name] = value
+    events = [list(row) for row in rows.tolist()]
+    for event in events:
+        for i, name in enumerate(rows.dtype.names):
+            if rows.dtype[name].kind == 'S':
+                event[i] = event[i].decode('utf-8')
+    return events
+
+
+@pytest.fixture(scope='module')
+def dataFile(tmp_path_factory):
+    """A DataStore file with two sessions of 1kHz eye samples and messages,
+    and 1 second trials starting every 2 seconds."""
+    folder = tmp_path_factory.mktemp('export')
+    eventClasses = {'monocular_eye_sample': MonocularEyeSampleEvent,
+                    'message': MessageEvent}
+    EventConstants.addClassMappings(
+        [cls.EVENT_TYPE_ID for cls in eventClasses.values()], eventClasses)
+
+    datastore = DataStoreFile('export.hdf5', str(folder), 'w',
+                              {'multiple_sessions': False, 'flush_interval': 32})
+    datastore.updateDataStoreStructure(Computer, eventClasses)
+    datastore.createOrUpdateExperimentEntry([0, 'export', 'Export', '', '1.0'])
+    for code, start in (('a', 10.0), ('b', 100.0)):
+        session_id = datastore.createExperimentSessionEntry(
+            dict(code=code, name=code, comments='', user_variables='{}'))
+        datastore.initConditionVariableTable(1, session_id, CV_DTYPE)
+        trialStarts = start + np.arange(5) * 2.0
+        datastore.extendConditionVariableColumns(1, session_id, [
+            list(range(5)), ['{}{}'.format(code, n).encode('utf-8') for n in range(5)],
+            list(trialStarts), list(trialStarts + 1.0)])
+        sampleTimes = start + np.arange(10 * SAMPLE_RATE) / SAMPLE_RATE
+        datastore._handleEvents(_makeEvents(
+            MonocularEyeSampleEvent, sampleTimes, gaze_x=np.arange(len(sampleTimes))))
+        messageTimes = start + np.arange(0, 10, 0.5) + 0.0001
+        datastore._handleEvents(_makeEvents(
+            MessageEvent, messageTimes, text='session {}'.format(code)))
+    datastore.close()
+    return str(folder / 'export.hdf5')
+
+
+def test_trialWindows():
+    cv = np.zeros(5, dtype=[('EXPERIMENT_ID', 'i4'), ('SESSION_ID', 'i4'),
+                            ('trial_start', 'f8'), ('trial_stop', 'f8')])
+    cv['SESSION_ID'] = [1, 1, 1, 2, 2]
+    cv['trial_start'] = [3.0, 1.0, np.nan, 1.0, 5.0]
+    cv['trial_stop'] = [4.0, 2.0, 9.0, 2.0, 6.0]
+    windows = TrialWindows(cv, 'trial_start', 'trial_stop')
+    times = np.array([0.5, 1.0, 1.5, 2.5, 3.5, 4.0, 1.5, 5.5, 6.5, 1.5])
+    sessions = np.array([1, 1, 1, 1, 1, 1, 2, 2, 2, 3])
+    np.testing.assert_array_equal(windows.trialIndices(sessions, times),
+                                  [-1, 1, 1, -1, 0, 0, 3, 4, -1, -1])
+    windows = TrialWindows(cv, 'trial_start', 'trial_stop', time_margins=(0.5, 0.5))
+    np.testing.assert_array_equal(windows.trialIndices(sessions[:4], times[:4]), [1, 1, 1, 0])
+    with pytest.raises(ValueError):
+        TrialWindows(cv, 'start', 'trial_stop')
+
+
+def _expectedTrials(events):
+    """The trial of each event, found one event at a time."""
+    trials = []
+    for session_id, t in zip(events['session_id'], events['time']):
+        start = 10.0 if session_id == 1 else 100.0
+        trial = int((t - start) // 2)
+        trials.append(trial if t - start - trial * 2 <= 1.0 else -1)
+    return trials
+
+
+def test_exportCsv(dataFile, tmp_path):
+    counts = exportFile(dataFile, str(tmp_path), exportFormat='csv', trialStart='trial_start',
+                        trialStop='trial_stop', chunkSize=3000)
+    assert counts == dict(MonocularEyeSampleEvent=20000, MessageEvent=40)
+    folder = tmp_path / 'export'
+    assert sorted(os.listdir(folder)) == ['MessageEvent', 'MonocularEyeSampleEvent']
+    assert sorted(os.listdir(folder / 'MessageEvent')) == ['session_1.csv', 'session_2.csv']
+
+    for session_id, code in ((1, 'a'), (2, 'b')):
+        samples = pandas.read_csv(folder / 'MonocularEyeSampleEvent' / 'session_{}.csv'.format(session_id))
+        assert len(samples) == 10000
+        assert list(samples['gaze_x']) == list(range(10000))
+        trials = _expectedTrials(samples)
+        # rows of both sessions' trials are in the one condition variables table
+        assert list(samples['trial_index']) == [t + 5 * (session_id - 1) if t >= 0 else -1 for t in trials]
+        inTrial = samples['trial_index'] >= 0
+        assert list(samples['trial'][inTrial]) == [t for t in trials if t >= 0]
+        assert set(samples['word'][inTrial]) == {'{}{}'.format(code, n) for n in range(5)}
+        assert samples['word'][~inTrial].isna().all()
+
+        messages = pandas.read_csv(folder / 'MessageEvent' / 'session_{}.csv'.format(session_id))
+        assert set(messages['text']) == {'session {}'.format(code)}
+        trials = np.array(_expectedTrials(messages), dtype=float)
+        trials[trials < 0] = np.nan
+        np.testing.assert_array_equal(messages['trial'], trials)
+
+    counts = exportFile(dataFile, str(tmp_path / 'trials'), exportFormat='csv', eventTypes=['MessageEvent'],
+                        trialStart='trial_start', trialStop='trial_stop', cvColumns=['word'], trialsOnly=True)
+    messages = pandas.read_csv(tmp_path / 'trials' / 'export' / 'MessageEvent' / 'session_1.csv')
+    assert counts == dict(MessageEvent=len(messages) * 2)
+    assert (messages['trial_index'] >= 0).all()
+    assert 'trial' not in messages.columns and messages['word'].notna().all()
+
+
+def test_exportCsvIntegers(dataFile, tmp_path):
+    # chunks with and without events outside trials write integer condition variables the same way
+    exportFile(dataFile, str(tmp_path), exportFormat='csv', eventTypes=['MonocularEyeSampleEvent'],
+               trialStart='trial_start', trialStop='trial_stop', chunkSize=500)
+    samples = pandas.read_csv(tmp_path / 'export' / 'MonocularEyeSampleEvent' / 'session_1.csv', dtype=str)
+    trials = samples['trial'].dropna()
+    assert len(trials) < len(samples)
+    assert trials.str.isdigit().all()
+
+
+def test_exportArrow(dataFile, tmp_path):
+    pytest.importorskip('pyarrow')
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    exportFile(dataFile, str(tmp_path), exportFormat='csv', trialStart='trial_start', trialStop='trial_stop')
+    expected = pandas.read_csv(tmp_path / 'export' / 'MonocularEyeSampleEvent' / 'session_2.csv')
+    for exportFormat, read in (('parquet', pyarrow.parquet.read_table), ('feather', pyarrow.feather.read_table)):
+        exportFile(dataFile, str(tmp_path), exportFormat=exportFormat, trialStart='trial_start',
+                   trialStop='trial_stop', chunkSize=3000)
+        table = read(str(tmp_path / 'export' / 'MonocularEyeSampleEvent' / 'session_2.{}'.format(exportFormat)))
+        assert table.num_rows == 10000
+        assert table.column('trial_index').to_pylist() == list(expected['trial_index'])
+        assert table.column('word').null_count == (expected['trial_index'] < 0).sum()
+        if exportFormat == 'parquet':
+            assert pyarrow.parquet.ParquetFile(
+                str(tmp_path / 'export' / 'MonocularEyeSampleEvent' / 'session_2.parquet')).num_row_groups == 4
+
+
+def test_pyarrowMissing(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with pytest.raises(ImportError, match='pip install pyarrow') as err:
+        _importPyarrow()
+    assert isinstance(err.value.__cause__, ImportError)
+
+
+def test_main(dataFile, tmp_path, capsys):
+    copies = []
+    for name in ('one.hdf5', 'two.hdf5'):
+        copies.append(str(tmp_path / name))
+        shutil.copy(dataFile, copies[-1])
+    output = tmp_path / 'exported'
+    assert main(copies + ['-o', str(output), '-f', 'csv', '-j', '2', '-e', 'MessageEvent',
+                          '--trial-start', 'trial_start', '--trial-stop', 'trial_stop']) == 0
+    for name in ('one', 'two'):
+        assert sorted(os.listdir(output / name / 'MessageEvent')) == ['session_1.csv', 'session_2.csv']
+    assert 'MessageEvent 40' in capsys.readouterr().out
+
+    assert main([str(tmp_path / 'missing.hdf5'), '-o', str(output), '-f', 'csv']) == 1
+    assert 'export failed' in capsys.readouterr().err
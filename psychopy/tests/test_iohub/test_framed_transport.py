@@ -0,0 +1,163 @@
+"""
+Tests for the tcp and uds (framed) transports of the ioHub Server, compared
+with the udp transport. The servers are run by a gevent hub in a thread of
+this process, rather than by launching the ioHub Server.
+"""
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import gevent
+import msgpack
+import pytest
+
+from psychopy.iohub.net import (UDPClientConnection, FramedClientConnection,
+                                FrameReader, packFrame, getFramedAddress)
+from psychopy.iohub.server import udpServer, framedServer, FramedReply
+
+EVENT_COUNT = 300
+
+
+class _Server:
+    """Just enough of an ioServer to answer GET_EVENTS and RPC requests."""
+    def __init__(self, event_count):
+        self.events = [[0, 0, 0, n, 0, 0.0, 0.0, float(n), 0.0, 0.0, 0]
+                       for n in range(event_count)]
+        self.eventBuffer = deque()
+
+    def log(self, text):
+        pass
+
+    def processDeviceEvents(self):
+        self.eventBuffer.extend(self.events)
+
+    def getDeviceMetrics(self, reset=False):
+        return dict()
+
+
+@pytest.fixture(params=['tcp', 'uds'])
+def servers(request, tmp_path):
+    """Runs a udpServer and a framedServer using the tcp or uds transport,
+    returning their addresses."""
+    if request.param == 'uds' and not hasattr(socket, 'AF_UNIX'):
+        pytest.skip('Unix domain sockets not available.')
+    config = dict(ipc_transport=request.param, tcp_port=0,
+                  uds_path=str(tmp_path / 'iohub.sock'))
+    addresses = dict()
+    ready = threading.Event()
+    running = [True]
+
+    def serve():
+        udp = udpServer(_Server(EVENT_COUNT), '127.0.0.1:0')
+        framed = framedServer(udp, getFramedAddress(config))
+        udp.start()
+        framed.start()
+        addresses['udp'] = udp.server_port
+        addresses['framed'] = framed.uds_path or ('127.0.0.1', framed.server_port)
+        ready.set()
+        while running[0]:
+            gevent.sleep(0.01)
+        framed.stop()
+        udp.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield addresses
+    running[0] = False
+    thread.join(5)
+
+
+def test_frameReader():
+    frames = b''.join(packFrame(msgpack.packb, n, ['data', n]) for n in range(50))
+    reader = FrameReader()
+    received = []
+    # frames split across, and sharing, reads
+    for start in range(0, len(frames), 7):
+        reader.feed(frames[start:start + 7])
+        received.extend(reader.frames())
+    assert received == [[n, ['data', n]] for n in range(50)]
+    assert len(reader._buffer) == 0
+
+
+def test_getFramedAddress():
+    assert getFramedAddress(dict()) is None
+    assert getFramedAddress(dict(ipc_transport='tcp', tcp_port=9100)) == ('127.0.0.1', 9100)
+    if hasattr(socket, 'AF_UNIX'):
+        assert getFramedAddress(dict(ipc_transport='uds', udp_port=9100)).endswith('iohub_9100.sock')
+    with pytest.raises(ValueError):
+        getFramedAddress(dict(ipc_transport='pipe'))
+
+
+def test_pipelinedRequests(servers):
+    client = FramedClientConnection(servers['framed'], timeout=5, max_pending=4)
+    try:
+        requestIds = [client.sendRequest(['RPC', 'getTime']) for n in range(10)]
+        # only max_pending requests are waiting for a response at a time
+        assert len(client._pending) <= 4
+        times = [client.getResponse(r)[2] for r in reversed(requestIds)]
+        assert times == sorted(times, reverse=True)
+        assert client.request(['RPC', 'getDeviceMetrics', [False]]) == ['RPC_RESULT', 'getDeviceMetrics', {}]
+        assert client.request(['RPC', 'noSuchMethod']) == 'RPC_ATTRIBUTE_ERROR'
+
+        # large responses are sent as one frame
+        client.sendTo(['GET_EVENTS'])
+        (reply, events), _ = client.receive()
+        assert reply == 'GET_EVENTS_RESULT' and len(events) == EVENT_COUNT
+        with pytest.raises(KeyError):
+            client.getResponse(requestIds[0])
+    finally:
+        client.close()
+
+
+def _requestRate(sendTo, receive, request, duration=0.25):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        sendTo(request)
+        assert receive()[0] is not None
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(sys.platform == 'darwin', reason='UDP multi packet responses are slow on macOS')
+def test_framedThroughput(servers, record_property):
+    """Request rates of the udp and framed transports, for small and large
+    requests."""
+    udp = UDPClientConnection(remote_port=servers['udp'], timeout=5)
+    framed = FramedClientConnection(servers['framed'], timeout=5)
+    try:
+        for name, request in (('rpc', ['RPC', 'getTime']), ('events', ['GET_EVENTS'])):
+            record_property("{}_udp_per_sec".format(name),
+                            _requestRate(udp.sendTo, udp.receive, request))
+            record_property("{}_framed_per_sec".format(name),
+                            _requestRate(framed.sendTo, framed.receive, request))
+        # pipelining several small requests at a time
+        start = time.perf_counter()
+        for n in range(100):
+            for r in [framed.sendRequest(['RPC', 'getTime']) for i in range(10)]:
+                assert framed.getResponse(r)[0] == 'RPC_RESULT'
+        record_property("rpc_framed_pipelined_per_sec", 1000 / (time.perf_counter() - start))
+    finally:
+        udp.close()
+        framed.close()
+
+
+class _BrokenSocket:
+    closed = False
+
+    def sendall(self, data):
+        raise ConnectionResetError()
+
+    def close(self):
+        self.closed = True
+
+
+def test_framedReplySendError():
+    # a failed send closes the connection rather than sending on it again
+    sock = _BrokenSocket()
+    FramedReply(sock, None, 1, msgpack.packb).send(['RPC_RESULT', 'getTime', 0.0])
+    assert sock.closed
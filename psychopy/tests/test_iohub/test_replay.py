@@ -0,0 +1,215 @@
+"""
+Tests for the Replay device, which streams events from an ioHub DataStore
+file. The device is created directly, so the ioHub Server isn't needed.
+"""
+import gc
+import time
+
+import numpy as np
+import pytest
+
+tables = pytest.importorskip('tables')
+
+from psychopy.iohub.constants import EventConstants
+from psychopy.iohub.datastore import DataStoreFile
+from psychopy.iohub.devices import DeviceEvent, Computer, import_device
+from psychopy.iohub.devices.replay import (Replay, MonocularEyeSampleEvent,
+                                           MessageEvent)
+
+SAMPLE_RATE = 2000
+
+
+def _makeEvents(eventClass, times, **values):
+    rows = np.zeros(len(times), dtype=eventClass.NUMPY_DTYPE)
+    rows['type'] = eventClass.EVENT_TYPE_ID
+    rows['time'] = times
+    rows['device_time'] = np.asarray(times) + 1000
+    rows['logged_time'] = times
+    for name, value in values.items():
+        rows[name] = value
+    events = [list(row) for row in rows.tolist()]
+    for event in events:
+        for i, name in enumerate(rows.dtype.names):
+            if rows.dtype[name].kind == 'S':
+                event[i] = event[i].decode('utf-8')
+    return events
+
+
+@pytest.fixture(scope='module')
+def replayFile(tmp_path_factory):
+    """A DataStore file with a 2kHz eye sample stream and messages in session
+    'a', and a few of each in session 'b'."""
+    folder = tmp_path_factory.mktemp('replay')
+    eventClasses = {'monocular_eye_sample': MonocularEyeSampleEvent,
+                    'message': MessageEvent}
+    EventConstants.addClassMappings(
+        [cls.EVENT_TYPE_ID for cls in eventClasses.values()], eventClasses)
+
+    datastore = DataStoreFile('replay.hdf5', str(folder), 'w',
+                              {'multiple_sessions': False, 'flush_interval': 32})
+    datastore.updateDataStoreStructure(Computer, eventClasses)
+    datastore.createOrUpdateExperimentEntry([0, 'replay', 'Replay', '', '1.0'])
+    for code, duration, start in (('a', 0.5, 10.0), ('b', 0.05, 20.0)):
+        datastore.createExperimentSessionEntry(
+            dict(code=code, name=code, comments='', user_variables='{}'))
+        sampleTimes = start + np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+        datastore._handleEvents(_makeEvents(
+            MonocularEyeSampleEvent, sampleTimes,
+            gaze_x=np.arange(len(sampleTimes))))
+        messageTimes = start + np.arange(0, duration, 0.1) + 0.0001
+        datastore._handleEvents(_makeEvents(
+            MessageEvent, messageTimes, text='session {}'.format(code)))
+    datastore.close()
+    return str(folder / 'replay.hdf5')
+
+
+class _Server:
+    """Stands in for the ioHub Server, which clears the device's events when
+    event reporting is enabled."""
+    def processDeviceEvents(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def server(monkeypatch):
+    # closing a device (as it's collected) unsets the server of its class, so
+    # collect the devices of earlier tests first
+    gc.collect()
+    monkeypatch.setattr(Replay, '_iohub_server', _Server())
+
+
+def _makeReplay(replayFile, **config):
+    dconfig = dict(name='replay', file=replayFile, session_code=None,
+                   speed=1.0, loop=False, auto_report_events=False,
+                   event_buffer_length=1024, device_number=0,
+                   manufacturer_name='Open Science Tools', model_name='Replay',
+                   monitor_event_types=['MonocularEyeSampleEvent', 'MessageEvent'])
+    dconfig.update(config)
+    return Replay(dconfig=dconfig)
+
+
+def _replayAll(replay, pollInterval=0.0, timeout=10):
+    events = []
+    replay.enableEventReporting(True)
+    start = time.perf_counter()
+    while not replay.getReplayStatus()['finished']:
+        replay._poll()
+        events.extend(replay._native_event_buffer)
+        replay._native_event_buffer.clear()
+        assert time.perf_counter() - start < timeout
+        if pollInterval:
+            time.sleep(pollInterval)
+    return events, time.perf_counter() - start
+
+
+@pytest.mark.benchmark
+def test_replayAsFastAsPossible(replayFile, record_property):
+    replay = _makeReplay(replayFile, speed=0.0)
+    events, duration = _replayAll(replay)
+    replay._close()
+
+    samples = [e for e in events
+               if e[DeviceEvent.EVENT_TYPE_ID_INDEX] == MonocularEyeSampleEvent.EVENT_TYPE_ID]
+    messages = [e for e in events
+                if e[DeviceEvent.EVENT_TYPE_ID_INDEX] == MessageEvent.EVENT_TYPE_ID]
+    # only session 'a' by default
+    assert len(samples) == 0.5 * SAMPLE_RATE
+    assert len(messages) == 5
+    assert all(m[-1] == 'session a' for m in messages)
+    # events are merged in time order and given new ids and times
+    gazeX = [e[MonocularEyeSampleEvent.CLASS_ATTRIBUTE_NAMES.index('gaze_x')]
+             for e in samples]
+    assert gazeX == list(range(len(samples)))
+    ids = [e[DeviceEvent.EVENT_ID_INDEX] for e in events]
+    assert ids == sorted(set(ids))
+    times = np.array([e[DeviceEvent.EVENT_HUB_TIME_INDEX] for e in events])
+    assert np.all(np.diff(times) >= 0)
+    assert abs(times[-1] - Computer.getTime()) < 5
+    record_property("events_per_sec", len(events) / duration)
+
+
+def test_replayTiming(replayFile, record_property):
+    speed = 5.0
+    replay = _makeReplay(replayFile, speed=speed)
+    events, duration = _replayAll(replay, pollInterval=0.001)
+
+    times = np.array([e[DeviceEvent.EVENT_HUB_TIME_INDEX] for e in events])
+    delays = np.array([e[DeviceEvent.EVENT_DELAY_INDEX] for e in events])
+    deviceTimes = np.array([e[DeviceEvent.EVENT_DEVICE_TIME_INDEX] for e in events])
+    # intervals between events are those recorded, scaled by the speed
+    samples = np.array([e[DeviceEvent.EVENT_TYPE_ID_INDEX] == MonocularEyeSampleEvent.EVENT_TYPE_ID
+                        for e in events])
+    np.testing.assert_allclose(np.diff(times[samples]), 1.0 / SAMPLE_RATE / speed,
+                               rtol=1e-6)
+    np.testing.assert_allclose(deviceTimes - times, 1000)
+    assert np.all(delays >= 0)
+    # events aren't replayed before they are due
+    assert duration > 0.5 / speed * 0.9
+    record_property("median_delay", np.median(delays))
+
+    # replaying again from the start, with a different speed part way through
+    replay.restart()
+    replay.setSpeed(0.0)
+    replay._poll()
+    assert replay.getReplayStatus()['replayed_count'] == len(events)
+    with pytest.raises(ValueError):
+        replay.setSpeed(-1)
+    replay._close()
+
+
+def test_replaySessionAndTypes(replayFile):
+    replay = _makeReplay(replayFile, speed=0.0, session_code='b',
+                         monitor_event_types=['MessageEvent'])
+    events, duration = _replayAll(replay)
+    assert [e[-1] for e in events] == ['session b']
+    replay._close()
+
+
+def test_replayMissingSession(replayFile):
+    replay = _makeReplay(replayFile, session_code='c')
+    assert replay._hw_interface_status == Replay.HW_STAT_ERROR
+    assert replay.getReplayStatus()['finished']
+    replay.enableEventReporting(True)
+    assert not replay._poll()
+
+
+def test_replayLoop(replayFile):
+    replay = _makeReplay(replayFile, speed=0.0, loop=True, session_code='b',
+                         event_buffer_length=256)
+    replay.enableEventReporting(True)
+    for n in range(3):
+        replay._poll()
+    assert replay.getReplayStatus()['replayed_count'] == 3 * 256
+    assert not replay.getReplayStatus()['finished']
+    replay._close()
+
+
+def test_replayMouseEvents(tmp_path):
+    # the ioHub Server loads the Keyboard device before the Replay device,
+    # which the mouse event classes need
+    try:
+        import_device('psychopy.iohub.devices.keyboard', 'Keyboard')
+    except ImportError:
+        pytest.skip('The Keyboard device can not be loaded.')
+    _, _, eventClasses = import_device('psychopy.iohub.devices.replay', 'Replay')
+    MouseMoveEvent = eventClasses['MOUSE_MOVE']
+    EventConstants.addClassMappings([MouseMoveEvent.EVENT_TYPE_ID], eventClasses)
+    assert EventConstants.getClass(MouseMoveEvent.EVENT_TYPE_ID) is MouseMoveEvent
+
+    datastore = DataStoreFile('mouse.hdf5', str(tmp_path), 'w',
+                              {'multiple_sessions': False, 'flush_interval': 32})
+    datastore.updateDataStoreStructure(Computer, {'mouse_move': MouseMoveEvent})
+    datastore.createOrUpdateExperimentEntry([0, 'replay', 'Replay', '', '1.0'])
+    datastore.createExperimentSessionEntry(
+        dict(code='a', name='a', comments='', user_variables='{}'))
+    datastore._handleEvents(_makeEvents(MouseMoveEvent, 10.0 + np.arange(5) / 100,
+                                        x_position=np.arange(5)))
+    datastore.close()
+
+    replay = _makeReplay(str(tmp_path / 'mouse.hdf5'), speed=0.0,
+                         monitor_event_types=['MouseMoveEvent'])
+    events, duration = _replayAll(replay)
+    replay._close()
+    assert {e[DeviceEvent.EVENT_TYPE_ID_INDEX] for e in events} == {MouseMoveEvent.EVENT_TYPE_ID}
+    xIndex = MouseMoveEvent.CLASS_ATTRIBUTE_NAMES.index('x_position')
+    assert [e[xIndex] for e in events] == list(range(5))
@@ -0,0 +1,133 @@
+import threading
+import timeit
+
+import numpy as np
+import pytest
+
+from psychopy.iohub.util import RingBuffer, NumPyRingBuffer
+
+sampleDtype = np.dtype([('time', np.float64), ('gaze_x', np.float32),
+                        ('status', np.uint8)])
+
+
+def _samples(start, count):
+    samples = np.zeros(count, dtype=sampleDtype)
+    samples['time'] = np.arange(start, start + count)
+    samples['gaze_x'] = samples['time'] * 2
+    return samples
+
+
+def test_structured():
+    buffer = RingBuffer(10, dtype=sampleDtype)
+    assert len(buffer) == 0 and buffer.maxlen == 10
+    buffer.append((0, 0, 1))
+    buffer.append([1, 2, 0])
+    buffer.extend(_samples(2, 5))
+    assert len(buffer) == 7
+    np.testing.assert_array_equal(buffer.getElements()['time'], np.arange(7))
+    assert buffer.popleft()['status'] == 1
+
+    # wrap around, keeping only the newest elements
+    buffer.extend(_samples(7, 8))
+    assert buffer.isFull()
+    elements = buffer.getElements()
+    np.testing.assert_array_equal(elements['time'], np.arange(5, 15))
+    np.testing.assert_array_equal(elements['gaze_x'], np.arange(5, 15) * 2)
+    # reads are views, not copies
+    assert np.shares_memory(elements, buffer._npa)
+
+    popped = buffer.popElements(4)
+    np.testing.assert_array_equal(popped['time'], np.arange(5, 9))
+    assert not np.shares_memory(popped, buffer._npa)
+    assert len(buffer) == 6
+    buffer.extend(_samples(100, 25))
+    np.testing.assert_array_equal(buffer.popElements()['time'], np.arange(115, 125))
+    assert len(buffer) == 0
+    assert len(buffer.popElements()) == 0
+    with pytest.raises(IndexError):
+        buffer.popleft()
+
+
+def test_objects():
+    buffer = RingBuffer(3, dtype=object)
+    events = [[n, 'event', n * 0.1] for n in range(5)]
+    for event in events[:2]:
+        buffer.append(event)
+    buffer.extend(events[2:])
+    assert list(buffer) == events[2:]
+    assert buffer.popleft() is events[2]
+    buffer.clear()
+    assert len(buffer) == 0 and not buffer
+    buffer.extend(events[:1])
+    assert list(buffer.popElements()) == events[:1]
+
+    # like a deque with maxlen=0
+    empty = RingBuffer(0, dtype=object)
+    empty.append(events[0])
+    empty.extend(events)
+    assert len(empty) == 0 and list(empty) == []
+
+
+def test_numPyRingBuffer():
+    buffer = NumPyRingBuffer(5)
+    for value in range(3):
+        buffer.append(value)
+    assert not buffer.isFull()
+    assert buffer.mean() == 1
+    for value in range(3, 8):
+        buffer.append(value)
+    assert buffer.isFull()
+    assert list(buffer[0:3]) == [3, 4, 5]
+    assert buffer[-1] == 7
+    assert buffer.max() == 7
+    buffer[0] = 10
+    buffer[1:3] = 0
+    # changes to the elements are kept as the buffer wraps
+    buffer.append(8)
+    buffer.append(9)
+    np.testing.assert_array_equal(buffer.getElements(), [0, 6, 7, 8, 9])
+    assert np.median(buffer.getElements()) == 7
+    buffer.clear()
+    assert len(buffer) == 0
+    buffer.append(1.5)
+    assert buffer[0] == 1.5
+
+
+def test_producerConsumerThreads():
+    """Elements read while another thread adds elements are in order, and
+    are never repeated or from an unfinished write."""
+    buffer = RingBuffer(64, dtype=sampleDtype)
+    count = 20000
+
+    def produce():
+        for start in range(0, count, 10):
+            buffer.extend(_samples(start, 10))
+            buffer.append(_samples(count + start, 1)[0])
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    received = []
+    while producer.is_alive() or len(buffer):
+        received.append(buffer.popElements())
+    producer.join()
+    received = np.concatenate(received)
+    assert len(received) > 0
+    np.testing.assert_array_equal(received['gaze_x'], received['time'] * 2)
+    ordered = received[received['time'] < count]['time']
+    assert np.all(np.diff(ordered) > 0)
+
+
+@pytest.mark.benchmark
+def test_bulkExtendSpeed(record_property):
+    samples = _samples(0, 1000)
+    buffer = RingBuffer(1024, dtype=sampleDtype)
+
+    def appendEach():
+        for sample in samples:
+            buffer.append(sample)
+
+    tExtend = min(timeit.repeat(lambda: buffer.extend(samples), number=10, repeat=3))
+    tAppend = min(timeit.repeat(appendEach, number=10, repeat=3))
+    record_property("extend_1000_samples_ms", tExtend * 100)
+    record_property("append_1000_samples_ms", tAppend * 100)
+    np.testing.assert_array_equal(buffer.getElements()[-len(samples):], samples)
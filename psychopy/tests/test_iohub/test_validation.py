@@ -0,0 +1,150 @@
+"""
+Tests for the sample selection and error calculations of the eye tracker
+ValidationProcedure, using synthetic samples and messages rather than a
+window and eye tracker.
+"""
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from psychopy.iohub.constants import EventConstants
+from psychopy.iohub.client.eyetracker.validation.procedure import (
+    ValidationProcedure, ValidationTargetRenderer)
+
+STATIONARY = ValidationTargetRenderer.TARGET_STATIONARY
+
+
+class _Device:
+    def __init__(self, name):
+        self.name = name
+
+    def getName(self):
+        return self.name
+
+
+def _message(t, text):
+    return SimpleNamespace(time=t, category='VALIDATION', text=text)
+
+
+def _targetData(positions, rate, binocular=False, seed=0):
+    """Events for each target position: the target moves to the position,
+    is stationary, expands, and is stationary again until the next position.
+    Gaze is the target position plus noise, with ~5% missing samples."""
+    rng = np.random.default_rng(seed)
+    tracker, experiment = _Device('tracker'), _Device('experiment')
+    targetdata = []
+    for pindex, (x, y) in enumerate(positions):
+        t0 = pindex * 2.0
+        messages = [_message(t0, 'POS_UPDATE {},{}'.format(x, y)),
+                    _message(t0 + 0.2, 'TARGET_POS {},{}'.format(x, y)),
+                    _message(t0 + 1.0, 'EXPAND_SIZE 1.0 2.0'),
+                    _message(t0 + 1.2, 'START_DRAW {},{},{},0,0'.format(pindex, x, y)),
+                    _message(t0 + 2.0, 'BEGIN_SEQUENCE {}'.format(pindex))]
+        times = t0 + np.arange(int(2.0 * rate)) / rate
+        gaze = np.asarray((x, y)) + rng.normal(0, 5, (len(times), 2))
+        status = (rng.random(len(times)) < 0.05).astype(int)
+        if binocular:
+            samples = [SimpleNamespace(type=EventConstants.BINOCULAR_EYE_SAMPLE, time=t, status=s,
+                                       left_gaze_x=gx - 1, left_gaze_y=gy, left_pupil_measure1=3.0,
+                                       right_gaze_x=gx + 1, right_gaze_y=gy, right_pupil_measure1=3.0)
+                       for t, s, (gx, gy) in zip(times, status, gaze)]
+        else:
+            samples = [SimpleNamespace(type=EventConstants.MONOCULAR_EYE_SAMPLE, time=t, status=s,
+                                       gaze_x=gx, gaze_y=gy, pupil_measure1=3.0)
+                       for t, s, (gx, gy) in zip(times, status, gaze)]
+        targetdata.append(dict(events={tracker: samples, experiment: messages}))
+    return targetdata
+
+
+def _makeProcedure(positions, rate=1000, binocular=False):
+    renderer = ValidationTargetRenderer.__new__(ValidationTargetRenderer)
+    renderer.targetdata = _targetData(positions, rate, binocular)
+    renderer.positions = SimpleNamespace(getPositions=lambda: [np.asarray(p) for p in positions])
+    procedure = ValidationProcedure.__new__(ValidationProcedure)
+    procedure.targetsequence = renderer
+    procedure.io = SimpleNamespace(sendMessageEvent=lambda text, category: None)
+    procedure.win = SimpleNamespace(units='pix', size=np.asarray((1920, 1080)))
+    procedure.positions = SimpleNamespace(bounds=[-960, 540, 960, -540])
+    procedure.results_in_degrees = False
+    procedure.accuracy_period_start = 0.55
+    procedure.accuracy_period_stop = 0.15
+    return procedure
+
+
+def _expectedErrors(samples, binocular):
+    """Error stats of one position's samples, calculated as the procedure
+    used to, one position at a time."""
+    stationary = samples[samples['targ_state'] == STATIONARY]
+    last_stime = stationary[-1]['eye_time']
+    used = stationary[(stationary['eye_time'] >= last_stime - 0.55) &
+                      (stationary['eye_time'] < last_stime - 0.15) &
+                      (stationary['eye_status'] == 0)]
+    if binocular:
+        error = (np.hypot(used['targ_pos_x'] - used['left_eye_x'], used['targ_pos_y'] - used['left_eye_y']) +
+                 np.hypot(used['targ_pos_x'] - used['right_eye_x'], used['targ_pos_y'] - used['right_eye_y'])) / 2
+        gaze = np.column_stack(((used['left_eye_x'] + used['right_eye_x']) / 2,
+                                (used['left_eye_y'] + used['right_eye_y']) / 2))
+    else:
+        error = np.hypot(used['targ_pos_x'] - used['eye_x'], used['targ_pos_y'] - used['eye_y'])
+        gaze = np.column_stack((used['eye_x'], used['eye_y']))
+    s2s = np.sqrt(np.mean(np.sum(np.diff(gaze, axis=0) ** 2, axis=1)))
+    return dict(min_error=error.min(), max_error=error.max(), mean_error=error.mean(),
+                stdev_error=error.std(), rms_s2s_precision=s2s), len(used)
+
+
+@pytest.mark.parametrize('binocular', [False, True])
+def test_sampleMessageData(binocular):
+    positions = [(0, 0), (-400, 300), (400, -300)]
+    procedure = _makeProcedure(positions, binocular=binocular)
+    sample_array = procedure.targetsequence.getSampleMessageData()
+    assert len(sample_array) == 3
+    for pindex, samples in enumerate(sample_array):
+        # the last message of a position ends its samples
+        assert len(samples) == 2000
+        assert np.all(samples['targ_pos_ix'] == pindex)
+        t = samples['eye_time'] - pindex * 2.0
+        state = samples['targ_state']
+        assert np.all(state[t < 0.2] == ValidationTargetRenderer.TARGET_MOVING)
+        assert np.all(state[(t >= 0.2) & (t < 1.0)] == STATIONARY)
+        assert np.all(state[(t >= 1.0) & (t < 1.2)] == STATIONARY + ValidationTargetRenderer.TARGET_EXPANDING)
+        assert np.all(state[t >= 1.2] == STATIONARY)
+        assert set(samples['last_msg_type'][t >= 1.2]) == {'START_DRAW'}
+        assert set(samples['next_msg_type'][t >= 1.2]) == {'BEGIN_SEQUENCE'}
+        np.testing.assert_array_equal(samples['targ_pos_x'][t >= 0.2], positions[pindex][0])
+
+
+@pytest.mark.parametrize('binocular', [False, True])
+def test_validationResults(binocular):
+    positions = [(0, 0), (-400, 300), (400, -300), (400, 300)]
+    procedure = _makeProcedure(positions, binocular=binocular)
+    results = procedure._createValidationResults()
+    assert results['position_count'] == 4
+    assert results['passed'] and results['positions_failed_processing'] == 0
+
+    sample_array = procedure.targetsequence.getSampleMessageData()
+    for pindex, position_results in enumerate(results['position_results']):
+        expected, used_count = _expectedErrors(sample_array[pindex], binocular)
+        assert position_results['calculation_status'] == 'PASSED'
+        assert len(position_results['sample_from_filter_stages']['used_samples']) == used_count
+        for key, value in expected.items():
+            assert position_results[key] == pytest.approx(value)
+        assert position_results['filter_samples_time_range'] == pytest.approx(
+            [pindex * 2 + 1.999 - 0.55, pindex * 2 + 1.999 - 0.15])
+    assert results['mean_error'] == pytest.approx(
+        np.mean([p['mean_error'] for p in results['position_results']]))
+    assert results['min_error'] == min(p['min_error'] for p in results['position_results'])
+
+
+@pytest.mark.benchmark
+def test_validationResultsBenchmark(record_property):
+    """Time processing a 17 point validation with a 2 kHz tracker."""
+    positions = [(x, y) for x in (-400, -200, 0, 200, 400) for y in (-300, 0, 300)][:15]
+    positions += [(100, 100), (-100, -100)]
+    procedure = _makeProcedure(positions, rate=2000, binocular=True)
+    start = time.perf_counter()
+    results = procedure._createValidationResults()
+    record_property("samples", len(positions) * 4000)
+    record_property("duration_ms", (time.perf_counter() - start) * 1000)
+    assert results['passed']
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import pytest
+
+from psychopy.iohub.util.visualangle import VisualAngleCalc, generatedPointGrid
+
+DISPLAY_MM = (600.0, 330.0)
+DISPLAY_PIX = (1920, 1080)
+
+
+@pytest.fixture
+def calc():
+    return VisualAngleCalc(DISPLAY_MM, DISPLAY_PIX, 550.0)
+
+
+def test_pix2degForms(calc):
+    points = generatedPointGrid(1900, 1060, horiz_points=15, vert_points=15)
+    angle_x, angle_y = calc.pix2deg(points[:, 0], points[:, 1])
+    # N x 2 input gives N x 2 output
+    np.testing.assert_allclose(calc.pix2deg(points), np.column_stack((angle_x, angle_y)))
+    # scalars give the same angles
+    for i in (0, 17, 224):
+        assert calc.pix2deg(float(points[i, 0]), float(points[i, 1])) == pytest.approx(
+            (angle_x[i], angle_y[i]))
+    assert calc.pix2deg(0.0, 0.0) == (0.0, 0.0)
+    # symmetric about the display centre
+    np.testing.assert_allclose(angle_x, -angle_x[::-1], atol=1e-9)
+    # the edge of the display, level with the eye
+    assert calc.pix2deg(960.0, 0.0)[0] == pytest.approx(np.degrees(np.arctan(300.0 / 550.0)))
+
+
+def test_deg2pix(calc):
+    rng = np.random.default_rng(1)
+    pixels = rng.uniform((-960, -540), (960, 540), (1000, 2))
+    distances = rng.uniform(450, 750, 1000)
+    # with an eye distance for each sample
+    degrees = calc.pix2deg(pixels, eye_distance_mm=distances)
+    np.testing.assert_allclose(calc.deg2pix(degrees, eye_distance_mm=distances), pixels, atol=1e-6)
+    # farther from the display, the same position is a smaller angle
+    assert np.all(np.abs(calc.pix2deg(pixels, eye_distance_mm=distances + 100)) <= np.abs(degrees))
+    assert calc.deg2pix(*calc.pix2deg(-300.0, 200.0)) == pytest.approx((-300.0, 200.0))
+
+
+@pytest.mark.benchmark
+def test_millionSamples(calc, record_property):
+    pixels = np.random.default_rng(2).uniform((-960, -540), (960, 540), (10 ** 6, 2))
+    start = time.perf_counter()
+    degrees = calc.pix2deg(pixels)
+    record_property("pix2deg_ms", (time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    result = calc.deg2pix(degrees)
+    record_property("deg2pix_ms", (time.perf_counter() - start) * 1000)
+    np.testing.assert_allclose(result, pixels, atol=1e-6)
@@ -0,0 +1,85 @@
+"""
+Tests for the fast (integer nanosecond) clock reads and for mapping times
+between clocks. These don't need a window, unlike test_clock.py.
+"""
+import time
+import timeit
+
+import numpy as np
+import pytest
+
+from psychopy import clock
+
+
+def test_getTimeNs():
+    t = clock.getTimeNs()
+    assert isinstance(t, int)
+    assert abs(t / 1e9 - clock.getTime()) < 0.001
+
+    timer = clock.Clock()
+    timer.addTime(2)
+    assert abs(timer.getTimeNs() / 1e9 - timer.getTime()) < 0.001
+    assert abs(timer.getTimeNs(applyZero=False) / 1e9 -
+               timer.getTime(applyZero=False)) < 0.001
+
+    countdown = clock.CountdownTimer(5)
+    assert abs(countdown.getTimeNs() / 1e9 - countdown.getTime()) < 0.001
+
+
+def test_getTimesFromNs():
+    timer = clock.Clock()
+    timer.reset(10)
+    raw = []
+    expected = []
+    for n in range(100):
+        raw.append(clock.getTimeNs())
+        expected.append(timer.getTime())
+    times = timer.getTimesFromNs(raw)
+    assert times.shape == (100,)
+    np.testing.assert_allclose(times, expected, atol=0.001)
+    assert np.all(np.diff(times) >= 0)
+    np.testing.assert_allclose(timer.getTimesFromNs(raw, applyZero=False),
+                               times + timer._epochTimeAtLastReset)
+
+
+@pytest.mark.benchmark
+def test_getTimeNsSpeed(record_property):
+    """Time reading the raw time, compared with making a Timestamp"""
+    timer = clock.Clock()
+    tNs = min(timeit.repeat(timer.getTimeNs, number=10000, repeat=3))
+    tStamp = min(timeit.repeat(timer.getTime, number=10000, repeat=3))
+    record_property("getTimeNsUs", tNs * 100)
+    record_property("getTimeUs", tStamp * 100)
+
+
+def test_clockMapping():
+    # a target clock which runs fast and is offset, with some jitter
+    rng = np.random.default_rng(0)
+    start = clock.getTime()
+
+    def target():
+        return 1000 + (clock.getTime() - start) * 1.001 + rng.normal(0, 1e-6)
+
+    mapping = clock.ClockMapping(clock.monotonicClock, target)
+    for n in range(20):
+        time.sleep(0.005)
+        sourceT, targetT, uncertainty = mapping.sample()
+        assert uncertainty >= 0
+    assert abs(mapping.drift - 0.001) < 1e-4
+
+    sourceTimes = clock.monotonicClock.getTime() + np.arange(5)
+    reset = clock.monotonicClock.getLastResetTime()
+    expected = 1000 + (sourceTimes + reset - start) * 1.001
+    np.testing.assert_allclose(mapping.toTarget(sourceTimes), expected, atol=1e-4)
+    np.testing.assert_allclose(mapping.toSource(mapping.toTarget(sourceTimes)),
+                               sourceTimes)
+    assert isinstance(mapping.toTarget(1.0), float)
+
+
+def test_clockMappingToEpoch():
+    mapping = clock.ClockMapping(maxSamples=10)
+    mapping.startSampling(interval=0.01)
+    time.sleep(0.2)
+    mapping.stopSampling()
+    assert 5 < len(mapping.samples) <= 10
+    assert abs(mapping.toTarget(clock.monotonicClock.getTime()) - time.time()) < 0.01
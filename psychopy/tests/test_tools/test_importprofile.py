@@ -0,0 +1,49 @@
+import pytest
+
+from psychopy.tools import importprofile
+
+sampleOutput = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:      2000 |       5000 |     numpy.core
+import time:      1000 |       6000 |   numpy
+import time:       500 |       6600 | psychopy.tools
+import time:       300 |       6900 | psychopy.visual
+"""
+
+
+def test_parseImportTime():
+    records = importprofile.parseImportTime(sampleOutput)
+    assert [r.name for r in records] == [
+        "_io", "numpy.core", "numpy", "psychopy.tools", "psychopy.visual"]
+    assert [r.depth for r in records] == [1, 2, 1, 0, 0]
+    assert records[2].self == pytest.approx(0.001)
+    assert records[2].cumulative == pytest.approx(0.006)
+    assert importprofile.getTotalTime(records) == pytest.approx(0.0135)
+
+
+def test_summarize():
+    records = importprofile.parseImportTime(sampleOutput)
+    byModule = importprofile.summarize(records, by="module", prefix="psychopy")
+    assert [name for name, t in byModule] == ["psychopy.visual", "psychopy.tools"]
+    byPackage = dict(importprofile.summarize(records, by="package"))
+    assert byPackage["numpy"] == pytest.approx(0.003)
+    assert byPackage["psychopy"] == pytest.approx(0.0008)
+
+
+@pytest.mark.parametrize("moduleName, heavyModules", [
+    ("psychopy.visual", ("pyglet.window", "PIL.Image", "freetype", "pandas")),
+    ("psychopy.data", ("pandas", "scipy", "openpyxl")),
+    ("psychopy.hardware", ("psychopy.iohub",)),
+])
+def test_lazyImportBenchmark(moduleName, heavyModules):
+    """
+    Importing the top level of these packages shouldn't import the heavy modules their contents
+    depend on, these are only imported when something which needs them is used.
+    """
+    records = importprofile.profileImport(moduleName)
+    imported = {record.name for record in records}
+    assert moduleName in imported
+    for heavy in heavyModules:
+        assert heavy not in imported, (
+            "Importing {} also imported {}".format(moduleName, heavy)
+        )
@@ -0,0 +1,66 @@
+import sys
+
+import pytest
+
+from psychopy.tools.importtools import lazyImport
+
+
+@pytest.fixture
+def lazyPackage(tmp_path, monkeypatch):
+    """
+    Make a package which lazily imports a class from one of its submodules.
+    """
+    package = tmp_path / "lazypkg"
+    package.mkdir()
+    (package / "__init__.py").write_text(
+        "from psychopy.tools.importtools import lazyImport\n"
+        "__getattr__, __dir__, __all__ = lazyImport(__name__, '''\n"
+        "from .stim import Stim\n"
+        "from . import other\n"
+        "''')\n"
+    )
+    (package / "stim.py").write_text("class Stim:\n    pass\n")
+    (package / "other.py").write_text("value = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazypkg"
+    for name in list(sys.modules):
+        if name.split(".")[0] == "lazypkg":
+            del sys.modules[name]
+
+
+def test_lazyNames(lazyPackage):
+    module = __import__(lazyPackage)
+    assert module.__all__ == ["Stim", "other"]
+    # nothing is imported until it's used
+    assert "lazypkg.stim" not in sys.modules
+    assert "Stim" in dir(module)
+    assert module.Stim.__module__ == "lazypkg.stim"
+
+
+def test_starImport(lazyPackage):
+    namespace = {}
+    exec("from lazypkg import *", namespace)
+    assert namespace["Stim"].__name__ == "Stim"
+    assert namespace["other"].value == 1
+
+
+def test_starImportData():
+    namespace = {}
+    exec("from psychopy.data import *", namespace)
+    for name in ("TrialHandler", "StairHandler", "ExperimentHandler", "importConditions", "haveXlrd"):
+        assert name in namespace
+
+
+def test_visualAll():
+    # star importing visual itself needs a display, so check what it would export
+    from psychopy import visual
+    for name in ("Window", "TextStim", "ImageStim", "event", "STOPPED", "FINISHED"):
+        assert name in visual.__all__
+    assert set(visual.__all__) <= set(dir(visual))
+
+
+def test_badImports():
+    with pytest.raises(ValueError):
+        lazyImport(__name__, "from os import *")
+    with pytest.raises(ValueError):
+        lazyImport(__name__, "x = 1")
@@ -0,0 +1,69 @@
+import io
+
+import numpy as np
+
+from psychopy import logging
+from psychopy.tools import logtools
+
+
+def _logTrials(logger, nTrials, t0=0):
+    for trialN in range(nTrials):
+        t = t0 + trialN * 0.5
+        logger.log("New trial", level=logging.EXP, t=t)
+        logger.log("stim: autoDraw = True", level=logging.EXP, t=t + 0.1)
+        logger.log("Keypress: {}".format("left" if trialN % 2 else "right"),
+                   level=logging.DATA, t=t + 0.3)
+        logger.log("debugging", level=logging.DEBUG, t=t + 0.4)
+    logger.flush()
+
+
+def test_recordDtype():
+    assert logtools.recordDtype.itemsize == logging.BinaryLogFile.recordSize
+
+
+def test_binaryLogMatchesText(tmp_path):
+    fileName = tmp_path / "test.psylog"
+    logger = logging._Logger()
+    text = io.StringIO()
+    logging.LogFile(text, level=logging.EXP, logger=logger)
+    binary = logging.BinaryLogFile(fileName, level=logging.EXP, filemode='w',
+                                   logger=logger)
+    _logTrials(logger, 10)
+    # exported binary log should be identical to the text log
+    assert logtools.binaryLogToText(fileName) == text.getvalue()
+
+    records, strings = logtools.readBinaryLog(fileName)
+    assert len(records) == 30
+    # repeated messages are only stored once
+    assert len(strings) == 4
+    assert records['t'][0] == 0
+    assert records['level'][2] == logging.DATA
+
+
+def test_loadBinaryLog(tmp_path):
+    fileName = tmp_path / "test.psylog"
+    logger = logging._Logger()
+    binary = logging.BinaryLogFile(fileName, level=logging.DEBUG, filemode='w',
+                                   logger=logger)
+    _logTrials(logger, 4)
+    binary.write("written directly\n")
+    # entries appended when the file is opened again should also be read
+    binary.stream.close()
+    logger.removeTarget(binary)
+    logging.BinaryLogFile(fileName, level=logging.DEBUG, logger=logger)
+    _logTrials(logger, 4, t0=2)
+
+    entries = logtools.loadBinaryLog(fileName)
+    assert len(entries) == 33
+    assert entries['message'][16] == "written directly"
+    assert entries['levelname'][16] == ""
+    assert entries['message'][-1] == "debugging"
+    # only onsets
+    onsets = logtools.loadBinaryLog(fileName, pattern="autoDraw = True")
+    np.testing.assert_allclose(onsets['t'], np.arange(8) * 0.5 + 0.1)
+    # only data, as a DataFrame
+    df = logtools.loadBinaryLog(fileName, level=logging.DATA, asDataFrame=True)
+    assert set(df['levelname']) == {"DATA", ""}
+    keys = df[df['levelname'] == "DATA"]['message']
+    assert set(keys) == {"Keypress: right", "Keypress: left"}
+    assert len(keys) == 8
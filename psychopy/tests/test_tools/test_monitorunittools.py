@@ -0,0 +1,98 @@
+import timeit
+
+import numpy as np
+import pytest
+
+from psychopy import monitors
+from psychopy.tools import monitorunittools as tools
+
+
+class _FakeWindow:
+    """Just enough of a Window to convert units, so no display is needed."""
+    def __init__(self, size=(800, 600), useRetina=False):
+        self.monitor = monitors.Monitor('testMonitor', width=40, distance=57,
+                                        autoLog=False)
+        self.monitor.setSizePix([1600, 1200])
+        self.size = np.array(size)
+        self.useRetina = useRetina
+        self.units = 'pix'
+
+
+@pytest.mark.parametrize("vertices", [
+    np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=float),
+    np.array([3.5, -2.0]),
+])
+def test_convertToPix(vertices):
+    win = _FakeWindow()
+    pos = np.array([2.0, 5.0])
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'deg', win),
+        tools.deg2pix(pos + vertices, win.monitor))
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'cm', win),
+        tools.cm2pix(pos + vertices, win.monitor))
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'degFlat', win),
+        tools.deg2pix(pos + vertices, win.monitor, correctFlat=True))
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'degFlatPos', win),
+        tools.deg2pix(pos, win.monitor, correctFlat=True) +
+        tools.deg2pix(vertices, win.monitor))
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'norm', win),
+        (pos + vertices) * win.size / 2)
+    np.testing.assert_allclose(
+        tools.convertToPix(vertices, pos, 'height', win),
+        (pos + vertices) * win.size[1])
+
+
+def test_unitConverter():
+    win = _FakeWindow()
+    converter = tools.getUnitConverter(win)
+    assert tools.getUnitConverter(win) is converter
+    np.testing.assert_allclose(converter.getScale('cm'), [40, 40])
+    np.testing.assert_allclose(
+        converter.getMatrix('deg') @ [1, 1, 1],
+        list(tools.deg2pix(np.array([1, 1]), win.monitor)) + [1])
+    pix = converter.toPix(np.zeros(2), [0.5, -0.5], 'norm')
+    np.testing.assert_allclose(converter.fromPix(pix, 'norm'), [0.5, -0.5])
+    with pytest.raises(ValueError):
+        converter.getScale('degFlat')
+
+    # changes to the monitor or window should be picked up
+    win.monitor.setDistance(114)
+    win.size = np.array([1600, 1200])
+    win.useRetina = True
+    assert not converter.isCurrent()
+    converter = tools.getUnitConverter(win)
+    assert converter.isCurrent()
+    np.testing.assert_allclose(
+        tools.convertToPix(np.ones(2), np.zeros(2), 'deg', win),
+        tools.deg2pix(np.ones(2), win.monitor))
+    np.testing.assert_allclose(
+        tools.convertToPix(np.ones(2), np.zeros(2), 'norm', win), [400, 300])
+
+
+def test_noMonitor():
+    win = _FakeWindow()
+    win.monitor = None
+    # units which don't need a monitor still work
+    np.testing.assert_allclose(
+        tools.convertToPix(np.ones(2), np.zeros(2), 'height', win), [600, 600])
+    with pytest.raises(ValueError, match="monitors.Monitor"):
+        tools.convertToPix(np.ones(2), np.zeros(2), 'deg', win)
+
+
+@pytest.mark.benchmark
+def test_convertManyPositions(record_property):
+    """Time converting thousands of positions, as for an ElementArrayStim
+    each frame (ideally a small fraction of a frame)."""
+    win = _FakeWindow()
+    vertices = np.random.uniform(-10, 10, (5000, 2))
+    pos = np.array([1.0, 2.0])
+    for units in ('deg', 'degFlat', 'norm'):
+        assert tools.convertToPix(vertices, pos, units, win).shape == (5000, 2)
+        perFrame = min(timeit.repeat(
+            lambda: tools.convertToPix(vertices, pos, units, win),
+            number=100, repeat=3)) / 100
+        record_property("convert5000{}Ms".format(units), perFrame * 1000)
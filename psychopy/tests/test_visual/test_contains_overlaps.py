@@ -120,6 +120,10 @@ def contains_overlaps(testType):
                     ))
                 # Un-highlight marker
                 pointMarker.draw()
+            if testType == 'contains':
+                # all points at once should give the same results
+                manyRes = shape.contains([getattr(p, units) for p in points])
+                assert list(manyRes) == list(correctResults[i])
             win.flip()
 
 mpl_version = matplotlib.__version__
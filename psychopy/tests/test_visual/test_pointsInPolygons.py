@@ -0,0 +1,70 @@
+"""Test the vectorised point in polygon kernel against pointInPolygon, and
+benchmark it for testing many points at once.
+"""
+import timeit
+
+import numpy as np
+import pytest
+
+from psychopy.visual import helpers
+
+
+def _star(nPoints, pos=(0, 0), radius=100):
+    """A concave polygon with 2 * nPoints vertices"""
+    angles = np.linspace(0, 2 * np.pi, 2 * nPoints, endpoint=False)
+    radii = np.where(np.arange(2 * nPoints) % 2, radius * 0.4, radius)
+    return np.column_stack([pos[0] + radii * np.cos(angles),
+                            pos[1] + radii * np.sin(angles)])
+
+
+polygons = [
+    [(1, 1), (1, -1), (-1, -1), (-1, 1)],
+    _star(5) / 100,
+    _star(50, pos=(0.5, 0.2), radius=80) / 100,
+    # self-crossing
+    np.random.default_rng(0).uniform(-1, 1, (30, 2)),
+]
+
+
+@pytest.mark.parametrize("poly", polygons)
+def test_matchesPointInPolygon(poly):
+    points = np.random.default_rng(1).uniform(-1.5, 1.5, (1000, 2))
+    expected = [bool(helpers.pointInPolygon(x, y, poly)) for x, y in points]
+    assert list(helpers.pointsInPolygons(points, poly)) == expected
+
+
+def test_manyPolygons():
+    points = np.random.default_rng(2).uniform(-1.5, 1.5, (500, 2))
+    points[0] = np.nan
+    inside = helpers.pointsInPolygons(points, polygons)
+    assert inside.shape == (500, len(polygons))
+    assert not inside[0].any()
+    for n, poly in enumerate(polygons):
+        np.testing.assert_array_equal(
+            inside[:, n], helpers.pointsInPolygons(points, poly))
+    # too few vertices to be a polygon
+    assert not helpers.pointsInPolygons(points, [(0, 0), (1, 1)]).any()
+    assert helpers.pointsInPolygons(np.zeros((0, 2)), polygons).shape == (0, 4)
+
+
+def test_polygonsOverlap():
+    assert helpers.polygonsOverlap(polygons[0], polygons[1])
+    assert not helpers.polygonsOverlap(polygons[0], _star(5, pos=(5, 5), radius=1))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("nPoints", [5, 200])
+def test_pointsInPolygonsSpeed(nPoints, record_property):
+    """Time testing 10^5 points against a complex shape at once, compared with
+    testing each point separately."""
+    poly = _star(nPoints)
+    points = np.random.default_rng(3).uniform(-150, 150, (100000, 2))
+    tMany = min(timeit.repeat(lambda: helpers.pointsInPolygons(points, poly),
+                              number=1, repeat=3))
+
+    def each():
+        for x, y in points[:1000]:
+            helpers.pointInPolygon(x, y, poly)
+    tEach = min(timeit.repeat(each, number=1, repeat=3)) * 100
+    record_property("atOnceMs", tMany * 1000)
+    record_property("separatelyMs", tEach * 1000)
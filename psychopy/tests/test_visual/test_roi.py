@@ -97,3 +97,55 @@ class TestROI(_TestUnitsMixin, _TestBoilerplateMixin):
         )
         # Check that convenience functios return correct values
         assert self.obj.numLooks == looks.shape[0]
+
+
+class TestROIGroup:
+
+    def setup_method(self):
+        self.win = visual.Window([128, 128], pos=[50, 50], units="pix", allowGUI=False, autoLog=False)
+        self.rois = [
+            visual.ROI(self.win, name=f"roi{n}", shape="rectangle",
+                       units='pix', pos=pos, size=(20, 20), autoLog=False)
+            for n, pos in enumerate([(-30, -30), (30, -30), (-30, 30), (30, 30)])
+        ]
+        self.group = visual.ROIGroup(self.rois)
+
+    def teardown_method(self):
+        self.win.close()
+
+    def test_contains(self):
+        positions = np.random.uniform(-64, 64, (500, 2))
+        positions[0] = np.nan
+        hits = self.group.contains(positions)
+        assert hits.shape == (500, 4)
+        assert not hits[0].any()
+        for n, roi in enumerate(self.rois):
+            expected = [bool(roi.contains(x, y, 'pix')) for x, y in positions[1:]]
+            assert list(hits[1:, n]) == expected
+        # index should be rebuilt when an ROI moves
+        self.rois[0].pos = (0, 0)
+        assert self.group.contains([(0, 0)], units='pix')[0].tolist() == [True, False, False, False]
+
+    def test_update(self):
+        roi = self.rois[0]
+        # times of samples on the ROI's clock
+        offset = roi.clock.getLastResetTime() - core.monotonicClock.getLastResetTime()
+        inside, outside = roi.pos, (0, 0)
+        samples = [
+            {'type': 51, 'time': 0.0 + offset, 'gaze_x': outside[0], 'gaze_y': outside[1]},
+            {'type': 51, 'time': 0.1 + offset, 'gaze_x': inside[0], 'gaze_y': inside[1]},
+            {'type': 20, 'time': 0.15 + offset},  # not an eye sample
+            {'type': 51, 'time': 0.2 + offset, 'gaze_x': outside[0], 'gaze_y': outside[1]},
+            {'type': 51, 'time': 0.3 + offset, 'gaze_x': inside[0], 'gaze_y': inside[1]},
+        ]
+        hits = self.group.update(samples)
+        assert hits.shape == (4, 4)
+        np.testing.assert_allclose(roi.timesOn, [0.1, 0.3])
+        np.testing.assert_allclose(roi.timesOff, [0.2, 0.3])
+        assert roi.wasLookedIn
+        # look continues into the next block of samples
+        self.group.update([inside, outside], times=[0.4 + offset, 0.5 + offset])
+        np.testing.assert_allclose(roi.timesOff, [0.2, 0.5])
+        assert not roi.wasLookedIn
+        assert roi.numLooks == 2
+        assert self.rois[1].numLooks == 0
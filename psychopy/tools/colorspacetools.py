@@ -24,6 +24,22 @@ import numpy
 from psychopy import logging
 from psychopy.tools.coordinatetools import sph2cart
 
+# inverted conversion matrices, by the bytes of the matrix they're the inverse of
+_inverseCache = {}
+
+
+def _invertMatrix(matrix):  # used internally, not exported by __all__
+    """Invert a conversion matrix, remembering the result so that converting
+    colors every frame doesn't invert the same (e.g. monitor) matrix each time.
+    """
+    matrix = numpy.asarray(matrix, dtype=float)
+    key = (matrix.shape, matrix.tobytes())
+    if key not in _inverseCache:
+        if len(_inverseCache) > 64:
+            _inverseCache.clear()
+        _inverseCache[key] = numpy.linalg.inv(matrix)
+    return _inverseCache[key]
+
 
 def unpackColors(colors):  # used internally, not exported by __all__
     """Reshape an array of color values to Nx3 format.
@@ -671,7 +687,7 @@ def rgb2lms(rgb_Nx3, conversionMatrix=None):
                         'Using default LMS conversion matrix.')
     else:
         cones_to_rgb = conversionMatrix
-    rgb_to_cones = numpy.linalg.inv(cones_to_rgb)
+    rgb_to_cones = _invertMatrix(cones_to_rgb)
 
     lms = numpy.dot(rgb_to_cones, rgb_3xN)
     return numpy.transpose(lms)  # return in the shape we received it
@@ -695,7 +711,7 @@ def rgb2dklCart(picture, conversionMatrix=None):
         logging.warning('This monitor has not been color-calibrated. '
                         'Using default DKL conversion matrix.')
     else:
-        conversionMatrix = numpy.linalg.inv(conversionMatrix)
+        conversionMatrix = _invertMatrix(conversionMatrix)
 
     # Reshape the picture so that it can multiplied by the conversion matrix
     red = picture[:, :, 0]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2024 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Report how long it takes to import PsychoPy modules, per submodule.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``,
+so results aren't affected by what has already been imported. Run it as::
+
+    python -m psychopy.tools.importprofile psychopy.visual psychopy.data
+
+to print the cumulative import time of each `psychopy` submodule, or with
+``--by package`` to see which packages (numpy, pyglet, etc.) the time goes to.
+Use ``--budget`` to exit with an error when importing takes longer than a
+given number of milliseconds, e.g. to catch startup regressions in CI.
+"""
+
+__all__ = [
+    'ImportRecord',
+    'parseImportTime',
+    'profileImport',
+    'summarize',
+    'getTotalTime',
+    'main'
+]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+# default modules to profile
+defaultModules = ('psychopy.visual', 'psychopy.data', 'psychopy.hardware')
+
+ImportRecord = namedtuple('ImportRecord', ['name', 'self', 'cumulative', 'depth'])
+ImportRecord.__doc__ = """Time taken to import one module, in seconds.
+
+`self` excludes and `cumulative` includes the time taken by modules first
+imported by this one. `depth` is how deeply nested the import was (0 for the
+module being profiled and any modules imported before it).
+"""
+
+
+def parseImportTime(text):
+    """Parse the output of ``python -X importtime``.
+
+    Parameters
+    ----------
+    text : str
+        Output (stderr) from running Python with ``-X importtime``. Lines which
+        aren't import times are ignored.
+
+    Returns
+    -------
+    list of ImportRecord
+        One record per module, in the order they finished importing.
+    """
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            selfTime = int(fields[0]) / 1e6
+            cumulative = int(fields[1]) / 1e6
+        except ValueError:
+            continue  # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        # each level of nesting is indented by two spaces
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, selfTime, cumulative, depth))
+
+    return records
+
+
+def profileImport(moduleName, python=None, env=None):
+    """Import a module in a new interpreter and record the time taken to
+    import each module.
+
+    Parameters
+    ----------
+    moduleName : str
+        Module to import, e.g. "psychopy.visual".
+    python : str or None
+        Python executable to use, default is the one running this.
+    env : dict or None
+        Environment variables for the interpreter, default is a copy of this
+        process's environment.
+
+    Returns
+    -------
+    list of ImportRecord
+        One record per module imported.
+    """
+    if python is None:
+        python = sys.executable
+    if env is None:
+        env = dict(os.environ)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", "import {}".format(moduleName)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        universal_newlines=True)
+    records = parseImportTime(proc.stderr)
+    if proc.returncode != 0:
+        # importtime output is interleaved with the traceback, drop it
+        errors = [line for line in proc.stderr.splitlines()
+                  if not line.startswith("import time:")]
+        raise RuntimeError("Failed to import {}:\n{}".format(
+            moduleName, "\n".join(errors[-10:])))
+
+    return records
+
+
+def summarize(records, by="module", prefix="psychopy"):
+    """Total up import times.
+
+    Parameters
+    ----------
+    records : list of ImportRecord
+        Records from `profileImport` or `parseImportTime`.
+    by : str
+        "module" to get the cumulative time of each module whose name starts
+        with `prefix`, or "package" to get the total time spent importing each
+        top-level package (from the `self` time of its modules).
+    prefix : str or None
+        When `by` is "module", only include modules in this package (None for
+        all modules).
+
+    Returns
+    -------
+    list of tuple
+        Pairs of (name, seconds), slowest first.
+    """
+    totals = {}
+    if by == "module":
+        for record in records:
+            if prefix is None or record.name == prefix or \
+                    record.name.startswith(prefix + "."):
+                totals[record.name] = record.cumulative
+    elif by == "package":
+        for record in records:
+            package = record.name.split(".")[0]
+            totals[package] = totals.get(package, 0) + record.self
+    else:
+        raise ValueError("`by` should be 'module' or 'package', not {!r}".format(by))
+
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def getTotalTime(records):
+    """Total time taken by a profiled import, in seconds.
+    """
+    return sum(record.cumulative for record in records if record.depth == 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m psychopy.tools.importprofile",
+        description="Report the cumulative import time of each submodule.")
+    parser.add_argument(
+        'modules', nargs='*', default=list(defaultModules),
+        help="Modules to profile (default: {})".format(" ".join(defaultModules)))
+    parser.add_argument(
+        '--by', choices=('module', 'package'), default='module',
+        help="Report time per module in --prefix, or per top-level package")
+    parser.add_argument(
+        '--prefix', default='psychopy',
+        help="Only report modules in this package when --by module")
+    parser.add_argument(
+        '--top', type=int, default=20, help="Number of entries to report per module")
+    parser.add_argument(
+        '--repeat', type=int, default=1,
+        help="Profile each module this many times and report the fastest run")
+    parser.add_argument(
+        '--json', action='store_true', help="Print results as JSON")
+    parser.add_argument(
+        '--budget', type=float, default=None,
+        help="Exit with an error if any module takes longer than this many "
+             "milliseconds to import")
+    args = parser.parse_args(argv)
+
+    results = {}
+    overBudget = []
+    for moduleName in args.modules:
+        # take the fastest run, as slower ones are mostly disk/CPU noise
+        runs = [profileImport(moduleName) for n in range(max(args.repeat, 1))]
+        records = min(runs, key=getTotalTime)
+        total = getTotalTime(records)
+        results[moduleName] = {
+            'total': total,
+            'nModules': len(records),
+            'entries': summarize(records, by=args.by, prefix=args.prefix)[:args.top],
+        }
+        if args.budget is not None and total * 1000 > args.budget:
+            overBudget.append(moduleName)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for moduleName, result in results.items():
+            print("{}: {:.1f} ms, {} modules imported".format(
+                moduleName, result['total'] * 1000, result['nModules']))
+            for name, seconds in result['entries']:
+                print("  {:10.1f} ms  {}".format(seconds * 1000, name))
+            print()
+
+    for moduleName in overBudget:
+        sys.stderr.write("{} took longer than {} ms to import\n".format(
+            moduleName, args.budget))
+
+    return int(bool(overBudget))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2024 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Tools for deferring imports until they're needed.
+
+Packages such as `psychopy.visual` use `lazyImport` to make the names they
+expose available without importing the submodules which define them, so that
+``from psychopy import visual`` only pays for the stimuli an experiment
+actually uses. This module must stay cheap to import, so should only import
+from the standard library.
+"""
+
+__all__ = [
+    'lazyImport'
+]
+
+import ast
+import importlib
+import importlib.util
+import sys
+
+
+def _parseImports(imports):
+    """Parse a string of import statements into a dict mapping each name they
+    would define to the module it comes from and the attribute to get from it
+    (None if the name is the module itself).
+    """
+    lazy = {}
+    for node in ast.parse(imports).body:
+        if isinstance(node, ast.ImportFrom):
+            source = "." * node.level + (node.module or "")
+            for alias in node.names:
+                if alias.name == "*":
+                    raise ValueError("Star imports can't be made lazy")
+                lazy[alias.asname or alias.name] = (source, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname is None and "." in alias.name:
+                    raise ValueError(
+                        "Lazy `import {0}` needs an `as` name, as it would "
+                        "otherwise define `{1}`".format(
+                            alias.name, alias.name.split(".")[0]))
+                lazy[alias.asname or alias.name] = (alias.name, None)
+        else:
+            raise ValueError(
+                "Only import statements can be made lazy, not: {}".format(
+                    ast.dump(node)))
+
+    return lazy
+
+
+def _importSubmodule(moduleName, name):
+    """Import a submodule, raising AttributeError (as getattr would) rather
+    than ModuleNotFoundError if there isn't one.
+    """
+    fullName = moduleName + "." + name
+    try:
+        return importlib.import_module(fullName)
+    except ModuleNotFoundError as err:
+        if err.name != fullName:
+            raise  # submodule exists but failed to import something
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(moduleName, name)
+        ) from None
+
+
+def lazyImport(moduleName, imports):
+    """Make the names defined by some import statements available from a
+    module without running them until each name is first used (PEP 562).
+
+    Parameters
+    ----------
+    moduleName : str
+        Name of the module to add names to, usually `__name__`.
+    imports : str
+        Import statements, as they would be written in the module (relative
+        imports are relative to `moduleName`).
+
+    Returns
+    -------
+    tuple
+        Functions to assign to the module's `__getattr__` and `__dir__`, and
+        a list of the names defined by `imports`. As well as these names,
+        `__getattr__` imports submodules of a package on first access, as
+        would have happened if they'd been imported by the package. The list
+        of names should be included in the module's `__all__`, as star imports
+        only include names which aren't yet defined if they're in `__all__`.
+
+    Examples
+    --------
+    In a package's `__init__.py`::
+
+        from psychopy.tools.importtools import lazyImport
+
+        __getattr__, __dir__, __all__ = lazyImport(__name__, '''
+        from .window import Window
+        from psychopy import event
+        ''')
+
+    """
+    module = sys.modules[moduleName]
+    lazy = _parseImports(imports)
+    # relative imports are relative to the module if it's a package, otherwise
+    # to the package containing it
+    package = module.__spec__.parent if module.__spec__ else moduleName
+    isPackage = hasattr(module, "__path__")
+
+    def __getattr__(name):
+        if name in lazy:
+            source, attr = lazy[name]
+            sourceModule = importlib.import_module(source, package)
+            if attr is None:
+                value = sourceModule
+            elif sourceModule is module:
+                # submodule of this package, getattr would come back here
+                value = _importSubmodule(moduleName, attr)
+            else:
+                # same as `from source import attr`, which tries submodules too
+                try:
+                    value = getattr(sourceModule, attr)
+                except AttributeError:
+                    value = _importSubmodule(sourceModule.__name__, attr)
+        elif isPackage and not name.startswith("__") and \
+                importlib.util.find_spec(moduleName + "." + name) is not None:
+            value = importlib.import_module(moduleName + "." + name)
+        else:
+            raise AttributeError(
+                "module '{}' has no attribute '{}'".format(moduleName, name))
+        # store the value so that __getattr__ isn't called for it again
+        setattr(module, name, value)
+
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(lazy))
+
+    return __getattr__, __dir__, list(lazy)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Part of the PsychoPy library
+# Copyright (C) 2002-2018 Jonathan Peirce (C) 2019-2024 Open Science Tools Ltd.
+# Distributed under the terms of the GNU General Public License (GPL).
+
+"""Read log files written by :class:`psychopy.logging.BinaryLogFile`, and
+convert them to the text layout of a normal log file or to csv. Run it as::
+
+    python -m psychopy.tools.logtools experiment.psylog experiment.log
+
+to convert a binary log to text (or to csv, if the output ends in .csv).
+"""
+
+__all__ = [
+    'recordDtype',
+    'readBinaryLog',
+    'loadBinaryLog',
+    'binaryLogToText',
+    'main'
+]
+
+import argparse
+import re
+import struct
+import sys
+
+import numpy as np
+
+from psychopy import logging
+
+# dtype of the records in a binary log file
+recordDtype = np.dtype([('t', '<f8'), ('level', '<i4'), ('msgId', '<u4')])
+
+
+def readBinaryLog(fileName):
+    """Read the records and string table of a binary log file.
+
+    Parameters
+    ----------
+    fileName : str or Path
+        Path of a file written by :class:`~psychopy.logging.BinaryLogFile`.
+
+    Returns
+    -------
+    tuple
+        The records, as a structured array with fields `t`, `level` and
+        `msgId`, and the table of strings (a list) which `msgId` indexes.
+    """
+    with open(fileName, 'rb') as f:
+        buffer = f.read()
+
+    magic = logging.BinaryLogFile.magic
+    if not buffer.startswith(magic):
+        raise ValueError("{} is not a binary PsychoPy log file".format(fileName))
+
+    strings = []
+    blocks = []
+    offset = 0  # ids in the current section are relative to this
+    pos = 0
+    while pos < len(buffer):
+        if buffer.startswith(magic, pos):
+            # new section, with string ids starting again from 0
+            offset = len(strings)
+            pos += len(magic)
+            continue
+        if pos + 5 > len(buffer):
+            break  # truncated, e.g. if the experiment crashed mid-write
+        tag = buffer[pos:pos + 1]
+        length, = struct.unpack_from("<I", buffer, pos + 1)
+        start = pos + 5
+        pos = start + length
+        if pos > len(buffer):
+            break
+        if tag == b"S":
+            nStrings, = struct.unpack_from("<I", buffer, start)
+            stringPos = start + 4
+            for n in range(nStrings):
+                size, = struct.unpack_from("<I", buffer, stringPos)
+                stringPos += 4
+                strings.append(buffer[stringPos:stringPos + size].decode('utf-8'))
+                stringPos += size
+        elif tag == b"R":
+            records = np.frombuffer(buffer, dtype=recordDtype,
+                                    count=length // recordDtype.itemsize,
+                                    offset=start)
+            if offset:
+                records = records.copy()
+                records['msgId'] += offset
+            blocks.append(records)
+        else:
+            raise ValueError("Unknown chunk {!r} in binary log file {}".format(
+                tag, fileName))
+
+    if blocks:
+        records = np.concatenate(blocks)
+    else:
+        records = np.zeros(0, dtype=recordDtype)
+
+    return records, strings
+
+
+def loadBinaryLog(fileName, level=logging.NOTSET, pattern=None, asDataFrame=False):
+    """Load a binary log file.
+
+    Parameters
+    ----------
+    fileName : str or Path
+        Path of a file written by :class:`~psychopy.logging.BinaryLogFile`.
+    level : int
+        Only load entries of at least this level (text written directly to the
+        file is always included).
+    pattern : str or None
+        Only load entries whose message matches this regular expression (using
+        `re.search`), e.g. ``"autoDraw = True"`` to get stimulus onsets. This is
+        quick as each distinct message is only checked once.
+    asDataFrame : bool
+        Return a `pandas.DataFrame` (with message as a categorical column)
+        rather than a NumPy structured array.
+
+    Returns
+    -------
+    numpy.ndarray or pandas.DataFrame
+        Entries with fields `t`, `level`, `levelname` and `message`.
+    """
+    records, strings = readBinaryLog(fileName)
+    keep = (records['level'] >= level) | \
+           (records['level'] == logging.BinaryLogFile.rawLevel)
+    if pattern is not None:
+        regex = re.compile(pattern)
+        matches = np.array([regex.search(string) is not None for string in strings],
+                           dtype=bool)
+        keep &= matches[records['msgId']] if len(strings) else False
+    records = records[keep]
+
+    # work out each level's name once
+    levels, levelIndex = np.unique(records['level'], return_inverse=True)
+    levelNames = np.array([_getLevelName(thisLevel) for thisLevel in levels],
+                          dtype=object)
+
+    if asDataFrame:
+        import pandas as pd
+        # the same string can appear in the table more than once (if the file
+        # was appended to), but categories must be unique
+        categories = list(dict.fromkeys(strings))
+        codeOf = {string: code for code, string in enumerate(categories)}
+        codes = np.array([codeOf[string] for string in strings], dtype=np.int64)
+        return pd.DataFrame({
+            't': records['t'],
+            'level': records['level'],
+            'levelname': levelNames[levelIndex] if len(records) else [],
+            'message': pd.Categorical.from_codes(
+                codes[records['msgId']] if len(records) else [], categories),
+        })
+
+    entries = np.empty(len(records), dtype=[
+        ('t', 'f8'), ('level', 'i4'), ('levelname', object), ('message', object)])
+    entries['t'] = records['t']
+    entries['level'] = records['level']
+    if len(records):
+        entries['levelname'] = levelNames[levelIndex]
+        entries['message'] = np.array(strings, dtype=object)[records['msgId']]
+
+    return entries
+
+
+def _getLevelName(level):
+    if level == logging.BinaryLogFile.rawLevel:
+        return ""
+    return logging.getLevel(int(level))
+
+
+def binaryLogToText(fileName, outFile=None, level=logging.NOTSET, pattern=None,
+                    format="{t:.4f} \t{levelname} \t{message}"):
+    """Convert a binary log file to the text layout of a
+    :class:`~psychopy.logging.LogFile`.
+
+    Parameters
+    ----------
+    fileName : str or Path
+        Path of a file written by :class:`~psychopy.logging.BinaryLogFile`.
+    outFile : str, Path, file or None
+        Where to write the text (None to just return it).
+    level : int
+        Only include entries of at least this level.
+    pattern : str or None
+        Only include entries whose message matches this regular expression.
+    format : str
+        Format of each line, as for `psychopy.logging.root.format`.
+
+    Returns
+    -------
+    str
+        The log as text.
+    """
+    entries = loadBinaryLog(fileName, level=level, pattern=pattern)
+    rawLevel = logging.BinaryLogFile.rawLevel
+    lines = []
+    for t, thisLevel, levelname, message in entries.tolist():
+        if thisLevel == rawLevel:
+            lines.append(message)  # written directly, so no time or level
+        else:
+            lines.append(format.format(
+                t=t, t_ms=t * 1000, level=thisLevel, levelname=levelname,
+                message=message))
+    lines.append("")
+    text = "\n".join(lines)
+
+    if outFile is None:
+        pass
+    elif hasattr(outFile, 'write'):
+        outFile.write(text)
+    else:
+        with open(outFile, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m psychopy.tools.logtools",
+        description="Convert a binary PsychoPy log file to text or csv.")
+    parser.add_argument('infile', help="Binary log file to read")
+    parser.add_argument(
+        'outfile', nargs='?', default=None,
+        help="File to write (default: print to stdout). Written as csv if it "
+             "ends in .csv, otherwise in the text layout of a log file.")
+    parser.add_argument(
+        '--level', default='NOTSET',
+        help="Only include entries of at least this level, e.g. EXP")
+    parser.add_argument(
+        '--pattern', default=None,
+        help="Only include entries whose message matches this regular "
+             "expression")
+    args = parser.parse_args(argv)
+
+    level = logging.getLevel(args.level)
+    if not isinstance(level, int):
+        parser.error("Unknown level: {}".format(args.level))
+
+    if args.outfile is not None and args.outfile.lower().endswith('.csv'):
+        df = loadBinaryLog(args.infile, level=level, pattern=args.pattern,
+                           asDataFrame=True)
+        df.to_csv(args.outfile, index=False)
+    else:
+        binaryLogToText(args.infile, outFile=args.outfile or sys.stdout,
+                        level=level, pattern=args.pattern)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,185 @@ from math import hypot as hypot3d
 # the given unit type to PsychoPy OpenGL pix unit space.
 _unit2PixMappings = dict()
 
+
+def _asList(value):
+    """Copy of a size (array, list or None) which can be compared later."""
+    if value is None:
+        return None
+    elif isinstance(value, np.ndarray):
+        return value.tolist()  # much quicker than list() for an array
+    return list(value)
+
+
+class UnitConverter:
+    """Converts coordinates between pixels and other units for a window.
+
+    The factors which depend on the monitor (size, width and distance) and
+    window (size, retina) are worked out once, and only again when one of them
+    changes. Get the converter for a window with `getUnitConverter`, rather
+    than creating one.
+
+    Linear units ('cm', 'deg', 'norm', 'height', 'pt') only need scaling, so
+    converting any number of coordinates is a single multiply (see
+    `getMatrix` for the equivalent affine matrix). 'degFlat' needs a
+    non-linear correction for the flat screen, which is vectorised.
+
+    Parameters
+    ----------
+    win : `~psychopy.visual.Window`
+        Window to convert coordinates for.
+    """
+    # 'deg' to 'cm' at the center of the screen, per cm of viewing distance
+    _cmPerDegPerDist = 0.017455
+
+    def __init__(self, win):
+        self.win = win
+        self._key = None
+        self.update()
+
+    @staticmethod
+    def _getKey(win):
+        """Values which, if changed, mean the factors need recalculating."""
+        monitor = getattr(win, 'monitor', None)
+        calib = getattr(monitor, 'currentCalib', None) or {}
+        return (
+            id(monitor), calib.get('width'), calib.get('distance'),
+            _asList(calib.get('sizePix')), _asList(getattr(win, 'size', None)),
+            bool(getattr(win, 'useRetina', False)))
+
+    def isCurrent(self):
+        """Whether the factors are still correct for the window and monitor.
+        """
+        return self._getKey(self.win) == self._key
+
+    def update(self):
+        """Work out the conversion factors from the window and its monitor.
+        """
+        win = self.win
+        self._key = self._getKey(win)
+        self._scales = {'pix': np.ones(2), 'pixels': np.ones(2)}
+        self._monitorError = None
+        self.distance = self.pixPerCm = None
+
+        winSize = getattr(win, 'size', None)
+        if winSize is not None:
+            # size of the window in its own (not retina) pixels
+            size = np.asarray(winSize, dtype=float) / (1 + bool(win.useRetina))
+            self._scales['norm'] = size / 2
+            self._scales['height'] = np.array([size[1], size[1]])
+
+        monitor = getattr(win, 'monitor', None)
+        if not isinstance(monitor, monitors.Monitor):
+            self._monitorError = (
+                "Converting to cm or deg requires a monitors.Monitor object "
+                "but the window has %s" % str(type(monitor)))
+            return
+        scrWidthCm = monitor.getWidth()
+        scrSizePix = monitor.getSizePix()
+        if scrSizePix is None:
+            msg = "Monitor %s has no known size in pixels (SEE MONITOR CENTER)"
+            self._monitorError = msg % monitor.name
+            return
+        if scrWidthCm is None:
+            msg = "Monitor %s has no known width in cm (SEE MONITOR CENTER)"
+            self._monitorError = msg % monitor.name
+            return
+        self.pixPerCm = scrSizePix[0] / float(scrWidthCm)
+        self._scales['cm'] = np.array([self.pixPerCm, self.pixPerCm])
+        self._scales['pt'] = self._scales['cm'] * (2.54 / 72)
+        self.distance = monitor.getDistance()
+        if self.distance is None:
+            msg = "Monitor %s has no known distance (SEE MONITOR CENTER)"
+            self._monitorError = msg % monitor.name
+            return
+        pixPerDeg = self.distance * self._cmPerDegPerDist * self.pixPerCm
+        self._scales['deg'] = self._scales['degs'] = np.array([pixPerDeg, pixPerDeg])
+
+    def getScale(self, units):
+        """Number of pixels per unit, along x and y.
+
+        Parameters
+        ----------
+        units : str
+            A linear unit, e.g. 'deg', 'cm', 'norm', 'height' or 'pix'.
+
+        Returns
+        -------
+        ndarray
+            Scale factors for x and y.
+        """
+        scale = self._scales.get(units)
+        if scale is None:
+            if units in ('cm', 'pt', 'deg', 'degs', 'degFlat', 'degFlatPos') \
+                    and self._monitorError:
+                raise ValueError(self._monitorError)
+            raise ValueError(
+                "The unit type [{0}] is not a linear unit".format(units))
+        return scale
+
+    def getMatrix(self, units):
+        """Affine matrix (3x3, for homogeneous 2D coordinates) which converts
+        from `units` to pixels.
+        """
+        matrix = np.eye(3)
+        matrix[0, 0], matrix[1, 1] = self.getScale(units)
+        return matrix
+
+    def degFlatToPix(self, degrees):
+        """Convert an Nx2 array (or single x, y pair) of positions in degrees
+        to pixels, correcting for the flat screen so that positions further
+        from the center are spaced further apart.
+        """
+        dist = self.distance
+        if dist is None or self.pixPerCm is None:
+            raise ValueError(self._monitorError)
+        rads = np.radians(degrees)
+        if rads.shape != (2,) and (rads.ndim != 2 or rads.shape[1] != 2):
+            msg = ("If using deg2cm with correctedFlat==True then degrees "
+                   "arg must have shape [N,2], not %s")
+            raise ValueError(msg % (repr(rads.shape)))
+        tanXY = np.tan(rads)
+        tanX = tanXY[..., 0]
+        tanY = tanXY[..., 1]
+        pix = np.empty(rads.shape, 'd')
+        pix[..., 0] = hypot(dist, tanY * dist) * tanX
+        pix[..., 1] = hypot(dist, tanX * dist) * tanY
+        pix *= self.pixPerCm
+        return pix
+
+    def toPix(self, vertices, pos, units):
+        """Combine vertices and position and convert them to pixels, as
+        `convertToPix` does for the built-in unit types.
+        """
+        if units == 'degFlat':
+            return self.degFlatToPix(np.add(pos, vertices))
+        elif units == 'degFlatPos':
+            return self.degFlatToPix(np.asarray(pos, dtype=float)) + \
+                np.multiply(vertices, self.getScale('deg'))
+        return np.add(pos, vertices) * self.getScale(units)
+
+    def fromPix(self, pixels, units):
+        """Convert coordinates in pixels to another (linear) unit.
+        """
+        return pixels / self.getScale(units)
+
+
+def getUnitConverter(win):
+    """Get the :class:`UnitConverter` for a window, updated if the window's
+    size or monitor have changed since it was last used.
+    """
+    converter = getattr(win, '_unitConverter', None)
+    if converter is None or converter.win is not win:
+        converter = UnitConverter(win)
+        try:
+            win._unitConverter = converter
+        except AttributeError:
+            pass  # can't store it, so it's worked out each time
+    elif not converter.isCurrent():
+        converter.update()
+    return converter
+
+
 # the following are to be used by convertToPix
 
 
@@ -29,44 +208,33 @@ _unit2PixMappings['pixels'] = _pix2pix
 
 
 def _cm2pix(vertices, pos, win):
-    return cm2pix(pos + vertices, win.monitor)
+    return getUnitConverter(win).toPix(vertices, pos, 'cm')
 _unit2PixMappings['cm'] = _cm2pix
 
 
 def _deg2pix(vertices, pos, win):
-    return deg2pix(pos + vertices, win.monitor)
+    return getUnitConverter(win).toPix(vertices, pos, 'deg')
 _unit2PixMappings['deg'] = _deg2pix
 _unit2PixMappings['degs'] = _deg2pix
 
 
 def _degFlatPos2pix(vertices, pos, win):
-    posCorrected = deg2pix(pos, win.monitor, correctFlat=True)
-    vertices = deg2pix(vertices, win.monitor, correctFlat=False)
-    return posCorrected + vertices
+    return getUnitConverter(win).toPix(vertices, pos, 'degFlatPos')
 _unit2PixMappings['degFlatPos'] = _degFlatPos2pix
 
 
 def _degFlat2pix(vertices, pos, win):
-    return deg2pix(array(pos) + array(vertices), win.monitor,
-                   correctFlat=True)
+    return getUnitConverter(win).toPix(vertices, pos, 'degFlat')
 _unit2PixMappings['degFlat'] = _degFlat2pix
 
 
 def _norm2pix(vertices, pos, win):
-    if win.useRetina:
-        return (pos + vertices) * win.size / 4.0
-    else:
-        return (pos + vertices) * win.size / 2.0
-
+    return getUnitConverter(win).toPix(vertices, pos, 'norm')
 _unit2PixMappings['norm'] = _norm2pix
 
 
 def _height2pix(vertices, pos, win):
-    if win.useRetina:
-        return (pos + vertices) * win.size[1] / 2.0
-    else:
-        return (pos + vertices) * win.size[1]
-
+    return getUnitConverter(win).toPix(vertices, pos, 'height')
 _unit2PixMappings['height'] = _height2pix
 
 
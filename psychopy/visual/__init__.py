@@ -24,38 +24,31 @@ if sys.platform == 'win32':
             except OSError:
                 pass
 
-from psychopy import event  # import before visual or
+from psychopy.constants import STOPPED, FINISHED, PLAYING, NOT_STARTED
+from psychopy.tools.importtools import lazyImport
+
+# Everything else is only imported when first used (PEP 562), so that importing
+# visual doesn't import pyglet, PIL, freetype etc. until they're needed. Use
+# `python -m psychopy.tools.importprofile psychopy.visual` to check the cost.
+__getattr__, __dir__, _lazyNames = lazyImport(__name__, """
+from psychopy import event
 from psychopy.visual import filters
 from psychopy.visual.backends import gamma
+# window
+from psychopy.visual.window import Window, getMsPerFrame, openWindows
 # absolute essentials (nearly all experiments will need these)
-from .basevisual import BaseVisualStim
+from psychopy.visual.basevisual import BaseVisualStim
 # non-private helpers
-from .helpers import pointInPolygon, polygonsOverlap
-from .image import ImageStim
-from .text import TextStim
-from .form import Form
-from .brush import Brush
-from .textbox2.textbox2 import TextBox2
-from .button import ButtonStim
-from .roi import ROI
-from .target import TargetStim
-# window, should always be loaded first
-from .window import Window, getMsPerFrame, openWindows
-
-# needed for backwards-compatibility
-
-# need absolute imports within lazyImports
-
-# A newer alternative lib is apipkg but then we have to specify all the vars
-# that will be included, not just the lazy ones? Syntax is:
-# import apipkg
-# apipkg.initpkg(__name__, {
-#        'GratingStim': "psychopy.visual.grating:GratingStim",
-# })
-
-from psychopy.constants import STOPPED, FINISHED, PLAYING, NOT_STARTED
+from psychopy.visual.helpers import pointInPolygon, pointsInPolygons, polygonsOverlap
+from psychopy.visual.image import ImageStim
+from psychopy.visual.text import TextStim
+from psychopy.visual.form import Form
+from psychopy.visual.brush import Brush
+from psychopy.visual.textbox2.textbox2 import TextBox2
+from psychopy.visual.button import ButtonStim
+from psychopy.visual.roi import ROI, ROIGroup
+from psychopy.visual.target import TargetStim
 
-lazyImports = """
 # stimuli derived from object or MinimalStim
 from psychopy.visual.aperture import Aperture  # uses BaseShapeStim, ImageStim
 from psychopy.visual.custommouse import CustomMouse
@@ -116,9 +109,7 @@ from psychopy.visual.stim3d import BoxStim
 from psychopy.visual.stim3d import PlaneStim
 from psychopy.visual.stim3d import ObjMeshStim
 
-"""
-try:
-    from psychopy.contrib.lazy_import import lazy_import
-    lazy_import(globals(), lazyImports)
-except Exception:
-    exec(lazyImports)
+""")
+
+# names exported by `from psychopy.visual import *`
+__all__ = ['STOPPED', 'FINISHED', 'PLAYING', 'NOT_STARTED'] + _lazyNames
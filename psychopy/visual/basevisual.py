@@ -40,8 +40,8 @@ from psychopy.tools.attributetools import (attributeSetter, logAttrib,
                                            setAttribute, AttributeGetSetMixin)
 from psychopy.tools.monitorunittools import (cm2pix, deg2pix, pix2cm,
                                              pix2deg, convertToPix)
-from psychopy.visual.helpers import (pointInPolygon, polygonsOverlap,
-                                     setColor, findImageFile)
+from psychopy.visual.helpers import (pointInPolygon, pointsInPolygons,
+                                     polygonsOverlap, setColor, findImageFile)
 from psychopy.tools.typetools import float_uint8
 from psychopy.tools.arraytools import makeRadialMatrix, createLumPattern
 from psychopy.event import Mouse
@@ -882,6 +882,9 @@ class ContainerMixin:
             + one arg (list, tuple or array) containing two vals (x,y)
             + an object with a getPos() method that returns x,y, such
                 as a :class:`~psychopy.event.Mouse`.
+            + an array of many points, with shape (N, 2), in which case an
+                array of N bools is returned (this is much quicker than
+                testing each point separately).
 
         Returns `True` if the point is within the area defined either by its
         `border` attribute (if one defined), or its `vertices` attribute if
@@ -897,6 +900,7 @@ class ContainerMixin:
         See Coder demos: shapeContains.py
         """
         # get the object in pixels
+        manyPoints = False
         if hasattr(x, 'border'):
             xy = x._borderPix  # access only once - this is a property
             units = 'pix'  # we can forget about the units
@@ -909,6 +913,7 @@ class ContainerMixin:
             units = x.units
         elif type(x) in [list, tuple, numpy.ndarray]:
             xy = numpy.array(x)
+            manyPoints = xy.ndim == 2
         else:
             xy = numpy.array((x, y))
         # try to work out what units x,y has
@@ -933,6 +938,8 @@ class ContainerMixin:
         else:
             poly = self.verticesPix  # e.g., tessellated vertices
 
+        if manyPoints:
+            return pointsInPolygons(xy, poly)
         return pointInPolygon(xy[0], xy[1], poly=poly)
 
     def overlaps(self, polygon):
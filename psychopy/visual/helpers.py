@@ -86,6 +86,92 @@ def pointInPolygon(x, y, poly):
     return inside
 
 
+def pointsInPolygons(points, polygons):
+    """Determine which of many points are inside each of many polygons.
+
+    This is a vectorised version of :func:`pointInPolygon`, for testing e.g.
+    all the eye samples from a trial or the positions of many dots at once.
+    Points outside a polygon's bounding box are rejected before the full
+    (crossing number) test, which is done for all the remaining points in
+    one go.
+
+    Parameters
+    ----------
+    points : array_like
+        Points to test, as an array of shape (N, 2). Points which are NaN are
+        not in any polygon.
+    polygons : array_like or list
+        A polygon as (x, y) vertices, or a list of polygons (which can have
+        different numbers of vertices).
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array of shape (N,) for a single polygon, or (N, M) for a list
+        of M polygons, True where a point is inside a polygon.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    single = not len(polygons) or np.ndim(polygons[0]) == 1
+    if single:
+        polygons = [polygons]
+    vertices = _padPolygons(polygons)
+
+    inside = np.zeros((len(points), len(vertices)), dtype=bool)
+    if not len(points):
+        return inside[:, 0] if single else inside
+    lower = vertices.min(axis=1)
+    upper = vertices.max(axis=1)
+    # no more than this many point x edge tests at a time, to limit memory
+    chunkSize = max(1, 2 ** 20 // vertices.shape[1])
+    for n, poly in enumerate(vertices):
+        if len(polygons[n]) < 3:
+            continue
+        candidates = np.flatnonzero(
+            np.all((points >= lower[n]) & (points <= upper[n]), axis=1))
+        for first in range(0, len(candidates), chunkSize):
+            chunk = candidates[first:first + chunkSize]
+            crosses = _crossesEdges(points[chunk, 0:1], points[chunk, 1:2],
+                                    poly)
+            inside[chunk, n] = np.logical_xor.reduce(crosses, axis=1)
+
+    return inside[:, 0] if single else inside
+
+
+def _padPolygons(polygons):
+    """Put polygons with different numbers of vertices into one array of
+    shape (M, V, 2), repeating the last vertex of the shorter ones (which
+    adds edges of zero length, that are never crossed).
+    """
+    nVerts = max([len(poly) for poly in polygons] + [1])
+    vertices = np.zeros((len(polygons), nVerts, 2))
+    for n, poly in enumerate(polygons):
+        if len(poly):
+            vertices[n, :len(poly)] = poly
+            vertices[n, len(poly):] = poly[-1]
+
+    return vertices
+
+
+def _crossesEdges(x, y, vertices):
+    """Which polygon edges a ray from (x, y) in the +x direction crosses,
+    with broadcasting. A point is inside a polygon if it crosses an odd
+    number of its edges (from each vertex to the one before it, with
+    `vertices` having x and y in the last dimension).
+    """
+    xVert = vertices[..., 0]
+    yVert = vertices[..., 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (np.roll(xVert, 1, axis=-1) - xVert) / \
+            (np.roll(yVert, 1, axis=-1) - yVert)
+    above = yVert > y
+    crosses = above != np.roll(above, 1, axis=-1)
+    # edges which aren't crossed can have an infinite or nan slope
+    with np.errstate(invalid='ignore'):
+        crosses &= x < xVert + (y - yVert) * slope
+
+    return crosses
+
+
 def polygonsOverlap(poly1, poly2):
     """Determine if two polygons intersect; can fail for very pointy polygons.
 
@@ -131,6 +217,13 @@ def polygonsOverlap(poly1, poly2):
     except AttributeError:
         poly2_vert_pix = poly2
 
+    # can't overlap if their bounding boxes don't
+    poly1_vert_pix = np.asarray(poly1_vert_pix, dtype=float)
+    poly2_vert_pix = np.asarray(poly2_vert_pix, dtype=float)
+    if np.any(poly1_vert_pix.min(axis=0) > poly2_vert_pix.max(axis=0)) or \
+            np.any(poly2_vert_pix.min(axis=0) > poly1_vert_pix.max(axis=0)):
+        return False
+
     # faster if have matplotlib tools:
     if haveMatplotlib:
         if Version(matplotlib.__version__) > Version('1.2'):
@@ -147,14 +240,10 @@ def polygonsOverlap(poly1, poly2):
             except Exception:
                 pass
 
-    # fall through to pure python:
-    for p1 in poly1_vert_pix:
-        if pointInPolygon(p1[0], p1[1], poly2_vert_pix):
-            return True
-    for p2 in poly2_vert_pix:
-        if pointInPolygon(p2[0], p2[1], poly1_vert_pix):
-            return True
-    return False
+    # fall through to numpy:
+    if pointsInPolygons(poly1_vert_pix, poly2_vert_pix).any():
+        return True
+    return bool(pointsInPolygons(poly2_vert_pix, poly1_vert_pix).any())
 
 
 def setTexIfNoShaders(obj):
@@ -1,8 +1,11 @@
 import numpy as np
 
 from .shape import ShapeStim
+from .helpers import _crossesEdges, _padPolygons
 from ..event import Mouse
 from ..core import Clock
+from ..clock import monotonicClock
+from ..tools.monitorunittools import convertToPix
 
 
 class ROI(ShapeStim):
@@ -139,3 +142,256 @@ class ROI(ShapeStim):
         if self.debug:
             # Only draw if in debug mode
             ShapeStim.draw(self, win=win, keepMatrix=keepMatrix)
+
+
+class ROIGroup:
+    """
+    A group of :class:`ROI` objects which are tested against gaze together.
+
+    Testing each ROI separately means converting units and testing one point
+    against one polygon at a time, which is slow for displays with many ROIs
+    and when testing every eye sample rather than one position per frame.
+    An ROIGroup keeps the ROIs' outlines in pixels in a grid index, so a whole
+    block of samples (e.g. from an eyetracker's `getEvents()`) is tested
+    against all the ROIs at once, and only against ROIs near each sample.
+
+    Parameters
+    ----------
+    rois : list of :class:`ROI`
+        ROIs in the group, which must all be on the same window.
+    cellSize : float or None
+        Width and height of the cells of the grid index, in pixels. If None,
+        this is the average size of the ROIs.
+
+    Examples
+    --------
+    Update the looks at each ROI from all the eye samples since the last
+    frame::
+
+        group = visual.ROIGroup(rois)
+        ...
+        samples = tracker.getEvents()
+        group.update(samples)
+
+    """
+
+    def __init__(self, rois=(), cellSize=None):
+        self.rois = list(rois)
+        self.cellSize = cellSize
+        # outlines (in pixels) the index was last built from
+        self._polys = None
+
+    def __len__(self):
+        return len(self.rois)
+
+    def __iter__(self):
+        return iter(self.rois)
+
+    def append(self, roi):
+        """Add an ROI to the group"""
+        self.rois.append(roi)
+        self._polys = None
+
+    def remove(self, roi):
+        """Remove an ROI from the group"""
+        self.rois.remove(roi)
+        self._polys = None
+
+    @property
+    def win(self):
+        """Window the ROIs are on"""
+        if self.rois:
+            return self.rois[0].win
+
+    @staticmethod
+    def _getOutline(roi):
+        # the same outline as ROI.contains uses
+        if hasattr(roi, 'border'):
+            return roi._borderPix
+        return roi.verticesPix
+
+    def _updateIndex(self):
+        """Rebuild the grid index if any ROI has moved or changed shape."""
+        polys = [self._getOutline(roi) for roi in self.rois]
+        if self._polys is not None and len(polys) == len(self._polys) and \
+                all(new is old for new, old in zip(polys, self._polys)):
+            return  # outlines are only replaced when an ROI changes
+        self._polys = polys
+        nRois = len(polys)
+        if not nRois:
+            return
+
+        self._vertices = _padPolygons(polys)
+        lower = self._vertices.min(axis=1)
+        upper = self._vertices.max(axis=1)
+
+        # grid covering all the ROIs, listing the ROIs overlapping each cell
+        cellSize = self.cellSize
+        if cellSize is None:
+            cellSize = max(np.mean(upper - lower), 1.0)
+        self._cellSize = cellSize
+        self._origin = lower.min(axis=0)
+        self._gridShape = np.ceil(
+            (upper.max(axis=0) - self._origin) / cellSize).astype(int) + 1
+        first = np.floor((lower - self._origin) / cellSize).astype(int)
+        last = np.floor((upper - self._origin) / cellSize).astype(int)
+        cells = []
+        cellRois = []
+        for n in range(nRois):
+            cols, rows = np.meshgrid(np.arange(first[n, 0], last[n, 0] + 1),
+                                     np.arange(first[n, 1], last[n, 1] + 1))
+            cells.append(cols.ravel() * self._gridShape[1] + rows.ravel())
+            cellRois.append(np.full(cols.size, n))
+        cells = np.concatenate(cells)
+        cellRois = np.concatenate(cellRois)
+        order = np.argsort(cells, kind='stable')
+        self._cellRois = cellRois[order]
+        # ROIs in cell c are _cellRois[_cellStarts[c]:_cellStarts[c + 1]]
+        self._cellStarts = np.searchsorted(
+            cells[order], np.arange(np.prod(self._gridShape) + 1))
+
+    def contains(self, positions, units=None):
+        """Test which ROIs each of a set of positions is in.
+
+        Parameters
+        ----------
+        positions : array_like
+            Positions as an array of shape (N, 2). Missing positions (NaN)
+            are in none of the ROIs.
+        units : str or None
+            Units of the positions, by default the units of the window.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of shape (N, number of ROIs), True where a position
+            is in an ROI.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        hits = np.zeros((len(positions), len(self.rois)), dtype=bool)
+        if not len(positions) or not self.rois:
+            return hits
+        if units is None:
+            units = self.win.units
+        if units != 'pix':
+            positions = convertToPix(positions, pos=(0, 0), units=units,
+                                     win=self.win)
+        self._updateIndex()
+
+        # find the cell of each position, and so the ROIs it might be in
+        cellPos = np.floor((positions - self._origin) / self._cellSize)
+        valid = np.all((cellPos >= 0) & (cellPos < self._gridShape), axis=1)
+        pointIndex = np.flatnonzero(valid)
+        cellPos = cellPos[valid].astype(int)
+        cells = cellPos[:, 0] * self._gridShape[1] + cellPos[:, 1]
+        starts = self._cellStarts[cells]
+        counts = self._cellStarts[cells + 1] - starts
+        if not counts.sum():
+            return hits
+        # one entry per (position, candidate ROI) pair
+        pairPoints = np.repeat(pointIndex, counts)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        pairRois = self._cellRois[offsets + np.arange(counts.sum())]
+
+        # crossing number test of each pair
+        crosses = _crossesEdges(positions[pairPoints, 0:1],
+                                positions[pairPoints, 1:2],
+                                self._vertices[pairRois])
+        inside = np.logical_xor.reduce(crosses, axis=1)
+        hits[pairPoints[inside], pairRois[inside]] = True
+
+        return hits
+
+    def update(self, samples, times=None, units=None):
+        """Update the looks at each ROI (`timesOn`, `timesOff` and
+        `wasLookedIn`) from a block of gaze samples.
+
+        Looks are timed by the samples' own times rather than by when this
+        is called, so a look starts at the first sample in the ROI and ends at
+        the first sample outside it (or at the last sample, if the ROI is
+        still being looked at). Times are converted to each ROI's `clock`,
+        assuming sample times are on :data:`psychopy.clock.monotonicClock`
+        (as ioHub's are).
+
+        Parameters
+        ----------
+        samples : list or array_like
+            Either eye sample events from ioHub (as namedtuples, dicts or
+            objects, with `gaze_x` and `gaze_y` or the binocular equivalents,
+            any other events are ignored), or gaze positions as an array of
+            shape (N, 2).
+        times : array_like or None
+            Times of the samples on `monotonicClock`, if `samples` are
+            positions.
+        units : str or None
+            Units of the positions, by default the units of the window.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of shape (N, number of ROIs), True where a sample
+            is in an ROI.
+        """
+        if times is None:
+            positions, times = _getGazeSamples(samples)
+        else:
+            positions = samples
+        times = np.asarray(times, dtype=float).ravel()
+        hits = self.contains(positions, units=units)
+        if not len(times):
+            return hits
+
+        for roi, looking in zip(self.rois, hits.T):
+            roiTimes = times + (monotonicClock.getLastResetTime() -
+                                roi.clock.getLastResetTime())
+            wasLooking = np.concatenate([[roi.wasLookedIn], looking[:-1]])
+            starts = np.flatnonzero(looking & ~wasLooking)
+            ends = np.flatnonzero(~looking & wasLooking)
+            # time each look ended, or the last sample if it hasn't ended
+            endTimes = np.append(roiTimes[ends], roiTimes[-1])
+            if roi.wasLookedIn and roi.timesOff:
+                # a look continued from the last update
+                roi.timesOff[-1] = endTimes[0]
+            for start in starts:
+                roi.timesOn.append(roiTimes[start])
+                roi.timesOff.append(endTimes[np.searchsorted(ends, start)])
+            roi.wasLookedIn = bool(looking[-1])
+
+        return hits
+
+
+def _getGazeSamples(events):
+    """Get the positions and times of the eye samples in a list of ioHub
+    events."""
+    from psychopy.iohub.constants import EYE_SAMPLE_TYPES
+
+    positions = []
+    times = []
+    for event in events:
+        if isinstance(event, dict):
+            get = event.get
+        else:
+            def get(name, default=np.nan, event=event):
+                return getattr(event, name, default)
+        if get('type', None) not in EYE_SAMPLE_TYPES:
+            continue  # e.g. fixation or keyboard events
+        x = get('gaze_x', None)
+        if x is not None:
+            y = get('gaze_y', np.nan)
+        else:
+            # binocular samples, use the average of the eyes if both are valid
+            left = np.array([get('left_gaze_x', np.nan),
+                             get('left_gaze_y', np.nan)], dtype=float)
+            right = np.array([get('right_gaze_x', np.nan),
+                              get('right_gaze_y', np.nan)], dtype=float)
+            if np.isnan(left).any():
+                x, y = right
+            elif np.isnan(right).any():
+                x, y = left
+            else:
+                x, y = (left + right) / 2
+        positions.append((x, y))
+        times.append(get('time', np.nan))
+
+    return np.array(positions, dtype=float).reshape(-1, 2), \
+        np.array(times, dtype=float)